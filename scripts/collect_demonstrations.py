@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Demonstration collection script entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.training.pretrain import collect_demonstrations
+
+
+def main():
+    """Demonstration collection entry point."""
+    parser = argparse.ArgumentParser(
+        description="Roll out the heuristic controller in parallel into a "
+        "memory-mapped demonstration dataset for behavior-cloning warm starts"
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="scenarios/easy_world.yaml",
+        help="Path to scenario configuration file",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="demonstrations/easy_world",
+        help="Directory of the dataset",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=1000000, help="Transitions to record"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Rollout processes (default: number of cores)",
+    )
+    parser.add_argument(
+        "--obs-mode",
+        type=str,
+        choices=["dense", "topk", "graph"],
+        default="dense",
+        help="Observation layout; must match the policy to pretrain",
+    )
+    parser.add_argument(
+        "--k-neighbors",
+        type=int,
+        default=4,
+        help="Neighbors per drone ('topk') or max edges per drone ('graph')",
+    )
+    parser.add_argument(
+        "--max-drones",
+        type=int,
+        default=None,
+        help="Pad observations to this fleet size; use the largest fleet of "
+        "the curriculum phases when pretraining a curriculum",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Base rollout seed")
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        default=None,
+        help="Multiprocessing start method of the rollout processes",
+    )
+
+    args = parser.parse_args()
+
+    env_kwargs = {"obs_mode": args.obs_mode, "k_neighbors": args.k_neighbors}
+    if args.max_drones is not None:
+        env_kwargs["max_drones"] = args.max_drones
+
+    dataset = collect_demonstrations(
+        scenario_path=args.scenario,
+        dataset_dir=args.output,
+        n_samples=args.samples,
+        n_workers=args.workers,
+        env_kwargs=env_kwargs,
+        seed=args.seed,
+        start_method=args.start_method,
+    )
+    print(
+        f"Recorded {len(dataset):,} transitions from "
+        f"{dataset.metadata['episodes']} complete episodes to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Policy distillation script entry point for vertiport autonomy."""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.agents.drl.ppo import PPOAgent
+from vertiport_autonomy.training.distill import distill_policy
+
+
+def main():
+    """Policy distillation entry point."""
+    parser = argparse.ArgumentParser(
+        description="Distill a trained PPO policy into a compact low-latency "
+        "student controller"
+    )
+    parser.add_argument(
+        "--model", type=str, required=True, help="Path of the trained PPO model"
+    )
+    parser.add_argument(
+        "--vec-normalize",
+        type=str,
+        default=None,
+        help="VecNormalize statistics of the model (default: found next to it)",
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="scenarios/easy_world.yaml",
+        help="Path to scenario configuration file",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="models/student.npz",
+        help="Path of the student (a report is written next to it)",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=100000, help="Labelled states per round"
+    )
+    parser.add_argument(
+        "--hidden",
+        type=int,
+        nargs="+",
+        default=[64],
+        help="Hidden layer widths of the student",
+    )
+    parser.add_argument(
+        "--dagger-rounds",
+        type=int,
+        default=1,
+        help="Extra rounds on states visited by the student",
+    )
+    parser.add_argument(
+        "--epochs", type=int, default=10, help="Training epochs per round"
+    )
+    parser.add_argument(
+        "--obs-mode",
+        type=str,
+        choices=["dense", "topk"],
+        default="dense",
+        help="Observation layout; must match the teacher",
+    )
+    parser.add_argument(
+        "--k-neighbors", type=int, default=4, help="Neighbors per drone ('topk')"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    args = parser.parse_args()
+
+    teacher = PPOAgent(args.model, vec_normalize_path=args.vec_normalize)
+    print(f"Distilling {args.model} on {args.scenario}...")
+    student, report = distill_policy(
+        teacher,
+        args.scenario,
+        n_samples=args.samples,
+        hidden_sizes=args.hidden,
+        dagger_rounds=args.dagger_rounds,
+        epochs=args.epochs,
+        env_kwargs={"obs_mode": args.obs_mode, "k_neighbors": args.k_neighbors},
+        seed=args.seed,
+    )
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    student.save(args.output)
+    report_path = f"{os.path.splitext(args.output)[0]}_report.json"
+    with open(report_path, "w") as f:
+        json.dump(asdict(report), f, indent=2)
+    print(
+        f"Student ({report.student_parameters:,} parameters vs "
+        f"{report.teacher_parameters:,}) saved to {args.output}"
+    )
+    print(f"Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
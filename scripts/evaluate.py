@@ -8,9 +8,10 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from vertiport_autonomy.agents.heuristic import SimpleHeuristicAgent
+from vertiport_autonomy.agents.drl.serving import RemotePolicyAgent, load_policy_agent
 from vertiport_autonomy.evaluation.framework import (
     EvaluationFramework,
+    agent_wrapper,
     heuristic_agent_wrapper,
 )
 
@@ -22,7 +23,8 @@ def main():
         "--agent",
         type=str,
         default="heuristic",
-        help="Agent to evaluate: 'heuristic' or path to trained model",
+        help="Agent to evaluate: 'heuristic', path to trained model or "
+        "distilled student (.npz), or 'server:HOST:PORT' of a policy server",
     )
     parser.add_argument(
         "--scenario",
@@ -47,23 +49,72 @@ def main():
         action="store_true",
         help="Use deterministic actions (for trained models)",
     )
+    parser.add_argument(
+        "--vec-normalize",
+        type=str,
+        default=None,
+        help="VecNormalize statistics of a trained model (default: found "
+        "next to the model)",
+    )
+    parser.add_argument(
+        "--obs-mode",
+        type=str,
+        choices=["dense", "topk", "graph"],
+        default=None,
+        help="Observation layout (default: read from a trained model, else " "'dense')",
+    )
+    parser.add_argument(
+        "--k-neighbors",
+        type=int,
+        default=None,
+        help="Neighbors per drone ('topk') or max edges per drone ('graph')",
+    )
+    parser.add_argument(
+        "--max-drones",
+        type=int,
+        default=None,
+        help="Pad observations to this fleet size (default: the fleet size a "
+        "trained model was trained on, e.g. the largest curriculum fleet)",
+    )
 
     args = parser.parse_args()
 
     # Create evaluation framework
-    evaluator = EvaluationFramework()
+    evaluator = EvaluationFramework(output_dir=args.output_dir)
+
+    # Flags override the environment layout read from a trained model
+    overrides = {
+        "obs_mode": args.obs_mode,
+        "k_neighbors": args.k_neighbors,
+        "max_drones": args.max_drones,
+    }
+    overrides = {key: value for key, value in overrides.items() if value is not None}
 
     # Determine agent
     if args.agent.lower() == "heuristic":
         agent_fn = heuristic_agent_wrapper
         agent_name = "heuristic"
+    elif args.agent.startswith("server:"):
+        # Policy served by a running policy server (scripts/policy_server.py)
+        address = args.agent[len("server:") :]
+        print(f"Querying policy server at: {address}")
+        agent_name = "policy_server"
+        agent_fn = agent_wrapper(
+            RemotePolicyAgent(address, name=agent_name), env_kwargs=overrides
+        )
     else:
-        # Assume it's a path to a trained model
-        # This would need to be implemented to load PPO models
+        # Trained model or distilled student, evaluated with the NumPy policy
         print(f"Loading trained model from: {args.agent}")
-        agent_name = os.path.splitext(os.path.basename(args.agent))[0]
-        # For now, fall back to heuristic
-        agent_fn = heuristic_agent_wrapper
+        agent = load_policy_agent(
+            args.agent,
+            vec_normalize_path=args.vec_normalize,
+            deterministic=args.deterministic,
+            seed=args.seed,
+        )
+        agent_name = agent.name
+        env_kwargs = {**agent.env_kwargs, **overrides}
+        print(f"Environment layout: {env_kwargs}")
+        agent_fn = agent_wrapper(agent, env_kwargs=env_kwargs)
 
     # Run evaluation
     print(f"Evaluating agent: {agent_name}")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Policy inference server entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.agents.drl.serving import PolicyServer, load_policy_agent
+
+
+def main():
+    """Policy server entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve one copy of a trained policy to evaluation and "
+        "rollout workers with micro-batched inference "
+        "(authentication key: $VERTIPORT_AUTHKEY)"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        required=True,
+        help="Trained PPO model or distilled student (.npz)",
+    )
+    parser.add_argument(
+        "--vec-normalize",
+        type=str,
+        default=None,
+        help="VecNormalize statistics of the model (default: found next to it)",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface to listen on (only expose trusted networks)",
+    )
+    parser.add_argument("--port", type=int, default=7100, help="Port to listen on")
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=256,
+        help="Observations that close a micro-batch early",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=2.0,
+        help="Milliseconds a micro-batch stays open after its first request",
+    )
+    parser.add_argument(
+        "--stochastic",
+        action="store_true",
+        help="Sample actions instead of taking the most likely ones",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Sampling seed")
+
+    args = parser.parse_args()
+
+    agent = load_policy_agent(
+        args.model,
+        vec_normalize_path=args.vec_normalize,
+        deterministic=not args.stochastic,
+        seed=args.seed,
+    )
+    server = PolicyServer(
+        agent,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000.0,
+    )
+    host, port = server.address
+    print(f"🧠 Serving {agent.name} on {host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Served {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
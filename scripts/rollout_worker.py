@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Rollout worker daemon entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.training.remote import RolloutWorker
+
+
+def main():
+    """Rollout worker entry point."""
+    parser = argparse.ArgumentParser(
+        description="Host environments for a remote learner "
+        "(authentication key: $VERTIPORT_AUTHKEY)"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface to listen on (only expose trusted networks)",
+    )
+    parser.add_argument("--port", type=int, default=7000, help="Port to listen on")
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["dummy", "subproc", "shmem"],
+        default="dummy",
+        help="How the hosted environments are vectorized on this node",
+    )
+    parser.add_argument(
+        "--envs-per-worker",
+        type=int,
+        default=1,
+        help="Environments per local process for subprocess backends",
+    )
+    parser.add_argument(
+        "--worker-threads",
+        type=int,
+        default=1,
+        help="PyTorch/BLAS threads for policy inference and env processes",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        default=1,
+        help="zlib level of trajectory chunks (0 disables compression)",
+    )
+
+    args = parser.parse_args()
+
+    vec_env_kwargs = {}
+    if args.backend != "dummy":
+        vec_env_kwargs = {
+            "envs_per_worker": args.envs_per_worker,
+            "worker_threads": args.worker_threads,
+        }
+    worker = RolloutWorker(
+        host=args.host,
+        port=args.port,
+        backend=args.backend,
+        compress_level=args.compress_level,
+        worker_threads=args.worker_threads,
+        **vec_env_kwargs,
+    )
+    host, port = worker.address
+    print(f"🛰️  Rollout worker listening on {host}:{port}")
+    worker.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Real-time control loop entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.agents.drl.serving import RemotePolicyAgent, load_policy_agent
+from vertiport_autonomy.agents.heuristic import SimpleHeuristicAgent
+from vertiport_autonomy.config.loader import load_scenario_config
+from vertiport_autonomy.core.environment import VertiportEnv
+from vertiport_autonomy.evaluation.realtime import RealTimeRunner
+
+
+def main():
+    """Real-time runner entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run an agent in a real-time paced control loop and report "
+        "per-tick latencies and deadline misses"
+    )
+    parser.add_argument(
+        "--agent",
+        type=str,
+        default="heuristic",
+        help="Agent to run: 'heuristic', path to trained model or "
+        "distilled student (.npz), or 'server:HOST:PORT' of a policy server",
+    )
+    parser.add_argument(
+        "--vec-normalize",
+        type=str,
+        default=None,
+        help="VecNormalize statistics of a trained model (default: found next to it)",
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="scenarios/steady_flow.yaml",
+        help="Scenario configuration file",
+    )
+    parser.add_argument("--ticks", type=int, default=1000, help="Ticks to run")
+    parser.add_argument(
+        "--real-time-factor",
+        type=float,
+        default=1.0,
+        help="Simulated seconds per wall-clock second",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Decision deadline in milliseconds after the tick start "
+        "(default: the tick period)",
+    )
+    parser.add_argument(
+        "--fallback",
+        choices=["hover", "continue", "last"],
+        default="hover",
+        help="Action applied when the decision misses its deadline",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first episode")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write the report (with latency histograms) to this JSON file",
+    )
+
+    args = parser.parse_args()
+
+    config = load_scenario_config(args.scenario)
+    env = VertiportEnv(config)
+    if args.agent.lower() == "heuristic":
+        agent = SimpleHeuristicAgent.from_config(config)
+    elif args.agent.startswith("server:"):
+        agent = RemotePolicyAgent(args.agent[len("server:") :])
+    else:
+        agent = load_policy_agent(args.agent, vec_normalize_path=args.vec_normalize)
+
+    runner = RealTimeRunner(
+        env,
+        agent,
+        real_time_factor=args.real_time_factor,
+        decision_budget=None if args.budget_ms is None else args.budget_ms / 1000.0,
+        fallback=args.fallback,
+    )
+    print(f"⏱️  Running {agent.name} on {args.scenario} for {args.ticks} ticks")
+    report = runner.run(args.ticks, seed=args.seed)
+    env.close()
+
+    print(report.summary())
+    if args.output:
+        report.save(args.output)
+        print(f"Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
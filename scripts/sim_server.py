@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Simulation service entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.core.service import SimulationServer
+
+
+def main():
+    """Simulation server entry point."""
+    parser = argparse.ArgumentParser(
+        description="Host simulation sessions for external controllers, "
+        "batching concurrent steps into vectorized simulator calls "
+        "(authentication key: $VERTIPORT_AUTHKEY)"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface to listen on (only expose trusted networks)",
+    )
+    parser.add_argument("--port", type=int, default=7200, help="Port to listen on")
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=1024,
+        help="Pending steps that are advanced without waiting",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=0.5,
+        help="Milliseconds a batch of steps stays open after its first request",
+    )
+
+    args = parser.parse_args()
+
+    server = SimulationServer(
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000.0,
+    )
+    host, port = server.address
+    print(f"🛰️  Simulation service listening on {host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Served {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
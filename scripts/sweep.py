@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Hyperparameter sweep script entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.training.sweep import HyperparameterSweep
+
+
+def main():
+    """Hyperparameter sweep entry point."""
+    parser = argparse.ArgumentParser(
+        description="Search PPO hyperparameters with parallel trials and "
+        "successive-halving (ASHA) pruning"
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="scenarios/steady_flow.yaml",
+        help="Path to scenario configuration file",
+    )
+    parser.add_argument(
+        "--trials", type=int, default=20, help="Number of trials to sample"
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=None,
+        help="Concurrent trials (default: all cores / --cpus-per-trial)",
+    )
+    parser.add_argument(
+        "--cpus-per-trial", type=int, default=1, help="Cores pinned to each trial"
+    )
+    parser.add_argument(
+        "--min-timesteps",
+        type=int,
+        default=50000,
+        help="Timestep budget of the first rung",
+    )
+    parser.add_argument(
+        "--max-timesteps",
+        type=int,
+        default=1000000,
+        help="Timestep budget of a fully trained trial",
+    )
+    parser.add_argument(
+        "--reduction-factor",
+        type=int,
+        default=3,
+        help="Rung growth factor; the top 1/factor of each rung is promoted",
+    )
+    parser.add_argument(
+        "--eval-episodes",
+        type=int,
+        default=5,
+        help="Evaluation episodes scoring each rung",
+    )
+    parser.add_argument(
+        "--n-envs", type=int, default=4, help="Parallel environments per trial"
+    )
+    parser.add_argument(
+        "--sweep-dir",
+        type=str,
+        default="sweeps",
+        help="Directory for trial logs and the trials.jsonl results store",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Sampler seed")
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        default=None,
+        help="Multiprocessing start method of the trial processes",
+    )
+    parser.add_argument(
+        "--action-masking",
+        action="store_true",
+        help="Train trials with MaskablePPO (requires sb3-contrib)",
+    )
+
+    args = parser.parse_args()
+
+    sweep = HyperparameterSweep(
+        scenario_path=args.scenario,
+        n_trials=args.trials,
+        n_parallel=args.parallel,
+        cpus_per_trial=args.cpus_per_trial,
+        min_timesteps=args.min_timesteps,
+        max_timesteps=args.max_timesteps,
+        reduction_factor=args.reduction_factor,
+        n_eval_episodes=args.eval_episodes,
+        sweep_dir=args.sweep_dir,
+        seed=args.seed,
+        start_method=args.start_method,
+        n_envs=args.n_envs,
+        action_masking=args.action_masking,
+    )
+    sweep.run()
+    print(f"Trial records saved to {sweep.results_path}")
+
+
+if __name__ == "__main__":
+    main()
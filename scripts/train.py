@@ -38,20 +38,151 @@ def main():
     parser.add_argument(
         "--batch-size", type=int, default=128, help="Batch size for training"
     )
+    parser.add_argument(
+        "--action-masking",
+        action="store_true",
+        help="Mask invalid per-drone actions with MaskablePPO (needs sb3-contrib)",
+    )
+    parser.add_argument(
+        "--max-action-repeat",
+        type=int,
+        default=1,
+        help="Repeat actions until a decision point, up to this many ticks",
+    )
+    parser.add_argument(
+        "--obs-mode",
+        type=str,
+        choices=["dense", "topk", "graph"],
+        default="dense",
+        help="Observation layout: dense N x N matrices, k nearest neighbors or "
+        "a sparse graph for the message-passing policy",
+    )
+    parser.add_argument(
+        "--k-neighbors",
+        type=int,
+        default=4,
+        help="Neighbors per drone ('topk') or max edges per drone ('graph')",
+    )
+    parser.add_argument(
+        "--multi-agent",
+        action="store_true",
+        help="Train one shared per-drone policy on egocentric observations",
+    )
+    parser.add_argument(
+        "--vec-env",
+        type=str,
+        choices=["dummy", "subproc", "shmem", "threads", "remote"],
+        default="dummy",
+        help="Vectorization backend for the training environments",
+    )
+    parser.add_argument(
+        "--workers",
+        type=str,
+        nargs="+",
+        default=None,
+        help="host:port of rollout workers for --vec-env remote "
+        "(default: start workers on localhost)",
+    )
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        default=None,
+        help="Multiprocessing start method for subprocess backends",
+    )
+    parser.add_argument(
+        "--envs-per-worker",
+        type=int,
+        default=1,
+        help="Environments hosted by each worker process or thread",
+    )
+    parser.add_argument(
+        "--worker-threads",
+        type=int,
+        default=1,
+        help="PyTorch/BLAS threads per worker process",
+    )
+    parser.add_argument(
+        "--learner-threads",
+        type=int,
+        default=None,
+        help="PyTorch/BLAS threads of the learner process",
+    )
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        help="Pin worker processes to CPU cores round-robin",
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap policy inference on one half of the environments with "
+        "simulation of the other half",
+    )
+    parser.add_argument(
+        "--demonstrations",
+        type=str,
+        default=None,
+        help="Demonstration dataset to pretrain the policy on by behavior "
+        "cloning before PPO (see scripts/collect_demonstrations.py)",
+    )
+    parser.add_argument(
+        "--bc-epochs",
+        type=int,
+        default=5,
+        help="Behavior-cloning epochs over the demonstration dataset",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record a throughput breakdown (env step, inference, buffer, update)",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        default=None,
+        help="Resume from a full-state checkpoint (path, or the latest one "
+        "in <model-dir>/checkpoints if no path is given)",
+    )
 
     args = parser.parse_args()
 
+    vec_env_kwargs = {
+        "start_method": args.start_method,
+        "envs_per_worker": args.envs_per_worker,
+        "worker_threads": args.worker_threads,
+        "cpu_affinity": "auto" if args.pin_cpus else None,
+    }
+    if args.vec_env == "remote":
+        vec_env_kwargs["worker_addresses"] = args.workers
+
     # Create trainer
     trainer = Trainer(
         log_dir=args.log_dir,
         model_dir=args.model_dir,
         n_envs=args.n_envs,
+        action_masking=args.action_masking,
+        max_action_repeat=args.max_action_repeat,
+        env_kwargs={"obs_mode": args.obs_mode, "k_neighbors": args.k_neighbors},
+        multi_agent=args.multi_agent,
+        vec_env_backend=args.vec_env,
+        vec_env_kwargs=vec_env_kwargs,
+        learner_threads=args.learner_threads,
+        profile=args.profile,
+        pipeline_rollouts=args.pipeline,
         learning_rate=args.learning_rate,
         batch_size=args.batch_size,
     )
 
     # Train the model
-    model = trainer.train(scenario_path=args.scenario, total_timesteps=args.timesteps)
+    model = trainer.train(
+        scenario_path=args.scenario,
+        total_timesteps=args.timesteps,
+        resume=args.resume,
+        demonstrations=args.demonstrations,
+        pretrain_kwargs={"epochs": args.bc_epochs},
+    )
 
     print("Training complete!")
 
@@ -25,9 +25,10 @@ def main():
     parser.add_argument(
         "--phase",
         type=str,
-        choices=["easy_world", "intermediate_world", "hard_world", "all"],
+        choices=["easy_world", "intermediate_world", "hard_world", "all", "mixed"],
         default="all",
-        help="Which curriculum phase to run ('all' for full curriculum)",
+        help="Which curriculum phase to run ('all' for full curriculum, 'mixed' "
+        "for all scenarios at once)",
     )
     parser.add_argument(
         "--easy-steps", type=int, default=2000000, help="Training steps for easy phase"
@@ -41,11 +42,104 @@ def main():
     parser.add_argument(
         "--hard-steps", type=int, default=5000000, help="Training steps for hard phase"
     )
+    parser.add_argument(
+        "--mixed-steps",
+        type=int,
+        default=10000000,
+        help="Training steps for the mixed-difficulty curriculum",
+    )
+    parser.add_argument(
+        "--vec-env",
+        type=str,
+        choices=["dummy", "subproc", "shmem"],
+        default="dummy",
+        help="Vectorization backend for the training environments",
+    )
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        default=None,
+        help="Multiprocessing start method for subprocess backends",
+    )
+    parser.add_argument(
+        "--envs-per-worker",
+        type=int,
+        default=1,
+        help="Environments hosted by each worker process",
+    )
+    parser.add_argument(
+        "--worker-threads",
+        type=int,
+        default=1,
+        help="PyTorch/BLAS threads per worker process",
+    )
+    parser.add_argument(
+        "--learner-threads",
+        type=int,
+        default=None,
+        help="PyTorch/BLAS threads of the learner process",
+    )
+    parser.add_argument(
+        "--eval-workers",
+        type=int,
+        default=1,
+        help="Background processes evaluating policy snapshots during training",
+    )
+    parser.add_argument(
+        "--no-auto-advance",
+        action="store_true",
+        help="Run every phase for its full timestep budget",
+    )
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        help="Pin worker processes to CPU cores round-robin",
+    )
+    parser.add_argument(
+        "--demonstrations",
+        type=str,
+        default=None,
+        help="Demonstration dataset of the first phase's scenario, padded to the "
+        "largest fleet (--max-drones), to pretrain the policy on by behavior "
+        "cloning (see scripts/collect_demonstrations.py)",
+    )
+    parser.add_argument(
+        "--bc-epochs",
+        type=int,
+        default=5,
+        help="Behavior-cloning epochs over the demonstration dataset",
+    )
+
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        default=None,
+        help="Resume from a full-state checkpoint (path, or the latest one "
+        "in <model-dir>/checkpoints if no path is given)",
+    )
 
     args = parser.parse_args()
 
+    vec_env_kwargs = {
+        "start_method": args.start_method,
+        "envs_per_worker": args.envs_per_worker,
+        "worker_threads": args.worker_threads,
+        "cpu_affinity": "auto" if args.pin_cpus else None,
+    }
+
     # Create trainer
-    trainer = CurriculumTrainer(log_dir=args.log_dir, model_dir=args.model_dir)
+    trainer = CurriculumTrainer(
+        log_dir=args.log_dir,
+        model_dir=args.model_dir,
+        vec_env_backend=args.vec_env,
+        vec_env_kwargs=vec_env_kwargs,
+        learner_threads=args.learner_threads,
+        eval_workers=args.eval_workers,
+        auto_advance=not args.no_auto_advance,
+        demonstrations=args.demonstrations,
+        pretrain_kwargs={"epochs": args.bc_epochs},
+    )
 
     # Customize phases if step counts provided
     if any(
@@ -62,12 +156,15 @@ def main():
         trainer.set_custom_phases(custom_phases)
 
     # Run training
-    if args.phase == "all":
+    if args.phase == "mixed":
+        print("🎓 Running mixed-difficulty curriculum...")
+        final_model = trainer.train_mixed(args.mixed_steps, resume=args.resume)
+    elif args.phase == "all":
         print("🎓 Running full curriculum...")
-        final_model = trainer.run_full_curriculum()
+        final_model = trainer.run_full_curriculum(resume=args.resume)
     else:
         print(f"🎓 Running single phase: {args.phase}")
-        final_model = trainer.run_single_phase(args.phase)
+        final_model = trainer.run_single_phase(args.phase, resume=args.resume)
 
     print("Curriculum training complete! 🚁")
 
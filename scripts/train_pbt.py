@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Population-based training script entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.training.pbt import PopulationBasedTrainer
+
+
+def main():
+    """Population-based training entry point."""
+    parser = argparse.ArgumentParser(
+        description="Train a PPO population with exploit/explore across CPU cores"
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="scenarios/steady_flow.yaml",
+        help="Path to scenario configuration file",
+    )
+    parser.add_argument(
+        "--population", type=int, default=4, help="Number of concurrent learners"
+    )
+    parser.add_argument(
+        "--timesteps", type=int, default=1000000, help="Timesteps per member"
+    )
+    parser.add_argument(
+        "--ready-timesteps",
+        type=int,
+        default=50000,
+        help="Timesteps between exploit/explore steps",
+    )
+    parser.add_argument(
+        "--exploit-fraction",
+        type=float,
+        default=0.25,
+        help="Share of the population replaced from the top group",
+    )
+    parser.add_argument(
+        "--cpus-per-member",
+        type=int,
+        default=None,
+        help="Cores pinned to each member (default: even share of all cores)",
+    )
+    parser.add_argument(
+        "--n-envs", type=int, default=4, help="Parallel environments per member"
+    )
+    parser.add_argument(
+        "--pbt-dir",
+        type=str,
+        default="pbt",
+        help="Directory for the population store, logs and models",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Population seed")
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        default=None,
+        help="Multiprocessing start method of the member processes",
+    )
+
+    args = parser.parse_args()
+
+    trainer = PopulationBasedTrainer(
+        scenario_path=args.scenario,
+        population_size=args.population,
+        total_timesteps=args.timesteps,
+        ready_timesteps=args.ready_timesteps,
+        exploit_fraction=args.exploit_fraction,
+        cpus_per_member=args.cpus_per_member,
+        pbt_dir=args.pbt_dir,
+        seed=args.seed,
+        start_method=args.start_method,
+        n_envs=args.n_envs,
+    )
+    trainer.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Throughput tuning script entry point for vertiport autonomy."""
+
+import argparse
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from vertiport_autonomy.training.tuning import ThroughputTuner
+
+
+def main():
+    """Throughput tuning entry point."""
+    parser = argparse.ArgumentParser(
+        description="Find the fastest n_envs / n_steps / batch_size / backend "
+        "configuration for a scenario"
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="scenarios/steady_flow.yaml",
+        help="Path to scenario configuration file",
+    )
+    parser.add_argument(
+        "--n-envs",
+        type=int,
+        nargs="+",
+        default=[8, 16, 32],
+        help="Candidate numbers of parallel environments",
+    )
+    parser.add_argument(
+        "--n-steps",
+        type=int,
+        nargs="+",
+        default=[256, 1024],
+        help="Candidate PPO rollout lengths per environment",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[64, 128, 256],
+        help="Candidate PPO minibatch sizes",
+    )
+    parser.add_argument(
+        "--backends",
+        type=str,
+        nargs="+",
+        choices=["dummy", "subproc", "shmem"],
+        default=["dummy", "subproc"],
+        help="Candidate vectorization backends",
+    )
+    parser.add_argument(
+        "--envs-per-worker",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="Candidate environments per worker process",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=None,
+        help="Maximum acceptable peak resident memory in MiB",
+    )
+    parser.add_argument(
+        "--rollouts",
+        type=int,
+        default=2,
+        help="Rollout/update cycles per calibration burst",
+    )
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        default=None,
+        help="Multiprocessing start method for calibration and worker processes",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write all measurements and the recommendation to this JSON file",
+    )
+
+    args = parser.parse_args()
+
+    tuner = ThroughputTuner(
+        scenario_path=args.scenario,
+        n_envs_grid=args.n_envs,
+        n_steps_grid=args.n_steps,
+        batch_size_grid=args.batch_sizes,
+        backends=args.backends,
+        envs_per_worker_grid=args.envs_per_worker,
+        memory_budget_mb=args.memory_budget_mb,
+        n_rollouts=args.rollouts,
+        start_method=args.start_method,
+        vec_env_kwargs={"start_method": args.start_method},
+    )
+    tuner.run()
+
+    if args.output:
+        tuner.save_results(args.output)
+        print(f"Results saved to {args.output}")
+
+    best = tuner.recommend()
+    print("\n🏁 Recommended configuration:")
+    print(
+        f"   {best.steps_per_second:,.0f} steps/s "
+        f"(env {best.env_steps_per_second:,.0f})"
+    )
+    print(
+        f"   --n-envs {best.n_envs} --batch-size {best.batch_size} "
+        f"--vec-env {best.vec_env_backend} --envs-per-worker {best.envs_per_worker} "
+        f"(n_steps={best.n_steps})"
+    )
+
+
+if __name__ == "__main__":
+    main()
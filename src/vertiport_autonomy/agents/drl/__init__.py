@@ -1,4 +1,29 @@
 """Deep Reinforcement Learning agents."""
 
-# Future DRL agents will be imported here
-__all__ = []
+from .distilled import DistilledAgent
+from .ppo import PPOAgent, load_sb3_policy
+from .serving import PolicyServer, RemotePolicyAgent, load_policy_agent
+
+# The feature extractors need PyTorch; they are imported on first access so
+# the NumPy inference path never loads it
+_LAZY_IMPORTS = {"GraphFeaturesExtractor": ".extractors"}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "DistilledAgent",
+    "GraphFeaturesExtractor",
+    "PPOAgent",
+    "load_sb3_policy",
+    "PolicyServer",
+    "RemotePolicyAgent",
+    "load_policy_agent",
+]
@@ -0,0 +1,203 @@
+"""Compact student policy distilled from a trained PPO agent.
+
+The student replaces the ``N x N`` matrix inputs of the ``MultiInputPolicy``
+by compact features (see ``compact_features``) and evaluates a narrow MLP
+with NumPy, so a decision takes a few microseconds on a CPU. Students are
+trained by ``training.distill.distill_policy`` and stored as ``.npz`` files.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..base import BaseAgent
+from .ppo import ACTIVATIONS, select_actions
+
+# Distance reported for drones without a neighbor
+NO_NEIGHBOR_DISTANCE = 1000.0
+
+# Normalized features are clipped to this range, as by ``VecNormalize``
+CLIP_FEATURES = 10.0
+
+
+@lru_cache(maxsize=None)
+def _self_distance_offset(num_drones: int) -> np.ndarray:
+    """Matrix that hides each drone's zero distance to itself."""
+    offset = np.zeros((num_drones, num_drones), dtype=np.float32)
+    np.fill_diagonal(offset, np.inf)
+    return offset
+
+
+def compact_features(observation: Dict[str, Any], num_drones: int) -> np.ndarray:
+    """Builds the student's input features for a batch of observations.
+
+    The features are the flattened drone states, the infrastructure state
+    and, if the observation has a ``distance_matrix``, each drone's distance
+    to its nearest neighbor in place of the full matrix.
+
+    Args:
+        observation: ``VertiportEnv`` observation, optionally batched
+        num_drones: Number of drone slots of the observation
+
+    Returns:
+        Float32 array of shape ``(batch, num_features)``
+    """
+    drones_state = np.asarray(observation["drones_state"], dtype=np.float32)
+    batch_size = drones_state.size // (num_drones * drones_state.shape[-1])
+    features = [
+        drones_state.reshape(batch_size, -1),
+        np.asarray(observation["infrastructure_state"], dtype=np.float32).reshape(
+            batch_size, -1
+        ),
+    ]
+    if "distance_matrix" in observation:
+        distances = np.asarray(observation["distance_matrix"], dtype=np.float32)
+        distances = distances.reshape(batch_size, num_drones, num_drones)
+        nearest = (distances + _self_distance_offset(num_drones)).min(axis=2)
+        features.append(np.minimum(nearest, NO_NEIGHBOR_DISTANCE))
+    return np.concatenate(features, axis=1)
+
+
+class DistilledAgent(BaseAgent):
+    """Narrow MLP student over compact features, evaluated with NumPy."""
+
+    def __init__(
+        self,
+        layers: List[Tuple[np.ndarray, np.ndarray]],
+        feature_mean: np.ndarray,
+        feature_std: np.ndarray,
+        num_drones: int,
+        activation: str = "ReLU",
+        action_masking: bool = False,
+        deterministic: bool = True,
+        seed: Optional[int] = None,
+        name: str = "Distilled",
+    ):
+        """Initialize the student.
+
+        Args:
+            layers: ``(weight, bias)`` pairs with ``(in, out)`` weights; the
+                last layer outputs ``num_drones * actions_per_drone`` logits
+            feature_mean: Mean of the compact features
+            feature_std: Standard deviation of the compact features
+            num_drones: Number of drone slots
+            activation: Hidden layer activation (a key of ``ACTIVATIONS``)
+            action_masking: Rule out invalid actions per drone state
+            deterministic: Take the most likely action instead of sampling
+            seed: Seed of the action sampling if not deterministic
+            name: Agent name
+        """
+        super().__init__(name)
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation function '{activation}'")
+        self.layers = [
+            (np.ascontiguousarray(w, dtype=np.float32), b.astype(np.float32))
+            for w, b in layers
+        ]
+        self.feature_mean = feature_mean.astype(np.float32)
+        self.feature_scale = (1.0 / np.maximum(feature_std, 1e-6)).astype(np.float32)
+        self.num_drones = num_drones
+        self.activation_name = activation
+        self.activation = ACTIVATIONS[activation]
+        self.action_masking = action_masking
+        self.deterministic = deterministic
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def num_parameters(self) -> int:
+        """Number of weights and biases of the student."""
+        return sum(w.size + b.size for w, b in self.layers)
+
+    @property
+    def env_kwargs(self) -> Dict[str, Any]:
+        """``VertiportEnv`` arguments that reproduce the training fleet size."""
+        return {"max_drones": self.num_drones}
+
+    def action_logits(self, observation: Dict[str, Any]) -> np.ndarray:
+        """Computes the per-drone action logits for a batch of observations.
+
+        Args:
+            observation: Observation dict, optionally batched
+
+        Returns:
+            Array of shape ``(batch, num_drones, actions_per_drone)``
+        """
+        h = compact_features(observation, self.num_drones)
+        h -= self.feature_mean
+        h *= self.feature_scale
+        # In-place bounds are much cheaper than np.clip on a single decision
+        np.minimum(np.maximum(h, -CLIP_FEATURES, out=h), CLIP_FEATURES, out=h)
+        for weight, bias in self.layers[:-1]:
+            h = self.activation(h @ weight + bias)
+        weight, bias = self.layers[-1]
+        logits = h @ weight + bias
+        return logits.reshape(len(h), self.num_drones, -1)
+
+    def act(self, observation: Dict[str, Any]) -> np.ndarray:
+        """Select actions for one observation or a batch of observations.
+
+        Args:
+            observation: ``VertiportEnv`` observation, optionally with a
+                leading batch dimension on every array
+
+        Returns:
+            Array of actions of shape ``(num_drones,)``, or
+            ``(batch, num_drones)`` for batched observations
+        """
+        batched = np.ndim(observation["drones_state"]) > 2
+        actions = select_actions(
+            self.action_logits(observation),
+            observation,
+            self.action_masking,
+            None if self.deterministic else self.rng,
+        )
+        return actions if batched else actions[0]
+
+    def reset(self) -> None:
+        """Reset agent state for a new episode (the policy is stateless)."""
+        pass
+
+    def save(self, path: str) -> None:
+        """Saves the student to a ``.npz`` file.
+
+        Args:
+            path: Output path
+        """
+        arrays = {
+            "feature_mean": self.feature_mean,
+            "feature_std": 1.0 / self.feature_scale,
+            "num_drones": np.array(self.num_drones),
+            "activation": np.array(self.activation_name),
+            "action_masking": np.array(self.action_masking),
+        }
+        for i, (weight, bias) in enumerate(self.layers):
+            arrays[f"weight_{i}"] = weight
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "DistilledAgent":
+        """Loads a student saved with ``save``.
+
+        Args:
+            path: Path of the ``.npz`` file
+            **kwargs: ``deterministic``, ``seed`` or ``name`` overrides
+
+        Returns:
+            The student agent
+        """
+        with np.load(path) as data:
+            num_layers = sum(key.startswith("weight_") for key in data.files)
+            layers = [
+                (data[f"weight_{i}"], data[f"bias_{i}"]) for i in range(num_layers)
+            ]
+            return cls(
+                layers,
+                data["feature_mean"],
+                data["feature_std"],
+                num_drones=int(data["num_drones"]),
+                activation=str(data["activation"]),
+                action_masking=bool(data["action_masking"]),
+                **kwargs,
+            )
@@ -0,0 +1,86 @@
+"""Custom Stable-Baselines3 feature extractors for vertiport observations."""
+
+from typing import Dict
+
+import gymnasium as gym
+import torch
+from stable_baselines3.common.torch_layers import BaseFeaturesExtractor
+from torch import nn
+
+
+class GraphFeaturesExtractor(BaseFeaturesExtractor):
+    """Message-passing feature extractor for ``obs_mode="graph"`` observations.
+
+    Node features come from ``drones_state`` and messages flow along the padded
+    edge list (``edge_index``, ``edge_attr``, ``edge_mask``). After
+    ``num_layers`` rounds of mean-aggregated message passing the embeddings
+    of the nodes in ``node_mask`` are pooled (mean and max), so padded drone
+    slots do not dilute them, and concatenated with the infrastructure state.
+    None of the weights depend on the number of drones, so the same network
+    can be used for scenarios of different sizes.
+    """
+
+    def __init__(
+        self,
+        observation_space: gym.spaces.Dict,
+        hidden_dim: int = 64,
+        num_layers: int = 2,
+    ):
+        """Initialize the extractor.
+
+        Args:
+            observation_space: Graph observation space of ``VertiportEnv``
+            hidden_dim: Size of node embeddings and messages
+            num_layers: Number of message-passing rounds
+        """
+        node_dim = observation_space["drones_state"].shape[-1]
+        edge_dim = observation_space["edge_attr"].shape[-1]
+        infrastructure_dim = observation_space["infrastructure_state"].shape[0]
+        super().__init__(observation_space, 2 * hidden_dim + infrastructure_dim)
+
+        self.hidden_dim = hidden_dim
+        self.node_encoder = nn.Sequential(nn.Linear(node_dim, hidden_dim), nn.ReLU())
+        self.message_layers = nn.ModuleList(
+            [
+                nn.Sequential(
+                    nn.Linear(2 * hidden_dim + edge_dim, hidden_dim), nn.ReLU()
+                )
+                for _ in range(num_layers)
+            ]
+        )
+        self.update_layers = nn.ModuleList(
+            [
+                nn.Sequential(nn.Linear(2 * hidden_dim, hidden_dim), nn.ReLU())
+                for _ in range(num_layers)
+            ]
+        )
+
+    def forward(self, observations: Dict[str, torch.Tensor]) -> torch.Tensor:
+        nodes = observations["drones_state"]
+        batch_size, num_nodes, _ = nodes.shape
+        num_edges = observations["edge_index"].shape[-1]
+
+        # Offset node indices per sample so the whole batch is one graph
+        offsets = torch.arange(batch_size, device=nodes.device) * num_nodes
+        edge_index = observations["edge_index"].long() + offsets.view(-1, 1, 1)
+        src = edge_index[:, 0, :].reshape(-1)
+        dst = edge_index[:, 1, :].reshape(-1)
+        edge_attr = observations["edge_attr"].reshape(batch_size * num_edges, -1)
+        edge_mask = observations["edge_mask"].reshape(-1, 1)
+
+        degree = torch.zeros(batch_size * num_nodes, 1, device=nodes.device)
+        degree = degree.index_add(0, dst, edge_mask).clamp(min=1.0)
+
+        h = self.node_encoder(nodes).reshape(batch_size * num_nodes, -1)
+        for message_layer, update_layer in zip(self.message_layers, self.update_layers):
+            messages = message_layer(torch.cat([h[src], h[dst], edge_attr], dim=1))
+            messages = messages * edge_mask
+            aggregated = torch.zeros_like(h).index_add(0, dst, messages) / degree
+            h = update_layer(torch.cat([h, aggregated], dim=1))
+
+        h = h.reshape(batch_size, num_nodes, self.hidden_dim)
+        node_mask = observations["node_mask"].reshape(batch_size, num_nodes, 1)
+        mean = (h * node_mask).sum(dim=1) / node_mask.sum(dim=1).clamp(min=1.0)
+        # Embeddings are non-negative (ReLU), so masked nodes can be zeroed
+        maximum = (h * node_mask).max(dim=1).values
+        return torch.cat([mean, maximum, observations["infrastructure_state"]], dim=1)
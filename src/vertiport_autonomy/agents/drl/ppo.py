@@ -0,0 +1,402 @@
+"""Torch-free PPO agent with batched NumPy inference.
+
+``PPOAgent`` reads a Stable-Baselines3 ``PPO`` (or ``MaskablePPO``) zip and
+its ``VecNormalize`` statistics without importing PyTorch or
+Stable-Baselines3. The ``policy.pth`` tensors are decoded straight from the
+PyTorch zip serialization format, and the pickled classes of both libraries
+are replaced by plain stand-ins that only keep their attributes. The actor of
+a ``MultiInputPolicy`` (flatten-and-concatenate feature extractor, MLP and
+action head) is then evaluated with NumPy, on one observation or a batch.
+"""
+
+import base64
+import io
+import json
+import os
+import pickle
+import zipfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from gymnasium import spaces
+
+from ..base import BaseAgent
+
+# NumPy equivalents of the ``torch.nn`` activation modules
+ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, 0.0),
+    "LeakyReLU": lambda x: np.where(x > 0.0, x, 0.01 * x),
+    "ELU": lambda x: np.where(x > 0.0, x, np.expm1(x)),
+    "Sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "SiLU": lambda x: x / (1.0 + np.exp(-x)),
+    "Identity": lambda x: x,
+}
+
+# Element types of the legacy typed storages PyTorch pickles tensors with
+_STORAGE_DTYPES = {
+    "FloatStorage": np.float32,
+    "DoubleStorage": np.float64,
+    "HalfStorage": np.float16,
+    "LongStorage": np.int64,
+    "IntStorage": np.int32,
+    "ShortStorage": np.int16,
+    "CharStorage": np.int8,
+    "ByteStorage": np.uint8,
+    "BoolStorage": np.bool_,
+}
+
+# Logit of actions ruled out by the action mask (as in ``MaskablePPO``)
+_MASKED_LOGIT = -1e8
+
+
+class _StandIn:
+    """Attribute container replacing a pickled PyTorch or SB3 object."""
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+
+def _rebuild_tensor(
+    storage: np.ndarray,
+    storage_offset: int,
+    size: Tuple[int, ...],
+    stride: Tuple[int, ...],
+    *args: Any,
+) -> np.ndarray:
+    """NumPy version of ``torch._utils._rebuild_tensor_v2``."""
+    itemsize = storage.dtype.itemsize
+    return np.lib.stride_tricks.as_strided(
+        storage[storage_offset:],
+        shape=tuple(size),
+        strides=tuple(s * itemsize for s in stride),
+    ).copy()
+
+
+class _TorchFreeUnpickler(pickle.Unpickler):
+    """Unpickles PyTorch and SB3 data into NumPy arrays and stand-ins."""
+
+    def __init__(
+        self,
+        file: io.BytesIO,
+        archive: Optional[zipfile.ZipFile] = None,
+        prefix: str = "",
+    ):
+        super().__init__(file)
+        self.archive = archive
+        self.prefix = prefix
+        self.byteorder = "little"
+        if archive is not None and f"{prefix}byteorder" in archive.namelist():
+            self.byteorder = archive.read(f"{prefix}byteorder").decode()
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _rebuild_tensor
+        if module == "torch" and name.endswith("Storage"):
+            if name not in _STORAGE_DTYPES:
+                raise ValueError(f"Unsupported tensor storage type '{name}'")
+            return _STORAGE_DTYPES[name]
+        if module.split(".")[0] in ("torch", "stable_baselines3", "sb3_contrib"):
+            return type(name, (_StandIn,), {"__module__": module})
+        return super().find_class(module, name)
+
+    def persistent_load(self, pid: Tuple[Any, ...]) -> np.ndarray:
+        _, dtype, key, _, _ = pid
+        data = self.archive.read(f"{self.prefix}data/{key}")
+        storage = np.frombuffer(data, dtype=np.dtype(dtype))
+        if self.byteorder != "little":
+            storage = storage.byteswap()
+        return storage
+
+
+def _deserialize(item: Dict[str, Any]) -> Any:
+    """Decodes an SB3 ``":serialized:"`` entry of the ``data`` file."""
+    payload = base64.b64decode(item[":serialized:"].encode())
+    return _TorchFreeUnpickler(io.BytesIO(payload)).load()
+
+
+def load_sb3_policy(model_path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Reads the policy weights and metadata of a saved SB3 model.
+
+    Args:
+        model_path: Path of the model zip (the ``.zip`` suffix is optional)
+
+    Returns:
+        Tuple of the policy ``state_dict`` as NumPy arrays and the decoded
+        ``observation_space``, ``action_space``, ``policy_kwargs`` and
+        ``policy_class`` (a stand-in class) of the model
+    """
+    if not os.path.exists(model_path) and os.path.exists(f"{model_path}.zip"):
+        model_path = f"{model_path}.zip"
+
+    with zipfile.ZipFile(model_path) as model_zip:
+        data = json.loads(model_zip.read("data"))
+        policy_bytes = model_zip.read("policy.pth")
+
+    with zipfile.ZipFile(io.BytesIO(policy_bytes)) as archive:
+        pickle_name = next(n for n in archive.namelist() if n.endswith("data.pkl"))
+        prefix = pickle_name[: -len("data.pkl")]
+        unpickler = _TorchFreeUnpickler(
+            io.BytesIO(archive.read(pickle_name)), archive, prefix
+        )
+        state_dict = dict(unpickler.load())
+
+    metadata = {
+        key: _deserialize(data[key]) if ":serialized:" in data[key] else data[key]
+        for key in ("observation_space", "action_space", "policy_kwargs")
+        if key in data
+    }
+    metadata["policy_class"] = _deserialize(data["policy_class"])
+    return state_dict, metadata
+
+
+def select_actions(
+    logits: np.ndarray,
+    observation: Dict[str, Any],
+    action_masking: bool = False,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Turns per-drone action logits into actions.
+
+    Args:
+        logits: Array of shape ``(batch, num_drones, actions_per_drone)``
+        observation: The observation the logits were computed for; its raw
+            ``drones_state`` provides the drone states for action masking
+        action_masking: Rule out invalid actions per drone state
+        rng: Sample from the softmax with this generator (None takes the most
+            likely action)
+
+    Returns:
+        Integer array of shape ``(batch, num_drones)``
+    """
+    if action_masking:
+        from ...core.environment import compute_action_mask
+
+        states = np.asarray(observation["drones_state"])[..., 14]
+        mask = compute_action_mask(states.reshape(logits.shape[:2]))
+        logits = np.where(mask, logits, _MASKED_LOGIT)
+    if rng is not None:
+        # Gumbel-max trick: argmax of perturbed logits samples the softmax
+        logits = logits + rng.gumbel(size=logits.shape)
+    return np.argmax(logits, axis=-1).astype(np.int64)
+
+
+def find_vec_normalize_path(model_path: str) -> Optional[str]:
+    """Finds the ``VecNormalize`` statistics saved next to a model.
+
+    Looks for ``<model>_vecnormalize.pkl`` (checkpoints and final models)
+    and then ``vecnormalize.pkl`` in the model's directory (best models,
+    sweep and population members).
+
+    Args:
+        model_path: Path of the model zip
+
+    Returns:
+        Path of the statistics, or None if there are none
+    """
+    base = model_path[:-4] if model_path.endswith(".zip") else model_path
+    for candidate in (
+        f"{base}_vecnormalize.pkl",
+        os.path.join(os.path.dirname(model_path), "vecnormalize.pkl"),
+    ):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+class PPOAgent(BaseAgent):
+    """Trained PPO policy evaluated with NumPy.
+
+    Supports ``MultiInputPolicy`` models with the default feature extractor
+    (every observation key is flattened) and a ``MultiDiscrete`` action
+    space, i.e. the ``"dense"`` and ``"topk"`` observation modes of
+    ``VertiportEnv``. Only the actor is evaluated; the value network is
+    skipped.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        vec_normalize_path: Optional[str] = None,
+        deterministic: bool = True,
+        action_masking: Optional[bool] = None,
+        seed: Optional[int] = None,
+        name: Optional[str] = None,
+    ):
+        """Load a saved model.
+
+        Args:
+            model_path: Path of the SB3 model zip
+            vec_normalize_path: Path of the ``VecNormalize`` statistics (None
+                looks for them next to the model, see
+                ``find_vec_normalize_path``)
+            deterministic: Take the most likely action instead of sampling
+            action_masking: Rule out invalid actions per drone state (None
+                enables it for ``MaskablePPO`` models)
+            seed: Seed of the action sampling if not deterministic
+            name: Agent name (defaults to the model file name)
+
+        Raises:
+            ValueError: If the policy architecture is not supported
+        """
+        super().__init__(
+            name or os.path.splitext(os.path.basename(model_path))[0] or "PPO"
+        )
+        self.deterministic = deterministic
+        self.rng = np.random.default_rng(seed)
+
+        state_dict, metadata = load_sb3_policy(model_path)
+        observation_space = metadata["observation_space"]
+        action_space = metadata["action_space"]
+        if not isinstance(observation_space, spaces.Dict) or not all(
+            isinstance(space, spaces.Box) for space in observation_space.values()
+        ):
+            raise ValueError("PPOAgent requires a Dict of Box observations")
+        if not isinstance(action_space, spaces.MultiDiscrete):
+            raise ValueError("PPOAgent requires a MultiDiscrete action space")
+        if any("features_extractor." in key for key in state_dict):
+            raise ValueError(
+                "PPOAgent only supports the default flattening feature "
+                "extractor, not learned extractors such as "
+                "GraphFeaturesExtractor"
+            )
+
+        self.obs_shapes = {
+            key: space.shape for key, space in observation_space.spaces.items()
+        }
+        self.nvec = np.asarray(action_space.nvec).reshape(-1)
+        if len(set(self.nvec.tolist())) != 1:
+            raise ValueError("PPOAgent requires the same number of actions per drone")
+
+        activation = metadata.get("policy_kwargs", {}).get("activation_fn")
+        activation_name = activation.__name__ if activation is not None else "Tanh"
+        if activation_name not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation function '{activation_name}'")
+        self.activation = ACTIVATIONS[activation_name]
+
+        # Hidden layers are stored as (in, out) matrices for ``h @ W``
+        layer_ids = sorted(
+            int(key.split(".")[2])
+            for key in state_dict
+            if key.startswith("mlp_extractor.policy_net.") and key.endswith(".weight")
+        )
+        self.layers: List[Tuple[np.ndarray, np.ndarray]] = [
+            (
+                np.ascontiguousarray(
+                    state_dict[f"mlp_extractor.policy_net.{i}.weight"].T,
+                    dtype=np.float32,
+                ),
+                state_dict[f"mlp_extractor.policy_net.{i}.bias"].astype(np.float32),
+            )
+            for i in layer_ids
+        ]
+        self.action_weight = np.ascontiguousarray(
+            state_dict["action_net.weight"].T, dtype=np.float32
+        )
+        self.action_bias = state_dict["action_net.bias"].astype(np.float32)
+
+        if action_masking is None:
+            action_masking = metadata["policy_class"].__module__.startswith(
+                "sb3_contrib"
+            )
+        self.action_masking = action_masking
+
+        # Per-key (mean, 1 / std) of the observation normalization
+        self.obs_stats: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.clip_obs = np.inf
+        if vec_normalize_path is None:
+            vec_normalize_path = find_vec_normalize_path(model_path)
+        if vec_normalize_path is None:
+            print(
+                f"⚠️  No VecNormalize statistics found for {model_path}; "
+                "observations are not normalized"
+            )
+        else:
+            self.load_normalization(vec_normalize_path)
+
+    @property
+    def env_kwargs(self) -> Dict[str, Any]:
+        """``VertiportEnv`` arguments that reproduce the training spaces.
+
+        The fleet size (padded, e.g. for curriculum models) and the
+        observation mode are read from the saved observation space.
+        """
+        env_kwargs: Dict[str, Any] = {"max_drones": self.obs_shapes["drones_state"][0]}
+        if "neighbors" in self.obs_shapes:
+            env_kwargs["obs_mode"] = "topk"
+            env_kwargs["k_neighbors"] = self.obs_shapes["neighbors"][1]
+        return env_kwargs
+
+    def load_normalization(self, vec_normalize_path: str) -> None:
+        """Loads the observation statistics of a saved ``VecNormalize``.
+
+        Args:
+            vec_normalize_path: Path of the pickle written by
+                ``VecNormalize.save``
+        """
+        with open(vec_normalize_path, "rb") as f:
+            vec_normalize = _TorchFreeUnpickler(f).load()
+
+        self.obs_stats = {}
+        if not vec_normalize.norm_obs:
+            return
+        keys = vec_normalize.norm_obs_keys or list(vec_normalize.obs_rms)
+        for key in keys:
+            rms = vec_normalize.obs_rms[key]
+            self.obs_stats[key] = (
+                np.asarray(rms.mean, dtype=np.float64),
+                1.0
+                / np.sqrt(
+                    np.asarray(rms.var, dtype=np.float64) + vec_normalize.epsilon
+                ),
+            )
+        self.clip_obs = vec_normalize.clip_obs
+
+    def action_logits(self, observation: Dict[str, Any]) -> np.ndarray:
+        """Computes the per-drone action logits for a batch of observations.
+
+        Args:
+            observation: Observation dict with a leading batch dimension
+
+        Returns:
+            Array of shape ``(batch, num_drones, actions_per_drone)``
+        """
+        features = []
+        for key, shape in self.obs_shapes.items():
+            x = np.asarray(observation[key]).reshape((-1,) + shape)
+            if key in self.obs_stats:
+                mean, inverse_std = self.obs_stats[key]
+                x = np.clip((x - mean) * inverse_std, -self.clip_obs, self.clip_obs)
+            features.append(x.reshape(len(x), -1).astype(np.float32, copy=False))
+
+        h = np.concatenate(features, axis=1)
+        for weight, bias in self.layers:
+            h = self.activation(h @ weight + bias)
+        logits = h @ self.action_weight + self.action_bias
+        return logits.reshape(len(h), len(self.nvec), self.nvec[0])
+
+    def act(self, observation: Dict[str, Any]) -> np.ndarray:
+        """Select actions for one observation or a batch of observations.
+
+        Args:
+            observation: ``VertiportEnv`` observation, optionally with a
+                leading batch dimension on every array
+
+        Returns:
+            Array of actions of shape ``(num_drones,)``, or
+            ``(batch, num_drones)`` for batched observations
+        """
+        key, shape = next(iter(self.obs_shapes.items()))
+        batched = np.ndim(observation[key]) > len(shape)
+
+        actions = select_actions(
+            self.action_logits(observation),
+            observation,
+            self.action_masking,
+            None if self.deterministic else self.rng,
+        )
+        return actions if batched else actions[0]
+
+    def reset(self) -> None:
+        """Reset agent state for a new episode (the policy is stateless)."""
+        pass
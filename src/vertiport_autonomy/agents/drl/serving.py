@@ -0,0 +1,331 @@
+"""Centralized batched policy inference for evaluation and rollout workers.
+
+A ``PolicyServer`` holds the only copy of a policy (any agent whose ``act``
+accepts batched observations, e.g. ``PPOAgent`` or ``DistilledAgent``) and
+serves any number of ``RemotePolicyAgent`` clients over local sockets.
+Requests that arrive while a micro-batch is open are stacked into a single
+forward pass. A batch closes once it holds ``max_batch_size`` observations
+or ``max_wait`` seconds after its first request, whichever comes first, so
+a lone client never waits longer than the deadline.
+
+Messages are pickled over ``multiprocessing.connection`` sockets, which
+authenticate both ends with a shared key (see ``ipc.get_authkey``). Pickle
+still executes code from whoever holds the key, so only listen on trusted
+interfaces.
+"""
+
+import os
+import queue
+import threading
+import time
+import traceback
+from multiprocessing import Pipe
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ...ipc import Address, get_authkey, parse_address
+from ..base import BaseAgent
+from .distilled import DistilledAgent
+from .ppo import PPOAgent
+
+
+def load_policy_agent(
+    path: str,
+    vec_normalize_path: Optional[str] = None,
+    deterministic: bool = True,
+    seed: Optional[int] = None,
+) -> BaseAgent:
+    """Loads a trained PPO model or a distilled student for NumPy inference.
+
+    Args:
+        path: SB3 model zip, or ``.npz`` student written by ``distill_policy``
+        vec_normalize_path: ``VecNormalize`` statistics of a PPO model (None
+            looks for them next to the model)
+        deterministic: Take the most likely action instead of sampling
+        seed: Seed of the action sampling if not deterministic
+
+    Returns:
+        ``PPOAgent`` or ``DistilledAgent``
+    """
+    if path.endswith(".npz"):
+        name = os.path.splitext(os.path.basename(path))[0]
+        return DistilledAgent.load(
+            path, deterministic=deterministic, seed=seed, name=name
+        )
+    return PPOAgent(
+        path,
+        vec_normalize_path=vec_normalize_path,
+        deterministic=deterministic,
+        seed=seed,
+    )
+
+
+class PolicyServer:
+    """Serves one policy to many clients with deadline-bounded micro-batching."""
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        authkey: Optional[bytes] = None,
+        max_batch_size: int = 256,
+        max_wait: float = 0.002,
+    ):
+        """Initialize the server and bind its socket.
+
+        Args:
+            agent: Policy evaluated on the stacked observations of a batch
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            authkey: Shared authentication key (see ``get_authkey``)
+            max_batch_size: Observations that close a batch early
+            max_wait: Seconds a batch stays open after its first request
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self.agent = agent
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.authkey = get_authkey(authkey)
+        self.listener = Listener((host, port), authkey=self.authkey)
+
+        self.requests = 0
+        self.batches = 0
+        self.observations = 0
+
+        self._new_connections: "queue.Queue[Connection]" = queue.Queue()
+        self._wakeup_reader, self._wakeup_writer = Pipe(duplex=False)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        """Address the server listens on."""
+        return self.listener.address
+
+    def stats(self) -> Dict[str, float]:
+        """Request and batch counters since the server started.
+
+        Returns:
+            Requests, batches, observations and mean observations per batch
+        """
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "observations": self.observations,
+            "mean_batch_size": self.observations / max(self.batches, 1),
+        }
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError):
+                # Failed handshake, e.g. a wrong authentication key
+                if self._stop.is_set():
+                    return
+                continue
+            self._new_connections.put(connection)
+            self._wakeup_writer.send_bytes(b"c")
+
+    def _forward(
+        self, pending: List[Tuple[Connection, Dict[str, np.ndarray], int]]
+    ) -> List[Tuple[str, Any]]:
+        """Runs one forward pass over the requests and returns their replies."""
+        try:
+            batch = {
+                key: np.concatenate([obs[key] for _, obs, _ in pending])
+                for key in pending[0][1]
+            }
+            actions = self.agent.act(batch)
+        except Exception:
+            error = traceback.format_exc()
+            return [("error", error)] * len(pending)
+
+        replies = []
+        offset = 0
+        for _, _, rows in pending:
+            replies.append(("ok", actions[offset : offset + rows]))
+            offset += rows
+        return replies
+
+    def _flush(self, pending: List[Tuple[Connection, Dict[str, np.ndarray], int]]):
+        """Runs one forward pass over the pending requests and replies.
+
+        If the batched pass fails, every request is retried on its own, so a
+        malformed request fails alone instead of taking its batch with it.
+        """
+        replies = self._forward(pending)
+        if len(pending) > 1 and replies[0][0] == "error":
+            replies = [self._forward([request])[0] for request in pending]
+
+        # Counted before replying, so a client that got its reply sees it
+        self.requests += len(pending)
+        self.batches += 1
+        self.observations += sum(rows for _, _, rows in pending)
+
+        for (connection, _, _), reply in zip(pending, replies):
+            self._reply(connection, reply)
+
+    @staticmethod
+    def _reply(connection: Connection, reply: Tuple[str, Any]) -> None:
+        try:
+            connection.send(reply)
+        except (OSError, EOFError):
+            # The client is gone; its connection is dropped on next read
+            pass
+
+    def serve_forever(self) -> None:
+        """Gathers requests into micro-batches until ``close`` is called."""
+        accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        accept_thread.start()
+
+        connections: List[Connection] = []
+        pending: List[Tuple[Connection, Dict[str, np.ndarray], int]] = []
+        pending_rows = 0
+        deadline = 0.0
+        while not self._stop.is_set():
+            timeout = None
+            if pending:
+                timeout = max(deadline - time.perf_counter(), 0.0)
+
+            for connection in wait([self._wakeup_reader] + connections, timeout):
+                if connection is self._wakeup_reader:
+                    self._wakeup_reader.recv_bytes()
+                    while not self._new_connections.empty():
+                        connections.append(self._new_connections.get_nowait())
+                    continue
+                try:
+                    observation = connection.recv()
+                except (OSError, EOFError):
+                    connections.remove(connection)
+                    connection.close()
+                    continue
+                try:
+                    if not isinstance(observation, dict) or not observation:
+                        raise TypeError(
+                            "Expected a non-empty dict of observation arrays, "
+                            f"got {type(observation).__name__}"
+                        )
+                    rows = len(next(iter(observation.values())))
+                except Exception:
+                    # Only this client gets the error; the batch goes on
+                    self._reply(connection, ("error", traceback.format_exc()))
+                    continue
+                if not pending:
+                    deadline = time.perf_counter() + self.max_wait
+                pending.append((connection, observation, rows))
+                pending_rows += rows
+
+            if pending and (
+                pending_rows >= self.max_batch_size or time.perf_counter() >= deadline
+            ):
+                self._flush(pending)
+                pending, pending_rows = [], 0
+
+        for connection in connections:
+            connection.close()
+
+    def start(self) -> "PolicyServer":
+        """Serves from a background thread.
+
+        Returns:
+            The server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stops serving and closes the socket."""
+        self._stop.set()
+        self._wakeup_writer.send_bytes(b"s")
+        try:
+            # Unblocks the pending accept() so the accept thread can exit
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError):
+            pass
+        if self._thread is not None:
+            self._thread.join()
+        self.listener.close()
+
+
+class RemotePolicyAgent(BaseAgent):
+    """Agent that queries a ``PolicyServer`` for its actions.
+
+    The connection is opened on first use and is not pickled, so the agent
+    can be handed to worker processes (e.g. as ``agent_factory`` result or
+    evaluation agent) that each open their own connection.
+    """
+
+    def __init__(
+        self,
+        address: Union[str, Address],
+        authkey: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        name: str = "RemotePolicy",
+    ):
+        """Initialize the client.
+
+        Args:
+            address: Server address, ``"host:port"`` or ``(host, port)``
+            authkey: Shared authentication key (see ``get_authkey``)
+            timeout: Seconds to wait for a reply (None waits forever)
+            name: Agent name
+        """
+        super().__init__(name)
+        self.address = parse_address(address)
+        self.authkey = get_authkey(authkey)
+        self.timeout = timeout
+        self._connection: Optional[Connection] = None
+
+    def act(self, observation: Dict[str, Any]) -> np.ndarray:
+        """Select actions for one observation or a batch of observations.
+
+        Args:
+            observation: ``VertiportEnv`` observation, optionally with a
+                leading batch dimension on every array
+
+        Returns:
+            Array of actions of shape ``(num_drones,)``, or
+            ``(batch, num_drones)`` for batched observations
+
+        Raises:
+            TimeoutError: If the server does not reply within ``timeout``
+            RuntimeError: If the policy failed on the server
+        """
+        batched = np.ndim(observation["drones_state"]) > 2
+        if not batched:
+            observation = {
+                key: np.asarray(value)[None] for key, value in observation.items()
+            }
+
+        if self._connection is None:
+            self._connection = Client(self.address, authkey=self.authkey)
+        self._connection.send(observation)
+        if self.timeout is not None and not self._connection.poll(self.timeout):
+            # A late reply would answer the next request; start over instead
+            self.close()
+            raise TimeoutError(f"No reply from {self.address} within {self.timeout} s")
+        status, payload = self._connection.recv()
+        if status != "ok":
+            raise RuntimeError(f"Policy server error:\n{payload}")
+        return payload if batched else payload[0]
+
+    def reset(self) -> None:
+        """Reset agent state for a new episode (the policy is stateless)."""
+        pass
+
+    def close(self) -> None:
+        """Closes the connection to the server."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_connection"] = None
+        return state
@@ -1,44 +1,389 @@
 """
-Simplified Heuristic Baseline Agent
+Heuristic Baseline Agent (FR-3.1)
 
-Provides a working baseline for comparison with DRL agents.
-Uses simple FCFS strategy with basic conflict avoidance.
+Provides a rule-based baseline for comparison with DRL agents: a
+first-come-first-served (FCFS) clearance queue per FATO and rule-based
+conflict avoidance in which the lower-priority drone holds. All decisions
+are array operations over ``drones_state`` and ``distance_matrix``, so one
+call controls a batch of environments.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 from ..config.loader import load_scenario_config
+from ..config.schema import ScenarioConfig
 from ..core.environment import VertiportEnv
+from ..core.simulator import DroneState, VertiportSim
 from .base import BaseAgent
 
+# Columns of ``drones_state`` (see VertiportEnv._build_obs)
+POSITION = slice(0, 3)
+TARGET = slice(9, 12)
+STATE = 14
+CLEARANCE = 15
+
+HOVER, CONTINUE, GRANT_CLEARANCE = 0, 1, 4
+
+# Drones that follow the Continue/Hover actions
+MOVING_STATES = [
+    DroneState.EN_ROUTE_TO_ENTRY.value,
+    DroneState.CLEARED_TO_LAND.value,
+    DroneState.EN_ROUTE_TO_PAD.value,
+    DroneState.EN_ROUTE_TO_EXIT.value,
+]
+
+# Drones whose FATO is taken until they leave it: a FATO takes one landing at
+# a time, from clearance until the drone has lifted off again
+FATO_BUSY_STATES = [
+    DroneState.CLEARED_TO_LAND.value,
+    DroneState.EN_ROUTE_TO_PAD.value,
+    DroneState.ON_PAD.value,
+]
+
+# Drones that are always inside their FATO's approach corridor
+CORRIDOR_STATES = FATO_BUSY_STATES + [DroneState.AWAITING_CLEARANCE.value]
+
+# Conflict priority by drone state (higher wins, the other drone holds).
+# Drones the simulator keeps in place cannot yield, departures clear the
+# shared approach path before landings use it, and landings go before
+# drones still en route to their holding point.
+STATE_PRIORITY = np.zeros(len(DroneState), dtype=np.int64)
+STATE_PRIORITY[DroneState.AWAITING_CLEARANCE.value] = 4
+STATE_PRIORITY[DroneState.ON_PAD.value] = 4
+STATE_PRIORITY[DroneState.EN_ROUTE_TO_EXIT.value] = 3
+STATE_PRIORITY[DroneState.CLEARED_TO_LAND.value] = 2
+STATE_PRIORITY[DroneState.EN_ROUTE_TO_PAD.value] = 2
+STATE_PRIORITY[DroneState.EN_ROUTE_TO_ENTRY.value] = 1
+
 
 class SimpleHeuristicAgent(BaseAgent):
-    """Simple heuristic agent that uses FCFS strategy."""
+    """FCFS clearance with closest-approach conflict avoidance (FR-3.1).
+
+    Drones are assigned to FATOs round-robin (drone ``i`` lands on FATO
+    ``i % num_fatos``, as in ``VertiportSim``). Arrivals and departures of a
+    FATO share its approach path, so when the corridor entry points are
+    known (see ``from_config``) each FATO admits one drone at a time into its
+    corridor: arrivals queue ``queue_distance`` before the entry point and
+    the drone that has queued longest is admitted once the previous drone
+    has left the corridor. Drones waiting at a holding point are cleared
+    first come, first served, one landing per FATO at a time.
+
+    Conflict avoidance: every pair of drones is projected forward along the
+    velocities they would fly if allowed to continue. If the pair converges
+    to less than ``min_separation`` within ``horizon`` seconds, the drone
+    with the lower priority (see ``STATE_PRIORITY``; ties go to the lower
+    drone index) hovers, unless hovering would leave it in the other drone's
+    path and the other drone can hover instead.
 
-    def __init__(self, name: str = "SimpleHeuristic"):
-        """Initialize the simple heuristic agent."""
+    Observations may be single (``drones_state`` of shape ``(N, 16)``) or
+    batched over environments (``(B, N, 16)``); the actions have the
+    matching shape ``(N,)`` or ``(B, N)``.
+    """
+
+    def __init__(
+        self,
+        name: str = "SimpleHeuristic",
+        num_fatos: Optional[int] = None,
+        min_separation: float = 6.0,
+        drone_speed: float = 5.0,
+        arrival_radius: float = 1.0,
+        time_step: float = 0.1,
+        horizon: float = 3.0,
+        entry_points: Optional[np.ndarray] = None,
+        exit_points: Optional[np.ndarray] = None,
+    ):
+        """Initialize the heuristic agent.
+
+        Args:
+            name: Human-readable name for the agent
+            num_fatos: FATOs of the vertiport (None infers it from
+                ``infrastructure_state``, assuming one holding point per FATO)
+            min_separation: Separation the conflict check protects
+            drone_speed: Cruise speed used to project continuing drones
+            arrival_radius: Distance at which a drone has reached its target
+                waypoint
+            time_step: Simulation time step in seconds
+            horizon: Look-ahead time of the closest-approach check in seconds
+            entry_points: ``(num_drones, 3)`` first approach waypoint of each
+                drone's FATO; None disables corridor admission
+            exit_points: ``(num_drones, 3)`` exit gate of each drone
+        """
         super().__init__(name)
+        if (entry_points is None) != (exit_points is None):
+            raise ValueError("entry_points and exit_points must be given together")
+        self.num_fatos = num_fatos
+        self.min_separation = min_separation
+        self.drone_speed = drone_speed
+        self.arrival_radius = arrival_radius
+        self.time_step = time_step
+        self.horizon = horizon
+        self.entry_points = None if entry_points is None else np.asarray(entry_points)
+        self.exit_points = None if exit_points is None else np.asarray(exit_points)
+        # Queued drones stop where a departure passing the entry point keeps
+        # its separation
+        self.queue_distance = (
+            min_separation + 2 * arrival_radius + drone_speed * time_step
+        )
+
+        # FCFS queues: decision step at which each drone started queueing
+        self._tick = 0
+        self._queued_since: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_config(
+        cls, config: ScenarioConfig, name: str = "SimpleHeuristic", **kwargs
+    ) -> "SimpleHeuristicAgent":
+        """Creates an agent with the layout and kinematics of a scenario.
+
+        Args:
+            config: Scenario configuration
+            name: Human-readable name for the agent
+            **kwargs: Overrides of the other constructor arguments
+
+        Returns:
+            Configured agent
+        """
+        sim = VertiportSim(config)
+        simulation = config.simulation
+        params = {
+            "num_fatos": len(config.vertiport.fatos),
+            "min_separation": simulation.get("min_separation", 6.0),
+            "drone_speed": simulation.get("drone_speed", 5.0),
+            "arrival_radius": simulation.get("arrival_radius", 1.0),
+            "time_step": simulation.get("time_step", 0.1),
+            "entry_points": np.array([plan[1] for plan in sim.arrival_plans]),
+            "exit_points": np.array([plan[-1] for plan in sim.departure_plans]),
+            **kwargs,
+        }
+        return cls(name=name, **params)
 
     def act(self, observation: Dict[str, Any]) -> np.ndarray:
-        """Select actions based on simple heuristic strategy.
+        """Select actions for one observation or a batch of observations.
 
         Args:
-            observation: Current environment observation
+            observation: Current environment observation, optionally batched
+
+        Returns:
+            Array of actions for each drone (and environment)
+        """
+        drones_state = np.asarray(observation["drones_state"])
+        batched = drones_state.ndim == 3
+        if not batched:
+            observation = {key: value[np.newaxis] for key, value in observation.items()}
+            drones_state = drones_state[np.newaxis]
+
+        states = drones_state[..., STATE].astype(np.int64)
+        positions = drones_state[..., POSITION].astype(np.float64)
+        targets = drones_state[..., TARGET].astype(np.float64)
+        num_drones = states.shape[1]
+
+        num_fatos = self.num_fatos
+        if num_fatos is None:
+            num_fatos = max(np.shape(observation["infrastructure_state"])[-1] // 2, 1)
+        # (N, F) assignment of drones to FATOs
+        assigned = (np.arange(num_drones) % num_fatos)[:, np.newaxis] == np.arange(
+            num_fatos
+        )
+
+        # Drones queueing before a corridor or at a holding point
+        waiting = states == DroneState.AWAITING_CLEARANCE.value
+        in_corridor, approaching = self._corridor_occupancy(states, positions, targets)
+        self._update_queues(approaching | waiting)
+
+        actions = np.where(np.isin(states, MOVING_STATES), CONTINUE, HOVER)
+
+        admitted = self._first_in_queue(approaching, ~in_corridor, assigned)
+        queue_holds = approaching & ~admitted
+        actions[queue_holds] = HOVER
+
+        granted = drones_state[..., CLEARANCE] > 0.5
+        busy = np.isin(states, FATO_BUSY_STATES) | (waiting & granted)
+        grants = self._first_in_queue(waiting & ~granted, ~busy, assigned)
+        actions[grants] = GRANT_CLEARANCE
+
+        holds = self._conflict_holds(
+            positions, targets, states, queue_holds, observation
+        )
+        actions[holds & (actions == CONTINUE)] = HOVER
+
+        actions = actions.astype(np.int64)
+        return actions if batched else actions[0]
+
+    def _corridor_occupancy(
+        self, states: np.ndarray, positions: np.ndarray, targets: np.ndarray
+    ):
+        """Locates drones relative to their FATO's approach corridor.
+
+        Args:
+            states: Drone state values of shape ``(B, N)``
+            positions: Drone positions of shape ``(B, N, 3)``
+            targets: Target waypoints of shape ``(B, N, 3)``
+
+        Returns:
+            Tuple of ``(B, N)`` masks: drones inside their corridor, and
+            arrivals within ``queue_distance`` of the corridor entry
+        """
+        if self.entry_points is None:
+            in_corridor = np.isin(states, FATO_BUSY_STATES)
+            return in_corridor, np.zeros(states.shape, dtype=bool)
+
+        # Padded drone slots have no corridor
+        num_drones = states.shape[1]
+        known = min(num_drones, len(self.entry_points))
+        entries = np.full((num_drones, 3), np.nan)
+        exits = np.full((num_drones, 3), np.nan)
+        entries[:known] = self.entry_points[:known]
+        exits[:known] = self.exit_points[:known]
+
+        to_entry = np.linalg.norm(entries - positions, axis=-1)
+        heading_to_entry = np.isclose(targets, entries, atol=1e-3).all(axis=-1)
+        heading_to_exit = np.isclose(targets, exits, atol=1e-3).all(axis=-1)
+
+        arriving = states == DroneState.EN_ROUTE_TO_ENTRY.value
+        departing = states == DroneState.EN_ROUTE_TO_EXIT.value
+        in_corridor = (
+            np.isin(states, CORRIDOR_STATES)
+            | (arriving & ~heading_to_entry)
+            | (departing & ~heading_to_exit)
+        )
+        approaching = arriving & heading_to_entry & (to_entry < self.queue_distance)
+        return in_corridor, approaching
+
+    def _update_queues(self, queued: np.ndarray) -> None:
+        """Records when drones joined a queue and forgets drones that left."""
+        if self._queued_since is None or self._queued_since.shape != queued.shape:
+            self._queued_since = np.full(queued.shape, np.inf)
+        self._tick += 1
+        joined = queued & np.isinf(self._queued_since)
+        self._queued_since[joined] = self._tick
+        self._queued_since[~queued] = np.inf
+
+    def _first_in_queue(
+        self, queued: np.ndarray, available: np.ndarray, assigned: np.ndarray
+    ) -> np.ndarray:
+        """Selects the longest-queued drone of every FATO that is available.
+
+        Args:
+            queued: ``(B, N)`` mask of drones in the queue
+            available: ``(B, N)`` mask that is False for drones occupying their
+                FATO (a FATO is available if none of its drones is False)
+            assigned: ``(N, F)`` assignment of drones to FATOs
+
+        Returns:
+            Boolean ``(B, N)`` mask of the selected drones
+        """
+        occupied = (~available[..., np.newaxis] & assigned).any(axis=1)
+
+        # FCFS: earliest time in the queue, then lowest drone index
+        queue_time = np.where(queued, self._queued_since, np.inf)
+        candidates = np.where(assigned, queue_time[..., np.newaxis], np.inf)
+        first = candidates.argmin(axis=1)
+        has_candidate = np.isfinite(candidates.min(axis=1))
+
+        selected = np.zeros(queued.shape, dtype=bool)
+        b, f = np.nonzero(has_candidate & ~occupied)
+        selected[b, first[b, f]] = True
+        return selected
+
+    def _conflict_holds(
+        self,
+        positions: np.ndarray,
+        targets: np.ndarray,
+        states: np.ndarray,
+        queue_holds: np.ndarray,
+        observation: Dict[str, Any],
+    ) -> np.ndarray:
+        """Finds drones that must hover to resolve a predicted conflict.
+
+        Args:
+            positions: Drone positions of shape ``(B, N, 3)``
+            targets: Target waypoints of shape ``(B, N, 3)``
+            states: Drone state values of shape ``(B, N)``
+            queue_holds: Drones already held in a corridor queue
+            observation: Batched observation (for ``distance_matrix``)
+
+        Returns:
+            Boolean ``(B, N)`` mask of drones to hold
+        """
+        num_drones = states.shape[1]
+
+        # Velocity each drone flies if it continues
+        to_target = targets - positions
+        distance = np.linalg.norm(to_target, axis=-1, keepdims=True)
+        moving = (
+            np.isin(states, MOVING_STATES)
+            & (distance[..., 0] > self.arrival_radius)
+            & ~queue_holds
+        )
+        velocities = np.where(
+            moving[..., np.newaxis],
+            to_target / np.maximum(distance, 1e-8) * self.drone_speed,
+            0.0,
+        )
+
+        if "distance_matrix" in observation:
+            separation = np.asarray(observation["distance_matrix"], dtype=np.float64)
+        else:
+            separation = np.linalg.norm(
+                positions[:, np.newaxis] - positions[:, :, np.newaxis], axis=-1
+            )
+
+        # Relative position of drone j seen from drone i, shape (B, N, N, 3)
+        p = positions[:, np.newaxis, :, :] - positions[:, :, np.newaxis, :]
+        v_i = velocities[:, :, np.newaxis, :]
+        v_j = velocities[:, np.newaxis, :, :]
+
+        # Only drones in the managed airspace can conflict; pairs out of
+        # reach within the horizon are skipped using the distance matrix
+        priority_class = STATE_PRIORITY[states]
+        active = priority_class > 0
+        reach = self.min_separation + 2 * self.drone_speed * self.horizon
+        candidates = (
+            (separation < reach)
+            & active[:, :, np.newaxis]
+            & active[:, np.newaxis, :]
+            & ~np.eye(num_drones, dtype=bool)
+        )
+        conflict = candidates & self._converges(p, v_j - v_i)
+        # Conflicts left if only drone i hovers (the transpose: only j hovers)
+        remains_if_hold = candidates & self._converges(p, np.broadcast_to(v_j, p.shape))
+        hold_resolves = conflict & ~remains_if_hold
+        other_resolves = conflict & ~remains_if_hold.transpose(0, 2, 1)
+
+        # The lower-priority drone holds, unless holding would leave it in
+        # the path of the other drone and the other drone can hold instead;
+        # queued drones are not going to move and never yield
+        priority_class = np.where(queue_holds, STATE_PRIORITY.max(), priority_class)
+        priority = priority_class * num_drones - np.arange(num_drones)
+        lower = priority[:, :, np.newaxis] < priority[:, np.newaxis, :]
+        yields = np.where(
+            lower,
+            hold_resolves | ~other_resolves,
+            hold_resolves & ~other_resolves,
+        )
+        return (conflict & yields & moving[..., np.newaxis]).any(axis=2)
+
+    def _converges(self, p: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """Closest-approach check of relative positions ``p`` and velocities ``w``.
+
+        The time of closest approach ``t* = -p.w / |w|^2`` is clipped to the
+        horizon; pairs that are not closing in (``t* = 0``) never conflict.
 
         Returns:
-            Array of actions for each drone
+            Boolean mask of pairs that come closer than ``min_separation``
         """
-        # Simple strategy: all drones move to waypoint
-        num_drones = observation["drones_state"].shape[0]
-        actions = np.ones(num_drones, dtype=np.int32)  # All MOVE_TO_WAYPOINT
-        return actions
+        closing = -np.einsum("...k,...k->...", p, w)
+        speed_sq = np.einsum("...k,...k->...", w, w)
+        t_min = np.clip(closing / np.maximum(speed_sq, 1e-12), 0.0, self.horizon)
+        miss = np.linalg.norm(p + w * t_min[..., np.newaxis], axis=-1)
+        return (t_min > 0) & (miss < self.min_separation)
 
     def reset(self) -> None:
-        """Reset agent state for a new episode."""
-        # Simple heuristic doesn't maintain state
-        pass
+        """Reset the clearance queues for a new episode."""
+        self._tick = 0
+        self._queued_since = None
 
 
 def run_simple_heuristic(scenario_path: str, max_steps: int = 200):
@@ -48,15 +393,15 @@ def run_simple_heuristic(scenario_path: str, max_steps: int = 200):
 
     config = load_scenario_config(scenario_path)
     env = VertiportEnv(config)
+    agent = SimpleHeuristicAgent.from_config(config)
 
     obs, info = env.reset()
+    agent.reset()
     total_reward = 0
     step_count = 0
 
     while step_count < max_steps:
-        # Simple strategy: all drones move to waypoint
-        num_drones = obs["drones_state"].shape[0]
-        actions = np.ones(num_drones, dtype=np.int32)  # All MOVE_TO_WAYPOINT
+        actions = agent.act(obs)
 
         obs, reward, terminated, truncated, info = env.step(actions)
         total_reward += reward
@@ -1,13 +1,40 @@
 """Core simulation components."""
 
-from .environment import VertiportEnv
+from .batched_simulator import BatchedVertiportSim
+from .environment import VertiportEnv, compute_action_mask
 from .event_logger import EventLogger, EventType
+from .service import SimulationClient, SimulationServer
 from .simulator import DroneState, VertiportSim
+from .wrappers import DecisionPointWrapper
+
+# The multi-agent environments build on Stable-Baselines3 (and thus PyTorch);
+# they are imported on first access so torch-free consumers stay torch-free
+_LAZY_IMPORTS = {
+    "SharedPolicyVecEnv": ".multi_agent",
+    "VertiportParallelEnv": ".multi_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "VertiportSim",
     "DroneState",
+    "BatchedVertiportSim",
     "VertiportEnv",
+    "compute_action_mask",
     "EventLogger",
     "EventType",
+    "DecisionPointWrapper",
+    "VertiportParallelEnv",
+    "SharedPolicyVecEnv",
+    "SimulationServer",
+    "SimulationClient",
 ]
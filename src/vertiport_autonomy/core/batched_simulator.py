@@ -0,0 +1,276 @@
+"""Vectorized ``VertiportSim`` stepping many simulations of one scenario.
+
+``BatchedVertiportSim`` keeps the state of every simulation in stacked
+arrays (simulation, drone, ...) and advances any subset of them with one
+NumPy pass per phase of ``VertiportSim.step``, reproducing its transitions
+exactly, including the order in which drones sharing a FATO claim it. It
+records no events; use ``VertiportSim`` where the event log is needed.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from ..config.schema import ScenarioConfig
+from .simulator import DroneState, VertiportSim
+
+# Drone states whose drones hold their position whatever the action
+_IDLE_STATES = [
+    DroneState.FINISHED.value,
+    DroneState.INACTIVE.value,
+    DroneState.AWAITING_CLEARANCE.value,
+    DroneState.ON_PAD.value,
+]
+
+# Arrays of a simulation's state, with their dtype and per-drone shape
+# (``"fato"`` arrays have one entry per FATO instead)
+STATE_ARRAYS = {
+    "positions": (np.float64, (3,)),
+    "velocities": (np.float64, (3,)),
+    "accelerations": (np.float64, (3,)),
+    "waypoint_indices": (np.int64, ()),
+    "states": (np.int64, ()),
+    "hovering": (np.bool_, ()),
+    "hover_count": (np.int64, ()),
+    "clearance_granted": (np.bool_, ()),
+    "ground_times": (np.float64, ()),
+    "fato_occupancy": (np.bool_, "fato"),
+}
+
+
+class BatchedVertiportSim:
+    """Stacked ``VertiportSim`` states of one scenario, stepped together."""
+
+    def __init__(self, config: ScenarioConfig, capacity: int = 1):
+        """Initialize the batch with free simulation slots.
+
+        Args:
+            config: Scenario shared by all simulations
+            capacity: Initial number of slots (grown on demand by ``add``)
+        """
+        # The reference simulator provides the flight plans and constants
+        sim = VertiportSim(config)
+        self.config = config
+        self.num_drones = sim.num_drones
+        self.num_fatos = len(config.vertiport.fatos)
+        self.dt = sim.dt
+        self.arrival_radius = sim.arrival_radius
+        self.drone_radius = sim.drone_radius
+        self.drone_speed = sim.drone_speed
+        self.ground_time = config.simulation.get("ground_time", 5.0)
+
+        self.arrival_plans, self.arrival_lengths = self._pad_plans(sim.arrival_plans)
+        self.departure_plans, self.departure_lengths = self._pad_plans(
+            sim.departure_plans
+        )
+        self._drone_index = np.arange(self.num_drones)
+        self._initial = {
+            name: np.asarray(getattr(sim, name)).copy() for name in STATE_ARRAYS
+        }
+        self._initial["states"] = np.full(
+            self.num_drones, DroneState.EN_ROUTE_TO_ENTRY.value
+        )
+
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.active = np.zeros(0, dtype=bool)
+        self._grow(max(capacity, 1))
+
+    @staticmethod
+    def _pad_plans(plans):
+        """Stacks per-drone waypoint lists, padding with the last waypoint."""
+        lengths = np.array([len(plan) for plan in plans])
+        padded = np.zeros((len(plans), lengths.max(), 3))
+        for i, plan in enumerate(plans):
+            padded[i, : len(plan)] = plan
+            padded[i, len(plan) :] = plan[-1]
+        return padded, lengths
+
+    @property
+    def capacity(self) -> int:
+        """Number of simulation slots, used or free."""
+        return len(self.active)
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        for name, (dtype, shape) in STATE_ARRAYS.items():
+            rows = (self.num_fatos,) if shape == "fato" else (self.num_drones, *shape)
+            new = np.zeros((extra, *rows), dtype=dtype)
+            self.arrays[name] = np.concatenate([self.arrays.get(name, new[:0]), new])
+        self.active = np.concatenate([self.active, np.zeros(extra, dtype=bool)])
+
+    def add(self) -> int:
+        """Allocates a slot holding a freshly reset simulation.
+
+        Returns:
+            Index of the slot
+        """
+        free = np.flatnonzero(~self.active)
+        if len(free) == 0:
+            free = [self.capacity]
+            self._grow(2 * self.capacity)
+        index = int(free[0])
+        self.active[index] = True
+        self.reset([index])
+        return index
+
+    def remove(self, index: int) -> None:
+        """Frees a slot for reuse.
+
+        Args:
+            index: Slot returned by ``add``
+        """
+        self.active[index] = False
+
+    def reset(self, indices: Sequence[int]) -> None:
+        """Resets simulations to the initial state of the scenario.
+
+        Args:
+            indices: Slots to reset
+        """
+        for name, initial in self._initial.items():
+            self.arrays[name][indices] = initial
+
+    def _target_waypoints(self, s: Dict[str, np.ndarray]) -> np.ndarray:
+        """Vectorized ``VertiportSim._get_target_waypoint``."""
+        states = s["states"]
+        waypoints = s["waypoint_indices"]
+        arriving = states <= DroneState.CLEARED_TO_LAND.value
+        arriving &= states != DroneState.INACTIVE.value
+        departing = (states == DroneState.ON_PAD.value) | (
+            states == DroneState.EN_ROUTE_TO_EXIT.value
+        )
+        targets = s["positions"].copy()
+        arrival = self.arrival_plans[
+            self._drone_index, np.minimum(waypoints, self.arrival_plans.shape[1] - 1)
+        ]
+        departure = self.departure_plans[
+            self._drone_index,
+            np.minimum(waypoints, self.departure_plans.shape[1] - 1),
+        ]
+        targets[arriving] = arrival[arriving]
+        targets[departing] = departure[departing]
+        return targets
+
+    def step(self, indices: Sequence[int], actions: np.ndarray) -> None:
+        """Advances simulations by one time step, as ``VertiportSim.step``.
+
+        Args:
+            indices: Distinct slots to step
+            actions: Array of shape ``(len(indices), num_drones)``; 0 hovers,
+                1 continues, 4 grants clearance
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        actions = np.asarray(actions)
+        s = {name: array[indices] for name, array in self.arrays.items()}
+        states = s["states"]
+        velocities = s["velocities"]
+        hovering = s["hovering"]
+        prev_velocities = velocities.copy()
+
+        # 1. Clearance grants
+        s["clearance_granted"] |= (actions == 4) & (
+            states == DroneState.AWAITING_CLEARANCE.value
+        )
+
+        # 2. Velocities; other actions keep the previous velocity
+        idle = np.isin(states, _IDLE_STATES)
+        hover = ~idle & (actions == 0)
+        proceed = ~idle & (actions == 1)
+        s["hover_count"] += hover & ~hovering
+        velocities[idle | hover] = 0
+        hovering[idle | hover] = True
+
+        direction = self._target_waypoints(s) - s["positions"]
+        distance = np.linalg.norm(direction, axis=-1)
+        moving = proceed & (distance > self.arrival_radius) & (distance > 1e-8)
+        velocities[proceed] = 0
+        velocities[moving] = (
+            direction[moving] / distance[moving, None]
+        ) * self.drone_speed
+        hovering[proceed] = False
+
+        # 3.-5. Accelerations, positions and ground times
+        s["accelerations"] = (velocities - prev_velocities) / self.dt
+        s["positions"] += velocities * self.dt
+        s["ground_times"][states == DroneState.ON_PAD.value] += self.dt
+
+        # 6. Waypoint arrivals, from the states before any transition
+        distance = np.linalg.norm(self._target_waypoints(s) - s["positions"], axis=-1)
+        arrived = (states != DroneState.FINISHED.value) & (
+            distance < self.arrival_radius
+        )
+        self._advance_missions(s, arrived)
+
+        for name, array in s.items():
+            self.arrays[name][indices] = array
+
+    def _advance_missions(self, s: Dict[str, np.ndarray], arrived: np.ndarray):
+        """Vectorized ``VertiportSim._advance_mission`` of arrived drones."""
+        states = s["states"]
+        waypoints = s["waypoint_indices"]
+        entering = arrived & (states == DroneState.EN_ROUTE_TO_ENTRY.value)
+        cleared = (
+            arrived
+            & (states == DroneState.AWAITING_CLEARANCE.value)
+            & s["clearance_granted"]
+        )
+        approaching = arrived & (states == DroneState.CLEARED_TO_LAND.value)
+        leaving_pad = (
+            arrived
+            & (states == DroneState.ON_PAD.value)
+            & (s["ground_times"] >= self.ground_time)
+        )
+        exiting = arrived & (states == DroneState.EN_ROUTE_TO_EXIT.value)
+
+        at_holding = entering & (waypoints == self.arrival_lengths - 2)
+        at_fato = approaching & (waypoints == self.arrival_lengths - 1)
+        at_exit = exiting & (waypoints >= self.departure_lengths - 1)
+
+        # FATO claims depend on the claims and releases of lower drone
+        # indices. Drone i uses FATO i % num_fatos, so the k-th drone of
+        # every FATO is handled together, in order of k.
+        occupancy = s["fato_occupancy"]
+        landed = np.zeros_like(at_fato)
+        for first in range(0, self.num_drones, self.num_fatos):
+            drones = slice(first, min(first + self.num_fatos, self.num_drones))
+            fatos = slice(0, drones.stop - first)
+            occupancy[:, fatos] &= ~leaving_pad[:, drones]
+            landed[:, drones] = at_fato[:, drones] & ~occupancy[:, fatos]
+            occupancy[:, fatos] |= landed[:, drones]
+
+        waypoints += (entering & ~at_holding) | cleared | (approaching & ~at_fato)
+        waypoints += exiting & ~at_exit
+        waypoints[landed] = 0
+        waypoints[leaving_pad] = 1
+        s["clearance_granted"][cleared] = False
+        s["ground_times"][leaving_pad] = 0
+        states[at_holding] = DroneState.AWAITING_CLEARANCE.value
+        states[cleared] = DroneState.CLEARED_TO_LAND.value
+        states[landed] = DroneState.ON_PAD.value
+        states[leaving_pad] = DroneState.EN_ROUTE_TO_EXIT.value
+        states[at_exit] = DroneState.FINISHED.value
+
+    def get_state(self, indices: Sequence[int]) -> Dict[str, np.ndarray]:
+        """Returns the state of simulations, as ``VertiportSim._get_state``.
+
+        Args:
+            indices: Slots to report
+
+        Returns:
+            Dict of arrays with a leading simulation dimension: the state
+            arrays, ``target_waypoints``, ``distance_matrix`` and the
+            per-simulation ``collisions`` flag
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        s = {name: array[indices] for name, array in self.arrays.items()}
+        positions = s["positions"]
+        distances = np.linalg.norm(
+            positions[:, :, None, :] - positions[:, None, :, :], axis=-1
+        )
+        finished = s["states"] == DroneState.FINISHED.value
+        distances[finished[:, :, None] | finished[:, None, :]] = 1000.0
+        distances[:, self._drone_index, self._drone_index] = 1000.0
+        s["target_waypoints"] = self._target_waypoints(s)
+        s["distance_matrix"] = distances
+        s["collisions"] = (distances < 2 * self.drone_radius).any(axis=(1, 2))
+        return s
@@ -1,4 +1,6 @@
 # vertiport_env.py
+from typing import Optional
+
 import gymnasium as gym
 import matplotlib.pyplot as plt
 import numpy as np
@@ -8,55 +10,106 @@ from ..config.schema import ScenarioConfig
 from .event_logger import EventLogger, EventType
 from .simulator import DroneState, VertiportSim
 
+# Valid actions per drone state (FR-2.2), indexed by ``DroneState.value``.
+# Columns: 0 Hover, 1 Continue, 2 and 3 reserved (no-ops), 4 Grant Clearance.
+# Drones the simulator holds in place (INACTIVE, ON_PAD, FINISHED) only keep
+# action 0 so every row has at least one valid choice; drones waiting at a
+# holding point may either keep waiting (0) or be granted clearance (4).
+ACTION_MASK_TABLE = np.array(
+    [
+        [True, False, False, False, False],  # INACTIVE
+        [True, True, False, False, False],  # EN_ROUTE_TO_ENTRY
+        [True, False, False, False, True],  # AWAITING_CLEARANCE
+        [True, True, False, False, False],  # CLEARED_TO_LAND
+        [True, True, False, False, False],  # EN_ROUTE_TO_PAD
+        [True, False, False, False, False],  # ON_PAD
+        [True, True, False, False, False],  # EN_ROUTE_TO_EXIT
+        [True, False, False, False, False],  # FINISHED
+    ],
+    dtype=bool,
+)
+
+
+def compute_action_mask(states: np.ndarray) -> np.ndarray:
+    """Computes the per-drone action mask for an array of drone state values.
+
+    Args:
+        states: Integer drone state values of any shape, e.g. ``(num_drones,)``
+            for one environment or ``(num_envs, num_drones)`` for a batch
+
+    Returns:
+        Boolean array of shape ``states.shape + (5,)`` marking valid actions
+    """
+    return ACTION_MASK_TABLE[np.asarray(states, dtype=np.int64)]
+
+
+# Supported observation layouts: dense N x N matrices, k nearest neighbors or a
+# sparse graph (padded edge list) for message-passing policies
+OBS_MODES = ("dense", "topk", "graph")
+
+# Features per neighbor in "topk" mode (see VertiportEnv._get_nearest_neighbors)
+NEIGHBOR_FEATURES = 8
+
+# Features per edge in "graph" mode: relative position(3), distance(1)
+EDGE_FEATURES = 4
+
 
 class VertiportEnv(gym.Env):
     """A Gymnasium environment for the VertiportSim."""
 
     metadata = {"render_modes": ["human"], "render_fps": 10}
 
-    def __init__(self, config: ScenarioConfig, render_mode=None):
+    def __init__(
+        self,
+        config: ScenarioConfig,
+        render_mode=None,
+        obs_mode: str = "dense",
+        k_neighbors: int = 4,
+        max_drones: Optional[int] = None,
+    ):
+        """Initialize the environment.
+
+        Args:
+            config: Scenario configuration
+            render_mode: ``"human"`` to render with matplotlib
+            obs_mode: Observation layout, one of ``OBS_MODES``
+            k_neighbors: Neighbors per drone in ``"topk"``/``"graph"`` modes
+            max_drones: Pad observations and actions to this fleet size so
+                scenarios with different fleet sizes share one space (None
+                uses the scenario's ``max_drones``)
+        """
         super().__init__()
 
+        if obs_mode not in OBS_MODES:
+            raise ValueError(
+                f"Unknown obs_mode '{obs_mode}'. Available modes: {OBS_MODES}"
+            )
+        if k_neighbors < 1:
+            raise ValueError(f"k_neighbors must be >= 1, got {k_neighbors}")
+
         self.config = config
         self.num_drones = config.traffic.max_drones
+        self.max_drones = max_drones or self.num_drones
+        if self.max_drones < self.num_drones:
+            raise ValueError(
+                f"max_drones ({self.max_drones}) is smaller than the scenario's "
+                f"fleet size ({self.num_drones})"
+            )
+        self.obs_mode = obs_mode
+        self.k_neighbors = k_neighbors
         self.sim = VertiportSim(config)
 
         # Define action and observation space
         # Action space: 5 actions per drone as per FR-2.2
-        self.action_space = spaces.MultiDiscrete([5] * self.num_drones)
+        self.action_space = spaces.MultiDiscrete([5] * self.max_drones)
+        self.observation_space = self._build_observation_space()
 
-        # Observation space: Expanded to include adjacency matrix and infrastructure state
-        # drone_state: position(3), velocity(3), acceleration(3), target_waypoint(3),
-        #              hovering(1), hover_count(1), state(1), clearance_granted(1) = 16 features
-        # infrastructure_state: FATO occupancy (1 per FATO) + holding point occupancy (1 per holding point)
-        num_fatos = len(config.vertiport.fatos)
-        num_holdings = len(config.vertiport.holding_points)
-
-        self.observation_space = spaces.Dict(
-            {
-                "drones_state": spaces.Box(
-                    low=-100.0,
-                    high=100.0,
-                    shape=(self.num_drones, 16),
-                    dtype=np.float32,
-                ),
-                "distance_matrix": spaces.Box(
-                    low=0,
-                    high=1000.0,
-                    shape=(self.num_drones, self.num_drones),
-                    dtype=np.float32,
-                ),
-                "adjacency_matrix": spaces.Box(
-                    low=0,
-                    high=1,
-                    shape=(self.num_drones, self.num_drones),
-                    dtype=np.float32,
-                ),
-                "infrastructure_state": spaces.Box(
-                    low=0, high=1, shape=(num_fatos + num_holdings,), dtype=np.float32
-                ),
-            }
-        )
+        # Keys that VecNormalize should standardize (None means all keys)
+        self.norm_obs_keys = None
+        if self.obs_mode == "topk":
+            self.norm_obs_keys = ["drones_state", "neighbors", "infrastructure_state"]
+        elif self.obs_mode == "graph":
+            self.norm_obs_keys = ["drones_state", "edge_attr", "infrastructure_state"]
 
         self.max_steps = 1000
         self.current_step = 0
@@ -67,9 +120,153 @@ class VertiportEnv(gym.Env):
         if self.render_mode == "human":
             self.fig, self.ax = plt.subplots(figsize=(8, 8))
 
+    def set_scenario(self, config: ScenarioConfig) -> None:
+        """Swaps in a new scenario without recreating the environment.
+
+        Used for curriculum phase transitions inside long-lived worker
+        processes. The new scenario takes effect on the next ``reset()``.
+
+        Args:
+            config: Scenario configuration with the same vertiport layout and
+                at most ``max_drones`` drones
+
+        Raises:
+            ValueError: If the scenario changes the observation or action space
+        """
+        if config.traffic.max_drones > self.max_drones:
+            raise ValueError(
+                f"Scenario has {config.traffic.max_drones} drones but the "
+                f"environment is padded to {self.max_drones}"
+            )
+
+        previous_config = self.config
+        self.config = config
+        if self._build_observation_space() != self.observation_space:
+            self.config = previous_config
+            raise ValueError(
+                "Scenario changes the observation or action space; "
+                "create a new environment instead"
+            )
+
+        self.num_drones = config.traffic.max_drones
+        self.sim = VertiportSim(config)
+        self.current_step = 0
+        self.prev_hover_count = np.zeros(self.num_drones)
+
+    def _build_observation_space(self):
+        """Builds the observation space for the configured observation mode."""
+        # Observation space: Expanded to include adjacency matrix and infrastructure state
+        # drone_state: position(3), velocity(3), acceleration(3), target_waypoint(3),
+        #              hovering(1), hover_count(1), state(1), clearance_granted(1) = 16 features
+        # infrastructure_state: FATO occupancy (1 per FATO) + holding point occupancy (1 per holding point)
+        # Padded drones (beyond the scenario's fleet) are all-zero rows
+        num_fatos = len(self.config.vertiport.fatos)
+        num_holdings = len(self.config.vertiport.holding_points)
+
+        obs_spaces = {
+            "drones_state": spaces.Box(
+                low=-100.0,
+                high=100.0,
+                shape=(self.max_drones, 16),
+                dtype=np.float32,
+            ),
+            "infrastructure_state": spaces.Box(
+                low=0, high=1, shape=(num_fatos + num_holdings,), dtype=np.float32
+            ),
+        }
+
+        if self.obs_mode == "dense":
+            obs_spaces["distance_matrix"] = spaces.Box(
+                low=0,
+                high=1000.0,
+                shape=(self.max_drones, self.max_drones),
+                dtype=np.float32,
+            )
+            obs_spaces["adjacency_matrix"] = spaces.Box(
+                low=0,
+                high=1,
+                shape=(self.max_drones, self.max_drones),
+                dtype=np.float32,
+            )
+        elif self.obs_mode == "topk":
+            # neighbors: relative position(3), relative velocity(3), distance(1),
+            #            state(1) = 8 features for each of the k nearest drones
+            obs_spaces["neighbors"] = spaces.Box(
+                low=-1000.0,
+                high=1000.0,
+                shape=(self.max_drones, self.k_neighbors, NEIGHBOR_FEATURES),
+                dtype=np.float32,
+            )
+            obs_spaces["neighbor_mask"] = spaces.Box(
+                low=0,
+                high=1,
+                shape=(self.max_drones, self.k_neighbors),
+                dtype=np.float32,
+            )
+        elif self.obs_mode == "graph":
+            # Each drone receives at most k_neighbors edges from drones within
+            # sensor range, giving a padded edge list of max_drones * k entries
+            num_edges = self.max_drones * self.k_neighbors
+            obs_spaces["edge_index"] = spaces.Box(
+                low=0,
+                high=self.max_drones - 1,
+                shape=(2, num_edges),
+                dtype=np.float32,
+            )
+            obs_spaces["edge_attr"] = spaces.Box(
+                low=-1000.0,
+                high=1000.0,
+                shape=(num_edges, EDGE_FEATURES),
+                dtype=np.float32,
+            )
+            obs_spaces["edge_mask"] = spaces.Box(
+                low=0, high=1, shape=(num_edges,), dtype=np.float32
+            )
+            # 1 for the scenario's drones, 0 for padded slots
+            obs_spaces["node_mask"] = spaces.Box(
+                low=0, high=1, shape=(self.max_drones,), dtype=np.float32
+            )
+
+        return spaces.Dict(obs_spaces)
+
     def _get_obs(self):
         """Formats the simulator state into the observation space shape."""
-        state = self.sim._get_state()
+        obs = self._build_obs(self.sim._get_state())
+        if self.max_drones > self.num_drones:
+            obs = self._pad_obs(obs)
+        return obs
+
+    def _pad_obs(self, obs):
+        """Pads a scenario-sized observation to ``max_drones`` drones.
+
+        Padded drones are zero rows, infinitely far away (distance 1000) and
+        never adjacent; padded edges and nodes are masked out.
+        """
+        pad = self.max_drones - self.num_drones
+        edge_pad = pad * self.k_neighbors
+
+        padded = {}
+        for key, value in obs.items():
+            if key == "infrastructure_state":
+                padded[key] = value
+            elif key == "distance_matrix":
+                padded[key] = np.pad(
+                    value, ((0, pad), (0, pad)), constant_values=1000.0
+                )
+            elif key == "adjacency_matrix":
+                padded[key] = np.pad(value, ((0, pad), (0, pad)))
+            elif key == "edge_index":
+                padded[key] = np.pad(value, ((0, 0), (0, edge_pad)))
+            elif key in ("edge_attr", "edge_mask"):
+                widths = [(0, edge_pad)] + [(0, 0)] * (value.ndim - 1)
+                padded[key] = np.pad(value, widths)
+            else:
+                widths = [(0, pad)] + [(0, 0)] * (value.ndim - 1)
+                padded[key] = np.pad(value, widths)
+        return padded
+
+    def _build_obs(self, state):
+        """Builds the scenario-sized observation from a simulator state."""
 
         # Stack all state features per drone - now includes clearance_granted
         drones_state = np.hstack(
@@ -85,11 +282,6 @@ class VertiportEnv(gym.Env):
             ]
         ).astype(np.float32)
 
-        # Calculate adjacency matrix based on sensor range
-        sensor_range = self.config.simulation.get("sensor_range", 20.0)
-        dist_matrix = state["distance_matrix"]
-        adjacency_matrix = (dist_matrix > 0) & (dist_matrix < sensor_range)
-
         # Infrastructure state: FATO occupancy + holding point occupancy
         infrastructure_state = np.hstack(
             [
@@ -103,6 +295,31 @@ class VertiportEnv(gym.Env):
         if np.any(np.isnan(drones_state)):
             print(f"WARNING: NaN found in drones_state!")
 
+        if self.obs_mode == "topk":
+            neighbors, neighbor_mask = self._get_nearest_neighbors(state)
+            return {
+                "drones_state": drones_state,
+                "neighbors": neighbors,
+                "neighbor_mask": neighbor_mask,
+                "infrastructure_state": infrastructure_state.astype(np.float32),
+            }
+
+        if self.obs_mode == "graph":
+            edge_index, edge_attr, edge_mask = self._get_graph_edges(state)
+            return {
+                "drones_state": drones_state,
+                "edge_index": edge_index,
+                "edge_attr": edge_attr,
+                "edge_mask": edge_mask,
+                "node_mask": np.ones(self.num_drones, dtype=np.float32),
+                "infrastructure_state": infrastructure_state.astype(np.float32),
+            }
+
+        # Calculate adjacency matrix based on sensor range
+        sensor_range = self.config.simulation.get("sensor_range", 20.0)
+        dist_matrix = state["distance_matrix"]
+        adjacency_matrix = (dist_matrix > 0) & (dist_matrix < sensor_range)
+
         distance_matrix = np.where(
             np.isinf(state["distance_matrix"]), 1000.0, state["distance_matrix"]
         )
@@ -115,16 +332,124 @@ class VertiportEnv(gym.Env):
             "infrastructure_state": infrastructure_state.astype(np.float32),
         }
 
+    def _get_nearest_neighbors(self, state):
+        """Builds the k-nearest-neighbor features of every drone.
+
+        Neighbors are selected with a partial sort of each row of the distance
+        matrix, so the observation grows linearly with the number of drones.
+        Slots beyond the available neighbors are zero-filled with a distance of
+        1000 and a ``neighbor_mask`` of 0.
+
+        Args:
+            state: Simulator state as returned by ``VertiportSim._get_state``
+
+        Returns:
+            Tuple of ``(neighbors, neighbor_mask)`` arrays with shapes
+            ``(num_drones, k, 8)`` and ``(num_drones, k)``
+        """
+        neighbors = np.zeros(
+            (self.num_drones, self.k_neighbors, NEIGHBOR_FEATURES), dtype=np.float32
+        )
+        neighbors[:, :, 6] = 1000.0
+        neighbor_mask = np.zeros((self.num_drones, self.k_neighbors), dtype=np.float32)
+
+        k = min(self.k_neighbors, self.num_drones - 1)
+        if k == 0:
+            return neighbors, neighbor_mask
+
+        dist_matrix = np.nan_to_num(state["distance_matrix"], nan=1000.0, posinf=1000.0)
+        # Exclude each drone from its own neighbor set
+        candidates = dist_matrix.copy()
+        np.fill_diagonal(candidates, np.inf)
+        nearest = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+        distances = np.take_along_axis(dist_matrix, nearest, axis=1)
+        order = np.argsort(distances, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+
+        positions = state["positions"]
+        velocities = state["velocities"]
+        neighbors[:, :k, 0:3] = positions[nearest] - positions[:, np.newaxis, :]
+        neighbors[:, :k, 3:6] = velocities[nearest] - velocities[:, np.newaxis, :]
+        neighbors[:, :k, 6] = distances
+        neighbors[:, :k, 7] = state["states"][nearest]
+        neighbor_mask[:, :k] = 1.0
+
+        return neighbors, neighbor_mask
+
+    def _get_graph_edges(self, state):
+        """Builds the padded edge list of drones within sensor range.
+
+        Edge ``e = i * k + j`` points from the ``j``-th nearest in-range drone
+        to drone ``i``. Unused slots have index 0, zero features and an
+        ``edge_mask`` of 0, so message passing can ignore them.
+
+        Args:
+            state: Simulator state as returned by ``VertiportSim._get_state``
+
+        Returns:
+            Tuple of ``(edge_index, edge_attr, edge_mask)`` arrays with shapes
+            ``(2, num_edges)``, ``(num_edges, 4)`` and ``(num_edges,)``
+        """
+        num_edges = self.num_drones * self.k_neighbors
+        edge_index = np.zeros((2, num_edges), dtype=np.float32)
+        edge_attr = np.zeros((num_edges, EDGE_FEATURES), dtype=np.float32)
+        edge_mask = np.zeros(num_edges, dtype=np.float32)
+
+        k = min(self.k_neighbors, self.num_drones - 1)
+        if k == 0:
+            return edge_index, edge_attr, edge_mask
+
+        sensor_range = self.config.simulation.get("sensor_range", 20.0)
+        candidates = np.nan_to_num(state["distance_matrix"], nan=np.inf)
+        candidates = np.where(candidates < sensor_range, candidates, np.inf)
+        np.fill_diagonal(candidates, np.inf)
+
+        sources = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+        distances = np.take_along_axis(candidates, sources, axis=1)
+        valid = np.isfinite(distances)
+        targets = np.broadcast_to(
+            np.arange(self.num_drones)[:, np.newaxis], sources.shape
+        )
+
+        positions = state["positions"]
+        slots = (targets * self.k_neighbors + np.arange(k)[np.newaxis, :])[valid]
+        src, dst = sources[valid], targets[valid]
+        edge_index[0, slots] = src
+        edge_index[1, slots] = dst
+        edge_attr[slots, 0:3] = positions[src] - positions[dst]
+        edge_attr[slots, 3] = distances[valid]
+        edge_mask[slots] = 1.0
+
+        return edge_index, edge_attr, edge_mask
+
     def reset(self, *, seed=None, options=None):
         # Call the parent reset method with seed and options
         super().reset(seed=seed, options=options)
         self.sim.reset()
         self.current_step = 0
         self.prev_hover_count = np.zeros(self.num_drones)
-        return self._get_obs(), {}
+        return self._get_obs(), {"action_mask": self._get_action_mask()}
 
     def step(self, action):
+        reward, terminated, truncated, info = self.advance(action)
+        return self._get_obs(), reward, terminated, truncated, info
+
+    def advance(self, action):
+        """Steps the simulation without building the next observation.
+
+        ``step`` is ``advance`` followed by ``_get_obs``; the real-time runner
+        calls the two separately to time them.
+
+        Args:
+            action: Joint action of all drone slots
+
+        Returns:
+            Tuple of reward, terminated, truncated and info
+        """
         self.current_step += 1
+        # Actions of padded drone slots are ignored
+        action = np.asarray(action)[: self.num_drones]
 
         # Get state before the step for reward calculation
         prev_state = self.sim._get_state()
@@ -146,7 +471,38 @@ class VertiportEnv(gym.Env):
         if self.render_mode == "human":
             self.render()
 
-        return self._get_obs(), float(reward), bool(terminated), bool(truncated), {}
+        info = {"action_mask": self._get_action_mask()}
+        if terminated or truncated:
+            # Fraction of drones that finished their mission this episode
+            info["completion_rate"] = float(
+                np.mean(current_state["states"] == DroneState.FINISHED.value)
+            )
+        return float(reward), bool(terminated), bool(truncated), info
+
+    def _get_action_mask(self):
+        """Returns the ``(max_drones, 5)`` boolean mask of valid actions.
+
+        Padded drone slots only allow action 0.
+        """
+        states = np.fromiter(
+            (state.value for state in self.sim.states),
+            dtype=np.int64,
+            count=self.num_drones,
+        )
+        mask = compute_action_mask(states)
+        if self.max_drones > self.num_drones:
+            padding = np.zeros((self.max_drones - self.num_drones, 5), dtype=bool)
+            padding[:, 0] = True
+            mask = np.vstack([mask, padding])
+        return mask
+
+    def action_masks(self):
+        """Returns the flattened action mask expected by ``MaskablePPO``.
+
+        The mask concatenates the 5 per-drone entries of every
+        ``MultiDiscrete`` dimension, giving shape ``(max_drones * 5,)``.
+        """
+        return self._get_action_mask().reshape(-1)
 
     def _calculate_reward(
         self, prev_state, current_state, action, terminated, truncated
@@ -0,0 +1,295 @@
+"""Parallel multi-agent interface with per-drone egocentric observations.
+
+``VertiportParallelEnv`` follows the PettingZoo ``ParallelEnv`` API (dicts
+keyed by agent name) without depending on PettingZoo itself.
+``SharedPolicyVecEnv`` flattens several worlds into one Stable-Baselines3
+``VecEnv`` where every drone is a slot, so a single shared network processes
+all drones of all worlds in one batched forward pass.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from ..config.schema import ScenarioConfig
+from .environment import NEIGHBOR_FEATURES, VertiportEnv
+
+# Own features per drone: vector to target(3), velocity(3), hovering(1),
+# hover_count(1), clearance_granted(1), one-hot drone state(8)
+OWN_FEATURES = 17
+NUM_DRONE_STATES = 8
+
+
+def build_egocentric_observations(obs: Dict[str, np.ndarray]) -> np.ndarray:
+    """Builds the egocentric observation of every drone in one vectorized pass.
+
+    Args:
+        obs: ``"topk"`` observation of ``VertiportEnv``
+
+    Returns:
+        Array of shape ``(num_drones, obs_dim)`` with one row per drone:
+        own features, masked neighbor features, neighbor mask and the shared
+        infrastructure state
+    """
+    drones_state = obs["drones_state"]
+    num_drones = drones_state.shape[0]
+
+    states = drones_state[:, 14].astype(np.int64)
+    one_hot = np.zeros((num_drones, NUM_DRONE_STATES), dtype=np.float32)
+    one_hot[np.arange(num_drones), states] = 1.0
+
+    own = np.hstack(
+        [
+            drones_state[:, 9:12] - drones_state[:, 0:3],
+            drones_state[:, 3:6],
+            drones_state[:, 12:14],
+            drones_state[:, 15:16],
+            one_hot,
+        ]
+    )
+    neighbor_mask = obs["neighbor_mask"]
+    neighbors = obs["neighbors"] * neighbor_mask[:, :, np.newaxis]
+    infrastructure = np.broadcast_to(
+        obs["infrastructure_state"], (num_drones, obs["infrastructure_state"].size)
+    )
+
+    return np.hstack(
+        [own, neighbors.reshape(num_drones, -1), neighbor_mask, infrastructure]
+    ).astype(np.float32)
+
+
+class VertiportParallelEnv:
+    """PettingZoo-style parallel environment with one agent per drone.
+
+    All drones share the team reward of the underlying ``VertiportEnv`` and
+    stay in ``agents`` until the episode ends. Each agent observes its own
+    state relative to its target, its ``k_neighbors`` nearest drones and the
+    infrastructure state, so the observation size does not depend on the
+    fleet size.
+    """
+
+    metadata = {"render_modes": [], "name": "vertiport_parallel_v0"}
+
+    def __init__(self, config: ScenarioConfig, k_neighbors: int = 4):
+        """Initialize the parallel environment.
+
+        Args:
+            config: Scenario configuration
+            k_neighbors: Number of neighbors in each egocentric observation
+        """
+        self.env = VertiportEnv(config, obs_mode="topk", k_neighbors=k_neighbors)
+        self.sim = self.env.sim
+        self.num_drones = self.env.num_drones
+        self.render_mode = None
+
+        self.possible_agents = [f"drone_{i}" for i in range(self.num_drones)]
+        self.agents: List[str] = []
+
+        num_infrastructure = self.env.observation_space["infrastructure_state"].shape[0]
+        self.obs_dim = (
+            OWN_FEATURES + k_neighbors * (NEIGHBOR_FEATURES + 1) + num_infrastructure
+        )
+        self._observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(self.obs_dim,), dtype=np.float32
+        )
+        self._action_space = spaces.Discrete(5)
+        self._last_obs: Optional[Dict[str, np.ndarray]] = None
+
+    def observation_space(self, agent: str) -> spaces.Box:
+        return self._observation_space
+
+    def action_space(self, agent: str) -> spaces.Discrete:
+        return self._action_space
+
+    def reset_batch(self, seed: Optional[int] = None):
+        """Resets the episode and returns the batched egocentric observations.
+
+        Returns:
+            Tuple of ``(observations, action_masks)`` arrays with shapes
+            ``(num_drones, obs_dim)`` and ``(num_drones, 5)``
+        """
+        self._last_obs, info = self.env.reset(seed=seed)
+        self.agents = list(self.possible_agents)
+        return build_egocentric_observations(self._last_obs), info["action_mask"]
+
+    def step_batch(self, actions: np.ndarray):
+        """Steps all drones with an array of per-drone actions.
+
+        Returns:
+            Tuple of ``(observations, reward, terminated, truncated, info)`` where
+            observations has shape ``(num_drones, obs_dim)`` and the scalar team
+            reward is shared by every drone
+        """
+        self._last_obs, reward, terminated, truncated, info = self.env.step(
+            np.asarray(actions)
+        )
+        if terminated or truncated:
+            self.agents = []
+        observations = build_egocentric_observations(self._last_obs)
+        return observations, reward, terminated, truncated, info
+
+    def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        observations, action_masks = self.reset_batch(seed=seed)
+        obs = {agent: observations[i] for i, agent in enumerate(self.possible_agents)}
+        infos = {
+            agent: {"action_mask": action_masks[i]}
+            for i, agent in enumerate(self.possible_agents)
+        }
+        return obs, infos
+
+    def step(self, actions: Dict[str, int]):
+        # Agents without an action hover (action 0)
+        joint_action = np.array(
+            [actions.get(agent, 0) for agent in self.possible_agents], dtype=np.int64
+        )
+        observations, reward, terminated, truncated, info = self.step_batch(
+            joint_action
+        )
+
+        obs, rewards, terminations, truncations, infos = {}, {}, {}, {}, {}
+        for i, agent in enumerate(self.possible_agents):
+            obs[agent] = observations[i]
+            rewards[agent] = reward
+            terminations[agent] = terminated
+            truncations[agent] = truncated
+            infos[agent] = {"action_mask": info["action_mask"][i]}
+        return obs, rewards, terminations, truncations, infos
+
+    def action_masks(self) -> np.ndarray:
+        """Returns the ``(num_drones, 5)`` mask of valid actions per drone."""
+        return self.env._get_action_mask()
+
+    def state(self) -> np.ndarray:
+        """Returns the global state as the flattened ``drones_state`` array."""
+        if self._last_obs is None:
+            raise RuntimeError("reset() must be called before state()")
+        return self._last_obs["drones_state"].reshape(-1)
+
+    def close(self) -> None:
+        self.env.close()
+
+
+class SharedPolicyVecEnv(VecEnv):
+    """Vectorized environment exposing every drone of every world as a slot.
+
+    With ``n_worlds`` worlds of ``N`` drones the vector has ``n_worlds * N``
+    slots, each with a ``Discrete(5)`` action and a fixed-size egocentric
+    observation. A standard ``MlpPolicy`` trained on this vector shares its
+    parameters across drones and batches all of them in each forward pass.
+    When a world's episode ends, all of its slots are done and the world is
+    reset automatically.
+    """
+
+    def __init__(self, config: ScenarioConfig, n_worlds: int, k_neighbors: int = 4):
+        """Initialize the vectorized environment.
+
+        Args:
+            config: Scenario configuration shared by all worlds
+            n_worlds: Number of independent worlds
+            k_neighbors: Number of neighbors in each egocentric observation
+        """
+        self.worlds = [
+            VertiportParallelEnv(config, k_neighbors) for _ in range(n_worlds)
+        ]
+        self.n_worlds = n_worlds
+        self.drones_per_world = self.worlds[0].num_drones
+        agent = self.worlds[0].possible_agents[0]
+        super().__init__(
+            n_worlds * self.drones_per_world,
+            self.worlds[0].observation_space(agent),
+            self.worlds[0].action_space(agent),
+        )
+        self._actions: Optional[np.ndarray] = None
+
+    def reset(self):
+        observations = []
+        for w, world in enumerate(self.worlds):
+            obs, _ = world.reset_batch(seed=self._seeds[w])
+            observations.append(obs)
+        self._reset_seeds()
+        self._reset_options()
+        return np.concatenate(observations)
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions).reshape(
+            self.n_worlds, self.drones_per_world
+        )
+
+    def step_wait(self):
+        n = self.drones_per_world
+        observations = np.empty(
+            (self.num_envs, self.observation_space.shape[0]), np.float32
+        )
+        rewards = np.empty(self.num_envs, dtype=np.float32)
+        dones = np.empty(self.num_envs, dtype=bool)
+        infos: List[Dict[str, Any]] = []
+
+        for w, world in enumerate(self.worlds):
+            obs, reward, terminated, truncated, info = world.step_batch(
+                self._actions[w]
+            )
+            done = terminated or truncated
+            slot = slice(w * n, (w + 1) * n)
+            rewards[slot] = reward
+            dones[slot] = done
+
+            world_infos = [
+                {
+                    "action_mask": info["action_mask"][i],
+                    "TimeLimit.truncated": truncated and not terminated,
+                }
+                for i in range(n)
+            ]
+            if done:
+                for i in range(n):
+                    world_infos[i]["terminal_observation"] = obs[i]
+                obs, _ = world.reset_batch()
+            observations[slot] = obs
+            infos.extend(world_infos)
+
+        return observations, rewards, dones, infos
+
+    def action_masks(self) -> np.ndarray:
+        """Returns the ``(num_envs, 5)`` mask of valid actions of every slot."""
+        return np.concatenate([world.action_masks() for world in self.worlds])
+
+    def close(self) -> None:
+        for world in self.worlds:
+            world.close()
+
+    def _get_worlds(self, indices) -> List[VertiportParallelEnv]:
+        """Maps slot indices to their (deduplicated) worlds."""
+        world_ids = sorted(
+            {i // self.drones_per_world for i in self._get_indices(indices)}
+        )
+        return [self.worlds[w] for w in world_ids]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [
+            getattr(self.worlds[i // self.drones_per_world], attr_name)
+            for i in self._get_indices(indices)
+        ]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        for world in self._get_worlds(indices):
+            setattr(world, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        # Masks are per slot, which lets MaskablePPO mask each drone's action
+        if method_name == "action_masks":
+            masks = self.action_masks()
+            return [masks[i] for i in self._get_indices(indices)]
+        # Other methods run once per world; every slot gets its world's result
+        indices = list(self._get_indices(indices))
+        results = {}
+        for i in indices:
+            world_id = i // self.drones_per_world
+            if world_id not in results:
+                method = getattr(self.worlds[world_id], method_name)
+                results[world_id] = method(*method_args, **method_kwargs)
+        return [results[i // self.drones_per_world] for i in indices]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
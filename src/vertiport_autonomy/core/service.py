@@ -0,0 +1,530 @@
+"""Asyncio simulation service for external traffic-management components.
+
+``SimulationServer`` hosts many concurrent ``VertiportSim`` sessions behind
+a local TCP socket. Sessions of the same scenario live in one
+``BatchedVertiportSim``, and step requests that arrive within ``max_wait``
+seconds of each other, from any number of connections, are advanced by a
+single vectorized call per scenario. ``SimulationClient`` is a blocking
+Python client; other languages only need the framing below.
+
+Protocol (all integers little-endian):
+
+- Every message is a ``uint32`` payload length followed by the payload.
+- On connect the server sends a 32-byte nonce. The client answers with
+  ``HMAC-SHA256(authkey, nonce)`` (see ``ipc.get_authkey``) and the server
+  replies ``0x00``, or closes the connection on a wrong key.
+- Requests are ``uint8 op, uint32 session`` followed by the op's body:
+  ``CREATE`` the UTF-8 scenario path (session ignored), ``STEP`` one
+  ``uint8`` action per drone, the others nothing. Only the connection
+  that created a session may use or close it.
+- Replies are ``uint8 status`` (``0`` ok, ``1`` error with a UTF-8
+  message) followed by the op's result: ``CREATE`` returns ``uint32
+  session, uint16 num_drones, uint16 num_fatos, float64 dt``; ``RESET`` and
+  ``STEP`` the compact state (``STEP_FIELDS``), ``SNAPSHOT`` the full
+  simulator state and ``CLOSE`` nothing.
+- States are array blocks: ``uint8 count``, then per array ``uint8
+  name_length, name, 3-byte NumPy dtype string (e.g. "<f4"), uint8 ndim,
+  uint32 shape[ndim]`` and the raw C-order data.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import socket
+import struct
+import threading
+from enum import IntEnum
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from ..config.loader import load_scenario_config
+from ..ipc import Address, get_authkey, parse_address
+from .batched_simulator import BatchedVertiportSim
+
+_LENGTH = struct.Struct("<I")
+_REQUEST = struct.Struct("<BI")
+_CREATED = struct.Struct("<IHHd")
+_NONCE_SIZE = 32
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Actions of VertiportEnv's per-drone action space
+NUM_ACTIONS = 5
+
+# State arrays returned by RESET and STEP, with their wire dtype
+STEP_FIELDS = {
+    "positions": "<f4",
+    "velocities": "<f4",
+    "states": "|u1",
+    "fato_occupancy": "|u1",
+    "collisions": "|u1",
+}
+
+
+class Op(IntEnum):
+    """Request operations."""
+
+    CREATE = 1
+    RESET = 2
+    STEP = 3
+    SNAPSHOT = 4
+    CLOSE = 5
+
+
+def encode_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    """Encodes named arrays as an array block.
+
+    Args:
+        arrays: Arrays to encode, in order
+
+    Returns:
+        Array block bytes
+    """
+    parts = [struct.pack("<B", len(arrays))]
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("<"))
+        encoded_name = name.encode()
+        parts += [
+            struct.pack("<B", len(encoded_name)),
+            encoded_name,
+            array.dtype.str.encode(),
+            struct.pack(f"<B{array.ndim}I", array.ndim, *array.shape),
+            array.tobytes(),
+        ]
+    return b"".join(parts)
+
+
+def decode_arrays(data: bytes, offset: int = 0) -> Dict[str, np.ndarray]:
+    """Decodes an array block.
+
+    Args:
+        data: Message bytes
+        offset: Start of the array block in ``data``
+
+    Returns:
+        Named read-only arrays backed by ``data``
+    """
+    arrays = {}
+    (count,) = struct.unpack_from("<B", data, offset)
+    offset += 1
+    for _ in range(count):
+        (name_length,) = struct.unpack_from("<B", data, offset)
+        offset += 1
+        name = data[offset : offset + name_length].decode()
+        offset += name_length
+        dtype = np.dtype(data[offset : offset + 3].decode())
+        (ndim,) = struct.unpack_from("<B", data, offset + 3)
+        shape = struct.unpack_from(f"<{ndim}I", data, offset + 4)
+        offset += 4 + 4 * ndim
+        size = dtype.itemsize * int(np.prod(shape))
+        arrays[name] = np.frombuffer(data, dtype, int(np.prod(shape)), offset)
+        arrays[name] = arrays[name].reshape(shape)
+        offset += size
+    return arrays
+
+
+def _resolve(
+    future: asyncio.Future,
+    result: Optional[bytes] = None,
+    error: Optional[Exception] = None,
+) -> None:
+    """Completes a step future unless its connection dropped meanwhile."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class _Session:
+    """A simulation hosted in a slot of a scenario's batch."""
+
+    def __init__(self, session_id: int, batch: BatchedVertiportSim):
+        self.id = session_id
+        self.batch = batch
+        self.slot = batch.add()
+        self.steps = 0
+        self.closed = False
+
+
+class SimulationServer:
+    """Hosts concurrent simulation sessions and batches their steps."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        authkey: Optional[bytes] = None,
+        max_batch_size: int = 1024,
+        max_wait: float = 0.0005,
+    ):
+        """Initialize the server and bind its socket.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            authkey: Shared authentication key (see ``get_authkey``)
+            max_batch_size: Pending steps that are advanced without waiting
+            max_wait: Seconds a batch of steps stays open after its first
+                request (0 still gathers the requests that arrived together)
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self.authkey = get_authkey(authkey)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.socket = socket.create_server((host, port))
+
+        self.sessions: Dict[int, _Session] = {}
+        self.batches: Dict[str, BatchedVertiportSim] = {}
+        self.requests = 0
+        self.steps = 0
+        self.step_calls = 0
+
+        self._next_session = 1
+        self._pending: List[Tuple[_Session, np.ndarray, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        """Address the server listens on."""
+        return self.socket.getsockname()[:2]
+
+    def stats(self) -> Dict[str, float]:
+        """Request and batching counters since the server started.
+
+        Returns:
+            Open sessions, requests, session steps, vectorized step calls and
+            mean session steps per call
+        """
+        return {
+            "sessions": len(self.sessions),
+            "requests": self.requests,
+            "steps": self.steps,
+            "step_calls": self.step_calls,
+            "mean_batch_size": self.steps / max(self.step_calls, 1),
+        }
+
+    def _create(self, scenario_path: str) -> _Session:
+        key = os.path.realpath(scenario_path)
+        if key not in self.batches:
+            self.batches[key] = BatchedVertiportSim(load_scenario_config(key))
+        session = _Session(self._next_session, self.batches[key])
+        self._next_session += 1
+        self.sessions[session.id] = session
+        return session
+
+    def _close(self, session: _Session) -> None:
+        session.closed = True
+        session.batch.remove(session.slot)
+        del self.sessions[session.id]
+
+    def _compact_states(self, batch: BatchedVertiportSim, slots) -> List[bytes]:
+        state = batch.get_state(slots)
+        return [
+            encode_arrays(
+                {
+                    name: state[name][row].astype(dtype)
+                    for name, dtype in STEP_FIELDS.items()
+                }
+            )
+            for row in range(len(slots))
+        ]
+
+    def _flush(self) -> None:
+        """Advances all pending steps with one call per scenario."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        while pending:
+            # A session is stepped at most once per call; repeats wait a call
+            stepped: Set[int] = set()
+            groups: Dict[int, List[Tuple[_Session, np.ndarray, asyncio.Future]]] = {}
+            later = []
+            for entry in pending:
+                session = entry[0]
+                if session.closed:
+                    _resolve(entry[2], error=KeyError(f"Session {session.id} closed"))
+                elif session.id in stepped:
+                    later.append(entry)
+                else:
+                    stepped.add(session.id)
+                    groups.setdefault(id(session.batch), []).append(entry)
+            for entries in groups.values():
+                batch = entries[0][0].batch
+                slots = [session.slot for session, _, _ in entries]
+                try:
+                    batch.step(slots, np.stack([actions for _, actions, _ in entries]))
+                    replies = self._compact_states(batch, slots)
+                except Exception as error:
+                    for _, _, future in entries:
+                        _resolve(future, error=error)
+                    continue
+                for (session, _, future), reply in zip(entries, replies):
+                    session.steps += 1
+                    _resolve(future, reply)
+                self.steps += len(entries)
+                self.step_calls += 1
+            pending = later
+
+    async def _step(self, session: _Session, actions: np.ndarray) -> bytes:
+        future = self._loop.create_future()
+        self._pending.append((session, actions, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _session(self, session_id: int) -> _Session:
+        if session_id not in self.sessions:
+            raise KeyError(f"Unknown session {session_id}")
+        return self.sessions[session_id]
+
+    async def _dispatch(self, payload: bytes, owned: Set[int]) -> bytes:
+        """Runs one request and returns the reply's result."""
+        op, session_id = _REQUEST.unpack_from(payload)
+        body = payload[_REQUEST.size :]
+        if op == Op.CREATE:
+            session = self._create(body.decode())
+            owned.add(session.id)
+            batch = session.batch
+            return _CREATED.pack(
+                session.id, batch.num_drones, batch.num_fatos, batch.dt
+            )
+
+        session = self._session(session_id)
+        if session_id not in owned:
+            raise PermissionError(f"Session {session_id} belongs to another connection")
+        if op == Op.RESET:
+            session.batch.reset([session.slot])
+            session.steps = 0
+            return self._compact_states(session.batch, [session.slot])[0]
+        if op == Op.STEP:
+            actions = np.frombuffer(body, dtype=np.uint8)
+            if len(actions) != session.batch.num_drones:
+                raise ValueError(
+                    f"Expected {session.batch.num_drones} actions, got {len(actions)}"
+                )
+            if actions.max(initial=0) >= NUM_ACTIONS:
+                raise ValueError(f"Actions must be below {NUM_ACTIONS}")
+            return await self._step(session, actions)
+        if op == Op.SNAPSHOT:
+            state = session.batch.get_state([session.slot])
+            state = {name: array[0] for name, array in state.items()}
+            state["steps"] = np.array(session.steps, dtype=np.int64)
+            return encode_arrays(state)
+        if op == Op.CLOSE:
+            self._close(session)
+            owned.discard(session.id)
+            return b""
+        raise ValueError(f"Unknown operation {op}")
+
+    async def _authenticate(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        nonce = os.urandom(_NONCE_SIZE)
+        writer.write(_LENGTH.pack(len(nonce)) + nonce)
+        (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        if length != hashlib.sha256().digest_size:
+            return False
+        digest = await reader.readexactly(length)
+        expected = hmac.new(self.authkey, nonce, hashlib.sha256).digest()
+        if not hmac.compare_digest(digest, expected):
+            return False
+        writer.write(_LENGTH.pack(1) + bytes([STATUS_OK]))
+        return True
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves the requests of one connection in order."""
+        self._writers.add(writer)
+        owned: Set[int] = set()
+        try:
+            if not await self._authenticate(reader, writer):
+                return
+            while True:
+                (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                payload = await reader.readexactly(length)
+                self.requests += 1
+                try:
+                    reply = bytes([STATUS_OK]) + await self._dispatch(payload, owned)
+                except Exception as error:
+                    message = f"{type(error).__name__}: {error}"
+                    reply = bytes([STATUS_ERROR]) + message.encode()
+                writer.write(_LENGTH.pack(len(reply)) + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Sessions die with the connection that created them
+            for session_id in owned:
+                if session_id in self.sessions:
+                    self._close(self.sessions[session_id])
+            self._writers.discard(writer)
+            writer.close()
+
+    async def serve(self) -> None:
+        """Serves connections until ``close`` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle, sock=self.socket)
+        self._ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            for writer in list(self._writers):
+                writer.close()
+
+    def serve_forever(self) -> None:
+        """Runs ``serve`` in a new event loop."""
+        asyncio.run(self.serve())
+
+    def start(self) -> "SimulationServer":
+        """Serves from a background thread.
+
+        Returns:
+            The server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def close(self) -> None:
+        """Stops serving and closes the socket."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join()
+        self.socket.close()
+
+
+class SimulationClient:
+    """Blocking client of a ``SimulationServer``."""
+
+    def __init__(
+        self,
+        address: Union[str, Address],
+        authkey: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Connect and authenticate.
+
+        Args:
+            address: Server address, ``"host:port"`` or ``(host, port)``
+            authkey: Shared authentication key (see ``get_authkey``)
+            timeout: Seconds to wait for a reply (None waits forever)
+
+        Raises:
+            ConnectionError: If the server rejects the key
+        """
+        self.socket = socket.create_connection(parse_address(address), timeout)
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        nonce = self._receive()
+        digest = hmac.new(get_authkey(authkey), nonce, hashlib.sha256).digest()
+        self.socket.sendall(_LENGTH.pack(len(digest)) + digest)
+        try:
+            self._receive()
+        except ConnectionError:
+            self.socket.close()
+            raise ConnectionError("Authentication with the simulation server failed")
+
+    def _receive_exactly(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Connection closed by the simulation server")
+            data += chunk
+        return bytes(data)
+
+    def _receive(self) -> bytes:
+        (length,) = _LENGTH.unpack(self._receive_exactly(_LENGTH.size))
+        return self._receive_exactly(length)
+
+    def _request(self, op: Op, session: int = 0, body: bytes = b"") -> bytes:
+        payload = _REQUEST.pack(op, session) + body
+        self.socket.sendall(_LENGTH.pack(len(payload)) + payload)
+        reply = self._receive()
+        if reply[0] != STATUS_OK:
+            raise RuntimeError(f"Simulation server error: {reply[1:].decode()}")
+        return reply[1:]
+
+    def create(self, scenario_path: str) -> Tuple[int, int, int, float]:
+        """Creates a session.
+
+        Args:
+            scenario_path: Scenario configuration file, as seen by the server
+
+        Returns:
+            Session id, number of drones, number of FATOs and time step
+        """
+        return _CREATED.unpack(self._request(Op.CREATE, body=scenario_path.encode()))
+
+    def reset(self, session: int) -> Dict[str, np.ndarray]:
+        """Resets a session to the start of its scenario.
+
+        Args:
+            session: Session id
+
+        Returns:
+            Compact state (``STEP_FIELDS``)
+        """
+        return decode_arrays(self._request(Op.RESET, session))
+
+    def step(self, session: int, actions: np.ndarray) -> Dict[str, np.ndarray]:
+        """Advances a session by one time step.
+
+        Args:
+            session: Session id
+            actions: One action per drone (0 hover, 1 continue, 4 grant)
+
+        Returns:
+            Compact state (``STEP_FIELDS``)
+        """
+        body = np.asarray(actions, dtype=np.uint8).tobytes()
+        return decode_arrays(self._request(Op.STEP, session, body))
+
+    def snapshot(self, session: int) -> Dict[str, np.ndarray]:
+        """Returns the full simulator state of a session.
+
+        Args:
+            session: Session id
+
+        Returns:
+            ``BatchedVertiportSim.get_state`` arrays and the step count
+        """
+        return decode_arrays(self._request(Op.SNAPSHOT, session))
+
+    def close_session(self, session: int) -> None:
+        """Closes a session.
+
+        Args:
+            session: Session id
+        """
+        self._request(Op.CLOSE, session)
+
+    def close(self) -> None:
+        """Closes the connection, and with it the sessions it created."""
+        self.socket.close()
+
+    def __enter__(self) -> "SimulationClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
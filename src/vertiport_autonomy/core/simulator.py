@@ -117,6 +117,8 @@ class VertiportSim:
         self.hovering = np.zeros(self.num_drones, dtype=bool)
         self.hover_count = np.zeros(self.num_drones, dtype=int)
         self.clearance_granted = np.zeros(self.num_drones, dtype=bool)
+        self.fato_occupancy = np.zeros(len(self.config.vertiport.fatos), dtype=bool)
+        self.ground_times = np.zeros(self.num_drones, dtype=float)
 
         # Activate drones
         for i in range(self.num_drones):
@@ -244,6 +246,8 @@ class VertiportSim:
                 if fato_id >= 0 and not self.fato_occupancy[fato_id]:
                     self.states[drone_index] = DroneState.ON_PAD
                     self.fato_occupancy[fato_id] = True
+                    # On the pad the target is the start of the departure plan
+                    self.waypoint_indices[drone_index] = 0
                     self.logger.log_event(
                         EventType.FATO_OCCUPIED,
                         drone_id=drone_index,
@@ -292,6 +296,12 @@ class VertiportSim:
         pos_matrix = self.positions[:, np.newaxis, :] - self.positions[np.newaxis, :, :]
         dist_matrix = np.linalg.norm(pos_matrix, axis=2)
 
+        # Drones that finished their mission have left the vertiport airspace
+        # and are reported infinitely far away, like padded drone slots
+        finished = np.array([state == DroneState.FINISHED for state in self.states])
+        dist_matrix[finished, :] = 1000.0
+        dist_matrix[:, finished] = 1000.0
+
         # Collision detection
         # Drones can't collide with themselves, so set diagonal to a large value
         np.fill_diagonal(dist_matrix, 1000.0)
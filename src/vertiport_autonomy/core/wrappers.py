@@ -0,0 +1,97 @@
+"""Gymnasium wrappers for the vertiport environment."""
+
+import gymnasium as gym
+import numpy as np
+
+
+class DecisionPointWrapper(gym.Wrapper):
+    """Repeats the last joint action until a decision-relevant event occurs.
+
+    Most simulator ticks leave every drone in the same discrete state, so the
+    policy has nothing new to decide. This wrapper keeps applying the same
+    joint action until one of the following happens, or ``max_repeat`` ticks
+    have elapsed:
+
+    * any drone changes ``DroneState`` (reaches a holding point, is cleared,
+      lands, departs or finishes),
+    * a FATO becomes occupied or free,
+    * a new pair of drones comes within ``min_separation`` (separation threat),
+    * the episode terminates or is truncated.
+
+    Rewards of the repeated ticks are accumulated with discounting, i.e. the
+    macro-step reward is ``sum_k gamma**k * r_k``. The number of ticks and the
+    resulting discount ``gamma**k`` are reported in ``info["repeat_count"]``
+    and ``info["discount"]``; learners must bootstrap the next macro-step
+    with that discount (see ``training.semi_mdp``).
+    """
+
+    def __init__(self, env: gym.Env, max_repeat: int = 8, gamma: float = 0.99):
+        """Initialize the wrapper.
+
+        Args:
+            env: Environment exposing a ``VertiportSim`` as ``unwrapped.sim``
+            max_repeat: Maximum number of ticks a single action is repeated
+            gamma: Discount factor used to accumulate rewards within a repeat
+        """
+        if max_repeat < 1:
+            raise ValueError(f"max_repeat must be >= 1, got {max_repeat}")
+        super().__init__(env)
+        self.max_repeat = max_repeat
+        self.gamma = gamma
+
+        self._prev_states = None
+        self._prev_fato_occupancy = None
+        self._prev_threats = None
+
+    def reset(self, **kwargs):
+        obs, info = self.env.reset(**kwargs)
+        self._snapshot()
+        return obs, info
+
+    def step(self, action):
+        total_reward = 0.0
+        discount = 1.0
+        repeat_count = 0
+
+        while True:
+            obs, reward, terminated, truncated, info = self.env.step(action)
+            total_reward += discount * reward
+            discount *= self.gamma
+            repeat_count += 1
+
+            event = self._detect_event()
+            if terminated or truncated or event or repeat_count >= self.max_repeat:
+                break
+
+        info = dict(info)
+        info["repeat_count"] = repeat_count
+        info["discount"] = discount
+        return obs, float(total_reward), terminated, truncated, info
+
+    def _separation_threats(self, sim) -> np.ndarray:
+        """Returns the upper-triangular mask of drone pairs within min separation."""
+        delta = sim.positions[:, np.newaxis, :] - sim.positions[np.newaxis, :, :]
+        distances = np.linalg.norm(delta, axis=2)
+        return np.triu(distances < sim.min_separation, k=1)
+
+    def _snapshot(self) -> None:
+        """Records the discrete simulator state used for event detection."""
+        sim = self.env.unwrapped.sim
+        self._prev_states = np.array([state.value for state in sim.states])
+        self._prev_fato_occupancy = sim.fato_occupancy.copy()
+        self._prev_threats = self._separation_threats(sim)
+
+    def _detect_event(self) -> bool:
+        """Checks for a decision-relevant event since the previous tick."""
+        prev_states = self._prev_states
+        prev_fato_occupancy = self._prev_fato_occupancy
+        prev_threats = self._prev_threats
+        self._snapshot()
+
+        if not np.array_equal(self._prev_states, prev_states):
+            return True
+        if not np.array_equal(self._prev_fato_occupancy, prev_fato_occupancy):
+            return True
+        # Only newly formed conflicts count, otherwise a sustained loss of
+        # separation would force a decision on every tick.
+        return bool(np.any(self._prev_threats & ~prev_threats))
@@ -2,8 +2,11 @@
 
 from .framework import EvaluationFramework
 from .metrics import calculate_performance_metrics
+from .realtime import RealTimeReport, RealTimeRunner
 
 __all__ = [
     "EvaluationFramework",
     "calculate_performance_metrics",
+    "RealTimeReport",
+    "RealTimeRunner",
 ]
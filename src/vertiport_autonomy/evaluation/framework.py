@@ -10,14 +10,17 @@ import json
 import os
 import time
 from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 
+from ..agents.base import BaseAgent
 from ..agents.heuristic import SimpleHeuristicAgent
 from ..config.loader import load_scenario_config
+from ..config.schema import ScenarioConfig
 from ..core.environment import VertiportEnv
+from ..core.event_logger import EventType
 from ..core.simulator import DroneState
 
 
@@ -316,30 +319,108 @@ class EvaluationFramework:
         return comparison
 
 
-def heuristic_agent_wrapper(scenario_path: str, seed: int, max_steps: int) -> Dict:
-    """Wrapper for simple heuristic agent to match evaluation interface"""
-
+def run_agent_episode(
+    agent: BaseAgent,
+    config: ScenarioConfig,
+    seed: int,
+    max_steps: int,
+    env_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict:
+    """Runs one episode of an agent and collects the raw evaluation metrics.
+
+    Args:
+        agent: Agent acting on ``VertiportEnv`` observations
+        config: Scenario configuration
+        seed: Episode seed
+        max_steps: Maximum steps of the episode
+        env_kwargs: Extra keyword arguments for ``VertiportEnv``
+
+    Returns:
+        Raw metrics in the format expected by ``EvaluationFramework``
+    """
     # Set random seed
     np.random.seed(seed)
 
-    # Run heuristic agent (this would need to be implemented in the agent class)
-    # For now, create a placeholder since the heuristic agent structure changed
-    config = load_scenario_config(scenario_path)
-    metrics = {
-        "episode_length": max_steps,
-        "total_reward": -100.0,  # Placeholder
-        "collisions": 0,
-        "missions_completed": config.traffic.max_drones,
+    env = VertiportEnv(config, **(env_kwargs or {}))
+    env.max_steps = max_steps
+
+    obs, info = env.reset(seed=seed)
+    agent.reset()
+    dt = env.sim.dt
+    total_reward = 0.0
+    collisions = 0
+    los_violations = 0
+    time_in_states: Dict[str, float] = {}
+    finish_times: Dict[int, float] = {}
+
+    step_count = 0
+    while step_count < max_steps:
+        obs, reward, terminated, truncated, info = env.step(agent.act(obs))
+        total_reward += reward
+        step_count += 1
+
+        state = env.sim._get_state()
+        collisions += int(state["collisions"])
+        pairs = np.triu(state["distance_matrix"] < env.sim.min_separation, k=1)
+        los_violations += int(pairs.sum())
+        for drone_id, value in enumerate(state["states"]):
+            name = DroneState(value).name
+            time_in_states[name] = time_in_states.get(name, 0.0) + dt
+            if value == DroneState.FINISHED.value and drone_id not in finish_times:
+                finish_times[drone_id] = step_count * dt
+
+        if terminated or truncated:
+            break
+
+    events = env.sim.logger.get_events()
+    env.close()
+
+    return {
+        "episode_length": step_count,
+        "total_reward": total_reward,
+        "average_reward": total_reward / step_count if step_count > 0 else 0.0,
+        "collisions": collisions,
+        "los_violations": los_violations,
+        "unauthorized_landings": sum(
+            event["event_type"] == EventType.UNAUTHORIZED_LANDING.value
+            for event in events
+        ),
+        "missions_completed": len(finish_times),
+        "total_drones": config.traffic.max_drones,
+        "average_mission_time": (
+            float(np.mean(list(finish_times.values()))) if finish_times else 0.0
+        ),
+        "final_states": [DroneState(value).name for value in state["states"]],
+        "time_in_states": time_in_states,
     }
-    metrics["total_drones"] = config.traffic.max_drones
-    metrics["collisions"] = 0  # Simple heuristic doesn't track this
-    metrics["los_violations"] = 0
-    metrics["unauthorized_landings"] = 0
-    metrics["average_mission_time"] = 0.0
-    metrics["final_states"] = []
-    metrics["time_in_states"] = {}
-
-    return metrics
+
+
+def heuristic_agent_wrapper(scenario_path: str, seed: int, max_steps: int) -> Dict:
+    """Wrapper for simple heuristic agent to match evaluation interface"""
+    config = load_scenario_config(scenario_path)
+    agent = SimpleHeuristicAgent.from_config(config)
+    return run_agent_episode(agent, config, seed, max_steps)
+
+
+def agent_wrapper(
+    agent: BaseAgent, env_kwargs: Optional[Dict[str, Any]] = None
+) -> Callable[[str, int, int], Dict]:
+    """Wraps an agent instance to match the evaluation interface.
+
+    Args:
+        agent: Agent evaluated on every scenario, e.g. a ``PPOAgent``
+        env_kwargs: Extra keyword arguments for ``VertiportEnv``; must match
+            the environments the agent was trained on
+
+    Returns:
+        Function of ``(scenario_path, seed, max_steps)`` returning metrics
+    """
+
+    def agent_fn(scenario_path: str, seed: int, max_steps: int) -> Dict:
+        config = load_scenario_config(scenario_path)
+        return run_agent_episode(agent, config, seed, max_steps, env_kwargs)
+
+    return agent_fn
 
 
 def main():
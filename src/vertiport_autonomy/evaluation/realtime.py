@@ -0,0 +1,269 @@
+"""Real-time control loop with latency budgets and deadline accounting.
+
+``RealTimeRunner`` drives an agent against ``VertiportEnv`` in a loop paced
+to wall-clock time: tick ``k`` starts ``k * dt / real_time_factor`` seconds
+after the run started. Every tick builds the observation, asks the agent
+for a decision and steps the simulation, and the latency of each stage is
+recorded. The decision (observation build plus inference) has a hard
+deadline, ``decision_budget`` seconds after the tick started. Inference
+runs on a worker thread, so a late agent is not waited for. Its decision is
+dropped, the tick counts as a deadline miss and the configured fallback
+action (by default hovering) is applied instead. While a late inference is
+still running, later ticks fall back as well.
+
+``RealTimeReport`` summarizes the run with p50/p99/p99.9 latencies,
+log-spaced latency histograms, deadline misses and tick overruns, and can
+be exported to JSON.
+"""
+
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from ..agents.base import BaseAgent
+from ..core.environment import VertiportEnv
+
+# Timed stages of a tick
+STAGES = ("observation", "inference", "step", "tick")
+
+# Histogram bin edges in seconds: 1 us to 10 s, 20 bins per decade
+HISTOGRAM_EDGES = np.logspace(-6, 1, 7 * 20 + 1)
+
+# Per-drone actions applied by the named fallbacks ("last" repeats the
+# previously applied joint action)
+FALLBACK_ACTIONS = {"hover": 0, "continue": 1}
+
+
+@dataclass
+class LatencyStats:
+    """Latency percentiles of one stage, in milliseconds."""
+
+    count: int
+    mean: float
+    p50: float
+    p99: float
+    p999: float
+    max: float
+    histogram: List[int] = field(default_factory=list)
+
+
+@dataclass
+class RealTimeReport:
+    """Summary of a real-time run."""
+
+    ticks: int
+    period_ms: float
+    decision_budget_ms: float
+    deadline_misses: int
+    miss_rate: float
+    tick_overruns: int
+    episodes: int
+    fallback: str
+    stages: Dict[str, LatencyStats] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """One line per stage with its p50/p99/p99.9 latency."""
+        lines = [
+            f"{self.ticks} ticks of {self.period_ms:.1f} ms, "
+            f"decision budget {self.decision_budget_ms:.1f} ms: "
+            f"{self.deadline_misses} deadline misses ({self.miss_rate:.2%}), "
+            f"{self.tick_overruns} tick overruns"
+        ]
+        for stage, stats in self.stages.items():
+            lines.append(
+                f"  {stage:<12} p50 {stats.p50:8.3f} ms  p99 {stats.p99:8.3f} ms  "
+                f"p99.9 {stats.p999:8.3f} ms  max {stats.max:8.3f} ms"
+            )
+        return "\n".join(lines)
+
+    def save(self, path: str) -> None:
+        """Exports the report (including histograms) as JSON.
+
+        Args:
+            path: Output path
+        """
+        report = asdict(self)
+        report["histogram_edges_ms"] = (HISTOGRAM_EDGES * 1e3).tolist()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def latency_stats(samples: np.ndarray) -> LatencyStats:
+    """Summarizes latency samples given in seconds.
+
+    Args:
+        samples: Latencies in seconds
+
+    Returns:
+        Percentiles in milliseconds and counts per ``HISTOGRAM_EDGES`` bin
+    """
+    if len(samples) == 0:
+        return LatencyStats(0, 0.0, 0.0, 0.0, 0.0, 0.0, [])
+    p50, p99, p999 = np.percentile(samples, [50, 99, 99.9]) * 1e3
+    histogram, _ = np.histogram(
+        np.clip(samples, HISTOGRAM_EDGES[0], HISTOGRAM_EDGES[-1]), HISTOGRAM_EDGES
+    )
+    return LatencyStats(
+        count=len(samples),
+        mean=float(np.mean(samples) * 1e3),
+        p50=float(p50),
+        p99=float(p99),
+        p999=float(p999),
+        max=float(np.max(samples) * 1e3),
+        histogram=histogram.tolist(),
+    )
+
+
+class RealTimeRunner:
+    """Runs an agent against ``VertiportEnv`` paced to wall-clock time."""
+
+    def __init__(
+        self,
+        env: VertiportEnv,
+        agent: BaseAgent,
+        real_time_factor: float = 1.0,
+        decision_budget: Optional[float] = None,
+        fallback: Union[str, np.ndarray] = "hover",
+        spin_threshold: float = 0.0005,
+    ):
+        """Initialize the runner.
+
+        Args:
+            env: Environment to control (observations must be unbatched)
+            agent: Agent deciding every tick
+            real_time_factor: Simulated seconds per wall-clock second
+            decision_budget: Seconds after the tick start by which the
+                decision must be made (defaults to the whole tick period)
+            fallback: Action applied on a deadline miss: ``"hover"``,
+                ``"continue"``, ``"last"`` (repeat the previous action) or an
+                explicit joint action
+            spin_threshold: The last part of a wait that is spent busy-waiting
+                instead of sleeping, for precise tick starts
+        """
+        if real_time_factor <= 0:
+            raise ValueError(f"real_time_factor must be > 0, got {real_time_factor}")
+        if isinstance(fallback, str) and fallback not in (*FALLBACK_ACTIONS, "last"):
+            raise ValueError(f"Unknown fallback '{fallback}'")
+        self.env = env
+        self.agent = agent
+        self.period = env.sim.dt / real_time_factor
+        self.decision_budget = (
+            self.period if decision_budget is None else decision_budget
+        )
+        self.fallback = fallback
+        self.spin_threshold = spin_threshold
+
+    def _fallback_action(self, last_action: np.ndarray) -> np.ndarray:
+        if isinstance(self.fallback, str):
+            if self.fallback == "last":
+                return last_action
+            return np.full(
+                self.env.max_drones, FALLBACK_ACTIONS[self.fallback], dtype=np.int64
+            )
+        return np.asarray(self.fallback, dtype=np.int64)
+
+    def _wait_until(self, target: float) -> None:
+        """Sleeps until shortly before ``target``, then spins."""
+        remaining = target - time.perf_counter()
+        if remaining > self.spin_threshold:
+            time.sleep(remaining - self.spin_threshold)
+        while time.perf_counter() < target:
+            pass
+
+    def run(self, n_ticks: int, seed: Optional[int] = None) -> RealTimeReport:
+        """Runs ``n_ticks`` paced ticks, resetting at episode ends.
+
+        Args:
+            n_ticks: Number of ticks to run
+            seed: Seed of the first episode
+
+        Returns:
+            Latency and deadline report of the run
+        """
+        latencies = {stage: np.zeros(n_ticks) for stage in STAGES}
+        inference_times: List[float] = []
+        deadline_misses = 0
+        tick_overruns = 0
+        episodes = 0
+
+        def timed_act(observation) -> np.ndarray:
+            start = time.perf_counter()
+            action = self.agent.act(observation)
+            inference_times.append(time.perf_counter() - start)
+            return action
+
+        self.env.reset(seed=seed)
+        self.agent.reset()
+        last_action = np.zeros(self.env.max_drones, dtype=np.int64)
+        in_flight: Optional[Future] = None
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            next_tick = time.perf_counter()
+            for tick in range(n_ticks):
+                self._wait_until(next_tick)
+                tick_start = time.perf_counter()
+                deadline = tick_start + self.decision_budget
+
+                observation = self.env._get_obs()
+                observed = time.perf_counter()
+                latencies["observation"][tick] = observed - tick_start
+
+                # A late inference still occupies the agent: fall back again
+                action = None
+                if in_flight is None or in_flight.done():
+                    in_flight = executor.submit(timed_act, observation)
+                    try:
+                        action = in_flight.result(
+                            timeout=max(deadline - time.perf_counter(), 0.0)
+                        )
+                        in_flight = None
+                    except FutureTimeoutError:
+                        pass
+                decided = time.perf_counter()
+                latencies["inference"][tick] = decided - observed
+                if action is None or decided > deadline:
+                    deadline_misses += 1
+                    action = self._fallback_action(last_action)
+                last_action = np.asarray(action, dtype=np.int64)
+
+                _, terminated, truncated, _ = self.env.advance(last_action)
+                stepped = time.perf_counter()
+                latencies["step"][tick] = stepped - decided
+                latencies["tick"][tick] = stepped - tick_start
+
+                if terminated or truncated:
+                    episodes += 1
+                    if in_flight is not None:
+                        in_flight.result()
+                        in_flight = None
+                    self.env.reset()
+                    self.agent.reset()
+
+                next_tick += self.period
+                if time.perf_counter() > next_tick:
+                    # Start the next tick now rather than bursting to catch up
+                    tick_overruns += 1
+                    next_tick = time.perf_counter()
+        finally:
+            executor.shutdown(wait=True)
+
+        stages = {stage: latency_stats(samples) for stage, samples in latencies.items()}
+        # Inference latency of the agent itself, including decisions that
+        # came too late to be applied
+        stages["agent"] = latency_stats(np.asarray(inference_times))
+        return RealTimeReport(
+            ticks=n_ticks,
+            period_ms=self.period * 1e3,
+            decision_budget_ms=self.decision_budget * 1e3,
+            deadline_misses=deadline_misses,
+            miss_rate=deadline_misses / max(n_ticks, 1),
+            tick_overruns=tick_overruns,
+            episodes=episodes,
+            fallback=self.fallback if isinstance(self.fallback, str) else "custom",
+            stages=stages,
+        )
@@ -0,0 +1,34 @@
+"""Socket helpers shared by the rollout workers and local services.
+
+Kept free of PyTorch and Stable-Baselines3 imports so lightweight clients
+can use them.
+"""
+
+import os
+from typing import Optional, Tuple, Union
+
+Address = Tuple[str, int]
+
+DEFAULT_AUTHKEY = b"vertiport-rollout"
+
+
+def get_authkey(authkey: Optional[bytes] = None) -> bytes:
+    """Returns the shared authentication key.
+
+    Args:
+        authkey: Explicit key (defaults to ``$VERTIPORT_AUTHKEY``, then to a
+            fixed development key)
+    """
+    if authkey is not None:
+        return authkey
+    return os.environ.get("VERTIPORT_AUTHKEY", "").encode() or DEFAULT_AUTHKEY
+
+
+def parse_address(address: Union[str, Address]) -> Address:
+    """Parses ``"host:port"`` into a ``(host, port)`` tuple."""
+    if isinstance(address, tuple):
+        return address
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Address must be 'host:port', got '{address}'")
+    return host, int(port)
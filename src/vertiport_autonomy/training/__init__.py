@@ -1,9 +1,50 @@
 """Training utilities and frameworks."""
 
+from .callbacks import AsyncEvalCallback, CurriculumAdvancementCallback
+from .checkpoint import AsyncCheckpointCallback, CheckpointManager
 from .curriculum import CurriculumTrainer
+from .distill import DistillationReport, distill_policy
+from .mixed_curriculum import MixedScenarioVecEnv, make_mixed_scenario_vec_env
+from .pbt import PopulationBasedTrainer, PopulationStore
+from .pipeline import PipelinedPPO, PipelinedVecEnv
+from .pretrain import DemonstrationDataset, collect_demonstrations, pretrain_policy
+from .profiling import ThroughputProfilerCallback
+from .remote import DistributedPPO, RemoteVecEnv, RolloutWorker
+from .semi_mdp import SemiMDPDiscountCallback, semi_mdp_rollout_buffer
+from .sweep import HyperparameterSweep, TrialResult
 from .trainer import Trainer
+from .tuning import CalibrationResult, ThroughputTuner
+from .vec_env import BatchedSubprocVecEnv, ThreadedVecEnv, make_training_vec_env
 
 __all__ = [
     "Trainer",
     "CurriculumTrainer",
+    "AsyncEvalCallback",
+    "CurriculumAdvancementCallback",
+    "CheckpointManager",
+    "AsyncCheckpointCallback",
+    "ThroughputProfilerCallback",
+    "BatchedSubprocVecEnv",
+    "make_training_vec_env",
+    "MixedScenarioVecEnv",
+    "make_mixed_scenario_vec_env",
+    "ThroughputTuner",
+    "CalibrationResult",
+    "HyperparameterSweep",
+    "TrialResult",
+    "PopulationBasedTrainer",
+    "PopulationStore",
+    "RolloutWorker",
+    "RemoteVecEnv",
+    "DistributedPPO",
+    "PipelinedVecEnv",
+    "PipelinedPPO",
+    "ThreadedVecEnv",
+    "DemonstrationDataset",
+    "collect_demonstrations",
+    "pretrain_policy",
+    "DistillationReport",
+    "distill_policy",
+    "SemiMDPDiscountCallback",
+    "semi_mdp_rollout_buffer",
 ]
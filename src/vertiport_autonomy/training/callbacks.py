@@ -0,0 +1,393 @@
+"""Training callbacks for vertiport autonomy agents."""
+
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type
+
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.base_class import BaseAlgorithm
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+from ..config.loader import load_scenario_config
+from ..core.environment import VertiportEnv
+from .vec_env import limit_threads
+
+
+def _evaluate_snapshot(
+    algorithm_class: Type[BaseAlgorithm],
+    model_path: str,
+    stats_path: Optional[str],
+    scenario_path: str,
+    env_kwargs: Dict[str, Any],
+    wrapper_class: Optional[Type[gym.Wrapper]],
+    wrapper_kwargs: Dict[str, Any],
+    n_eval_episodes: int,
+    deterministic: bool,
+    use_masking: bool,
+) -> Tuple[List[float], List[int]]:
+    """Evaluates a saved policy snapshot on freshly created environments.
+
+    Runs inside an evaluation worker process, so neither the training
+    environments nor their normalization statistics are touched. Episodes
+    are recorded by a ``Monitor`` below ``wrapper_class``, as in training.
+
+    Returns:
+        Tuple of per-episode rewards and lengths
+    """
+    config = load_scenario_config(scenario_path)
+
+    def make_env() -> gym.Env:
+        env = Monitor(VertiportEnv(config, **env_kwargs))
+        if wrapper_class is not None:
+            env = wrapper_class(env, **wrapper_kwargs)
+        return env
+
+    env = DummyVecEnv([make_env])
+    if stats_path is not None:
+        env = VecNormalize.load(stats_path, env)
+        env.training = False
+        env.norm_reward = False
+
+    model = algorithm_class.load(model_path, device="cpu")
+    if use_masking:
+        from sb3_contrib.common.maskable.evaluation import evaluate_policy
+    else:
+        from stable_baselines3.common.evaluation import evaluate_policy
+
+    rewards, lengths = evaluate_policy(
+        model,
+        env,
+        n_eval_episodes=n_eval_episodes,
+        deterministic=deterministic,
+        return_episode_rewards=True,
+    )
+    env.close()
+    return list(rewards), list(lengths)
+
+
+class AsyncEvalCallback(BaseCallback):
+    """Evaluates policy snapshots in a separate process pool.
+
+    Every ``eval_freq`` calls the model and its ``VecNormalize`` statistics are
+    saved to a snapshot, which is evaluated on the worker's own environments
+    while training continues. Finished evaluations are picked up on later
+    steps and reported like ``EvalCallback`` does (``eval/mean_reward``,
+    ``eval/mean_ep_length``, ``evaluations.npz`` and ``best_model.zip``), at
+    the timestep of the snapshot. Training never waits for an evaluation: if
+    ``max_pending`` evaluations are already running, the snapshot is skipped.
+    """
+
+    def __init__(
+        self,
+        scenario_path: str,
+        n_eval_episodes: int = 5,
+        eval_freq: int = 10000,
+        n_workers: int = 1,
+        env_kwargs: Optional[Dict[str, Any]] = None,
+        wrapper_class: Optional[Type[gym.Wrapper]] = None,
+        wrapper_kwargs: Optional[Dict[str, Any]] = None,
+        log_path: Optional[str] = None,
+        best_model_save_path: Optional[str] = None,
+        deterministic: bool = True,
+        max_pending: Optional[int] = None,
+        start_method: Optional[str] = None,
+        worker_threads: int = 1,
+        verbose: int = 1,
+    ):
+        """Initialize the callback.
+
+        Args:
+            scenario_path: Scenario the evaluation environments are built from
+            n_eval_episodes: Episodes per evaluation
+            eval_freq: Evaluate every ``eval_freq`` callback calls
+            n_workers: Number of evaluation processes
+            env_kwargs: Extra keyword arguments for ``VertiportEnv``
+            wrapper_class: Optional wrapper applied to each evaluation env
+            wrapper_kwargs: Keyword arguments for ``wrapper_class``
+            log_path: Directory for ``evaluations.npz`` (None disables it)
+            best_model_save_path: Directory for ``best_model.zip`` and its
+                ``vecnormalize.pkl`` (None disables saving)
+            deterministic: Use deterministic actions during evaluation
+            max_pending: Maximum number of evaluations in flight
+                (defaults to ``n_workers``)
+            start_method: Start method of the evaluation processes (default:
+                forkserver where available, otherwise spawn, so that workers
+                do not inherit the trainer's threads and memory)
+            worker_threads: PyTorch/BLAS threads per evaluation process
+            verbose: Verbosity level
+        """
+        super().__init__(verbose)
+        self.scenario_path = scenario_path
+        self.n_eval_episodes = n_eval_episodes
+        self.eval_freq = eval_freq
+        self.n_workers = n_workers
+        self.env_kwargs = env_kwargs or {}
+        self.wrapper_class = wrapper_class
+        self.wrapper_kwargs = wrapper_kwargs or {}
+        self.log_path = log_path
+        self.best_model_save_path = best_model_save_path
+        self.deterministic = deterministic
+        self.max_pending = max_pending or n_workers
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        self.start_method = start_method
+        self.worker_threads = worker_threads
+
+        self.best_mean_reward = -np.inf
+        self.last_mean_reward = -np.inf
+        self.evaluations_timesteps: List[int] = []
+        self.evaluations_results: List[List[float]] = []
+        self.evaluations_length: List[List[int]] = []
+
+        self._use_masking = False
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._snapshot_dir: Optional[str] = None
+        self._pending: List[Tuple[Future, int, str, Optional[str]]] = []
+
+    def _init_callback(self) -> None:
+        if self.log_path is not None:
+            os.makedirs(self.log_path, exist_ok=True)
+        if self.best_model_save_path is not None:
+            os.makedirs(self.best_model_save_path, exist_ok=True)
+
+        # Masked models are evaluated with their action masks
+        try:
+            from sb3_contrib import MaskablePPO
+
+            self._use_masking = isinstance(self.model, MaskablePPO)
+        except ImportError:
+            self._use_masking = False
+
+        self._snapshot_dir = tempfile.mkdtemp(prefix="vertiport_eval_")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=mp.get_context(self.start_method),
+            initializer=limit_threads,
+            initargs=(self.worker_threads,),
+        )
+
+    def _on_step(self) -> bool:
+        self._collect_results(wait=False)
+
+        if self.eval_freq > 0 and self.n_calls % self.eval_freq == 0:
+            if len(self._pending) >= self.max_pending:
+                if self.verbose >= 1:
+                    print(
+                        f"Skipping evaluation at {self.num_timesteps} timesteps: "
+                        f"{len(self._pending)} evaluations still running"
+                    )
+            else:
+                self._submit_snapshot()
+        return True
+
+    def _on_training_end(self) -> None:
+        self._collect_results(wait=True)
+        self._executor.shutdown()
+        shutil.rmtree(self._snapshot_dir, ignore_errors=True)
+
+    def _submit_snapshot(self) -> None:
+        """Saves the current model and normalization stats and queues them."""
+        prefix = os.path.join(self._snapshot_dir, f"snapshot_{self.num_timesteps}")
+        model_path = f"{prefix}.zip"
+        self.model.save(model_path)
+
+        stats_path = None
+        vec_normalize = self.model.get_vec_normalize_env()
+        if vec_normalize is not None:
+            stats_path = f"{prefix}_vecnormalize.pkl"
+            vec_normalize.save(stats_path)
+
+        future = self._executor.submit(
+            _evaluate_snapshot,
+            type(self.model),
+            model_path,
+            stats_path,
+            self.scenario_path,
+            self.env_kwargs,
+            self.wrapper_class,
+            self.wrapper_kwargs,
+            self.n_eval_episodes,
+            self.deterministic,
+            self._use_masking,
+        )
+        self._pending.append((future, self.num_timesteps, model_path, stats_path))
+
+    def _collect_results(self, wait: bool) -> None:
+        """Reports finished evaluations in snapshot order."""
+        while self._pending:
+            future, timesteps, model_path, stats_path = self._pending[0]
+            if not wait and not future.done():
+                break
+            self._pending.pop(0)
+
+            try:
+                episode_rewards, episode_lengths = future.result()
+            except Exception as e:
+                print(
+                    f"⚠️  Evaluation of snapshot at {timesteps} timesteps failed: {e}"
+                )
+            else:
+                self._report(
+                    timesteps, episode_rewards, episode_lengths, model_path, stats_path
+                )
+
+            os.remove(model_path)
+            if stats_path is not None:
+                os.remove(stats_path)
+
+    def _report(
+        self,
+        timesteps: int,
+        episode_rewards: List[float],
+        episode_lengths: List[int],
+        model_path: str,
+        stats_path: Optional[str],
+    ) -> None:
+        """Logs one evaluation result and keeps the best snapshot."""
+        self.evaluations_timesteps.append(timesteps)
+        self.evaluations_results.append(episode_rewards)
+        self.evaluations_length.append(episode_lengths)
+        if self.log_path is not None:
+            np.savez(
+                os.path.join(self.log_path, "evaluations"),
+                timesteps=self.evaluations_timesteps,
+                results=self.evaluations_results,
+                ep_lengths=self.evaluations_length,
+            )
+
+        mean_reward, std_reward = np.mean(episode_rewards), np.std(episode_rewards)
+        mean_ep_length = np.mean(episode_lengths)
+        self.last_mean_reward = float(mean_reward)
+
+        if self.verbose >= 1:
+            print(
+                f"Eval num_timesteps={timesteps}, "
+                f"episode_reward={mean_reward:.2f} +/- {std_reward:.2f}"
+            )
+            std_ep_length = np.std(episode_lengths)
+            print(f"Episode length: {mean_ep_length:.2f} +/- {std_ep_length:.2f}")
+
+        self.logger.record("eval/mean_reward", float(mean_reward))
+        self.logger.record("eval/mean_ep_length", float(mean_ep_length))
+        self.logger.dump(timesteps)
+
+        if mean_reward > self.best_mean_reward:
+            self.best_mean_reward = float(mean_reward)
+            if self.best_model_save_path is not None:
+                if self.verbose >= 1:
+                    print("New best mean reward!")
+                shutil.copy(
+                    model_path,
+                    os.path.join(self.best_model_save_path, "best_model.zip"),
+                )
+                if stats_path is not None:
+                    shutil.copy(
+                        stats_path,
+                        os.path.join(self.best_model_save_path, "vecnormalize.pkl"),
+                    )
+
+
+class CurriculumAdvancementCallback(BaseCallback):
+    """Stops a curriculum phase once its success criteria are reliably met.
+
+    Tracks the episode reward (from the ``Monitor`` info) and the completion
+    rate (``info["completion_rate"]``) of the last ``window`` finished
+    episodes across all workers. Training stops as soon as the one-sided
+    lower confidence bound of each tracked mean clears its threshold, i.e.
+    ``mean - z * std / sqrt(n) >= threshold`` with ``z`` chosen for the
+    requested ``confidence``.
+    """
+
+    def __init__(
+        self,
+        reward_threshold: float,
+        completion_threshold: Optional[float] = None,
+        window: int = 100,
+        min_episodes: int = 20,
+        confidence: float = 0.95,
+        verbose: int = 1,
+    ):
+        """Initialize the callback.
+
+        Args:
+            reward_threshold: Required mean episode reward
+            completion_threshold: Required mean completion rate (None ignores it)
+            window: Number of recent episodes the statistics are computed on
+            min_episodes: Episodes required before the phase may end (at
+                least 2, the bounds need a sample standard deviation)
+            confidence: Confidence level of the lower bounds
+            verbose: Verbosity level
+        """
+        if not 0.5 <= confidence < 1.0:
+            raise ValueError(f"confidence must be in [0.5, 1), got {confidence}")
+        if min(min_episodes, window) < 2:
+            raise ValueError(
+                "min_episodes and window must be >= 2, got "
+                f"min_episodes={min_episodes}, window={window}"
+            )
+        super().__init__(verbose)
+        self.reward_threshold = reward_threshold
+        self.completion_threshold = completion_threshold
+        self.window = window
+        self.min_episodes = min(min_episodes, window)
+        self.confidence = confidence
+        self.z_score = NormalDist().inv_cdf(confidence)
+
+        self.episode_rewards: Deque[float] = deque(maxlen=window)
+        self.completion_rates: Deque[float] = deque(maxlen=window)
+        self.total_timesteps = 0
+        self.advanced = False
+        self.timesteps_saved = 0
+
+    def _lower_bound(self, values: Deque[float]) -> float:
+        """One-sided lower confidence bound of the mean of ``values``."""
+        data = np.asarray(values)
+        return float(data.mean() - self.z_score * data.std(ddof=1) / np.sqrt(data.size))
+
+    def _on_training_start(self) -> None:
+        self.total_timesteps = self.locals["total_timesteps"]
+
+    def _on_step(self) -> bool:
+        for info, done in zip(self.locals["infos"], self.locals["dones"]):
+            if not done or "episode" not in info:
+                continue
+            self.episode_rewards.append(float(info["episode"]["r"]))
+            if "completion_rate" in info:
+                self.completion_rates.append(info["completion_rate"])
+
+        if len(self.episode_rewards) < self.min_episodes:
+            return True
+
+        reward_bound = self._lower_bound(self.episode_rewards)
+        self.logger.record("curriculum/reward_lower_bound", reward_bound)
+        if reward_bound < self.reward_threshold:
+            return True
+
+        if self.completion_threshold is not None:
+            if len(self.completion_rates) < self.min_episodes:
+                return True
+            completion_bound = self._lower_bound(self.completion_rates)
+            self.logger.record("curriculum/completion_lower_bound", completion_bound)
+            if completion_bound < self.completion_threshold:
+                return True
+
+        self.advanced = True
+        self.timesteps_saved = max(self.total_timesteps - self.num_timesteps, 0)
+        self.logger.record("curriculum/timesteps_saved", self.timesteps_saved)
+        if self.verbose >= 1:
+            print(
+                f"🎯 Success criteria met at {self.num_timesteps:,} timesteps "
+                f"(reward lower bound {reward_bound:.2f} >= "
+                f"{self.reward_threshold:.2f}); "
+                f"saved {self.timesteps_saved:,} timesteps"
+            )
+        return False
@@ -0,0 +1,250 @@
+"""Full-state training checkpoints written on a background thread.
+
+A checkpoint captures everything needed to resume a run faithfully: policy
+and optimizer parameters, ``VecNormalize`` statistics, the Python, NumPy and
+PyTorch RNG states, the timestep and update counters and any extra metadata
+such as the current curriculum phase. The state is copied on the training
+thread (cheap), then serialized by a single background thread to a
+temporary file that is atomically renamed into place, so a crash never
+leaves a truncated checkpoint behind.
+"""
+
+import copy
+import glob
+import os
+import random
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+from stable_baselines3.common.base_class import BaseAlgorithm
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+def capture_training_state(
+    model: BaseAlgorithm, extra: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Copies the resumable state of a model and its environment.
+
+    Args:
+        model: Model to capture
+        extra: Additional metadata stored with the checkpoint
+
+    Returns:
+        State dictionary independent of further training
+    """
+    # Deep copies detach the snapshot from the live tensors
+    parameters = copy.deepcopy(model.get_parameters())
+
+    vec_normalize = None
+    vec_normalize_env = model.get_vec_normalize_env()
+    if vec_normalize_env is not None:
+        vec_normalize = {
+            "obs_rms": copy.deepcopy(vec_normalize_env.obs_rms),
+            "ret_rms": copy.deepcopy(vec_normalize_env.ret_rms),
+        }
+
+    return {
+        "algorithm": type(model).__name__,
+        "num_timesteps": model.num_timesteps,
+        "n_updates": getattr(model, "_n_updates", 0),
+        "episode_num": model._episode_num,
+        "parameters": parameters,
+        "vec_normalize": vec_normalize,
+        "rng": {
+            "python": random.getstate(),
+            "numpy": np.random.get_state(),
+            "torch": torch.get_rng_state(),
+        },
+        "extra": dict(extra or {}),
+    }
+
+
+def restore_training_state(
+    model: BaseAlgorithm, state: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Restores a captured state into a model built with the same settings.
+
+    Args:
+        model: Model with the same algorithm, policy and environment layout
+        state: State returned by ``capture_training_state`` or ``load``
+
+    Returns:
+        The checkpoint's extra metadata
+
+    Raises:
+        ValueError: If the checkpoint was written by another algorithm
+    """
+    if state["algorithm"] != type(model).__name__:
+        raise ValueError(
+            f"Checkpoint was written by {state['algorithm']}, "
+            f"cannot restore into {type(model).__name__}"
+        )
+
+    model.set_parameters(state["parameters"], exact_match=True)
+    model.num_timesteps = state["num_timesteps"]
+    model._n_updates = state["n_updates"]
+    model._episode_num = state["episode_num"]
+
+    vec_normalize_env = model.get_vec_normalize_env()
+    if state["vec_normalize"] is not None and vec_normalize_env is not None:
+        vec_normalize_env.obs_rms = state["vec_normalize"]["obs_rms"]
+        vec_normalize_env.ret_rms = state["vec_normalize"]["ret_rms"]
+
+    random.setstate(state["rng"]["python"])
+    np.random.set_state(state["rng"]["numpy"])
+    torch.set_rng_state(state["rng"]["torch"])
+    return state["extra"]
+
+
+class CheckpointManager:
+    """Writes, rotates and loads full-state checkpoints in one directory."""
+
+    def __init__(
+        self, directory: str, keep_last: int = 3, name_prefix: str = "checkpoint"
+    ):
+        """Initialize the manager.
+
+        Args:
+            directory: Directory holding the checkpoints
+            keep_last: Number of most recent checkpoints to keep (0 keeps all)
+            name_prefix: File name prefix of the checkpoints
+        """
+        self.directory = directory
+        self.keep_last = keep_last
+        self.name_prefix = name_prefix
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: List[Future] = []
+        checkpoints = self.list_checkpoints()
+        self._sequence = self._sequence_of(checkpoints[-1]) + 1 if checkpoints else 0
+
+    def _path(self, sequence: int, timesteps: int) -> str:
+        return os.path.join(
+            self.directory, f"{self.name_prefix}_{sequence:06d}_{timesteps}_steps.pt"
+        )
+
+    def _sequence_of(self, path: str) -> int:
+        """Returns the sequence number of a checkpoint path (-1 if foreign)."""
+        match = re.fullmatch(
+            rf"{re.escape(self.name_prefix)}_(\d+)_\d+_steps\.pt",
+            os.path.basename(path),
+        )
+        return int(match.group(1)) if match else -1
+
+    def list_checkpoints(self) -> List[str]:
+        """Returns the checkpoint paths from oldest to newest."""
+        paths = glob.glob(os.path.join(self.directory, f"{self.name_prefix}_*.pt"))
+        return sorted(
+            (p for p in paths if self._sequence_of(p) >= 0), key=self._sequence_of
+        )
+
+    def latest(self) -> Optional[str]:
+        """Returns the path of the newest checkpoint, if any."""
+        self.wait()
+        checkpoints = self.list_checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def save(
+        self,
+        model: BaseAlgorithm,
+        extra: Optional[Dict[str, Any]] = None,
+        blocking: bool = False,
+    ) -> str:
+        """Captures the model state and writes it in the background.
+
+        Args:
+            model: Model to checkpoint
+            extra: Additional metadata, e.g. ``{"phase": "easy_world"}``
+            blocking: Wait until the checkpoint is on disk
+
+        Returns:
+            Path the checkpoint is written to
+        """
+        state = capture_training_state(model, extra)
+        path = self._path(self._sequence, model.num_timesteps)
+        self._sequence += 1
+
+        # Surface errors of finished writes instead of dropping them
+        for future in [f for f in self._pending if f.done()]:
+            future.result()
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(self._executor.submit(self._write, state, path))
+        if blocking:
+            self.wait()
+        return path
+
+    def _write(self, state: Dict[str, Any], path: str) -> None:
+        """Serializes a state atomically and applies the retention limit."""
+        tmp_path = f"{path}.tmp"
+        torch.save(state, tmp_path)
+        os.replace(tmp_path, path)
+
+        if self.keep_last > 0:
+            for old_path in self.list_checkpoints()[: -self.keep_last]:
+                os.remove(old_path)
+
+    def wait(self) -> None:
+        """Blocks until all queued checkpoints are written."""
+        for future in self._pending:
+            future.result()
+        self._pending = []
+
+    def load(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """Loads a checkpoint.
+
+        Args:
+            path: Checkpoint file (defaults to the newest one)
+
+        Returns:
+            Checkpoint state for ``restore_training_state``
+
+        Raises:
+            FileNotFoundError: If there is no checkpoint to load
+        """
+        path = path or self.latest()
+        if path is None or not os.path.exists(path):
+            raise FileNotFoundError(f"No checkpoint found in {self.directory}")
+        return torch.load(path, map_location="cpu", weights_only=False)
+
+    def close(self) -> None:
+        """Writes pending checkpoints and stops the background thread."""
+        self.wait()
+        self._executor.shutdown()
+
+
+class AsyncCheckpointCallback(BaseCallback):
+    """Saves full-state checkpoints every ``save_freq`` callback calls."""
+
+    def __init__(
+        self,
+        manager: CheckpointManager,
+        save_freq: int,
+        extra: Optional[Dict[str, Any]] = None,
+        verbose: int = 0,
+    ):
+        """Initialize the callback.
+
+        Args:
+            manager: Checkpoint manager writing the files
+            save_freq: Save every ``save_freq`` callback calls
+            extra: Metadata stored with every checkpoint
+            verbose: Verbosity level
+        """
+        super().__init__(verbose)
+        self.manager = manager
+        self.save_freq = save_freq
+        self.extra = extra or {}
+
+    def _on_step(self) -> bool:
+        if self.n_calls % self.save_freq == 0:
+            path = self.manager.save(self.model, extra=self.extra)
+            if self.verbose >= 1:
+                print(f"Saving checkpoint to {path}")
+        return True
+
+    def _on_training_end(self) -> None:
+        self.manager.wait()
@@ -1,31 +1,87 @@
 """Curriculum learning trainer for progressive difficulty training."""
 
+import copy
+import io
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from stable_baselines3 import PPO
-from stable_baselines3.common.callbacks import CheckpointCallback, EvalCallback
-from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.vec_env import VecNormalize
 
 from ..config.loader import load_scenario_config
 from ..core.environment import VertiportEnv
+from .callbacks import AsyncEvalCallback, CurriculumAdvancementCallback
+from .checkpoint import (
+    AsyncCheckpointCallback,
+    CheckpointManager,
+    restore_training_state,
+)
+from .mixed_curriculum import make_mixed_scenario_vec_env
+from .pretrain import DemonstrationDataset, pretrain_policy
+from .vec_env import limit_threads, make_training_vec_env
 
 
 class CurriculumTrainer:
     """Curriculum learning trainer for vertiport autonomy."""
 
-    def __init__(self, log_dir: str = "logs", model_dir: str = "models"):
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        model_dir: str = "models",
+        vec_env_backend: str = "dummy",
+        vec_env_kwargs: Optional[Dict[str, Any]] = None,
+        learner_threads: Optional[int] = None,
+        eval_workers: int = 1,
+        auto_advance: bool = True,
+        advancement_kwargs: Optional[Dict[str, Any]] = None,
+        keep_checkpoints: int = 3,
+        demonstrations: Optional[str] = None,
+        pretrain_kwargs: Optional[Dict[str, Any]] = None,
+    ):
         """Initialize the curriculum trainer.
 
         Args:
             log_dir: Directory for training logs
             model_dir: Directory for saving models
+            vec_env_backend: Vectorization backend: ``"dummy"``, ``"subproc"``
+                or ``"shmem"`` (see ``make_training_vec_env``)
+            vec_env_kwargs: Worker topology for subprocess backends
+            learner_threads: PyTorch/BLAS threads of the learner process
+            eval_workers: Number of background evaluation processes
+            auto_advance: End a phase early once its ``success_threshold``
+                (and optional ``completion_threshold``) is reliably reached
+            advancement_kwargs: Extra ``CurriculumAdvancementCallback``
+                arguments, e.g. ``{"window": 100, "confidence": 0.95}``
+            keep_checkpoints: Number of recent full-state checkpoints to keep
+            demonstrations: Directory of a demonstration dataset collected on
+                the first phase's scenario with ``max_drones`` set to the
+                largest fleet of the phases; the new model is pretrained on
+                it by behavior cloning before the first phase
+            pretrain_kwargs: Extra ``pretrain_policy`` arguments
         """
         self.log_dir = log_dir
         self.model_dir = model_dir
+        self.vec_env_backend = vec_env_backend
+        self.vec_env_kwargs = vec_env_kwargs or {}
+        self.learner_threads = learner_threads
+        self.eval_workers = eval_workers
+        self.auto_advance = auto_advance
+        self.advancement_kwargs = advancement_kwargs or {}
+        self.demonstrations = demonstrations
+        self.pretrain_kwargs = pretrain_kwargs or {}
+        self.timesteps_saved: Dict[str, int] = {}
+        self.env: Optional[VecNormalize] = None
+        self._scenario_configs: Dict[str, Any] = {}
+        if self.learner_threads is not None:
+            limit_threads(self.learner_threads)
         os.makedirs(self.log_dir, exist_ok=True)
         os.makedirs(self.model_dir, exist_ok=True)
+        self.checkpoint_manager = CheckpointManager(
+            os.path.join(self.model_dir, "checkpoints"),
+            keep_last=keep_checkpoints,
+            name_prefix="curriculum",
+        )
 
         # Default curriculum phases
         self.phases = [
@@ -78,14 +134,95 @@ class CurriculumTrainer:
         """
         self.phases = phases
 
+    def _load_config(self, scenario_path: str):
+        """Loads a scenario configuration once and caches it."""
+        config = self._scenario_configs.get(scenario_path)
+        if config is None:
+            config = load_scenario_config(scenario_path)
+            self._scenario_configs[scenario_path] = config
+        return config
+
+    def fleet_size(self) -> int:
+        """Largest number of drones over all phases.
+
+        Every phase environment is padded to this fleet size, so all phases
+        share one observation and action space and a single model (and its
+        normalization statistics) carries over between them.
+        """
+        return max(
+            self._load_config(phase["scenario"]).traffic.max_drones
+            for phase in self.phases
+        )
+
+    def _get_phase_environment(self, phase_config: Dict[str, Any]) -> VecNormalize:
+        """Get the normalized training environment for a phase.
+
+        If the previous phase's environment has the same number of envs and
+        the new scenario keeps the (padded) observation and action spaces,
+        the scenario is swapped inside the running workers. Otherwise the old
+        environment is closed and a new one is created. Either way the
+        normalization statistics carry over while the observation space
+        stays the same.
+
+        Args:
+            phase_config: Configuration for this phase
+
+        Returns:
+            Normalized vectorized environment
+        """
+        start = time.perf_counter()
+        config = self._load_config(phase_config["scenario"])
+        max_drones = self.fleet_size()
+
+        if self.env is not None and self.env.num_envs == phase_config["n_envs"]:
+            probe = VertiportEnv(config, max_drones=max_drones)
+            if (
+                probe.observation_space == self.env.observation_space
+                and probe.action_space == self.env.action_space
+            ):
+                self.env.env_method("set_scenario", config)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                print(f"Swapped scenario in running workers in {elapsed_ms:.1f} ms")
+                return self.env
+            print("Observation or action space changed, recreating environments...")
+
+        previous = self.env
+        self.close()
+        env = make_training_vec_env(
+            VertiportEnv,
+            n_envs=phase_config["n_envs"],
+            env_kwargs={"config": config, "max_drones": max_drones},
+            backend=self.vec_env_backend,
+            **self.vec_env_kwargs,
+        )
+        self.env = VecNormalize(env, norm_obs=True, norm_reward=True, clip_obs=10.0)
+        if (
+            previous is not None
+            and previous.observation_space == self.env.observation_space
+        ):
+            self.env.obs_rms = copy.deepcopy(previous.obs_rms)
+            self.env.ret_rms = copy.deepcopy(previous.ret_rms)
+        return self.env
+
+    def close(self) -> None:
+        """Close the training environment and its worker processes."""
+        if self.env is not None:
+            self.env.close()
+            self.env = None
+
     def train_phase(
-        self, phase_config: Dict[str, Any], model: Optional[PPO] = None
+        self,
+        phase_config: Dict[str, Any],
+        model: Optional[PPO] = None,
+        resume_state: Optional[Dict[str, Any]] = None,
     ) -> PPO:
         """Train a single curriculum phase.
 
         Args:
             phase_config: Configuration for this phase
             model: Previous model to continue from (None for first phase)
+            resume_state: Checkpoint state to restore before training; if it
+                was taken during this phase, only the remaining timesteps run
 
         Returns:
             Trained model for this phase
@@ -96,33 +233,28 @@ class CurriculumTrainer:
         print(f"Target Timesteps: {phase_config['timesteps']:,}")
         print(f"{'='*60}")
 
-        # Load configuration for this phase
-        config = load_scenario_config(phase_config["scenario"])
-
-        # Create vectorized environment
-        env = make_vec_env(
-            VertiportEnv, n_envs=phase_config["n_envs"], env_kwargs={"config": config}
-        )
-
-        # Normalize environment
-        env = VecNormalize(env, norm_obs=True, norm_reward=True, clip_obs=10.0)
+        # Reuse the running workers when the new scenario fits them
+        env = self._get_phase_environment(phase_config)
 
         # Setup callbacks
         phase_log_dir = os.path.join(self.log_dir, f"curriculum_{phase_config['name']}")
-        checkpoint_callback = CheckpointCallback(
+        checkpoint_callback = AsyncCheckpointCallback(
+            self.checkpoint_manager,
             save_freq=100000,
-            save_path=os.path.join(self.model_dir, phase_config["name"]),
-            name_prefix=f"curriculum_{phase_config['name']}",
+            extra={"phase": phase_config["name"]},
         )
 
-        eval_callback = EvalCallback(
-            eval_env=env,
+        # Evaluate snapshots out of process so training never waits on it
+        eval_callback = AsyncEvalCallback(
+            scenario_path=phase_config["scenario"],
             n_eval_episodes=10,
             eval_freq=50000,
+            n_workers=self.eval_workers,
+            env_kwargs={"max_drones": self.fleet_size()},
             log_path=phase_log_dir,
             best_model_save_path=os.path.join(self.model_dir, phase_config["name"]),
             deterministic=True,
-            render=False,
+            start_method=self.vec_env_kwargs.get("start_method"),
             verbose=1,
         )
 
@@ -138,33 +270,60 @@ class CurriculumTrainer:
                 gamma=0.99,
                 **phase_config["hyperparams"],
             )
+            # Skip the cold start by cloning the demonstrations first
+            if self.demonstrations is not None and resume_state is None:
+                dataset = DemonstrationDataset(self.demonstrations)
+                print(f"Pretraining on {len(dataset):,} demonstration samples...")
+                pretrain_policy(model, dataset, **self.pretrain_kwargs)
         else:
-            # Subsequent phases - reload model with new environment
+            # Subsequent phases - continue the in-memory model on the new env
             print("Continuing from previous phase...")
-            # Get the path to the previous phase model
-            prev_phase_idx = [p["name"] for p in self.phases].index(
-                phase_config["name"]
-            ) - 1
-            prev_phase_name = self.phases[prev_phase_idx]["name"]
-            model_path = os.path.join(
-                self.model_dir, f"curriculum_{prev_phase_name}_final"
-            )
-
-            # Load model with new environment
-            model = PPO.load(model_path, env=env)
-            print(f"Loaded model from: {model_path}")
+            if model.n_envs == env.num_envs:
+                model.set_env(env)
+            else:
+                # The rollout buffer is sized for the old number of envs;
+                # reload the model (optimizer state included) on the new one
+                buffer = io.BytesIO()
+                model.save(buffer)
+                buffer.seek(0)
+                model = PPO.load(buffer, env=env, tensorboard_log=self.log_dir)
 
             # Update learning rate if specified
             if "learning_rate" in phase_config["hyperparams"]:
                 model.learning_rate = phase_config["hyperparams"]["learning_rate"]
+                model._setup_lr_schedule()
                 print(f"Updated learning rate to: {model.learning_rate}")
 
+        # Restore a checkpoint; mid-phase checkpoints continue their phase
+        timesteps = phase_config["timesteps"]
+        reset_num_timesteps = True
+        if resume_state is not None:
+            extra = restore_training_state(model, resume_state)
+            if extra.get("phase") == phase_config["name"] and not extra.get(
+                "phase_complete"
+            ):
+                print(f"Resuming phase at {model.num_timesteps:,} timesteps")
+                timesteps = max(timesteps - model.num_timesteps, 0)
+                reset_num_timesteps = False
+
+        # Stop the phase early once its success criteria are reliably met
+        callbacks = [checkpoint_callback, eval_callback]
+        advancement_callback = None
+        if self.auto_advance and phase_config.get("success_threshold") is not None:
+            advancement_callback = CurriculumAdvancementCallback(
+                reward_threshold=phase_config["success_threshold"],
+                completion_threshold=phase_config.get("completion_threshold"),
+                **self.advancement_kwargs,
+            )
+            callbacks.append(advancement_callback)
+
         # Train the model
-        print(f"Training for {phase_config['timesteps']:,} timesteps...")
+        print(f"Training for {timesteps:,} timesteps...")
         model.learn(
-            total_timesteps=phase_config["timesteps"],
-            callback=[checkpoint_callback, eval_callback],
+            total_timesteps=timesteps,
+            callback=callbacks,
             tb_log_name=f"curriculum_{phase_config['name']}",
+            reset_num_timesteps=reset_num_timesteps,
         )
 
         # Save final model for this phase
@@ -172,39 +331,200 @@ class CurriculumTrainer:
             self.model_dir, f"curriculum_{phase_config['name']}_final"
         )
         model.save(final_model_path)
+        model.get_vec_normalize_env().save(f"{final_model_path}_vecnormalize.pkl")
+        self.checkpoint_manager.save(
+            model, extra={"phase": phase_config["name"], "phase_complete": True}
+        )
         print(f"Phase completed! Model saved to: {final_model_path}")
 
+        if advancement_callback is not None:
+            self.timesteps_saved[phase_config["name"]] = (
+                advancement_callback.timesteps_saved
+            )
+
         return model
 
-    def run_full_curriculum(self) -> PPO:
+    def load_checkpoint(self, resume: str) -> Dict[str, Any]:
+        """Load a full-state checkpoint.
+
+        Args:
+            resume: Checkpoint path, or ``"latest"`` for the newest checkpoint
+
+        Returns:
+            Checkpoint state
+        """
+        state = self.checkpoint_manager.load(None if resume == "latest" else resume)
+        extra = state["extra"]
+        status = "completed" if extra.get("phase_complete") else "in progress"
+        print(
+            f"Loaded checkpoint of phase '{extra.get('phase')}' ({status}) "
+            f"at {state['num_timesteps']:,} timesteps"
+        )
+        return state
+
+    def run_full_curriculum(self, resume: Optional[str] = None) -> PPO:
         """Run the complete curriculum learning process.
 
+        Args:
+            resume: Checkpoint to resume from: a path, or ``"latest"`` for the
+                newest checkpoint in ``model_dir/checkpoints``
+
         Returns:
             Final trained model
         """
         print("🎓 Starting Curriculum Learning for Vertiport Autonomy")
         print(f"Total phases: {len(self.phases)}")
 
+        # Skip the phases a checkpoint has already completed
+        start = 0
+        resume_state = None
+        if resume is not None:
+            resume_state = self.load_checkpoint(resume)
+            extra = resume_state["extra"]
+            if extra.get("phase") not in self.get_phase_names():
+                raise ValueError(
+                    f"Checkpoint phase '{extra.get('phase')}' is not a curriculum phase"
+                )
+            start = self.get_phase_names().index(extra["phase"])
+            if extra.get("phase_complete"):
+                start += 1
+            if start == len(self.phases):
+                raise RuntimeError("Checkpoint is from a completed curriculum")
+
         model = None
-        for i, phase_config in enumerate(self.phases):
+        for i, phase_config in enumerate(self.phases[start:], start):
             print(f"\n📚 Phase {i+1}/{len(self.phases)}: {phase_config['name']}")
-            model = self.train_phase(phase_config, model)
+            model = self.train_phase(
+                phase_config, model, resume_state if i == start else None
+            )
 
             print(f"✅ Phase {phase_config['name']} completed successfully!")
 
+        self.close()
+        self.checkpoint_manager.wait()
         print(f"\n🎉 Curriculum Learning Complete!")
+        if self.timesteps_saved:
+            total_saved = sum(self.timesteps_saved.values())
+            print(f"Timesteps saved by early advancement: {total_saved:,}")
         print(f"Final model saved in: {self.model_dir}")
 
         if model is None:
             raise RuntimeError("No model was trained - curriculum phases list is empty")
         return model
 
-    def run_single_phase(self, phase_name: str, model: Optional[PPO] = None) -> PPO:
+    def train_mixed(
+        self,
+        total_timesteps: int,
+        n_envs: int = 16,
+        hyperparams: Optional[Dict[str, Any]] = None,
+        window: int = 50,
+        epsilon: float = 0.2,
+        resume: Optional[str] = None,
+    ) -> PPO:
+        """Train on all phase scenarios at once with adaptive scenario sampling.
+
+        Every environment slot runs one of the phases' scenarios, padded to
+        the largest fleet, and switches scenario at episode end according to
+        per-scenario learning progress (see ``MixedScenarioVecEnv``).
+
+        Args:
+            total_timesteps: Total training timesteps
+            n_envs: Number of environment slots
+            hyperparams: PPO hyperparameters (defaults to the first phase's)
+            window: Episodes per scenario used to estimate learning progress
+            epsilon: Share of uniform sampling across scenarios
+            resume: Checkpoint of an earlier mixed run to resume from: a path,
+                or ``"latest"``
+
+        Returns:
+            Trained model
+        """
+        if not self.phases:
+            raise RuntimeError("No curriculum phases defined")
+        scenario_paths = [phase["scenario"] for phase in self.phases]
+        hyperparams = hyperparams or self.phases[0]["hyperparams"]
+
+        print("🎓 Starting Mixed-Difficulty Curriculum for Vertiport Autonomy")
+        print(f"Scenarios: {scenario_paths}")
+        print(f"Total timesteps: {total_timesteps:,}")
+
+        mixed_env = make_mixed_scenario_vec_env(
+            scenario_paths,
+            n_envs=n_envs,
+            backend=self.vec_env_backend,
+            window=window,
+            epsilon=epsilon,
+            **self.vec_env_kwargs,
+        )
+        env = VecNormalize(mixed_env, norm_obs=True, norm_reward=True, clip_obs=10.0)
+        max_drones = env.get_attr("max_drones")[0]
+
+        checkpoint_callback = AsyncCheckpointCallback(
+            self.checkpoint_manager, save_freq=100000, extra={"phase": "mixed"}
+        )
+        # Evaluate on the hardest scenario, padded like the training envs
+        eval_callback = AsyncEvalCallback(
+            scenario_path=scenario_paths[-1],
+            n_eval_episodes=10,
+            eval_freq=50000,
+            n_workers=self.eval_workers,
+            env_kwargs={"max_drones": max_drones},
+            log_path=os.path.join(self.log_dir, "curriculum_mixed"),
+            best_model_save_path=os.path.join(self.model_dir, "mixed"),
+            deterministic=True,
+            start_method=self.vec_env_kwargs.get("start_method"),
+            verbose=1,
+        )
+
+        model = PPO(
+            "MultiInputPolicy",
+            env,
+            verbose=1,
+            tensorboard_log=self.log_dir,
+            gamma=0.99,
+            **hyperparams,
+        )
+        reset_num_timesteps = True
+        if resume is not None:
+            state = self.load_checkpoint(resume)
+            if state["extra"].get("phase") != "mixed":
+                raise ValueError("Checkpoint is not from a mixed curriculum run")
+            restore_training_state(model, state)
+            total_timesteps = max(total_timesteps - model.num_timesteps, 0)
+            reset_num_timesteps = False
+
+        model.learn(
+            total_timesteps=total_timesteps,
+            callback=[checkpoint_callback, eval_callback],
+            tb_log_name="curriculum_mixed",
+            reset_num_timesteps=reset_num_timesteps,
+        )
+        self.checkpoint_manager.save(model, extra={"phase": "mixed"}, blocking=True)
+
+        final_model_path = os.path.join(self.model_dir, "curriculum_mixed_final")
+        model.save(final_model_path)
+        env.save(f"{final_model_path}_vecnormalize.pkl")
+        env.close()
+
+        print("Final scenario sampling probabilities:")
+        for name, probability in mixed_env.sampling_probabilities().items():
+            print(f"   {name}: {probability:.2f}")
+        print(f"Mixed curriculum completed! Model saved to: {final_model_path}")
+
+        return model
+
+    def run_single_phase(
+        self,
+        phase_name: str,
+        model: Optional[PPO] = None,
+        resume: Optional[str] = None,
+    ) -> PPO:
         """Run a single phase of the curriculum.
 
         Args:
             phase_name: Name of the phase to run
             model: Optional model to continue from
+            resume: Checkpoint to restore first: a path, or ``"latest"``
 
         Returns:
             Trained model for this phase
@@ -224,7 +544,10 @@ class CurriculumTrainer:
                 f"Phase '{phase_name}' not found. Available phases: {available_phases}"
             )
 
-        return self.train_phase(phase_config, model)
+        resume_state = self.load_checkpoint(resume) if resume is not None else None
+        model = self.train_phase(phase_config, model, resume_state)
+        self.checkpoint_manager.wait()
+        return model
 
     def get_phase_names(self) -> List[str]:
         """Get list of available phase names.
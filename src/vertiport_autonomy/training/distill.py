@@ -0,0 +1,326 @@
+"""Policy distillation into a compact low-latency controller.
+
+``distill_policy`` queries a trained PPO policy (a ``PPOAgent``) over large
+batches of states from lockstep ``VertiportEnv`` rollouts and fits a
+``DistilledAgent`` student, a narrow MLP over compact features, to the
+teacher's per-drone action distributions. After the first round the student
+drives the rollouts itself (DAgger), so it also learns the teacher's
+decisions in the states its own mistakes lead to. The returned
+``DistillationReport`` gives the student's agreement with the teacher on
+fresh states visited by the student, and the per-decision latency of both
+policies.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from torch import nn
+
+from ..agents.base import BaseAgent
+from ..agents.drl.distilled import CLIP_FEATURES, DistilledAgent, compact_features
+from ..agents.drl.ppo import PPOAgent
+from ..config.loader import load_scenario_config
+from ..core.environment import VertiportEnv, compute_action_mask
+
+
+@dataclass
+class DistillationReport:
+    """Fidelity and latency of a distilled student."""
+
+    samples: int
+    action_agreement: float
+    joint_agreement: float
+    teacher_parameters: int
+    student_parameters: int
+    teacher_latency_p50_us: float
+    teacher_latency_p99_us: float
+    student_latency_p50_us: float
+    student_latency_p99_us: float
+    loss: List[float] = field(default_factory=list)
+
+
+class _LockstepEnvs:
+    """Environments stepped together on batched observations."""
+
+    def __init__(
+        self,
+        scenario_path: str,
+        n_envs: int,
+        env_kwargs: Dict[str, Any],
+        seed: Optional[int],
+    ):
+        config = load_scenario_config(scenario_path)
+        self.envs = [VertiportEnv(config, **env_kwargs) for _ in range(n_envs)]
+        self.observations = [
+            env.reset(seed=None if seed is None else seed + i)[0]
+            for i, env in enumerate(self.envs)
+        ]
+
+    def batch(self) -> Dict[str, np.ndarray]:
+        return {
+            key: np.stack([obs[key] for obs in self.observations])
+            for key in self.observations[0]
+        }
+
+    def step(self, actions: np.ndarray) -> None:
+        for i, env in enumerate(self.envs):
+            obs, _, terminated, truncated, _ = env.step(actions[i])
+            if terminated or truncated:
+                obs, _ = env.reset()
+            self.observations[i] = obs
+
+    def close(self) -> None:
+        for env in self.envs:
+            env.close()
+
+
+def _teacher_probabilities(
+    teacher: PPOAgent, observation: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """Per-drone action probabilities of the teacher for a batch."""
+    logits = teacher.action_logits(observation).astype(np.float64)
+    if teacher.action_masking:
+        mask = compute_action_mask(observation["drones_state"][..., 14])
+        logits = np.where(mask, logits, -np.inf)
+    logits -= logits.max(axis=-1, keepdims=True)
+    probabilities = np.exp(logits)
+    return (probabilities / probabilities.sum(axis=-1, keepdims=True)).astype(
+        np.float32
+    )
+
+
+def _collect(
+    teacher: PPOAgent,
+    behavior: BaseAgent,
+    envs: _LockstepEnvs,
+    n_samples: int,
+    exploration: float,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Labels the states visited by ``behavior`` with the teacher's policy."""
+    num_drones = teacher.obs_shapes["drones_state"][0]
+    features, probabilities = [], []
+    collected = 0
+    while collected < n_samples:
+        batch = envs.batch()
+        features.append(compact_features(batch, num_drones))
+        probabilities.append(_teacher_probabilities(teacher, batch))
+        collected += len(envs.envs)
+
+        actions = behavior.act(batch)
+        explore = rng.random(actions.shape) < exploration
+        actions[explore] = rng.integers(0, teacher.nvec[0], size=explore.sum())
+        envs.step(actions)
+    return (
+        np.concatenate(features)[:n_samples],
+        np.concatenate(probabilities)[:n_samples],
+    )
+
+
+def _build_student(
+    n_features: int, hidden_sizes: Sequence[int], n_outputs: int, activation: str
+) -> nn.Sequential:
+    layers: List[nn.Module] = []
+    for size in hidden_sizes:
+        layers += [nn.Linear(n_features, size), getattr(nn, activation)()]
+        n_features = size
+    layers.append(nn.Linear(n_features, n_outputs))
+    return nn.Sequential(*layers)
+
+
+def _fit_student(
+    network: nn.Sequential,
+    features: np.ndarray,
+    probabilities: np.ndarray,
+    epochs: int,
+    batch_size: int,
+    learning_rate: float,
+    rng: np.random.Generator,
+) -> List[float]:
+    """Minimizes the cross-entropy between teacher and student actions."""
+    optimizer = torch.optim.Adam(network.parameters(), lr=learning_rate)
+    inputs = torch.as_tensor(features)
+    targets = torch.as_tensor(probabilities)
+    losses = []
+    for _ in range(epochs):
+        order = torch.as_tensor(rng.permutation(len(inputs)))
+        epoch_losses = []
+        for start in range(0, len(order), batch_size):
+            indices = order[start : start + batch_size]
+            logits = network(inputs[indices]).reshape(targets[indices].shape)
+            loss = -(targets[indices] * torch.log_softmax(logits, dim=-1)).sum(-1)
+            loss = loss.mean()
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            epoch_losses.append(loss.item())
+        losses.append(float(np.mean(epoch_losses)))
+    return losses
+
+
+def measure_latency(
+    agent: BaseAgent, observations: List[Dict[str, np.ndarray]], repeats: int = 3
+) -> Tuple[float, float]:
+    """Measures the latency of single (unbatched) decisions.
+
+    Args:
+        agent: Agent to time
+        observations: Observations to decide on
+        repeats: Passes over the observations
+
+    Returns:
+        Median and 99th percentile latency in microseconds
+    """
+    agent.act(observations[0])
+    latencies = []
+    for _ in range(repeats):
+        for obs in observations:
+            start = time.perf_counter()
+            agent.act(obs)
+            latencies.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    return float(p50), float(p99)
+
+
+def distill_policy(
+    teacher: PPOAgent,
+    scenario_path: str,
+    n_samples: int = 100000,
+    hidden_sizes: Sequence[int] = (64,),
+    activation: str = "ReLU",
+    dagger_rounds: int = 1,
+    epochs: int = 10,
+    batch_size: int = 1024,
+    learning_rate: float = 1e-3,
+    exploration: float = 0.1,
+    n_envs: int = 16,
+    env_kwargs: Optional[Dict[str, Any]] = None,
+    eval_samples: int = 10000,
+    seed: Optional[int] = 0,
+    verbose: int = 1,
+) -> Tuple[DistilledAgent, DistillationReport]:
+    """Distills a trained PPO policy into a compact student.
+
+    Args:
+        teacher: Trained policy; its ``deterministic`` decisions are the target
+        scenario_path: Path to scenario configuration file
+        n_samples: Labelled states per round
+        hidden_sizes: Hidden layer widths of the student MLP
+        activation: Hidden layer activation (a ``torch.nn`` module name that
+            ``ACTIVATIONS`` supports)
+        dagger_rounds: Extra rounds on states visited by the student
+        epochs: Passes over the aggregated states per round
+        batch_size: States per gradient step
+        learning_rate: Adam learning rate
+        exploration: Probability of a random action per drone while
+            collecting training states
+        n_envs: Environments stepped in lockstep
+        env_kwargs: Extra keyword arguments for ``VertiportEnv``; must match
+            the teacher's training environments
+        eval_samples: Fresh student-visited states to measure fidelity on
+        seed: Seed of the rollouts and the training
+        verbose: Print progress if >= 1
+
+    Returns:
+        Tuple of the student and its ``DistillationReport``
+    """
+    env_kwargs = dict(env_kwargs or {})
+    rng = np.random.default_rng(seed)
+    if seed is not None:
+        torch.manual_seed(seed)
+    num_drones = teacher.obs_shapes["drones_state"][0]
+    n_actions = int(teacher.nvec[0])
+
+    envs = _LockstepEnvs(scenario_path, n_envs, env_kwargs, seed)
+    network: Optional[nn.Sequential] = None
+    student: Optional[DistilledAgent] = None
+    losses: List[float] = []
+    for round_index in range(dagger_rounds + 1):
+        behavior = teacher if student is None else student
+        round_features, round_probabilities = _collect(
+            teacher, behavior, envs, n_samples, exploration, rng
+        )
+        if network is None:
+            features, probabilities = round_features, round_probabilities
+            mean, std = features.mean(axis=0), features.std(axis=0)
+            network = _build_student(
+                features.shape[1], hidden_sizes, num_drones * n_actions, activation
+            )
+        else:
+            features = np.concatenate([features, round_features])
+            probabilities = np.concatenate([probabilities, round_probabilities])
+
+        normalized = np.clip(
+            (features - mean) / np.maximum(std, 1e-6), -CLIP_FEATURES, CLIP_FEATURES
+        )
+        round_losses = _fit_student(
+            network,
+            normalized.astype(np.float32),
+            probabilities,
+            epochs,
+            batch_size,
+            learning_rate,
+            rng,
+        )
+        losses += round_losses
+        linears = [module for module in network if isinstance(module, nn.Linear)]
+        student = DistilledAgent(
+            [(m.weight.detach().numpy().T, m.bias.detach().numpy()) for m in linears],
+            mean,
+            std,
+            num_drones=num_drones,
+            activation=activation,
+            action_masking=teacher.action_masking,
+        )
+        if verbose >= 1:
+            print(
+                f"   Round {round_index + 1}/{dagger_rounds + 1}: "
+                f"{len(features):,} states, loss {round_losses[-1]:.4f}"
+            )
+    envs.close()
+
+    # Fidelity on fresh states visited by the student itself
+    envs = _LockstepEnvs(scenario_path, n_envs, env_kwargs, None)
+    matches, joint_matches, decisions = 0, 0, 0
+    latency_observations: List[Dict[str, np.ndarray]] = []
+    while decisions < eval_samples:
+        batch = envs.batch()
+        student_actions = student.act(batch)
+        equal = student_actions == teacher.act(batch)
+        matches += int(equal.sum())
+        joint_matches += int(equal.all(axis=1).sum())
+        decisions += len(equal)
+        if len(latency_observations) < 256:
+            latency_observations += [dict(obs) for obs in envs.observations]
+        envs.step(student_actions)
+    envs.close()
+
+    teacher_p50, teacher_p99 = measure_latency(teacher, latency_observations)
+    student_p50, student_p99 = measure_latency(student, latency_observations)
+    report = DistillationReport(
+        samples=len(features),
+        action_agreement=matches / (decisions * num_drones),
+        joint_agreement=joint_matches / decisions,
+        teacher_parameters=sum(w.size + b.size for w, b in teacher.layers)
+        + teacher.action_weight.size
+        + teacher.action_bias.size,
+        student_parameters=student.num_parameters,
+        teacher_latency_p50_us=teacher_p50,
+        teacher_latency_p99_us=teacher_p99,
+        student_latency_p50_us=student_p50,
+        student_latency_p99_us=student_p99,
+        loss=losses,
+    )
+    if verbose >= 1:
+        print(
+            f"   Agreement: {report.action_agreement:.3f} per drone, "
+            f"{report.joint_agreement:.3f} joint"
+        )
+        print(
+            f"   Latency p50/p99: teacher {teacher_p50:.1f}/{teacher_p99:.1f} us, "
+            f"student {student_p50:.1f}/{student_p99:.1f} us"
+        )
+    return student, report
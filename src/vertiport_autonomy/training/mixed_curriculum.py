@@ -0,0 +1,202 @@
+"""Concurrent mixed-difficulty curriculum sampling.
+
+Instead of training scenarios one phase after another, every environment
+slot of one vectorized environment runs its own scenario. Whenever an
+episode ends, the slot draws its next scenario with probabilities that
+follow each scenario's recent learning progress, so the rollout batch
+always mixes difficulties and concentrates on what is currently being
+learned. All scenarios are padded to a common ``max_drones`` so they share
+one observation and action space.
+"""
+
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv, VecEnvWrapper
+
+from ..config.loader import load_scenario_config
+from ..config.schema import ScenarioConfig
+from ..core.environment import VertiportEnv
+from .vec_env import make_training_vec_env
+
+
+class MixedScenarioVecEnv(VecEnvWrapper):
+    """Assigns scenarios to environment slots by learning progress.
+
+    Learning progress of a scenario is the absolute difference between the
+    mean episode reward of the older and the newer half of its last
+    ``window`` episodes. Slots draw their next scenario with probability
+    ``epsilon / K + (1 - epsilon) * progress / sum(progress)``; scenarios
+    without enough episodes yet count as the most promising one. The wrapped
+    environments must expose ``set_scenario`` and a ``Monitor`` episode info
+    and should sit below ``VecNormalize``.
+    """
+
+    def __init__(
+        self,
+        venv: VecEnv,
+        scenarios: Dict[str, ScenarioConfig],
+        window: int = 50,
+        epsilon: float = 0.2,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            venv: Vectorized ``VertiportEnv`` padded to the largest fleet
+            scenarios: Scenario configurations by name
+            window: Episodes per scenario used to estimate learning progress
+            epsilon: Share of uniform sampling across scenarios
+            seed: Seed of the scenario sampler
+        """
+        if not scenarios:
+            raise ValueError("At least one scenario is required")
+        if window < 4:
+            raise ValueError(f"window must be >= 4, got {window}")
+        super().__init__(venv)
+        self.scenarios = dict(scenarios)
+        self.scenario_names = list(self.scenarios)
+        self.window = window
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+
+        self.episode_rewards: Dict[str, Deque[float]] = {
+            name: deque(maxlen=window) for name in self.scenario_names
+        }
+        self.slot_scenarios: List[str] = [
+            self.scenario_names[i % len(self.scenario_names)]
+            for i in range(self.num_envs)
+        ]
+
+    def learning_progress(self) -> Dict[str, Optional[float]]:
+        """Returns the learning progress per scenario (None if too few episodes)."""
+        progress: Dict[str, Optional[float]] = {}
+        for name, rewards in self.episode_rewards.items():
+            if len(rewards) < 4:
+                progress[name] = None
+                continue
+            data = np.asarray(rewards)
+            half = len(data) // 2
+            progress[name] = float(abs(data[half:].mean() - data[:half].mean()))
+        return progress
+
+    def sampling_probabilities(self) -> Dict[str, float]:
+        """Returns the probability of each scenario being drawn next."""
+        progress = self.learning_progress()
+        known = [p for p in progress.values() if p is not None]
+        optimistic = max(known) if known else 1.0
+        scores = np.array(
+            [optimistic if p is None else p for p in progress.values()], dtype=float
+        )
+
+        num_scenarios = len(scores)
+        uniform = np.full(num_scenarios, 1.0 / num_scenarios)
+        if scores.sum() <= 0:
+            probabilities = uniform
+        else:
+            probabilities = (
+                self.epsilon * uniform + (1.0 - self.epsilon) * scores / scores.sum()
+            )
+        return dict(zip(progress.keys(), probabilities.tolist()))
+
+    def _assign(self, assignments: Dict[str, List[int]]) -> None:
+        """Swaps the scenario of the given slots, one call per scenario."""
+        for name, indices in assignments.items():
+            self.venv.env_method("set_scenario", self.scenarios[name], indices=indices)
+            for i in indices:
+                self.slot_scenarios[i] = name
+
+    def reset(self):
+        assignments: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.slot_scenarios):
+            assignments.setdefault(name, []).append(i)
+        self._assign(assignments)
+        return self.venv.reset()
+
+    def step_wait(self):
+        obs, rewards, dones, infos = self.venv.step_wait()
+
+        assignments: Dict[str, List[int]] = {}
+        probabilities = None
+        for i, done in enumerate(dones):
+            infos[i]["scenario"] = self.slot_scenarios[i]
+            if not done:
+                continue
+            if "episode" in infos[i]:
+                self.episode_rewards[self.slot_scenarios[i]].append(
+                    float(infos[i]["episode"]["r"])
+                )
+
+            if probabilities is None:
+                probabilities = self.sampling_probabilities()
+            name = self.rng.choice(
+                self.scenario_names, p=[probabilities[n] for n in self.scenario_names]
+            )
+            if name != self.slot_scenarios[i]:
+                assignments.setdefault(name, []).append(i)
+
+        if assignments:
+            # The slot already auto-reset into its old scenario, so swap the
+            # scenario and reset it again to start the new one right away
+            self._assign(assignments)
+            indices = [i for slot_indices in assignments.values() for i in slot_indices]
+            for i, (new_obs, _) in zip(
+                indices, self.venv.env_method("reset", indices=indices)
+            ):
+                if isinstance(obs, dict):
+                    for key, value in new_obs.items():
+                        obs[key][i] = value
+                else:
+                    obs[i] = new_obs
+
+        return obs, rewards, dones, infos
+
+
+def make_mixed_scenario_vec_env(
+    scenario_paths: Sequence[str],
+    n_envs: int,
+    env_kwargs: Optional[Dict[str, Any]] = None,
+    backend: str = "dummy",
+    window: int = 50,
+    epsilon: float = 0.2,
+    seed: Optional[int] = None,
+    **vec_env_kwargs,
+) -> MixedScenarioVecEnv:
+    """Create a vectorized environment running several scenarios at once.
+
+    Args:
+        scenario_paths: Scenario configuration files; names are the file stems
+        n_envs: Number of environment slots
+        env_kwargs: Extra keyword arguments for ``VertiportEnv``
+        backend: Vectorization backend (see ``make_training_vec_env``)
+        window: Episodes per scenario used to estimate learning progress
+        epsilon: Share of uniform sampling across scenarios
+        seed: Seed of the environments and the scenario sampler
+        **vec_env_kwargs: Worker topology for subprocess backends
+
+    Returns:
+        Mixed-scenario vectorized environment (not yet normalized)
+    """
+    scenarios = {
+        os.path.splitext(os.path.basename(path))[0]: load_scenario_config(path)
+        for path in scenario_paths
+    }
+    largest = max(scenarios.values(), key=lambda config: config.traffic.max_drones)
+
+    venv = make_training_vec_env(
+        VertiportEnv,
+        n_envs=n_envs,
+        env_kwargs={
+            **(env_kwargs or {}),
+            "config": largest,
+            "max_drones": largest.traffic.max_drones,
+        },
+        backend=backend,
+        seed=seed,
+        **vec_env_kwargs,
+    )
+    return MixedScenarioVecEnv(
+        venv, scenarios, window=window, epsilon=epsilon, seed=seed
+    )
@@ -0,0 +1,419 @@
+"""Population-based training (PBT) across local CPU cores.
+
+``PopulationBasedTrainer`` runs a population of PPO learners as separate
+processes, each pinned to its own share of the cores. Every
+``ready_timesteps`` a member publishes its rolling training reward and a
+full-state snapshot to a ``PopulationStore`` directory. Members in the
+bottom ``exploit_fraction`` of the population then copy the weights,
+optimizer state and ``VecNormalize`` statistics of a random member of the
+top fraction (exploit) and multiply its learning rate and entropy
+coefficient by a random perturbation factor (explore). Members never wait
+for each other; each one exploits whatever the store holds at that moment.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from .checkpoint import capture_training_state, restore_training_state
+from .vec_env import available_cpus, limit_threads, pin_to_cpus, plan_cpu_affinity
+
+# Hyperparameters perturbed on exploit and their allowed ranges
+DEFAULT_PERTURB_BOUNDS: Dict[str, Tuple[float, float]] = {
+    "learning_rate": (1e-6, 1e-2),
+    "ent_coef": (1e-5, 0.1),
+}
+
+
+class PopulationStore:
+    """File-based store of population members' scores and snapshots.
+
+    Each member owns ``member_XX.json`` (its latest record) and
+    ``member_XX.pt`` (its latest training state). Both are written to a
+    temporary file and atomically renamed, so readers in other processes
+    never see partial files.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize the store.
+
+        Args:
+            directory: Directory shared by all members
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, member_id: int, extension: str) -> str:
+        return os.path.join(self.directory, f"member_{member_id:02d}.{extension}")
+
+    def publish(
+        self,
+        member_id: int,
+        record: Dict[str, Any],
+        state: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Writes a member's record and, optionally, its training state.
+
+        The state is written first so a visible record always points to a
+        complete snapshot.
+        """
+        if state is not None:
+            state_path = self._path(member_id, "pt")
+            torch.save(state, f"{state_path}.tmp")
+            os.replace(f"{state_path}.tmp", state_path)
+
+        record_path = self._path(member_id, "json")
+        with open(f"{record_path}.tmp", "w") as f:
+            json.dump(record, f)
+        os.replace(f"{record_path}.tmp", record_path)
+
+    def records(self) -> Dict[int, Dict[str, Any]]:
+        """Returns the latest record of every member that has published."""
+        records = {}
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith("member_") and name.endswith(".json"):
+                with open(os.path.join(self.directory, name)) as f:
+                    record = json.load(f)
+                records[record["member_id"]] = record
+        return records
+
+    def load_state(self, member_id: int) -> Dict[str, Any]:
+        """Loads a member's latest training state."""
+        return torch.load(
+            self._path(member_id, "pt"), map_location="cpu", weights_only=False
+        )
+
+
+def select_exploit_source(
+    member_id: int,
+    records: Dict[int, Dict[str, Any]],
+    exploit_fraction: float,
+    rng: np.random.Generator,
+) -> Optional[int]:
+    """Decides whether a member exploits and from whom.
+
+    Args:
+        member_id: Member asking
+        records: Latest records by member id
+        exploit_fraction: Share of the population in the bottom and top groups
+        rng: Random number generator
+
+    Returns:
+        Id of a top member to copy, or None if ``member_id`` is not in the
+        bottom group
+    """
+    scored = sorted(
+        (r for r in records.values() if r.get("score") is not None),
+        key=lambda r: r["score"],
+    )
+    n_group = int(len(scored) * exploit_fraction)
+    if n_group == 0:
+        return None
+
+    bottom = [r["member_id"] for r in scored[:n_group]]
+    top = [r["member_id"] for r in scored[-n_group:]]
+    if member_id not in bottom:
+        return None
+    return int(rng.choice(top))
+
+
+def perturb_hyperparameters(
+    hyperparams: Dict[str, float],
+    bounds: Dict[str, Tuple[float, float]],
+    factors: Sequence[float],
+    rng: np.random.Generator,
+) -> Dict[str, float]:
+    """Multiplies each bounded hyperparameter by a random factor.
+
+    Args:
+        hyperparams: Current values
+        bounds: Allowed (low, high) range per perturbed hyperparameter
+        factors: Candidate multiplicative factors
+        rng: Random number generator
+
+    Returns:
+        New values clipped to their bounds
+    """
+    perturbed = dict(hyperparams)
+    for name, (low, high) in bounds.items():
+        factor = factors[rng.integers(len(factors))]
+        perturbed[name] = float(np.clip(hyperparams[name] * factor, low, high))
+    return perturbed
+
+
+def copy_member_state(model, state: Dict[str, Any]) -> Dict[str, float]:
+    """Exploits another member by copying its published training state.
+
+    Copies the weights, optimizer state and normalization statistics but
+    keeps the model's own timestep, update and episode counters. The
+    rolling episode rewards are cleared, so the next score only reflects
+    episodes played with the copied policy.
+
+    Args:
+        model: Model of the exploiting member
+        state: Source member's state, published with its hyperparameters in
+            ``extra["hyperparams"]``
+
+    Returns:
+        Hyperparameters the source was trained with when it took the state
+    """
+    counters = (model.num_timesteps, model._n_updates, model._episode_num)
+    extra = restore_training_state(model, state)
+    model.num_timesteps, model._n_updates, model._episode_num = counters
+    if model.ep_info_buffer is not None:
+        model.ep_info_buffer.clear()
+    return dict(extra["hyperparams"])
+
+
+def _run_member(
+    member_id: int,
+    scenario_path: str,
+    hyperparams: Dict[str, float],
+    total_timesteps: int,
+    ready_timesteps: int,
+    exploit_fraction: float,
+    perturb_bounds: Dict[str, Tuple[float, float]],
+    perturb_factors: Sequence[float],
+    store_dir: str,
+    member_dir: str,
+    cpus: List[int],
+    seed: Optional[int],
+    trainer_kwargs: Dict[str, Any],
+) -> None:
+    """Trains one population member, exploiting and exploring periodically."""
+    limit_threads(len(cpus))
+    pin_to_cpus(cpus)
+
+    from .trainer import Trainer
+
+    store = PopulationStore(store_dir)
+    rng = np.random.default_rng(seed)
+    history: List[Dict[str, Any]] = []
+    record: Dict[str, Any] = {"member_id": member_id, "score": None}
+
+    try:
+        trainer = Trainer(
+            log_dir=member_dir, model_dir=member_dir, **trainer_kwargs, **hyperparams
+        )
+        env = trainer.create_environment(scenario_path)
+        model = trainer.create_model(env, verbose=0, seed=seed)
+
+        while model.num_timesteps < total_timesteps:
+            model.learn(
+                total_timesteps=min(
+                    ready_timesteps, total_timesteps - model.num_timesteps
+                ),
+                callback=trainer.algorithm_callbacks(),
+                reset_num_timesteps=False,
+                tb_log_name=f"member_{member_id}",
+            )
+
+            # Rolling training reward over the recent episodes
+            episode_rewards = [info["r"] for info in model.ep_info_buffer]
+            score = float(np.mean(episode_rewards)) if episode_rewards else None
+            record = {
+                "member_id": member_id,
+                "score": score,
+                "timesteps": model.num_timesteps,
+                "hyperparams": hyperparams,
+                "history": history,
+                "status": "running",
+            }
+            # The state carries its hyperparameters, so an exploiting member
+            # never pairs it with a record the source published later
+            state = capture_training_state(model, extra={"hyperparams": hyperparams})
+            store.publish(member_id, record, state)
+
+            source = select_exploit_source(
+                member_id, store.records(), exploit_fraction, rng
+            )
+            if source is None or model.num_timesteps >= total_timesteps:
+                continue
+
+            # Exploit: copy the source's weights, optimizer and normalization
+            # statistics, keeping this member's own counters and RNG stream
+            source_hyperparams = copy_member_state(model, store.load_state(source))
+            np.random.seed(int(rng.integers(2**31)))
+            torch.manual_seed(int(rng.integers(2**31)))
+
+            # Explore: perturb the source's hyperparameters
+            hyperparams = perturb_hyperparameters(
+                source_hyperparams, perturb_bounds, perturb_factors, rng
+            )
+            for name, value in hyperparams.items():
+                setattr(model, name, value)
+            model._setup_lr_schedule()
+            history.append(
+                {
+                    "timesteps": model.num_timesteps,
+                    "copied_from": source,
+                    "score": score,
+                    "hyperparams": hyperparams,
+                }
+            )
+
+        model.save(os.path.join(member_dir, "final_model"))
+        env.save(os.path.join(member_dir, "vecnormalize.pkl"))
+        env.close()
+        record.update(hyperparams=hyperparams, history=history, status="completed")
+        store.publish(member_id, record)
+    except Exception:
+        record.update(status="failed", error=traceback.format_exc(limit=5))
+        store.publish(member_id, record)
+
+
+class PopulationBasedTrainer:
+    """Trains a PPO population with asynchronous exploit/explore."""
+
+    def __init__(
+        self,
+        scenario_path: str,
+        population_size: int = 4,
+        total_timesteps: int = 1000000,
+        ready_timesteps: int = 50000,
+        exploit_fraction: float = 0.25,
+        perturb_factors: Sequence[float] = (0.8, 1.25),
+        perturb_bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        initial_hyperparams: Optional[Dict[str, Tuple[float, float]]] = None,
+        cpus_per_member: Optional[int] = None,
+        pbt_dir: str = "pbt",
+        seed: Optional[int] = None,
+        start_method: Optional[str] = None,
+        **trainer_kwargs,
+    ):
+        """Initialize the population.
+
+        Args:
+            scenario_path: Path to scenario configuration file
+            population_size: Number of concurrent learners
+            total_timesteps: Training timesteps of every member
+            ready_timesteps: Timesteps between exploit/explore steps
+            exploit_fraction: Share of the population replaced from the top
+                group at each step
+            perturb_factors: Candidate factors applied on explore
+            perturb_bounds: Allowed range of each perturbed hyperparameter;
+                keys must be plain float attributes of PPO such as
+                ``learning_rate``, ``ent_coef`` or ``vf_coef`` (defaults to
+                ``DEFAULT_PERTURB_BOUNDS``)
+            initial_hyperparams: Log-uniform (low, high) range each member's
+                starting value is drawn from (defaults to the bounds)
+            cpus_per_member: Cores pinned to each member (defaults to an even
+                share of all cores)
+            pbt_dir: Directory for the store and member logs and models
+            seed: Seed of the initial hyperparameters and the members
+            start_method: Start method of the member processes
+            **trainer_kwargs: Fixed ``Trainer`` arguments of every member
+        """
+        if population_size < 2:
+            raise ValueError(f"population_size must be >= 2, got {population_size}")
+        if not 0 < exploit_fraction <= 0.5:
+            raise ValueError(
+                f"exploit_fraction must be in (0, 0.5], got {exploit_fraction}"
+            )
+        if trainer_kwargs.get("multi_agent"):
+            raise ValueError("Population-based training does not support multi-agent")
+
+        self.scenario_path = scenario_path
+        self.population_size = population_size
+        self.total_timesteps = total_timesteps
+        self.ready_timesteps = ready_timesteps
+        self.exploit_fraction = exploit_fraction
+        self.perturb_factors = tuple(perturb_factors)
+        self.perturb_bounds = perturb_bounds or DEFAULT_PERTURB_BOUNDS
+        self.initial_hyperparams = initial_hyperparams or self.perturb_bounds
+        self.cpus_per_member = cpus_per_member or max(
+            len(available_cpus()) // population_size, 1
+        )
+        self.pbt_dir = pbt_dir
+        self.seed = seed
+        self.start_method = start_method
+        self.trainer_kwargs = {"n_envs": 4, **trainer_kwargs}
+        self.store = PopulationStore(os.path.join(pbt_dir, "store"))
+
+    def initial_population(self) -> List[Dict[str, float]]:
+        """Draws the starting hyperparameters of every member."""
+        rng = np.random.default_rng(self.seed)
+        return [
+            {
+                name: float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                for name, (low, high) in self.initial_hyperparams.items()
+            }
+            for _ in range(self.population_size)
+        ]
+
+    def run(self) -> Dict[int, Dict[str, Any]]:
+        """Trains the population until every member is done.
+
+        Returns:
+            Final record of every member
+        """
+        ctx = mp.get_context(self.start_method)
+        cpu_slots = plan_cpu_affinity(self.population_size, self.cpus_per_member)
+        seeds = np.random.SeedSequence(self.seed).generate_state(self.population_size)
+
+        print(
+            f"🧬 Training a population of {self.population_size} for "
+            f"{self.total_timesteps} timesteps, exploit every {self.ready_timesteps}"
+        )
+        start = time.time()
+        processes = []
+        for member_id, hyperparams in enumerate(self.initial_population()):
+            process = ctx.Process(
+                target=_run_member,
+                args=(
+                    member_id,
+                    self.scenario_path,
+                    hyperparams,
+                    self.total_timesteps,
+                    self.ready_timesteps,
+                    self.exploit_fraction,
+                    self.perturb_bounds,
+                    self.perturb_factors,
+                    self.store.directory,
+                    os.path.join(self.pbt_dir, f"member_{member_id:02d}"),
+                    cpu_slots[member_id],
+                    int(seeds[member_id]),
+                    self.trainer_kwargs,
+                ),
+            )
+            process.start()
+            processes.append(process)
+
+        for process in processes:
+            process.join()
+
+        records = self.store.records()
+        for member_id, record in sorted(records.items()):
+            score = record.get("score")
+            print(
+                f"   member {member_id}: {record.get('status')}, score "
+                f"{'n/a' if score is None else f'{score:.2f}'}, "
+                f"{len(record.get('history', []))} exploits"
+            )
+            if record.get("status") == "failed":
+                print(record.get("error"))
+        best = self.best_member(records)
+        if best is not None:
+            print(
+                f"🏆 Best member {best['member_id']}: {best['score']:.2f} "
+                f"{best['hyperparams']} ({time.time() - start:.0f}s)"
+            )
+        return records
+
+    def best_member(
+        self, records: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the record of the best completed member, if any."""
+        records = records if records is not None else self.store.records()
+        completed = [
+            r
+            for r in records.values()
+            if r.get("status") == "completed" and r.get("score") is not None
+        ]
+        return max(completed, key=lambda r: r["score"]) if completed else None
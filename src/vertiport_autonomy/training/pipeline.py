@@ -0,0 +1,395 @@
+"""Pipelined rollout collection overlapping inference and simulation.
+
+In the regular PPO rollout loop the learner computes actions for all
+environments, then waits while all of them step, so the policy's threads
+and the environment workers take turns being idle. ``PipelinedVecEnv``
+splits the environments into two independently stepped halves and
+``PipelinedPPO`` alternates between them: while one half simulates, the
+policy runs on the other half's observations.
+
+Each half still steps its own environments strictly in sequence, so every
+transition is exactly what ``PPO`` would record; only the order in which
+the two halves are processed changes. ``VecNormalize`` statistics are
+updated half by half, which merges the same samples into the running
+statistics in a different order.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from gymnasium import spaces
+from stable_baselines3 import PPO
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.utils import obs_as_tensor
+from stable_baselines3.common.vec_env import VecEnv, VecNormalize
+
+
+def _take(obs, index):
+    """Indexes an observation batch (array or dict of arrays)."""
+    if isinstance(obs, dict):
+        return {key: value[index] for key, value in obs.items()}
+    return obs[index]
+
+
+def _concat(parts: List[Any]):
+    """Concatenates observation batches (arrays or dicts of arrays)."""
+    if isinstance(parts[0], dict):
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    return np.concatenate(parts)
+
+
+def _empty_like(obs):
+    if isinstance(obs, dict):
+        return {key: np.empty_like(value) for key, value in obs.items()}
+    return np.empty_like(obs)
+
+
+def _copy(obs):
+    if isinstance(obs, dict):
+        return {key: value.copy() for key, value in obs.items()}
+    return obs.copy()
+
+
+def _assign(out, index, obs) -> None:
+    if isinstance(out, dict):
+        for key in out:
+            out[key][index] = obs[key]
+    else:
+        out[index] = obs
+
+
+class PipelinedVecEnv(VecEnv):
+    """Two independently stepped vector environments presented as one.
+
+    ``step`` steps both halves like a single vector environment; the
+    ``half_step_async``/``half_step_wait`` pair lets a caller step one half
+    while doing other work. The halves should run in worker processes
+    (``"subproc"``, ``"shmem"`` or ``"remote"``), otherwise nothing overlaps.
+    """
+
+    def __init__(self, halves: Sequence[VecEnv]):
+        """Initialize the vector environment.
+
+        Args:
+            halves: The two vector environments, with identical spaces
+        """
+        if len(halves) != 2:
+            raise ValueError(f"Expected two halves, got {len(halves)}")
+        self.halves = list(halves)
+        sizes = [half.num_envs for half in self.halves]
+        self.slices = [slice(0, sizes[0]), slice(sizes[0], sum(sizes))]
+        super().__init__(
+            sum(sizes), self.halves[0].observation_space, self.halves[0].action_space
+        )
+
+    def half_step_async(self, half: int, actions: np.ndarray) -> None:
+        """Starts stepping one half with its slice of the actions."""
+        self.halves[half].step_async(actions)
+
+    def half_step_wait(self, half: int):
+        """Waits for one half and returns its step results."""
+        return self.halves[half].step_wait()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        for half, half_slice in zip(self.halves, self.slices):
+            half.step_async(actions[half_slice])
+
+    def step_wait(self):
+        results = [half.step_wait() for half in self.halves]
+        obs, rewards, dones, infos = zip(*results)
+        return (
+            _concat(list(obs)),
+            np.concatenate(rewards),
+            np.concatenate(dones),
+            [info for half_infos in infos for info in half_infos],
+        )
+
+    def reset(self):
+        for half, half_slice in zip(self.halves, self.slices):
+            for i, seed in enumerate(self._seeds[half_slice]):
+                half._seeds[i] = seed
+            half.set_options(self._options[half_slice])
+        obs = [half.reset() for half in self.halves]
+        self.reset_infos = [info for half in self.halves for info in half.reset_infos]
+        self._reset_seeds()
+        self._reset_options()
+        return _concat(obs)
+
+    def close(self) -> None:
+        for half in self.halves:
+            half.close()
+
+    def _dispatch(self, indices) -> Dict[int, List[int]]:
+        """Groups global env indices into ``{half: [local indices]}``."""
+        groups: Dict[int, List[int]] = {}
+        for i in self._get_indices(indices):
+            half = 0 if i < self.slices[0].stop else 1
+            groups.setdefault(half, []).append(i - self.slices[half].start)
+        return groups
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [
+            result
+            for half, local in self._dispatch(indices).items()
+            for result in self.halves[half].get_attr(attr_name, local)
+        ]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        for half, local in self._dispatch(indices).items():
+            self.halves[half].set_attr(attr_name, value, local)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        return [
+            result
+            for half, local in self._dispatch(indices).items()
+            for result in self.halves[half].env_method(
+                method_name, *method_args, indices=local, **method_kwargs
+            )
+        ]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [
+            result
+            for half, local in self._dispatch(indices).items()
+            for result in self.halves[half].env_is_wrapped(wrapper_class, local)
+        ]
+
+
+def find_pipelined_vec_env(env: VecEnv) -> Optional[PipelinedVecEnv]:
+    """Returns the ``PipelinedVecEnv`` below ``VecNormalize``, if any."""
+    while isinstance(env, VecNormalize):
+        env = env.venv
+    return env if isinstance(env, PipelinedVecEnv) else None
+
+
+def _write_rows(
+    target: Optional[np.ndarray], env_slice: slice, values: np.ndarray, num_envs: int
+) -> np.ndarray:
+    """Writes the rows of one half into a full-size array, allocating it if needed."""
+    if target is None or target.shape != (num_envs,) + values.shape[1:]:
+        target = np.zeros((num_envs,) + values.shape[1:], dtype=values.dtype)
+    target[env_slice] = values
+    return target
+
+
+def normalize_half(
+    vec_normalize: VecNormalize,
+    env_slice: slice,
+    obs,
+    rewards: np.ndarray,
+    dones: np.ndarray,
+    infos: List[Dict[str, Any]],
+) -> Tuple[Any, np.ndarray]:
+    """Applies ``VecNormalize.step_wait`` to the results of one half.
+
+    Args:
+        vec_normalize: Normalization wrapper of the full environment
+        env_slice: Environments of the half
+        obs: Raw observations of the half
+        rewards: Raw rewards of the half
+        dones: Done flags of the half
+        infos: Infos of the half (terminal observations are normalized in place)
+
+    Returns:
+        Normalized observations and rewards
+    """
+    # Keep get_original_obs() and get_original_reward() current for the half
+    num_envs = vec_normalize.num_envs
+    if isinstance(obs, dict):
+        if not isinstance(vec_normalize.old_obs, dict):
+            vec_normalize.old_obs = {}
+        for key, value in obs.items():
+            vec_normalize.old_obs[key] = _write_rows(
+                vec_normalize.old_obs.get(key), env_slice, value, num_envs
+            )
+    else:
+        vec_normalize.old_obs = _write_rows(
+            vec_normalize.old_obs, env_slice, obs, num_envs
+        )
+    vec_normalize.old_reward = _write_rows(
+        vec_normalize.old_reward, env_slice, rewards, num_envs
+    )
+
+    if vec_normalize.training and vec_normalize.norm_obs:
+        if isinstance(obs, dict) and isinstance(vec_normalize.obs_rms, dict):
+            for key in vec_normalize.obs_rms.keys():
+                vec_normalize.obs_rms[key].update(obs[key])
+        else:
+            vec_normalize.obs_rms.update(obs)
+    obs = vec_normalize.normalize_obs(obs)
+
+    returns = vec_normalize.returns[env_slice]
+    if vec_normalize.training:
+        returns[:] = returns * vec_normalize.gamma + rewards
+        vec_normalize.ret_rms.update(returns)
+    rewards = vec_normalize.normalize_reward(rewards)
+
+    for idx, done in enumerate(dones):
+        if done and "terminal_observation" in infos[idx]:
+            infos[idx]["terminal_observation"] = vec_normalize.normalize_obs(
+                infos[idx]["terminal_observation"]
+            )
+    returns[dones] = 0
+    return obs, rewards
+
+
+class PipelinedPPO(PPO):
+    """PPO whose rollouts overlap policy inference with simulation.
+
+    With a ``PipelinedVecEnv`` (optionally wrapped in ``VecNormalize``) the
+    halves are stepped alternately: actions for one half are computed while
+    the other half simulates. Any other environment falls back to the
+    regular ``PPO`` rollout loop.
+    """
+
+    def _infer(self, obs) -> Tuple[np.ndarray, np.ndarray, torch.Tensor, torch.Tensor]:
+        """Samples actions for one half like ``PPO.collect_rollouts``."""
+        with torch.no_grad():
+            actions, values, log_probs = self.policy(obs_as_tensor(obs, self.device))
+        actions = actions.cpu().numpy()
+
+        clipped_actions = actions
+        if isinstance(self.action_space, spaces.Box):
+            if self.policy.squash_output:
+                clipped_actions = self.policy.unscale_action(clipped_actions)
+            else:
+                clipped_actions = np.clip(
+                    actions, self.action_space.low, self.action_space.high
+                )
+        return actions, clipped_actions, values, log_probs
+
+    def collect_rollouts(
+        self,
+        env: VecEnv,
+        callback: BaseCallback,
+        rollout_buffer: RolloutBuffer,
+        n_rollout_steps: int,
+    ) -> bool:
+        pipelined = find_pipelined_vec_env(env)
+        if pipelined is None or self.use_sde:
+            return super().collect_rollouts(
+                env, callback, rollout_buffer, n_rollout_steps
+            )
+
+        assert self._last_obs is not None, "No previous observation was provided"
+        self.policy.set_training_mode(False)
+        rollout_buffer.reset()
+        callback.on_rollout_start()
+
+        vec_normalize = self.get_vec_normalize_env()
+        slices = pipelined.slices
+        num_envs = env.num_envs
+
+        def new_record() -> Dict[str, Any]:
+            """Allocates the buffer inputs of one step, filled half by half."""
+            return {
+                "obs": _empty_like(self._last_obs),
+                "episode_starts": np.zeros(num_envs, dtype=bool),
+                "actions": None,
+                "values": torch.zeros((num_envs, 1), device=self.device),
+                "log_probs": torch.zeros(num_envs, device=self.device),
+            }
+
+        def start(half: int, record: Dict[str, Any]) -> None:
+            """Computes one half's actions and starts stepping it."""
+            obs = _take(self._last_obs, slices[half])
+            actions, clipped_actions, values, log_probs = self._infer(obs)
+            pipelined.half_step_async(half, clipped_actions)
+
+            _assign(record["obs"], slices[half], obs)
+            record["episode_starts"][slices[half]] = self._last_episode_starts[
+                slices[half]
+            ]
+            if record["actions"] is None:
+                record["actions"] = np.zeros(
+                    (num_envs,) + actions.shape[1:], dtype=actions.dtype
+                )
+            record["actions"][slices[half]] = actions
+            record["values"][slices[half]] = values
+            record["log_probs"][slices[half]] = log_probs
+
+        def finish(half: int) -> Tuple[Any, np.ndarray, np.ndarray, List[Dict]]:
+            """Waits for one half and advances its observations."""
+            obs, rewards, dones, infos = pipelined.half_step_wait(half)
+            if vec_normalize is not None:
+                obs, rewards = normalize_half(
+                    vec_normalize, slices[half], obs, rewards, dones, infos
+                )
+            _assign(self._last_obs, slices[half], obs)
+            self._last_episode_starts[slices[half]] = dones
+            return obs, rewards, dones, infos
+
+        # The last observations are updated half by half from here on
+        self._last_obs = _copy(self._last_obs)
+        self._last_episode_starts = np.array(self._last_episode_starts, dtype=bool)
+
+        step_record = new_record()
+        start(0, step_record)
+        for n_steps in range(n_rollout_steps):
+            start(1, step_record)  # overlaps with the simulation of half 0
+            first = finish(0)
+            next_record = None
+            if n_steps + 1 < n_rollout_steps:
+                next_record = new_record()
+                start(0, next_record)  # overlaps with the simulation of half 1
+            second = finish(1)
+
+            new_obs = _copy(self._last_obs)
+            rewards = np.concatenate([first[1], second[1]])
+            dones = np.concatenate([first[2], second[2]])
+            infos = first[3] + second[3]
+            actions = step_record["actions"]
+            values = step_record["values"]
+            log_probs = step_record["log_probs"]
+
+            self.num_timesteps += num_envs
+
+            # Give access to local variables
+            callback.update_locals(locals())
+            if not callback.on_step():
+                if next_record is not None:
+                    # Let the half that is already stepping finish
+                    finish(0)
+                return False
+
+            self._update_info_buffer(infos, dones)
+
+            if isinstance(self.action_space, spaces.Discrete):
+                actions = actions.reshape(-1, 1)
+
+            # Handle timeout by bootstrapping with value function
+            for idx, done in enumerate(dones):
+                if (
+                    done
+                    and infos[idx].get("terminal_observation") is not None
+                    and infos[idx].get("TimeLimit.truncated", False)
+                ):
+                    terminal_obs = self.policy.obs_to_tensor(
+                        infos[idx]["terminal_observation"]
+                    )[0]
+                    with torch.no_grad():
+                        terminal_value = self.policy.predict_values(terminal_obs)[0]
+                    rewards[idx] += self.gamma * terminal_value
+
+            rollout_buffer.add(
+                step_record["obs"],
+                actions,
+                rewards,
+                step_record["episode_starts"],
+                values,
+                log_probs,
+            )
+            step_record = next_record
+
+        with torch.no_grad():
+            values = self.policy.predict_values(obs_as_tensor(new_obs, self.device))
+
+        rollout_buffer.compute_returns_and_advantage(last_values=values, dones=dones)
+
+        callback.update_locals(locals())
+
+        callback.on_rollout_end()
+
+        return True
@@ -0,0 +1,316 @@
+"""Behavior-cloning warm start from rule-based demonstrations.
+
+``collect_demonstrations`` rolls out a rule-based controller (by default
+the FCFS ``SimpleHeuristicAgent``) in parallel worker processes. Every worker writes
+its observations and actions straight into its own rows of memory-mapped
+``.npy`` files, so the dataset can be far larger than memory and is never
+pickled between processes. ``pretrain_policy`` then fits a PPO
+``MultiInputPolicy`` to the demonstrations by maximizing the log-likelihood
+of the demonstrated actions, in shuffled mini-batches read from the memory
+maps. It also initializes the ``VecNormalize`` observation statistics from
+the dataset, so PPO starts with the normalization the policy was cloned
+under.
+"""
+
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import torch
+from stable_baselines3 import PPO
+from stable_baselines3.common.running_mean_std import RunningMeanStd
+from stable_baselines3.common.vec_env import VecNormalize
+
+from ..agents.base import BaseAgent
+from ..agents.heuristic import SimpleHeuristicAgent
+from .vec_env import _obs_buffers_spec, limit_threads
+
+METADATA_FILE = "metadata.json"
+ACTIONS_FILE = "actions.npy"
+
+
+def _obs_file(key: str) -> str:
+    return f"obs_{key}.npy"
+
+
+def _collect_worker(
+    scenario_path: str,
+    env_kwargs: Dict[str, Any],
+    agent_factory: Optional[Callable[[], BaseAgent]],
+    dataset_dir: str,
+    start: int,
+    stop: int,
+    seed: Optional[int],
+) -> List[float]:
+    """Fills rows ``[start, stop)`` of the dataset with agent transitions."""
+    limit_threads(1)
+
+    from ..config.loader import load_scenario_config
+    from ..core.environment import VertiportEnv
+
+    config = load_scenario_config(scenario_path)
+    env = VertiportEnv(config, **env_kwargs)
+    if agent_factory is None:
+        agent = SimpleHeuristicAgent.from_config(config)
+    else:
+        agent = agent_factory()
+    observations = {
+        key: np.load(os.path.join(dataset_dir, _obs_file(key)), mmap_mode="r+")
+        for key in env.observation_space.spaces
+    }
+    actions = np.load(os.path.join(dataset_dir, ACTIONS_FILE), mmap_mode="r+")
+
+    obs, _ = env.reset(seed=seed)
+    agent.reset()
+    episode_rewards: List[float] = []
+    episode_reward = 0.0
+    for row in range(start, stop):
+        action = agent.act(obs)
+        for key, buffer in observations.items():
+            buffer[row] = obs[key]
+        actions[row] = action
+
+        obs, reward, terminated, truncated, _ = env.step(action)
+        episode_reward += reward
+        if terminated or truncated:
+            episode_rewards.append(episode_reward)
+            episode_reward = 0.0
+            obs, _ = env.reset()
+            agent.reset()
+
+    for buffer in list(observations.values()) + [actions]:
+        buffer.flush()
+    env.close()
+    return episode_rewards
+
+
+class DemonstrationDataset:
+    """Memory-mapped demonstration dataset written by ``collect_demonstrations``."""
+
+    def __init__(self, dataset_dir: str):
+        """Open a dataset read-only.
+
+        Args:
+            dataset_dir: Directory containing ``metadata.json`` and the arrays
+        """
+        self.dataset_dir = dataset_dir
+        with open(os.path.join(dataset_dir, METADATA_FILE)) as f:
+            self.metadata: Dict[str, Any] = json.load(f)
+        self.observations = {
+            key: np.load(os.path.join(dataset_dir, _obs_file(key)), mmap_mode="r")
+            for key in self.metadata["obs_keys"]
+        }
+        self.actions = np.load(os.path.join(dataset_dir, ACTIONS_FILE), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def iter_batches(
+        self, batch_size: int, rng: Optional[np.random.Generator] = None
+    ) -> Iterator[Tuple[Dict[str, np.ndarray], np.ndarray]]:
+        """Yields one shuffled epoch of ``(observations, actions)`` batches.
+
+        Indices within a batch are sorted so reads from the memory maps stay
+        as sequential as possible.
+
+        Args:
+            batch_size: Samples per batch
+            rng: Random number generator for the shuffle
+
+        Yields:
+            Observation dict and action array of each batch
+        """
+        rng = rng or np.random.default_rng()
+        order = rng.permutation(len(self))
+        for start in range(0, len(order), batch_size):
+            indices = np.sort(order[start : start + batch_size])
+            yield (
+                {key: array[indices] for key, array in self.observations.items()},
+                np.asarray(self.actions[indices]),
+            )
+
+
+def collect_demonstrations(
+    scenario_path: str,
+    dataset_dir: str,
+    n_samples: int,
+    n_workers: Optional[int] = None,
+    agent_factory: Optional[Callable[[], BaseAgent]] = None,
+    env_kwargs: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = 0,
+    start_method: Optional[str] = None,
+) -> DemonstrationDataset:
+    """Rolls out a rule-based agent in parallel into a memory-mapped dataset.
+
+    Args:
+        scenario_path: Path to scenario configuration file
+        dataset_dir: Output directory (existing arrays are overwritten)
+        n_samples: Number of transitions to record
+        n_workers: Rollout processes (defaults to the number of cores)
+        agent_factory: Picklable factory of the demonstrating agent (None
+            uses ``SimpleHeuristicAgent`` configured for the scenario)
+        env_kwargs: Extra keyword arguments for ``VertiportEnv``; must match
+            the environments the policy is trained on
+        seed: Base seed; worker ``i`` resets with ``seed + i``
+        start_method: Multiprocessing start method of the workers
+
+    Returns:
+        The written dataset
+    """
+    from ..config.loader import load_scenario_config
+    from ..core.environment import VertiportEnv
+
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be >= 1, got {n_samples}")
+    env_kwargs = dict(env_kwargs or {})
+    n_workers = min(n_workers or os.cpu_count() or 1, n_samples)
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    # Allocate the arrays up front; workers fill disjoint row ranges
+    env = VertiportEnv(load_scenario_config(scenario_path), **env_kwargs)
+    spec = _obs_buffers_spec(env.observation_space, n_samples)
+    for key, (shape, dtype) in spec.items():
+        np.lib.format.open_memmap(
+            os.path.join(dataset_dir, _obs_file(key)), "w+", dtype, shape
+        ).flush()
+    np.lib.format.open_memmap(
+        os.path.join(dataset_dir, ACTIONS_FILE),
+        "w+",
+        np.int64,
+        (n_samples,) + env.action_space.shape,
+    ).flush()
+    env.close()
+
+    bounds = np.linspace(0, n_samples, n_workers + 1).astype(int)
+    with ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=mp.get_context(start_method)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _collect_worker,
+                scenario_path,
+                env_kwargs,
+                agent_factory,
+                dataset_dir,
+                int(bounds[i]),
+                int(bounds[i + 1]),
+                None if seed is None else seed + i,
+            )
+            for i in range(n_workers)
+        ]
+        episode_rewards = [r for future in futures for r in future.result()]
+
+    metadata = {
+        "scenario": scenario_path,
+        "env_kwargs": env_kwargs,
+        "agent": getattr(agent_factory, "__name__", "SimpleHeuristicAgent"),
+        "n_samples": n_samples,
+        "obs_keys": list(spec),
+        "episodes": len(episode_rewards),
+        "mean_episode_reward": (
+            float(np.mean(episode_rewards)) if episode_rewards else None
+        ),
+    }
+    with open(os.path.join(dataset_dir, METADATA_FILE), "w") as f:
+        json.dump(metadata, f, indent=2)
+    return DemonstrationDataset(dataset_dir)
+
+
+def fit_observation_statistics(
+    vec_normalize: VecNormalize, dataset: DemonstrationDataset, chunk_size: int = 4096
+) -> None:
+    """Replaces the observation statistics of ``vec_normalize`` by the dataset's.
+
+    Args:
+        vec_normalize: Normalization wrapper of the training environment
+        dataset: Demonstration dataset
+        chunk_size: Samples read from the memory maps at a time
+    """
+    for key in vec_normalize.norm_obs_keys:
+        rms = RunningMeanStd(shape=vec_normalize.obs_rms[key].mean.shape)
+        array = dataset.observations[key]
+        for start in range(0, len(array), chunk_size):
+            rms.update(np.asarray(array[start : start + chunk_size]))
+        vec_normalize.obs_rms[key] = rms
+
+
+def pretrain_policy(
+    model: PPO,
+    dataset: DemonstrationDataset,
+    epochs: int = 5,
+    batch_size: int = 256,
+    learning_rate: float = 1e-3,
+    seed: Optional[int] = None,
+    verbose: int = 1,
+) -> Dict[str, List[float]]:
+    """Clones the demonstrated actions into the policy of a PPO model.
+
+    The policy is trained with its own Adam optimizer, so PPO's optimizer
+    state is untouched. If the model's environment is wrapped in
+    ``VecNormalize``, its observation statistics are first fitted to the
+    dataset and the batches are normalized with them.
+
+    Args:
+        model: PPO model whose policy is pretrained
+        dataset: Demonstration dataset matching the model's observation space
+        epochs: Passes over the dataset
+        batch_size: Samples per gradient step
+        learning_rate: Adam learning rate
+        seed: Seed of the batch shuffle
+        verbose: Print the loss and accuracy of every epoch if >= 1
+
+    Returns:
+        Per-epoch mean negative log-likelihood (``"loss"``) and fraction of
+        per-drone actions matched by the policy's mode (``"accuracy"``)
+    """
+    expected_keys = set(model.observation_space.spaces)
+    if set(dataset.observations) != expected_keys:
+        raise ValueError(
+            f"Dataset observations {sorted(dataset.observations)} do not match "
+            f"the policy's {sorted(expected_keys)}"
+        )
+
+    vec_normalize = model.get_vec_normalize_env()
+    if vec_normalize is not None and vec_normalize.norm_obs:
+        fit_observation_statistics(vec_normalize, dataset)
+
+    policy = model.policy
+    policy.set_training_mode(True)
+    optimizer = torch.optim.Adam(policy.parameters(), lr=learning_rate)
+    rng = np.random.default_rng(seed)
+
+    history: Dict[str, List[float]] = {"loss": [], "accuracy": []}
+    for epoch in range(epochs):
+        losses, correct, total = [], 0, 0
+        for obs, actions in dataset.iter_batches(batch_size, rng):
+            if vec_normalize is not None:
+                obs = vec_normalize.normalize_obs(obs)
+            obs_tensor, _ = policy.obs_to_tensor(obs)
+            actions_tensor = torch.as_tensor(actions, device=policy.device)
+
+            distribution = policy.get_distribution(obs_tensor)
+            loss = -distribution.log_prob(actions_tensor).mean()
+            optimizer.zero_grad()
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(policy.parameters(), model.max_grad_norm)
+            optimizer.step()
+
+            losses.append(loss.item())
+            with torch.no_grad():
+                predicted = distribution.mode().reshape(actions_tensor.shape)
+                correct += (predicted == actions_tensor).sum().item()
+                total += actions_tensor.numel()
+
+        history["loss"].append(float(np.mean(losses)))
+        history["accuracy"].append(correct / max(total, 1))
+        if verbose >= 1:
+            print(
+                f"   BC epoch {epoch + 1}/{epochs}: loss {history['loss'][-1]:.4f}, "
+                f"action accuracy {history['accuracy'][-1]:.3f}"
+            )
+
+    policy.set_training_mode(False)
+    return history
@@ -0,0 +1,305 @@
+"""Throughput profiling for PPO training runs.
+
+``ThroughputProfilerCallback`` splits the wall time of every rollout/update
+cycle into environment stepping, observation normalization, policy
+inference, rollout buffer inserts and the gradient update, and reports
+throughput and peak memory alongside. The numbers go to the model's logger
+(TensorBoard) under ``profile/`` and to a JSON summary at the end of
+training, which makes throughput regressions between releases visible.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecNormalize
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Rollout components measured by instrumenting the model and its environment
+ROLLOUT_SECTIONS = ("env_step", "normalize", "inference", "buffer_insert")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Returns the peak resident set size of this process in MiB.
+
+    Returns:
+        Peak RSS in MiB, or None where ``resource`` is unavailable
+    """
+    if resource is None:
+        return None
+
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _proc_tree_rss(pid: int) -> int:
+    """Sums the RSS in bytes of a process and its descendants from ``/proc``."""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields after it are "state ppid"
+        ppid = int(stat[stat.rfind(")") + 2 :].split()[1])
+        children[ppid].append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children[current])
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            continue
+    return total
+
+
+def process_tree_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Returns the current RSS of a process and all its descendants in MiB.
+
+    Descendants include workers started through a forkserver, which are
+    grandchildren of the process that owns the forkserver. Uses ``psutil``
+    where installed and ``/proc`` otherwise.
+
+    Args:
+        pid: Root process (default: this process)
+
+    Returns:
+        Summed RSS in MiB, or None where neither source is available
+    """
+    pid = os.getpid() if pid is None else pid
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root, *root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        return total / (1024 * 1024)
+    if not os.path.isdir("/proc"):
+        return None
+    return _proc_tree_rss(pid) / (1024 * 1024)
+
+
+class PeakMemorySampler:
+    """Tracks the peak summed RSS of a process tree in a background thread.
+
+    Used as a context manager; ``peak_mb`` holds the largest sample (None
+    where the RSS cannot be read).
+    """
+
+    def __init__(self, pid: Optional[int] = None, interval: float = 0.05):
+        """Initialize the sampler.
+
+        Args:
+            pid: Root process (default: this process)
+            interval: Seconds between samples
+        """
+        self.pid = pid
+        self.interval = interval
+        self.peak_mb: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        """Takes one sample."""
+        rss = process_tree_rss_mb(self.pid)
+        if rss is not None:
+            self.peak_mb = rss if self.peak_mb is None else max(self.peak_mb, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "PeakMemorySampler":
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+class ThroughputProfilerCallback(BaseCallback):
+    """Records a per-rollout timing breakdown of PPO training.
+
+    The environment's ``step``, ``VecNormalize`` normalization, the policy's
+    forward pass and the rollout buffer's ``add`` are wrapped with timers for
+    the duration of training. ``env_step`` includes normalization, which is
+    also reported separately; ``other`` is the remaining rollout time
+    (callbacks, tensor conversion, advantage computation). The update time
+    spans from the end of one rollout to the start of the next.
+    """
+
+    def __init__(self, summary_path: Optional[str] = None, verbose: int = 0):
+        """Initialize the callback.
+
+        Args:
+            summary_path: Where to write the JSON summary (None disables it)
+            verbose: Verbosity level
+        """
+        super().__init__(verbose)
+        self.summary_path = summary_path
+        self.rollouts: List[Dict[str, float]] = []
+
+        self._sections: Dict[str, float] = defaultdict(float)
+        self._patched: List[Tuple[Any, str]] = []
+        self._rollout_start = 0.0
+        self._update_start: Optional[float] = None
+        self._n_updates = 0
+        self._last_update_seconds = 0.0
+        self._last_updates = 0
+        self._training_start = 0.0
+
+    def _timed(self, section: str, fn: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._sections[section] += time.perf_counter() - start
+
+        return wrapper
+
+    def _patch(self, obj: Any, name: str, section: str) -> None:
+        """Replaces ``obj.name`` by a timed version on this instance only."""
+        setattr(obj, name, self._timed(section, getattr(obj, name)))
+        self._patched.append((obj, name))
+
+    def _on_training_start(self) -> None:
+        self._patch(self.training_env, "step", "env_step")
+        vec_normalize = self.model.get_vec_normalize_env()
+        if isinstance(vec_normalize, VecNormalize):
+            self._patch(vec_normalize, "normalize_obs", "normalize")
+            self._patch(vec_normalize, "normalize_reward", "normalize")
+        self._patch(self.model.policy, "forward", "inference")
+        self._patch(self.model.rollout_buffer, "add", "buffer_insert")
+
+        self._n_updates = getattr(self.model, "_n_updates", 0)
+        self._training_start = time.perf_counter()
+
+    def _finish_update(self, now: float) -> None:
+        """Closes the update phase that started at the last rollout end."""
+        if self._update_start is None:
+            return
+        n_updates = getattr(self.model, "_n_updates", 0)
+        self._last_update_seconds = now - self._update_start
+        self._last_updates = n_updates - self._n_updates
+        self._n_updates = n_updates
+        self._update_start = None
+        if self.rollouts:
+            self.rollouts[-1]["update"] = self._last_update_seconds
+            self.rollouts[-1]["gradient_steps"] = self._last_updates
+
+    def _on_rollout_start(self) -> None:
+        now = time.perf_counter()
+        self._finish_update(now)
+        self._sections.clear()
+        self._rollout_start = now
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self) -> None:
+        now = time.perf_counter()
+        rollout_seconds = now - self._rollout_start
+        steps = self.model.n_steps * self.training_env.num_envs
+
+        record = {section: self._sections[section] for section in ROLLOUT_SECTIONS}
+        record["other"] = rollout_seconds - sum(
+            record[s] for s in ROLLOUT_SECTIONS if s != "normalize"
+        )
+        record["rollout"] = rollout_seconds
+        record["timesteps"] = steps
+        record["update"] = 0.0
+        record["gradient_steps"] = 0
+        self.rollouts.append(record)
+
+        for key, value in record.items():
+            if key not in ("timesteps", "update", "gradient_steps"):
+                self.logger.record(f"profile/{key}_s", value)
+        self.logger.record(
+            "profile/env_steps_per_s", steps / max(rollout_seconds, 1e-9)
+        )
+        if self._last_update_seconds > 0:
+            # Update metrics refer to the previous iteration's update
+            self.logger.record("profile/update_s", self._last_update_seconds)
+            self.logger.record(
+                "profile/updates_per_s", self._last_updates / self._last_update_seconds
+            )
+        rss = peak_rss_mb()
+        if rss is not None:
+            self.logger.record("profile/peak_rss_mb", rss)
+
+        self._update_start = now
+
+    def _on_training_end(self) -> None:
+        self._finish_update(time.perf_counter())
+        for obj, name in reversed(self._patched):
+            delattr(obj, name)
+        self._patched = []
+
+        if self.summary_path is not None:
+            with open(self.summary_path, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+            if self.verbose >= 1:
+                print(f"Throughput profile saved to {self.summary_path}")
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates the recorded rollouts.
+
+        Returns:
+            Totals per section, their share of the wall time, throughput and
+            peak memory
+        """
+        wall_seconds = time.perf_counter() - self._training_start
+        sections = ROLLOUT_SECTIONS + ("other", "rollout", "update")
+        totals = {s: sum(r[s] for r in self.rollouts) for s in sections}
+        timesteps = sum(r["timesteps"] for r in self.rollouts)
+        gradient_steps = sum(r["gradient_steps"] for r in self.rollouts)
+
+        return {
+            "iterations": len(self.rollouts),
+            "timesteps": timesteps,
+            "wall_seconds": wall_seconds,
+            "seconds": totals,
+            "fraction": {
+                s: totals[s] / max(wall_seconds, 1e-9)
+                for s in sections
+                if s != "rollout"
+            },
+            "env_steps_per_s": timesteps / max(totals["rollout"], 1e-9),
+            "timesteps_per_s": timesteps / max(wall_seconds, 1e-9),
+            "updates_per_s": gradient_steps / max(totals["update"], 1e-9),
+            "peak_rss_mb": peak_rss_mb(),
+            "rollouts": self.rollouts,
+        }
@@ -0,0 +1,992 @@
+"""Rollout collection on remote machines over TCP.
+
+A ``RolloutWorker`` daemon hosts a batch of environments on one node and
+serves one learner at a time. The learner-side ``RemoteVecEnv`` spreads its
+environments over any number of workers and presents them as a single
+``VecEnv``, so it can be used in two ways:
+
+* lockstep: every ``step`` sends the actions to the workers and waits for
+  their observations, exactly like ``BatchedSubprocVecEnv``;
+* worker inference: ``DistributedPPO`` sends the policy weights and the
+  ``VecNormalize`` statistics to the workers once per rollout. Each worker
+  then runs the whole rollout with its own copy of the policy and streams
+  the trajectory back in compressed chunks, so no network round trip is
+  paid per environment step.
+
+All messages are pickled and zlib-compressed over
+``multiprocessing.connection`` sockets, which authenticate both ends with a
+shared key. Pickle still executes code from whoever holds the key, so
+workers must only listen on trusted networks. Set the key on both sides
+with the ``VERTIPORT_AUTHKEY`` environment variable.
+
+Streaming uses credit-based backpressure: a worker never has more than
+``max_chunks_in_flight`` unacknowledged chunks on the wire. Workers that
+stop responding are reconnected; if they stay unreachable, their
+environments are moved to the least loaded live worker. Episodes that are
+cut short by a failure end with ``done=True`` and
+``info["worker_failure"] = True``.
+
+For tests and single-machine runs, ``launch_local_workers`` starts workers
+on localhost.
+"""
+
+import pickle
+import threading
+import time
+import traceback
+import zlib
+from multiprocessing import get_context
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import gymnasium as gym
+import numpy as np
+import torch
+from gymnasium import spaces
+from stable_baselines3 import PPO
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.running_mean_std import RunningMeanStd
+from stable_baselines3.common.utils import obs_as_tensor
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv, VecNormalize
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper
+
+from ..ipc import Address, get_authkey, parse_address
+from .vec_env import BatchedSubprocVecEnv, limit_threads
+
+# Connection failures that trigger worker recovery
+WORKER_ERRORS = (EOFError, OSError, TimeoutError)
+
+
+def send_message(connection: Connection, message: Any, compress_level: int) -> None:
+    """Pickles, compresses and sends one message."""
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    if compress_level > 0:
+        connection.send_bytes(b"z" + zlib.compress(payload, compress_level))
+    else:
+        connection.send_bytes(b"r" + payload)
+
+
+def recv_message(connection: Connection, timeout: Optional[float] = None) -> Any:
+    """Receives one message.
+
+    Raises:
+        TimeoutError: If no message arrives within ``timeout`` seconds
+    """
+    if timeout is not None and not connection.poll(timeout):
+        raise TimeoutError(f"No message within {timeout} seconds")
+    data = connection.recv_bytes()
+    payload = zlib.decompress(data[1:]) if data[:1] == b"z" else data[1:]
+    return pickle.loads(payload)
+
+
+def _normalize(
+    obs: Union[np.ndarray, Dict[str, np.ndarray]],
+    normalization: Optional[Dict[str, Any]],
+):
+    """Applies ``VecNormalize`` observation statistics without updating them."""
+    if normalization is None:
+        return obs
+
+    def scale(value: np.ndarray, rms: RunningMeanStd) -> np.ndarray:
+        normalized = (value - rms.mean) / np.sqrt(rms.var + normalization["epsilon"])
+        clip = normalization["clip_obs"]
+        return np.clip(normalized, -clip, clip).astype(np.float32)
+
+    obs_rms = normalization["obs_rms"]
+    if isinstance(obs, dict):
+        return {
+            key: (
+                scale(value, obs_rms[key])
+                if key in normalization["norm_obs_keys"]
+                else value
+            )
+            for key, value in obs.items()
+        }
+    return scale(obs, obs_rms)
+
+
+def _stack(items: List[Any]):
+    """Stacks per-step observations (arrays or dicts of arrays) along axis 0."""
+    if isinstance(items[0], dict):
+        return {key: np.stack([item[key] for item in items]) for key in items[0]}
+    return np.stack(items)
+
+
+def _take(obs, index):
+    """Indexes an observation batch (array or dict of arrays)."""
+    if isinstance(obs, dict):
+        return {key: value[index] for key, value in obs.items()}
+    return obs[index]
+
+
+class _Session:
+    """Serves one learner connection on a worker thread."""
+
+    def __init__(
+        self,
+        connection: Connection,
+        backend: str,
+        compress_level: int,
+        vec_env_kwargs: Dict[str, Any],
+    ):
+        self.connection = connection
+        self.backend = backend
+        self.compress_level = compress_level
+        self.vec_env_kwargs = vec_env_kwargs
+        self.stop = threading.Event()
+        self.venv: Optional[VecEnv] = None
+        self.obs = None
+        self.policy = None
+        self.normalization: Optional[Dict[str, Any]] = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def send(self, message: Any) -> None:
+        send_message(self.connection, message, self.compress_level)
+
+    def run(self) -> None:
+        try:
+            while not self.stop.is_set():
+                if not self.connection.poll(0.2):
+                    continue
+                message = recv_message(self.connection)
+                command, args = message[0], message[1:]
+                if command == "close":
+                    break
+                if command == "ack":
+                    # Late credit from a finished collection
+                    continue
+                try:
+                    self.handle(command, *args)
+                except WORKER_ERRORS:
+                    raise
+                except Exception:
+                    self.send(("error", traceback.format_exc(limit=5)))
+        except WORKER_ERRORS:
+            pass
+        finally:
+            if self.venv is not None:
+                self.venv.close()
+            self.connection.close()
+
+    def build_venv(self, env_fns: List[Callable[[], gym.Env]]) -> VecEnv:
+        if self.backend == "dummy":
+            return DummyVecEnv(env_fns)
+        return BatchedSubprocVecEnv(
+            env_fns, shared_memory=self.backend == "shmem", **self.vec_env_kwargs
+        )
+
+    def handle(self, command: str, *args) -> None:
+        if command == "configure":
+            if self.venv is not None:
+                self.venv.close()
+            self.venv = self.build_venv(args[0].var)
+            self.obs = None
+            self.send(("ok", self.venv.observation_space, self.venv.action_space))
+        elif command == "reset":
+            seeds, options = args
+            for i, seed in enumerate(seeds):
+                self.venv._seeds[i] = seed
+            self.venv.set_options(options)
+            self.obs = self.venv.reset()
+            self.send(("ok", self.obs, self.venv.reset_infos))
+        elif command == "step":
+            self.venv.step_async(args[0])
+            obs, rewards, dones, infos = self.venv.step_wait()
+            self.obs = obs
+            self.send(("ok", obs, rewards, dones, infos))
+        elif command == "get_attr":
+            name, indices = args
+            self.send(("ok", self.venv.get_attr(name, indices)))
+        elif command == "set_attr":
+            name, value, indices = args
+            self.send(("ok", self.venv.set_attr(name, value, indices)))
+        elif command == "env_method":
+            name, method_args, method_kwargs, indices = args
+            result = self.venv.env_method(
+                name, *method_args, indices=indices, **method_kwargs
+            )
+            self.send(("ok", result))
+        elif command == "is_wrapped":
+            wrapper_class, indices = args
+            self.send(("ok", self.venv.env_is_wrapped(wrapper_class, indices)))
+        elif command == "set_policy":
+            policy_class, policy_kwargs, state_dict, self.normalization = args
+            self.policy = policy_class(**policy_kwargs)
+            self.policy.load_state_dict(state_dict)
+            self.policy.set_training_mode(False)
+            self.send(("ok",))
+        elif command == "collect":
+            self.collect(*args)
+        else:
+            raise NotImplementedError(f"`{command}` is not implemented in the worker")
+
+    def act(self, deterministic: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples actions for the current observations with the local policy."""
+        obs = _normalize(self.obs, self.normalization)
+        with torch.no_grad():
+            obs_tensor = obs_as_tensor(obs, self.policy.device)
+            actions, _, _ = self.policy(obs_tensor, deterministic=deterministic)
+        actions = actions.cpu().numpy()
+
+        clipped_actions = actions
+        action_space = self.venv.action_space
+        if isinstance(action_space, spaces.Box):
+            if self.policy.squash_output:
+                clipped_actions = self.policy.unscale_action(actions)
+            else:
+                clipped_actions = np.clip(actions, action_space.low, action_space.high)
+        return actions, clipped_actions
+
+    def collect(
+        self,
+        n_steps: int,
+        chunk_steps: int,
+        max_chunks_in_flight: int,
+        deterministic: bool,
+    ) -> None:
+        """Runs a rollout with the local policy and streams it in chunks."""
+        credits = max_chunks_in_flight
+        chunk: Dict[str, Any] = {"initial_obs": self.obs}
+        steps: Dict[str, List[Any]] = {
+            "actions": [],
+            "new_obs": [],
+            "rewards": [],
+            "dones": [],
+            "infos": [],
+        }
+        for step in range(n_steps):
+            if self.stop.is_set():
+                return
+            actions, clipped_actions = self.act(deterministic)
+            self.venv.step_async(clipped_actions)
+            obs, rewards, dones, infos = self.venv.step_wait()
+            self.obs = obs
+            for key, value in zip(steps, (actions, obs, rewards, dones, infos)):
+                steps[key].append(value)
+
+            if len(steps["actions"]) == chunk_steps or step == n_steps - 1:
+                while credits == 0:
+                    message = recv_message(self.connection)
+                    if message[0] == "ack":
+                        credits += 1
+                chunk.update(
+                    actions=np.stack(steps["actions"]),
+                    new_obs=_stack(steps["new_obs"]),
+                    rewards=np.stack(steps["rewards"]),
+                    dones=np.stack(steps["dones"]),
+                    infos=steps["infos"],
+                )
+                self.send(("chunk", chunk))
+                credits -= 1
+                chunk = {}
+                steps = {key: [] for key in steps}
+
+
+class RolloutWorker:
+    """Rollout worker daemon hosting environments for a remote learner.
+
+    Environments are created by the learner's factories, which are sent
+    with cloudpickle, so both ends need the same package version. A new
+    learner connection replaces the current one, which lets a learner
+    reconnect after a network failure.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        authkey: Optional[bytes] = None,
+        backend: str = "dummy",
+        compress_level: int = 1,
+        worker_threads: Optional[int] = 1,
+        **vec_env_kwargs,
+    ):
+        """Initialize the worker and bind its socket.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            authkey: Shared authentication key (see ``get_authkey``)
+            backend: How the hosted environments are vectorized on this node:
+                ``"dummy"``, ``"subproc"`` or ``"shmem"``
+            compress_level: zlib level of outgoing messages (0 disables)
+            worker_threads: PyTorch/BLAS threads for local policy inference
+            **vec_env_kwargs: Worker topology for subprocess backends
+        """
+        if backend not in ("dummy", "subproc", "shmem"):
+            raise ValueError(f"Unknown worker backend '{backend}'")
+        if worker_threads is not None:
+            limit_threads(worker_threads)
+        self.backend = backend
+        self.compress_level = compress_level
+        self.vec_env_kwargs = vec_env_kwargs
+        self.listener = Listener((host, port), authkey=get_authkey(authkey))
+
+    @property
+    def address(self) -> Address:
+        """Address the worker listens on."""
+        return self.listener.address
+
+    def serve_forever(self) -> None:
+        """Accepts learner connections until the process is stopped."""
+        session: Optional[_Session] = None
+        while True:
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError):
+                # Failed handshake, e.g. a wrong authentication key
+                continue
+            if session is not None:
+                session.stop.set()
+                session.thread.join()
+            session = _Session(
+                connection, self.backend, self.compress_level, self.vec_env_kwargs
+            )
+            session.thread.start()
+
+
+def _serve_local_worker(ready, worker_kwargs: Dict[str, Any]) -> None:
+    """Process entry point of a localhost worker."""
+    worker = RolloutWorker(**worker_kwargs)
+    ready.send(worker.address)
+    ready.close()
+    worker.serve_forever()
+
+
+def launch_local_workers(
+    n_workers: int,
+    start_method: Optional[str] = None,
+    **worker_kwargs,
+) -> Tuple[List[Address], List[Any]]:
+    """Starts rollout workers as local processes listening on localhost.
+
+    Args:
+        n_workers: Number of workers
+        start_method: Multiprocessing start method
+        **worker_kwargs: Arguments of ``RolloutWorker``
+
+    Returns:
+        Worker addresses and processes (terminate them when done)
+    """
+    ctx = get_context(start_method)
+    addresses, processes = [], []
+    for _ in range(n_workers):
+        ready, child_ready = ctx.Pipe()
+        # daemon=True: if the learner crashes, workers must not hang around
+        process = ctx.Process(
+            target=_serve_local_worker,
+            args=(child_ready, {"host": "127.0.0.1", **worker_kwargs}),
+            daemon=True,
+        )
+        process.start()
+        child_ready.close()
+        addresses.append(ready.recv())
+        ready.close()
+        processes.append(process)
+    return addresses, processes
+
+
+class RemoteVecEnv(VecEnv):
+    """Vector environment whose environments run on remote rollout workers."""
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        addresses: Sequence[Union[str, Address]],
+        authkey: Optional[bytes] = None,
+        timeout: float = 60.0,
+        reconnect_attempts: int = 3,
+        retry_interval: float = 1.0,
+        compress_level: int = 1,
+        chunk_steps: int = 64,
+        max_chunks_in_flight: int = 4,
+        worker_inference: bool = True,
+        local_processes: Optional[List[Any]] = None,
+    ):
+        """Connect to the workers and create the environments on them.
+
+        Args:
+            env_fns: Environment factories, split evenly across the workers
+            addresses: Worker addresses as ``"host:port"`` or tuples
+            authkey: Shared authentication key (see ``get_authkey``)
+            timeout: Seconds without a reply after which a worker counts as
+                failed
+            reconnect_attempts: Reconnection attempts before a failed
+                worker's environments move to another worker
+            retry_interval: Seconds between reconnection attempts
+            compress_level: zlib level of outgoing messages (0 disables)
+            chunk_steps: Steps per streamed trajectory chunk
+            max_chunks_in_flight: Unacknowledged chunks a worker may send
+            worker_inference: Let ``DistributedPPO`` run the policy on the
+                workers instead of stepping them in lockstep
+            local_processes: Worker processes owned by this environment and
+                terminated on ``close``
+        """
+        if not addresses:
+            raise ValueError("At least one worker address is required")
+        self.env_fns = env_fns
+        self.addresses = [parse_address(address) for address in addresses]
+        self.authkey = get_authkey(authkey)
+        self.timeout = timeout
+        self.reconnect_attempts = reconnect_attempts
+        self.retry_interval = retry_interval
+        self.compress_level = compress_level
+        self.chunk_steps = chunk_steps
+        self.max_chunks_in_flight = max_chunks_in_flight
+        self.worker_inference = worker_inference
+        self.local_processes = local_processes or []
+        self.waiting = False
+        self.closed = False
+        self._replay: List[Tuple[Any, ...]] = []
+        self._policy_message: Optional[Tuple[Any, ...]] = None
+
+        n_envs = len(env_fns)
+        bounds = np.linspace(0, n_envs, len(self.addresses) + 1).round().astype(int)
+        self.assignments: List[List[int]] = [
+            list(range(start, end)) for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        self.connections: List[Optional[Connection]] = [None] * len(self.addresses)
+
+        observation_space = action_space = None
+        for worker in self._active_workers():
+            observation_space, action_space = self._connect(worker)
+        super().__init__(n_envs, observation_space, action_space)
+
+    # Connection management
+
+    def _active_workers(self) -> List[int]:
+        return [w for w, indices in enumerate(self.assignments) if indices]
+
+    def _send(self, worker: int, message: Any) -> None:
+        send_message(self.connections[worker], message, self.compress_level)
+
+    def _recv(self, worker: int) -> Any:
+        reply = recv_message(self.connections[worker], self.timeout)
+        if reply[0] == "error":
+            raise RuntimeError(
+                f"Rollout worker {self.addresses[worker]} failed:\n{reply[1]}"
+            )
+        return reply
+
+    def _request(self, worker: int, message: Any) -> Any:
+        self._send(worker, message)
+        return self._recv(worker)
+
+    def _connect(self, worker: int) -> Tuple[spaces.Space, spaces.Space]:
+        """(Re)connects a worker and creates its assigned environments."""
+        if self.connections[worker] is not None:
+            self.connections[worker].close()
+            self.connections[worker] = None
+        connection = Client(self.addresses[worker], authkey=self.authkey)
+        self.connections[worker] = connection
+        env_fns = [self.env_fns[i] for i in self.assignments[worker]]
+        _, observation_space, action_space = self._request(
+            worker, ("configure", CloudpickleWrapper(env_fns))
+        )
+        if self._policy_message is not None:
+            self._request(worker, self._policy_message)
+        return observation_space, action_space
+
+    def _recover(self, worker: int) -> List[int]:
+        """Restores the environments of a failed worker.
+
+        Returns:
+            Workers whose environments were recreated and need a reset
+        """
+        for attempt in range(self.reconnect_attempts):
+            try:
+                self._connect(worker)
+                return [worker]
+            except WORKER_ERRORS:
+                time.sleep(self.retry_interval)
+
+        # Give up on the worker and move its environments elsewhere
+        if self.connections[worker] is not None:
+            self.connections[worker].close()
+            self.connections[worker] = None
+        orphans, self.assignments[worker] = self.assignments[worker], []
+        live = [w for w in self._active_workers() if self.connections[w] is not None]
+        if not live:
+            raise ConnectionError("All rollout workers are unreachable")
+        target = min(live, key=lambda w: len(self.assignments[w]))
+        self.assignments[target] = sorted(self.assignments[target] + orphans)
+        try:
+            self._connect(target)
+        except WORKER_ERRORS:
+            return self._recover(target)
+        return [target]
+
+    def _reset_workers(self, workers: List[int], obs, infos: List[Dict]) -> None:
+        """Resets recreated workers and writes their first observations."""
+        for worker in workers:
+            indices = self.assignments[worker]
+            reply = self._request(
+                worker,
+                (
+                    "reset",
+                    [self._seeds[i] for i in indices],
+                    [self._options[i] for i in indices],
+                ),
+            )
+            self._scatter(obs, indices, reply[1])
+            for i in indices:
+                infos[i] = {"worker_failure": True}
+
+    # Observation assembly
+
+    def _empty_obs(self):
+        def empty(space: spaces.Space) -> np.ndarray:
+            return np.zeros((self.num_envs,) + space.shape, dtype=space.dtype)
+
+        if isinstance(self.observation_space, spaces.Dict):
+            return {
+                key: empty(space)
+                for key, space in self.observation_space.spaces.items()
+            }
+        return empty(self.observation_space)
+
+    @staticmethod
+    def _scatter(out, indices: List[int], obs) -> None:
+        if isinstance(out, dict):
+            for key in out:
+                out[key][indices] = obs[key]
+        else:
+            out[indices] = obs
+
+    # VecEnv interface
+
+    def step_async(self, actions: np.ndarray) -> None:
+        if not self._replay:
+            for worker in self._active_workers():
+                self._send(worker, ("step", actions[self.assignments[worker]]))
+        self.waiting = True
+
+    def step_wait(self):
+        self.waiting = False
+        if self._replay:
+            # Replay a step collected by worker inference (see ``collect``)
+            return self._replay.pop(0)
+
+        obs = self._empty_obs()
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos: List[Dict] = [{} for _ in range(self.num_envs)]
+        failed = []
+        for worker in self._active_workers():
+            indices = self.assignments[worker]
+            try:
+                _, worker_obs, worker_rewards, worker_dones, worker_infos = self._recv(
+                    worker
+                )
+            except WORKER_ERRORS:
+                failed.append(worker)
+                continue
+            self._scatter(obs, indices, worker_obs)
+            rewards[indices] = worker_rewards
+            dones[indices] = worker_dones
+            for i, info in zip(indices, worker_infos):
+                infos[i] = info
+
+        for worker in failed:
+            recreated = self._recover(worker)
+            self._reset_workers(recreated, obs, infos)
+            for recreated_worker in recreated:
+                indices = self.assignments[recreated_worker]
+                rewards[indices] = 0.0
+                dones[indices] = True
+        return obs, rewards, dones, infos
+
+    def reset(self):
+        self._replay = []
+        obs = self._empty_obs()
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        for worker in self._active_workers():
+            indices = self.assignments[worker]
+            try:
+                reply = self._request(
+                    worker,
+                    (
+                        "reset",
+                        [self._seeds[i] for i in indices],
+                        [self._options[i] for i in indices],
+                    ),
+                )
+            except WORKER_ERRORS:
+                self._reset_workers(self._recover(worker), obs, self.reset_infos)
+                continue
+            self._scatter(obs, indices, reply[1])
+            for i, info in zip(indices, reply[2]):
+                self.reset_infos[i] = info
+        self._reset_seeds()
+        self._reset_options()
+        return obs
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        for worker, connection in enumerate(self.connections):
+            if connection is None:
+                continue
+            try:
+                self._send(worker, ("close",))
+            except WORKER_ERRORS:
+                pass
+            connection.close()
+        for process in self.local_processes:
+            process.terminate()
+            process.join()
+        self.closed = True
+
+    def _locate(self, indices) -> Dict[int, List[Tuple[int, int]]]:
+        """Groups global env indices into ``{worker: [(global, local)]}``."""
+        positions = {
+            i: (worker, local)
+            for worker, assigned in enumerate(self.assignments)
+            for local, i in enumerate(assigned)
+        }
+        groups: Dict[int, List[Tuple[int, int]]] = {}
+        for i in self._get_indices(indices):
+            worker, local = positions[i]
+            groups.setdefault(worker, []).append((i, local))
+        return groups
+
+    def _call(self, command: str, make_args, indices) -> List[Any]:
+        results: Dict[int, Any] = {}
+        for worker, pairs in self._locate(indices).items():
+            message = (command,) + make_args([local for _, local in pairs])
+            try:
+                reply = self._request(worker, message)
+            except WORKER_ERRORS:
+                self._reset_workers(
+                    self._recover(worker), self._empty_obs(), [{}] * self.num_envs
+                )
+                return self._call(command, make_args, indices)
+            for (i, _), result in zip(pairs, reply[1]):
+                results[i] = result
+        return [results[i] for i in self._get_indices(indices)]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return self._call("get_attr", lambda local: (attr_name, local), indices)
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        self._call("set_attr", lambda local: (attr_name, value, local), indices)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        return self._call(
+            "env_method",
+            lambda local: (method_name, method_args, method_kwargs, local),
+            indices,
+        )
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return self._call("is_wrapped", lambda local: (wrapper_class, local), indices)
+
+    # Worker inference
+
+    def set_policy(
+        self, policy: torch.nn.Module, vec_normalize: Optional[VecNormalize] = None
+    ) -> None:
+        """Sends policy weights and observation statistics to all workers.
+
+        Args:
+            policy: SB3 policy to copy to the workers
+            vec_normalize: Normalization wrapper whose observation statistics
+                the workers apply before inference
+        """
+        normalization = None
+        if vec_normalize is not None and vec_normalize.norm_obs:
+            normalization = {
+                "obs_rms": vec_normalize.obs_rms,
+                "clip_obs": vec_normalize.clip_obs,
+                "epsilon": vec_normalize.epsilon,
+                "norm_obs_keys": vec_normalize.norm_obs_keys,
+            }
+        state_dict = {key: value.cpu() for key, value in policy.state_dict().items()}
+        self._policy_message = (
+            "set_policy",
+            type(policy),
+            policy._get_constructor_parameters(),
+            state_dict,
+            normalization,
+        )
+        for worker in self._active_workers():
+            try:
+                self._request(worker, self._policy_message)
+            except WORKER_ERRORS:
+                self._reset_workers(
+                    self._recover(worker), self._empty_obs(), [{}] * self.num_envs
+                )
+
+    def collect(
+        self, n_steps: int, deterministic: bool = False
+    ) -> Tuple[np.ndarray, Any, np.ndarray]:
+        """Collects a rollout with the policy running on the workers.
+
+        The collected steps are queued for replay: the next ``n_steps`` calls
+        of ``step`` return them in order and ignore their actions, so wrappers
+        such as ``VecNormalize`` process them exactly as in lockstep mode.
+
+        Args:
+            n_steps: Steps per environment
+            deterministic: Use deterministic actions
+
+        Returns:
+            Tuple of the ``restarted`` mask of environments that were
+            recreated after a worker failure (their rollout starts from a new
+            episode), the raw first observations of the rollout and the
+            actions taken, shaped ``(n_steps, n_envs, ...)``
+        """
+        if self._policy_message is None:
+            raise RuntimeError("Call set_policy() before collect()")
+
+        restarted = np.zeros(self.num_envs, dtype=bool)
+        chunks: Dict[int, List[Dict[str, Any]]] = {}
+        pending: Dict[Connection, int] = {}
+
+        def start(worker: int) -> None:
+            chunks[worker] = []
+            self._send(
+                worker,
+                (
+                    "collect",
+                    n_steps,
+                    self.chunk_steps,
+                    self.max_chunks_in_flight,
+                    deterministic,
+                ),
+            )
+            pending[self.connections[worker]] = worker
+
+        def fail(worker: int) -> None:
+            for connection, pending_worker in list(pending.items()):
+                if pending_worker == worker:
+                    del pending[connection]
+            chunks.pop(worker, None)
+            recreated = self._recover(worker)
+            self._reset_workers(recreated, self._empty_obs(), [{}] * self.num_envs)
+            for recreated_worker in recreated:
+                # The rehosting worker's collection restarts with the new envs
+                for connection, pending_worker in list(pending.items()):
+                    if pending_worker == recreated_worker:
+                        del pending[connection]
+                restarted[self.assignments[recreated_worker]] = True
+                start(recreated_worker)
+
+        for worker in self._active_workers():
+            try:
+                start(worker)
+            except WORKER_ERRORS:
+                fail(worker)
+
+        while pending:
+            ready = wait(list(pending), timeout=self.timeout)
+            if not ready:
+                for worker in set(pending.values()):
+                    fail(worker)
+                continue
+            for connection in ready:
+                if connection not in pending:
+                    continue
+                worker = pending[connection]
+                try:
+                    reply = self._recv(worker)
+                    chunks[worker].append(reply[1])
+                    received = sum(len(chunk["actions"]) for chunk in chunks[worker])
+                    if received == n_steps:
+                        del pending[connection]
+                    self._send(worker, ("ack",))
+                except WORKER_ERRORS:
+                    fail(worker)
+
+        return (restarted,) + self._assemble(chunks, n_steps)
+
+    def _assemble(self, chunks: Dict[int, List[Dict[str, Any]]], n_steps: int):
+        """Merges worker chunks into global arrays and queues the replay."""
+        initial_obs = self._empty_obs()
+        new_obs = _stack([self._empty_obs() for _ in range(n_steps)])
+        actions = None
+        rewards = np.zeros((n_steps, self.num_envs), dtype=np.float32)
+        dones = np.zeros((n_steps, self.num_envs), dtype=bool)
+        infos: List[List[Dict]] = [
+            [{} for _ in range(self.num_envs)] for _ in range(n_steps)
+        ]
+
+        for worker, worker_chunks in chunks.items():
+            indices = self.assignments[worker]
+            self._scatter(initial_obs, indices, worker_chunks[0]["initial_obs"])
+            step = 0
+            for chunk in worker_chunks:
+                length = len(chunk["actions"])
+                if actions is None:
+                    actions = np.zeros(
+                        (n_steps, self.num_envs) + chunk["actions"].shape[2:],
+                        dtype=chunk["actions"].dtype,
+                    )
+                window = slice(step, step + length)
+                actions[window, indices] = chunk["actions"]
+                rewards[window, indices] = chunk["rewards"]
+                dones[window, indices] = chunk["dones"]
+                for t in range(length):
+                    self._scatter(
+                        _take(new_obs, step + t), indices, _take(chunk["new_obs"], t)
+                    )
+                    for i, info in zip(indices, chunk["infos"][t]):
+                        infos[step + t][i] = info
+                step += length
+
+        self._replay = [
+            (_take(new_obs, t), rewards[t], dones[t], infos[t]) for t in range(n_steps)
+        ]
+        return initial_obs, actions
+
+
+def find_remote_vec_env(env: VecEnv) -> Optional[RemoteVecEnv]:
+    """Returns the ``RemoteVecEnv`` below ``VecNormalize``, if any.
+
+    Worker inference is only supported when every wrapper between the model
+    and the remote environment is a ``VecNormalize``.
+    """
+    while isinstance(env, VecNormalize):
+        env = env.venv
+    return env if isinstance(env, RemoteVecEnv) else None
+
+
+class DistributedPPO(PPO):
+    """PPO that lets remote rollout workers run the policy.
+
+    With a ``RemoteVecEnv`` (optionally wrapped in ``VecNormalize``), each
+    rollout ships the current weights and observation statistics to the
+    workers, which collect the whole rollout locally and stream it back.
+    Values and log-probabilities are then recomputed on the learner in one
+    batched pass over the rollout, so the rollout buffer matches what
+    ``PPO`` would have stored. The workers
+    normalize with the statistics from the start of the rollout, so
+    actions may be sampled from a marginally stale normalization. Any other
+    environment falls back to the regular ``PPO`` rollout loop.
+    """
+
+    def collect_rollouts(
+        self,
+        env: VecEnv,
+        callback: BaseCallback,
+        rollout_buffer: RolloutBuffer,
+        n_rollout_steps: int,
+    ) -> bool:
+        remote = find_remote_vec_env(env)
+        if remote is None or not remote.worker_inference or self.use_sde:
+            return super().collect_rollouts(
+                env, callback, rollout_buffer, n_rollout_steps
+            )
+
+        assert self._last_obs is not None, "No previous observation was provided"
+        self.policy.set_training_mode(False)
+        rollout_buffer.reset()
+        callback.on_rollout_start()
+
+        vec_normalize = self.get_vec_normalize_env()
+        remote.set_policy(self.policy, vec_normalize)
+        restarted, initial_obs, rollout_actions = remote.collect(n_rollout_steps)
+        if restarted.any():
+            # Environments recreated after a worker failure start new episodes
+            if vec_normalize is not None:
+                initial_obs = vec_normalize.normalize_obs(initial_obs)
+                vec_normalize.returns[restarted] = 0
+            self._scatter_last_obs(restarted, initial_obs)
+            self._last_episode_starts[restarted] = True
+
+        # Replay every step first; values and log-probabilities of the whole
+        # rollout are then computed in one batched forward pass
+        placeholder = torch.zeros(env.num_envs)
+        for n_steps in range(n_rollout_steps):
+            actions = rollout_actions[n_steps]
+
+            # Replays the collected step through the environment wrappers
+            new_obs, rewards, dones, infos = env.step(actions)
+
+            self.num_timesteps += env.num_envs
+
+            # Give access to local variables
+            callback.update_locals(locals())
+            if not callback.on_step():
+                return False
+
+            self._update_info_buffer(infos, dones)
+
+            if isinstance(self.action_space, spaces.Discrete):
+                actions = actions.reshape(-1, 1)
+
+            # Handle timeout by bootstrapping with value function
+            for idx, done in enumerate(dones):
+                if (
+                    done
+                    and infos[idx].get("terminal_observation") is not None
+                    and infos[idx].get("TimeLimit.truncated", False)
+                ):
+                    terminal_obs = self.policy.obs_to_tensor(
+                        infos[idx]["terminal_observation"]
+                    )[0]
+                    with torch.no_grad():
+                        terminal_value = self.policy.predict_values(terminal_obs)[0]
+                    rewards[idx] += self.gamma * terminal_value
+
+            rollout_buffer.add(
+                self._last_obs,
+                actions,
+                rewards,
+                self._last_episode_starts,
+                placeholder,
+                placeholder,
+            )
+            self._last_obs = new_obs
+            self._last_episode_starts = dones
+
+        self._evaluate_rollout(rollout_buffer, rollout_actions)
+        with torch.no_grad():
+            values = self.policy.predict_values(obs_as_tensor(new_obs, self.device))
+
+        rollout_buffer.compute_returns_and_advantage(last_values=values, dones=dones)
+
+        callback.update_locals(locals())
+
+        callback.on_rollout_end()
+
+        return True
+
+    def _evaluate_rollout(
+        self, rollout_buffer: RolloutBuffer, rollout_actions: np.ndarray
+    ) -> None:
+        """Fills the values and log-probabilities of a replayed rollout.
+
+        The policy does not change during a rollout, so evaluating all
+        stored observations at once gives the same results as evaluating
+        each step before it is taken.
+
+        Args:
+            rollout_buffer: Buffer holding the replayed rollout
+            rollout_actions: Actions shaped ``(n_steps, n_envs, ...)``
+        """
+        n_steps, n_envs = rollout_actions.shape[:2]
+
+        def flatten(array: np.ndarray) -> np.ndarray:
+            return array.reshape((n_steps * n_envs,) + array.shape[2:])
+
+        observations = rollout_buffer.observations
+        if isinstance(observations, dict):
+            observations = {key: flatten(obs) for key, obs in observations.items()}
+        else:
+            observations = flatten(observations)
+        with torch.no_grad():
+            values, log_probs, _ = self.policy.evaluate_actions(
+                obs_as_tensor(observations, self.device),
+                torch.as_tensor(flatten(rollout_actions), device=self.device),
+            )
+        rollout_buffer.values[:] = values.cpu().numpy().reshape(n_steps, n_envs)
+        rollout_buffer.log_probs[:] = log_probs.cpu().numpy().reshape(n_steps, n_envs)
+
+    def _scatter_last_obs(self, mask: np.ndarray, obs) -> None:
+        if isinstance(self._last_obs, dict):
+            for key in self._last_obs:
+                self._last_obs[key][mask] = obs[key][mask]
+        else:
+            self._last_obs[mask] = obs[mask]
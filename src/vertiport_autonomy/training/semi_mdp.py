@@ -0,0 +1,113 @@
+"""Semi-MDP discounting for macro-steps of variable length.
+
+Under ``DecisionPointWrapper`` one transition of the learner spans ``k``
+simulator ticks, so the value of the next decision point must be
+discounted by ``gamma**k`` instead of ``gamma``. The wrapper reports that
+discount as ``info["discount"]``. ``SemiMDPDiscountCallback`` records it in
+the rollout buffer before each transition is added, and the buffers made
+by ``semi_mdp_rollout_buffer`` use it for GAE. Transitions without the key
+are discounted by ``gamma``, as by the stock buffers.
+"""
+
+from functools import lru_cache
+from typing import Type
+
+import numpy as np
+import torch
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+class SemiMDPBufferMixin:
+    """Rollout buffer mixin with a discount per transition."""
+
+    def reset(self) -> None:
+        super().reset()
+        self.discounts = np.full(
+            (self.buffer_size, self.n_envs), self.gamma, dtype=np.float32
+        )
+
+    def compute_returns_and_advantage(
+        self, last_values: torch.Tensor, dones: np.ndarray
+    ) -> None:
+        """GAE(lambda) with the discount of each transition.
+
+        Args:
+            last_values: Value estimates of the observations after the last
+                transition
+            dones: Whether the last transition ended an episode
+        """
+        last_values = last_values.clone().cpu().numpy().flatten()
+
+        last_gae_lam = 0
+        for step in reversed(range(self.buffer_size)):
+            if step == self.buffer_size - 1:
+                next_non_terminal = 1.0 - dones.astype(np.float32)
+                next_values = last_values
+            else:
+                next_non_terminal = 1.0 - self.episode_starts[step + 1]
+                next_values = self.values[step + 1]
+            discount = self.discounts[step]
+            delta = (
+                self.rewards[step]
+                + discount * next_values * next_non_terminal
+                - self.values[step]
+            )
+            last_gae_lam = (
+                delta + discount * self.gae_lambda * next_non_terminal * last_gae_lam
+            )
+            self.advantages[step] = last_gae_lam
+        self.returns = self.advantages + self.values
+
+
+@lru_cache(maxsize=None)
+def semi_mdp_rollout_buffer(buffer_class: Type[RolloutBuffer]) -> Type[RolloutBuffer]:
+    """Returns the semi-MDP variant of a rollout buffer class.
+
+    Args:
+        buffer_class: ``RolloutBuffer`` or a subclass, e.g.
+            ``DictRolloutBuffer`` or ``MaskableDictRolloutBuffer``
+
+    Returns:
+        Subclass of ``buffer_class`` that discounts by ``discounts``
+    """
+    return type(
+        f"SemiMDP{buffer_class.__name__}", (SemiMDPBufferMixin, buffer_class), {}
+    )
+
+
+class SemiMDPDiscountCallback(BaseCallback):
+    """Feeds the per-transition discounts to a semi-MDP rollout buffer.
+
+    Also rescales the value bootstrap of truncated episodes, which the
+    algorithm adds to the reward with ``gamma``, to the discount of the
+    final macro-step.
+    """
+
+    def _on_step(self) -> bool:
+        buffer = self.model.rollout_buffer
+        if not isinstance(buffer, SemiMDPBufferMixin):
+            return True
+        gamma = self.model.gamma
+        infos = self.locals["infos"]
+        discounts = np.array(
+            [info.get("discount", gamma) for info in infos], dtype=np.float32
+        )
+        # Called after the environment step, before the transition is added
+        buffer.discounts[buffer.pos] = discounts
+
+        rewards = self.locals["rewards"]
+        policy = self.model.policy
+        for idx, done in enumerate(self.locals["dones"]):
+            terminal_obs = infos[idx].get("terminal_observation")
+            if (
+                done
+                and terminal_obs is not None
+                and infos[idx].get("TimeLimit.truncated", False)
+                and discounts[idx] != np.float32(gamma)
+            ):
+                terminal_obs = policy.obs_to_tensor(terminal_obs)[0]
+                with torch.no_grad():
+                    terminal_value = policy.predict_values(terminal_obs)[0].item()
+                rewards[idx] += (discounts[idx] - gamma) * terminal_value
+        return True
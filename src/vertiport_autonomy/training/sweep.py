@@ -0,0 +1,375 @@
+"""Parallel hyperparameter search with asynchronous successive halving.
+
+``HyperparameterSweep`` samples trial configurations from a search space and
+trains them as separate processes, each pinned to its own share of the CPU
+cores. Trials train in rungs of geometrically growing timestep budgets
+(``min_timesteps * reduction_factor**k``); after every rung the trial is
+evaluated on a separate environment and the coordinator decides whether it
+continues. Following ASHA, a trial is promoted only if its score ranks in
+the top ``1 / reduction_factor`` of all scores reported at that rung so far,
+so weak configurations stop early and free their cores for new trials.
+Every finished trial is appended to ``trials.jsonl`` in the sweep directory,
+next to each trial's last evaluated model and normalization statistics.
+"""
+
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .vec_env import available_cpus, limit_threads, pin_to_cpus, plan_cpu_affinity
+
+# Each entry is either a list of choices or a ("uniform" | "log_uniform" |
+# "int", low, high) tuple
+SearchSpace = Dict[str, Union[List[Any], Tuple[str, float, float]]]
+
+DEFAULT_SEARCH_SPACE: SearchSpace = {
+    "learning_rate": ("log_uniform", 1e-5, 1e-3),
+    "ent_coef": ("log_uniform", 1e-4, 5e-2),
+    "n_steps": [256, 512, 1024, 2048],
+    "batch_size": [64, 128, 256],
+    "gamma": [0.98, 0.99, 0.995],
+    "gae_lambda": ("uniform", 0.9, 0.98),
+    "clip_range": ("uniform", 0.1, 0.3),
+}
+
+
+def sample_params(
+    search_space: SearchSpace, rng: np.random.Generator
+) -> Dict[str, Any]:
+    """Draws one configuration from a search space.
+
+    Args:
+        search_space: Parameter specifications
+        rng: Random number generator
+
+    Returns:
+        Sampled parameters as plain Python values
+    """
+    params: Dict[str, Any] = {}
+    for name, spec in search_space.items():
+        if isinstance(spec, list):
+            params[name] = spec[rng.integers(len(spec))]
+            continue
+
+        kind, low, high = spec
+        if kind == "uniform":
+            params[name] = float(rng.uniform(low, high))
+        elif kind == "log_uniform":
+            params[name] = float(math.exp(rng.uniform(math.log(low), math.log(high))))
+        elif kind == "int":
+            params[name] = int(rng.integers(low, high + 1))
+        else:
+            raise ValueError(f"Unknown distribution '{kind}' for parameter '{name}'")
+    return params
+
+
+def rung_budgets(
+    min_timesteps: int, max_timesteps: int, reduction_factor: int
+) -> List[int]:
+    """Returns the cumulative timestep budget of every rung.
+
+    Args:
+        min_timesteps: Budget of the first rung
+        max_timesteps: Budget of the last rung
+        reduction_factor: Growth factor between rungs
+
+    Returns:
+        Increasing budgets ending at ``max_timesteps``
+    """
+    budgets = []
+    budget = min_timesteps
+    while budget < max_timesteps:
+        budgets.append(budget)
+        budget *= reduction_factor
+    budgets.append(max_timesteps)
+    return budgets
+
+
+@dataclass
+class TrialResult:
+    """Record of one sweep trial."""
+
+    trial_id: int
+    params: Dict[str, Any]
+    status: str = "running"
+    rung_scores: List[float] = field(default_factory=list)
+    timesteps: int = 0
+    score: Optional[float] = None
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _run_trial(
+    trial_id: int,
+    scenario_path: str,
+    params: Dict[str, Any],
+    budgets: List[int],
+    trainer_kwargs: Dict[str, Any],
+    n_eval_episodes: int,
+    trial_dir: str,
+    cpus: List[int],
+    connection,
+) -> None:
+    """Trains one trial rung by rung, asking the coordinator to continue."""
+    limit_threads(len(cpus))
+    pin_to_cpus(cpus)
+
+    from ..core.wrappers import DecisionPointWrapper
+    from .callbacks import _evaluate_snapshot
+    from .trainer import Trainer
+
+    try:
+        trainer = Trainer(
+            log_dir=trial_dir, model_dir=trial_dir, **trainer_kwargs, **params
+        )
+        env = trainer.create_environment(scenario_path)
+        model = trainer.create_model(env, verbose=0)
+
+        wrapper_class, wrapper_kwargs = None, {}
+        if trainer.max_action_repeat > 1:
+            wrapper_class = DecisionPointWrapper
+            wrapper_kwargs = {
+                "max_repeat": trainer.max_action_repeat,
+                "gamma": model.gamma,
+            }
+
+        model_path = os.path.join(trial_dir, "model.zip")
+        stats_path = os.path.join(trial_dir, "vecnormalize.pkl")
+        for rung, budget in enumerate(budgets):
+            model.learn(
+                total_timesteps=max(budget - model.num_timesteps, 0),
+                callback=trainer.algorithm_callbacks(),
+                reset_num_timesteps=False,
+                tb_log_name=f"trial_{trial_id}",
+            )
+            model.save(model_path)
+            env.save(stats_path)
+            rewards, _ = _evaluate_snapshot(
+                type(model),
+                model_path,
+                stats_path,
+                scenario_path,
+                trainer.env_kwargs,
+                wrapper_class,
+                wrapper_kwargs,
+                n_eval_episodes,
+                deterministic=True,
+                use_masking=trainer.action_masking,
+            )
+            connection.send(
+                ("report", rung, model.num_timesteps, float(np.mean(rewards)))
+            )
+            if connection.recv() == "stop":
+                break
+
+        env.close()
+        connection.send(("done", None))
+    except Exception:
+        connection.send(("error", traceback.format_exc(limit=5)))
+    connection.close()
+
+
+class HyperparameterSweep:
+    """Local ASHA hyperparameter sweep over ``Trainer`` arguments."""
+
+    def __init__(
+        self,
+        scenario_path: str,
+        search_space: Optional[SearchSpace] = None,
+        n_trials: int = 20,
+        n_parallel: Optional[int] = None,
+        cpus_per_trial: int = 1,
+        min_timesteps: int = 50000,
+        max_timesteps: int = 1000000,
+        reduction_factor: int = 3,
+        n_eval_episodes: int = 5,
+        sweep_dir: str = "sweeps",
+        seed: Optional[int] = None,
+        start_method: Optional[str] = None,
+        **trainer_kwargs,
+    ):
+        """Initialize the sweep.
+
+        Args:
+            scenario_path: Path to scenario configuration file
+            search_space: Parameter specifications; keys are ``Trainer`` or PPO
+                arguments (defaults to ``DEFAULT_SEARCH_SPACE``)
+            n_trials: Number of trials to sample
+            n_parallel: Concurrent trials (defaults to all cores divided by
+                ``cpus_per_trial``)
+            cpus_per_trial: Cores pinned to each running trial
+            min_timesteps: Timestep budget of the first rung
+            max_timesteps: Timestep budget of a fully trained trial
+            reduction_factor: Rung growth factor and inverse promotion rate
+            n_eval_episodes: Evaluation episodes scoring each rung
+            sweep_dir: Directory for trial logs and ``trials.jsonl``
+            seed: Seed of the configuration sampler
+            start_method: Start method of the trial processes
+            **trainer_kwargs: Fixed ``Trainer`` arguments of every trial
+        """
+        if reduction_factor < 2:
+            raise ValueError(f"reduction_factor must be >= 2, got {reduction_factor}")
+        if trainer_kwargs.get("multi_agent"):
+            raise ValueError("Sweeps do not support multi-agent training")
+        self.scenario_path = scenario_path
+        self.search_space = search_space or DEFAULT_SEARCH_SPACE
+        self.n_trials = n_trials
+        self.cpus_per_trial = cpus_per_trial
+        self.n_parallel = n_parallel or max(len(available_cpus()) // cpus_per_trial, 1)
+        self.budgets = rung_budgets(min_timesteps, max_timesteps, reduction_factor)
+        self.reduction_factor = reduction_factor
+        self.n_eval_episodes = n_eval_episodes
+        self.sweep_dir = sweep_dir
+        self.rng = np.random.default_rng(seed)
+        self.start_method = start_method
+        self.trainer_kwargs = {"n_envs": 4, **trainer_kwargs}
+
+        self.results_path = os.path.join(sweep_dir, "trials.jsonl")
+        self.rung_scores: List[List[float]] = [[] for _ in self.budgets]
+        self.trials: List[TrialResult] = []
+        os.makedirs(sweep_dir, exist_ok=True)
+
+    def should_promote(self, rung: int, score: float) -> bool:
+        """Records a rung score and decides whether the trial continues.
+
+        A trial is promoted if its score is at least the k-th best score
+        reported at this rung, with ``k = max(1, n // reduction_factor)``.
+        """
+        scores = self.rung_scores[rung]
+        scores.append(score)
+        k = max(len(scores) // self.reduction_factor, 1)
+        return score >= sorted(scores, reverse=True)[k - 1]
+
+    def _on_report(
+        self, trial: TrialResult, rung: int, timesteps: int, score: float
+    ) -> bool:
+        """Records a rung report of a trial and decides whether it continues.
+
+        Only trials stopped below the final rung are pruned; a trial that
+        reports its final rung has used its whole budget and completes,
+        whatever its rank at that rung.
+
+        Args:
+            trial: Record of the reporting trial
+            rung: Index of the reported rung
+            timesteps: Timesteps trained so far
+            score: Mean evaluation reward at this rung
+
+        Returns:
+            Whether the trial continues to the next rung
+        """
+        trial.rung_scores.append(score)
+        trial.timesteps = timesteps
+        trial.score = score
+        promoted = self.should_promote(rung, score)
+        if rung == len(self.budgets) - 1:
+            outcome = "final"
+        elif promoted:
+            outcome = "continue"
+        else:
+            outcome = "pruned"
+            trial.status = "pruned"
+        print(f"   trial {trial.trial_id} rung {rung}: {score:.2f} ({outcome})")
+        return promoted
+
+    def _record(self, trial: TrialResult) -> None:
+        """Appends a finished trial to the results store."""
+        with open(self.results_path, "a") as f:
+            f.write(json.dumps(asdict(trial)) + "\n")
+
+    def run(self) -> List[TrialResult]:
+        """Runs all trials and returns their records.
+
+        Returns:
+            Records of every trial in launch order
+        """
+        ctx = mp.get_context(self.start_method)
+        cpu_slots = plan_cpu_affinity(self.n_parallel, self.cpus_per_trial)
+        free_slots = list(range(self.n_parallel))
+        running: Dict[Any, Tuple[TrialResult, Any, int, float]] = {}
+
+        print(
+            f"🔍 Sweeping {self.n_trials} trials, {self.n_parallel} in parallel, "
+            f"rungs at {self.budgets} timesteps"
+        )
+        while len(self.trials) < self.n_trials or running:
+            # Fill free CPU slots with new trials
+            while free_slots and len(self.trials) < self.n_trials:
+                slot = free_slots.pop(0)
+                trial = TrialResult(
+                    trial_id=len(self.trials),
+                    params=sample_params(self.search_space, self.rng),
+                )
+                self.trials.append(trial)
+                parent_conn, child_conn = ctx.Pipe()
+                process = ctx.Process(
+                    target=_run_trial,
+                    args=(
+                        trial.trial_id,
+                        self.scenario_path,
+                        trial.params,
+                        self.budgets,
+                        self.trainer_kwargs,
+                        self.n_eval_episodes,
+                        os.path.join(self.sweep_dir, f"trial_{trial.trial_id}"),
+                        cpu_slots[slot],
+                        child_conn,
+                    ),
+                )
+                process.start()
+                child_conn.close()
+                running[parent_conn] = (trial, process, slot, time.time())
+
+            for conn in wait(list(running)):
+                trial, process, slot, start = running[conn]
+                try:
+                    message, *payload = conn.recv()
+                except EOFError:
+                    message, payload = "error", ["Trial process exited unexpectedly"]
+
+                if message == "report":
+                    promoted = self._on_report(trial, *payload)
+                    conn.send("continue" if promoted else "stop")
+                    continue
+
+                if message == "error":
+                    trial.status = "failed"
+                    trial.error = payload[0]
+                    print(f"   trial {trial.trial_id} failed: {trial.error}")
+                elif trial.status == "running":
+                    trial.status = "completed"
+
+                process.join()
+                conn.close()
+                trial.duration_seconds = time.time() - start
+                self._record(trial)
+                del running[conn]
+                free_slots.append(slot)
+
+        best = self.best_trial()
+        if best is not None:
+            print(f"🏆 Best trial {best.trial_id}: {best.score:.2f} {best.params}")
+        return self.trials
+
+    def best_trial(self) -> Optional[TrialResult]:
+        """Returns the best trial that reached the final rung, if any."""
+        finished = [
+            t
+            for t in self.trials
+            if t.status == "completed" and len(t.rung_scores) == len(self.budgets)
+        ]
+        return max(finished, key=lambda t: t.score) if finished else None
+
+
+def load_trials(results_path: str) -> List[TrialResult]:
+    """Loads trial records from a ``trials.jsonl`` results store."""
+    with open(results_path) as f:
+        return [TrialResult(**json.loads(line)) for line in f if line.strip()]
@@ -1,16 +1,32 @@
 """Basic training utilities for vertiport autonomy agents."""
 
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Type
 
 import torch
+from gymnasium import spaces
 from stable_baselines3 import PPO
-from stable_baselines3.common.callbacks import CheckpointCallback, EvalCallback
-from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.vec_env import VecNormalize
+from stable_baselines3.common.buffers import DictRolloutBuffer, RolloutBuffer
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecMonitor, VecNormalize
 
+from ..agents.drl.extractors import GraphFeaturesExtractor
 from ..config.loader import load_scenario_config
+from ..config.schema import ScenarioConfig
 from ..core.environment import VertiportEnv
+from ..core.multi_agent import SharedPolicyVecEnv
+from ..core.wrappers import DecisionPointWrapper
+from .checkpoint import (
+    AsyncCheckpointCallback,
+    CheckpointManager,
+    restore_training_state,
+)
+from .pipeline import PipelinedPPO
+from .pretrain import DemonstrationDataset, pretrain_policy
+from .profiling import ThroughputProfilerCallback
+from .remote import DistributedPPO
+from .semi_mdp import SemiMDPDiscountCallback, semi_mdp_rollout_buffer
+from .vec_env import limit_threads, make_training_vec_env
 
 
 class Trainer:
@@ -21,6 +37,16 @@ class Trainer:
         log_dir: str = "logs",
         model_dir: str = "models",
         n_envs: int = 50,
+        action_masking: bool = False,
+        max_action_repeat: int = 1,
+        env_kwargs: Optional[Dict[str, Any]] = None,
+        multi_agent: bool = False,
+        vec_env_backend: str = "dummy",
+        vec_env_kwargs: Optional[Dict[str, Any]] = None,
+        learner_threads: Optional[int] = None,
+        keep_checkpoints: int = 3,
+        profile: bool = False,
+        pipeline_rollouts: bool = False,
         **ppo_kwargs,
     ):
         """Initialize the trainer.
@@ -29,11 +55,49 @@ class Trainer:
             log_dir: Directory for training logs
             model_dir: Directory for saving models
             n_envs: Number of parallel environments
+            action_masking: Train with ``MaskablePPO`` so invalid per-drone
+                actions are never sampled (requires ``sb3-contrib``)
+            max_action_repeat: Repeat each joint action until a decision point
+                for at most this many ticks (1 disables action repeat)
+            env_kwargs: Extra keyword arguments for ``VertiportEnv``, e.g.
+                ``{"obs_mode": "topk", "k_neighbors": 4}``
+            multi_agent: Train one parameter-shared policy over per-drone
+                egocentric observations; ``n_envs`` then counts worlds and
+                ``env_kwargs`` may only set ``k_neighbors``
+            vec_env_backend: Vectorization backend: ``"dummy"``, ``"subproc"``,
+                ``"shmem"``, ``"threads"`` or ``"remote"`` (see
+                ``make_training_vec_env``)
+            vec_env_kwargs: Worker topology for subprocess backends or
+                ``{"worker_addresses": [...]}`` for remote workers, e.g.
+                ``{"envs_per_worker": 4, "start_method": "forkserver",
+                "cpu_affinity": "auto", "worker_threads": 1}``
+            learner_threads: PyTorch/BLAS threads of the learner process
+                (None keeps the library default)
+            keep_checkpoints: Number of recent full-state checkpoints to keep
+            profile: Record a per-rollout timing breakdown to TensorBoard and
+                ``log_dir/throughput_profile.json``
+            pipeline_rollouts: Step two halves of the environments
+                alternately so inference overlaps simulation (``PipelinedPPO``;
+                needs a subprocess, threads or remote backend to pay off)
             **ppo_kwargs: Additional arguments for PPO
         """
         self.log_dir = log_dir
         self.model_dir = model_dir
         self.n_envs = n_envs
+        self.action_masking = action_masking
+        self.max_action_repeat = max_action_repeat
+        self.env_kwargs = env_kwargs or {}
+        self.multi_agent = multi_agent
+        self.vec_env_backend = vec_env_backend
+        self.vec_env_kwargs = vec_env_kwargs or {}
+        self.learner_threads = learner_threads
+        self.keep_checkpoints = keep_checkpoints
+        self.profile = profile
+        self.pipeline_rollouts = pipeline_rollouts
+        self.checkpoint_manager: Optional[CheckpointManager] = None
+
+        if self.learner_threads is not None:
+            limit_threads(self.learner_threads)
         self.ppo_kwargs = ppo_kwargs
 
         # Create directories
@@ -54,27 +118,153 @@ class Trainer:
             "policy_kwargs": {"net_arch": [64, 64], "activation_fn": torch.nn.Tanh},
         }
 
-    def create_environment(self, scenario_path: str) -> VecNormalize:
+    def model_params(self, **override_params) -> Dict[str, Any]:
+        """Effective PPO arguments of a model built with ``create_model``.
+
+        Args:
+            **override_params: Parameters to override defaults
+
+        Returns:
+            Defaults, updated by the trainer's and then the override arguments
+        """
+        return {**self.default_ppo_params, **self.ppo_kwargs, **override_params}
+
+    def create_environment(
+        self, scenario_path: str, gamma: Optional[float] = None
+    ) -> VecNormalize:
         """Create a vectorized and normalized environment.
 
         Args:
             scenario_path: Path to scenario configuration file
+            gamma: Discount of the model trained on it, which also discounts
+                the ticks within a macro-step (defaults to the ``gamma`` of
+                ``model_params()``)
 
         Returns:
             Normalized vectorized environment
         """
         config = load_scenario_config(scenario_path)
 
+        if self.multi_agent:
+            return self.create_multi_agent_environment(config)
+
+        # Repeat actions between decision points if requested
+        wrapper_class = None
+        wrapper_kwargs = None
+        if self.max_action_repeat > 1:
+            wrapper_class = DecisionPointWrapper
+            wrapper_kwargs = {
+                "max_repeat": self.max_action_repeat,
+                "gamma": self.model_params()["gamma"] if gamma is None else gamma,
+            }
+
         # Create vectorized environment
-        env = make_vec_env(
-            VertiportEnv, n_envs=self.n_envs, env_kwargs={"config": config}
+        env = make_training_vec_env(
+            VertiportEnv,
+            n_envs=self.n_envs,
+            env_kwargs={"config": config, **self.env_kwargs},
+            backend=self.vec_env_backend,
+            wrapper_class=wrapper_class,
+            wrapper_kwargs=wrapper_kwargs,
+            pipelined=self.pipeline_rollouts,
+            **self.vec_env_kwargs,
         )
 
-        # Normalize environment
-        env = VecNormalize(env, norm_obs=True, norm_reward=True, clip_obs=10.0)
+        # Normalize environment (masks and indices are left untouched)
+        env = VecNormalize(
+            env,
+            norm_obs=True,
+            norm_reward=True,
+            clip_obs=10.0,
+            norm_obs_keys=env.get_attr("norm_obs_keys")[0],
+        )
 
         return env
 
+    def create_multi_agent_environment(self, config: ScenarioConfig) -> VecNormalize:
+        """Create a normalized environment with one slot per drone.
+
+        Args:
+            config: Scenario configuration
+
+        Returns:
+            Normalized ``SharedPolicyVecEnv`` over ``n_envs`` worlds
+        """
+        if self.max_action_repeat > 1:
+            raise ValueError("Action repeat is not supported in multi-agent mode")
+        if self.vec_env_backend != "dummy":
+            raise ValueError("Multi-agent mode only supports the 'dummy' backend")
+
+        env = SharedPolicyVecEnv(
+            config,
+            n_worlds=self.n_envs,
+            k_neighbors=self.env_kwargs.get("k_neighbors", 4),
+        )
+        env = VecMonitor(env)
+        return VecNormalize(env, norm_obs=True, norm_reward=True, clip_obs=10.0)
+
+    def get_algorithm_class(self) -> Type[PPO]:
+        """Get the PPO implementation used for training.
+
+        Returns:
+            ``MaskablePPO`` when action masking is enabled, ``PipelinedPPO``
+            for pipelined rollouts, ``DistributedPPO`` (policy inference on
+            the rollout workers) for the ``"remote"`` backend, otherwise
+            ``PPO``
+
+        Raises:
+            ImportError: If action masking is enabled without ``sb3-contrib``
+            ValueError: If action masking is combined with pipelined rollouts
+        """
+        if not self.action_masking:
+            if self.pipeline_rollouts:
+                return PipelinedPPO
+            return DistributedPPO if self.vec_env_backend == "remote" else PPO
+        if self.pipeline_rollouts:
+            raise ValueError("Pipelined rollouts do not support action masking")
+
+        try:
+            from sb3_contrib import MaskablePPO
+        except ImportError as e:
+            raise ImportError(
+                "Action masking requires sb3-contrib. Install it with "
+                "'pip install vertiport-autonomy[contrib]'."
+            ) from e
+        return MaskablePPO
+
+    def get_rollout_buffer_class(self, env: VecNormalize) -> Type[RolloutBuffer]:
+        """Get the semi-MDP rollout buffer for training with action repeat.
+
+        Args:
+            env: Environment for training
+
+        Returns:
+            Semi-MDP variant of the algorithm's default rollout buffer
+        """
+        dict_obs = isinstance(env.observation_space, spaces.Dict)
+        if self.action_masking:
+            from sb3_contrib.common.maskable.buffers import (
+                MaskableDictRolloutBuffer,
+                MaskableRolloutBuffer,
+            )
+
+            buffer_class = (
+                MaskableDictRolloutBuffer if dict_obs else MaskableRolloutBuffer
+            )
+        else:
+            buffer_class = DictRolloutBuffer if dict_obs else RolloutBuffer
+        return semi_mdp_rollout_buffer(buffer_class)
+
+    def algorithm_callbacks(self) -> List[BaseCallback]:
+        """Callbacks that every ``learn`` of a ``create_model`` model needs.
+
+        Returns:
+            ``SemiMDPDiscountCallback`` when actions are repeated, else nothing
+        """
+        if self.max_action_repeat > 1:
+            return [SemiMDPDiscountCallback()]
+        return []
+
     def create_model(self, env: VecNormalize, **override_params) -> PPO:
         """Create a PPO model.
 
@@ -86,11 +276,25 @@ class Trainer:
             PPO model instance
         """
         # Merge parameters
-        params = {**self.default_ppo_params, **self.ppo_kwargs, **override_params}
+        params = {
+            "verbose": 1,
+            "tensorboard_log": self.log_dir,
+            **self.model_params(**override_params),
+        }
 
-        model = PPO(
-            "MultiInputPolicy", env, verbose=1, tensorboard_log=self.log_dir, **params
-        )
+        # Graph observations need a message-passing feature extractor
+        if self.env_kwargs.get("obs_mode") == "graph":
+            policy_kwargs = dict(params.get("policy_kwargs") or {})
+            policy_kwargs.setdefault("features_extractor_class", GraphFeaturesExtractor)
+            params["policy_kwargs"] = policy_kwargs
+
+        # Macro-steps of repeated actions are discounted by gamma**k
+        if self.max_action_repeat > 1 and "rollout_buffer_class" not in params:
+            params["rollout_buffer_class"] = self.get_rollout_buffer_class(env)
+
+        policy = "MlpPolicy" if self.multi_agent else "MultiInputPolicy"
+        algorithm_class = self.get_algorithm_class()
+        model = algorithm_class(policy, env, **params)
 
         return model
 
@@ -112,13 +316,28 @@ class Trainer:
         Returns:
             List of callbacks
         """
-        checkpoint_callback = CheckpointCallback(
-            save_freq=save_freq, save_path=self.model_dir, name_prefix=name_prefix
+        # Full-state checkpoints (model, optimizer, normalization, RNG) are
+        # written on a background thread so training does not wait on disk
+        self.checkpoint_manager = CheckpointManager(
+            os.path.join(self.model_dir, "checkpoints"),
+            keep_last=self.keep_checkpoints,
+            name_prefix=name_prefix,
+        )
+        checkpoint_callback = AsyncCheckpointCallback(
+            self.checkpoint_manager, save_freq=save_freq
         )
 
         # Note: EvalCallback needs a separate environment
         # This is a simplified version - in practice you'd want a separate eval env
-        callbacks = [checkpoint_callback]
+        callbacks = [checkpoint_callback, *self.algorithm_callbacks()]
+
+        if self.profile:
+            callbacks.append(
+                ThroughputProfilerCallback(
+                    summary_path=os.path.join(self.log_dir, "throughput_profile.json"),
+                    verbose=1,
+                )
+            )
 
         return callbacks
 
@@ -129,6 +348,9 @@ class Trainer:
         tb_log_name: str = "PPO_Vertiport",
         save_final: bool = True,
         final_model_name: str = "ppo_vertiport_final",
+        resume: Optional[str] = None,
+        demonstrations: Optional[str] = None,
+        pretrain_kwargs: Optional[Dict[str, Any]] = None,
         **model_params,
     ) -> PPO:
         """Train a PPO agent.
@@ -139,6 +361,13 @@ class Trainer:
             tb_log_name: TensorBoard log name
             save_final: Whether to save final model
             final_model_name: Name for final model
+            resume: Checkpoint to resume from: a path, or ``"latest"`` for the
+                newest checkpoint in ``model_dir/checkpoints``
+            demonstrations: Directory of a demonstration dataset (see
+                ``collect_demonstrations``) to pretrain the policy on by
+                behavior cloning before PPO starts; ignored when resuming
+            pretrain_kwargs: Extra ``pretrain_policy`` arguments, e.g.
+                ``{"epochs": 10, "batch_size": 512}``
             **model_params: Additional model parameters
 
         Returns:
@@ -147,19 +376,44 @@ class Trainer:
         print("--- Starting Training ---")
         print(f"Scenario: {scenario_path}")
         print(f"Total timesteps: {total_timesteps:,}")
-        print(f"Parallel environments: {self.n_envs}")
-
-        # Create environment and model
-        env = self.create_environment(scenario_path)
+        print(f"Parallel environments: {self.n_envs} ({self.vec_env_backend})")
+        print(f"Action masking: {self.action_masking}")
+        print(f"Max action repeat: {self.max_action_repeat}")
+        print(f"Observation mode: {self.env_kwargs.get('obs_mode', 'dense')}")
+        print(f"Multi-agent (shared policy): {self.multi_agent}")
+
+        # Create environment and model; macro-steps use the model's discount
+        gamma = self.model_params(**model_params)["gamma"]
+        env = self.create_environment(scenario_path, gamma=gamma)
         model = self.create_model(env, **model_params)
 
         # Create callbacks
         callbacks = self.create_callbacks()
 
+        # Resume from a full-state checkpoint if requested
+        reset_num_timesteps = True
+        if resume is not None:
+            state = self.checkpoint_manager.load(None if resume == "latest" else resume)
+            restore_training_state(model, state)
+            print(f"Resuming from checkpoint at {model.num_timesteps:,} timesteps")
+            total_timesteps = max(total_timesteps - model.num_timesteps, 0)
+            reset_num_timesteps = False
+        elif demonstrations is not None:
+            if self.multi_agent:
+                raise ValueError("Behavior cloning does not support multi-agent mode")
+            dataset = DemonstrationDataset(demonstrations)
+            print(f"Pretraining on {len(dataset):,} demonstration samples...")
+            pretrain_policy(model, dataset, **(pretrain_kwargs or {}))
+
         # Train the model
         model.learn(
-            total_timesteps=total_timesteps, callback=callbacks, tb_log_name=tb_log_name
+            total_timesteps=total_timesteps,
+            callback=callbacks,
+            tb_log_name=tb_log_name,
+            reset_num_timesteps=reset_num_timesteps,
         )
+        self.checkpoint_manager.save(model, blocking=True)
+        self.checkpoint_manager.close()
 
         print("--- Training Finished ---")
 
@@ -167,6 +421,7 @@ class Trainer:
         if save_final:
             final_path = os.path.join(self.model_dir, final_model_name)
             model.save(final_path)
+            env.save(f"{final_path}_vecnormalize.pkl")
             print(f"Final model saved to {final_path}")
 
         return model
@@ -0,0 +1,329 @@
+"""Automatic throughput tuning for PPO training settings.
+
+Runs short calibration bursts over a grid of ``n_envs``, ``n_steps``,
+``batch_size`` and vectorization backends for a scenario, measures rollout
+throughput, update time and peak memory of each configuration, and
+recommends (or applies) the fastest configuration within a memory budget.
+Every burst runs in a fresh process, so peak memory readings of different
+configurations do not contaminate each other. Peak memory is the largest
+summed RSS of the burst's process tree, environment workers included.
+"""
+
+import itertools
+import json
+import multiprocessing as mp
+import shutil
+import tempfile
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from stable_baselines3.common.callbacks import BaseCallback
+
+from .profiling import PeakMemorySampler, peak_rss_mb
+
+
+class RolloutTimingCallback(BaseCallback):
+    """Measures wall time spent collecting rollouts and updating the policy."""
+
+    def __init__(self, verbose: int = 0):
+        super().__init__(verbose)
+        self.rollout_times: List[float] = []
+        self.update_times: List[float] = []
+        self._rollout_start: Optional[float] = None
+        self._update_start: Optional[float] = None
+
+    def _on_rollout_start(self) -> None:
+        now = time.perf_counter()
+        if self._update_start is not None:
+            self.update_times.append(now - self._update_start)
+            self._update_start = None
+        self._rollout_start = now
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self) -> None:
+        now = time.perf_counter()
+        self.rollout_times.append(now - self._rollout_start)
+        self._update_start = now
+
+    def _on_training_end(self) -> None:
+        if self._update_start is not None:
+            self.update_times.append(time.perf_counter() - self._update_start)
+            self._update_start = None
+
+
+@dataclass
+class CalibrationResult:
+    """Measurements of one calibration burst."""
+
+    n_envs: int
+    n_steps: int
+    batch_size: int
+    vec_env_backend: str
+    envs_per_worker: int
+    timesteps: int = 0
+    env_steps_per_second: float = 0.0
+    steps_per_second: float = 0.0
+    mean_rollout_seconds: float = 0.0
+    mean_update_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    fits_budget: bool = True
+    error: Optional[str] = None
+
+
+def _run_calibration(
+    scenario_path: str,
+    settings: Dict[str, Any],
+    n_rollouts: int,
+    trainer_kwargs: Dict[str, Any],
+    connection,
+) -> None:
+    """Runs one calibration burst and sends back a ``CalibrationResult``."""
+    from .trainer import Trainer
+
+    result = CalibrationResult(**settings)
+    log_dir = tempfile.mkdtemp(prefix="vertiport_tuning_")
+    try:
+        vec_env_kwargs = {
+            **trainer_kwargs.pop("vec_env_kwargs", {}),
+            "envs_per_worker": settings["envs_per_worker"],
+        }
+        with PeakMemorySampler() as memory:
+            trainer = Trainer(
+                log_dir=log_dir,
+                model_dir=log_dir,
+                n_envs=settings["n_envs"],
+                vec_env_backend=settings["vec_env_backend"],
+                vec_env_kwargs=vec_env_kwargs,
+                **trainer_kwargs,
+            )
+            env = trainer.create_environment(scenario_path)
+            model = trainer.create_model(
+                env,
+                n_steps=settings["n_steps"],
+                batch_size=settings["batch_size"],
+                verbose=0,
+                tensorboard_log=None,
+            )
+
+            timing = RolloutTimingCallback()
+            total_timesteps = settings["n_steps"] * settings["n_envs"] * n_rollouts
+            model.learn(
+                total_timesteps=total_timesteps,
+                callback=[timing, *trainer.algorithm_callbacks()],
+            )
+            env.close()
+
+        rollout_seconds = sum(timing.rollout_times)
+        update_seconds = sum(timing.update_times)
+        result.timesteps = model.num_timesteps
+        result.env_steps_per_second = model.num_timesteps / max(rollout_seconds, 1e-9)
+        result.steps_per_second = model.num_timesteps / max(
+            rollout_seconds + update_seconds, 1e-9
+        )
+        result.mean_rollout_seconds = rollout_seconds / max(
+            len(timing.rollout_times), 1
+        )
+        result.mean_update_seconds = update_seconds / max(len(timing.update_times), 1)
+        # The sampler may miss a short spike of this process between samples
+        peaks = [rss for rss in (memory.peak_mb, peak_rss_mb()) if rss is not None]
+        result.peak_rss_mb = max(peaks) if peaks else None
+    except Exception:
+        result.error = traceback.format_exc(limit=3)
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    connection.send(result)
+    connection.close()
+
+
+class ThroughputTuner:
+    """Grid search over PPO throughput settings for one scenario."""
+
+    def __init__(
+        self,
+        scenario_path: str,
+        n_envs_grid: Sequence[int] = (8, 16, 32),
+        n_steps_grid: Sequence[int] = (256, 1024),
+        batch_size_grid: Sequence[int] = (64, 128, 256),
+        backends: Sequence[str] = ("dummy", "subproc"),
+        envs_per_worker_grid: Sequence[int] = (1,),
+        memory_budget_mb: Optional[float] = None,
+        n_rollouts: int = 2,
+        start_method: Optional[str] = None,
+        **trainer_kwargs,
+    ):
+        """Initialize the tuner.
+
+        Args:
+            scenario_path: Path to scenario configuration file
+            n_envs_grid: Candidate numbers of parallel environments
+            n_steps_grid: Candidate PPO rollout lengths per environment
+            batch_size_grid: Candidate PPO minibatch sizes
+            backends: Candidate vectorization backends
+            envs_per_worker_grid: Candidate environments per worker process
+                (only varied for subprocess backends)
+            memory_budget_mb: Maximum acceptable peak RSS (None = unlimited)
+            n_rollouts: Rollout/update cycles per calibration burst
+            start_method: Start method of the calibration processes (default:
+                spawn, so that every burst owns its whole process tree)
+            **trainer_kwargs: Further ``Trainer`` arguments (e.g. ``env_kwargs``)
+        """
+        self.scenario_path = scenario_path
+        self.n_envs_grid = list(n_envs_grid)
+        self.n_steps_grid = list(n_steps_grid)
+        self.batch_size_grid = list(batch_size_grid)
+        self.backends = list(backends)
+        self.envs_per_worker_grid = list(envs_per_worker_grid)
+        self.memory_budget_mb = memory_budget_mb
+        self.n_rollouts = n_rollouts
+        self.start_method = start_method
+        self.trainer_kwargs = trainer_kwargs
+        self.results: List[CalibrationResult] = []
+
+    def configurations(self) -> List[Dict[str, Any]]:
+        """Lists the settings of every calibration burst in the grid.
+
+        Minibatches larger than a rollout are skipped, as are envs-per-worker
+        values for the in-process backend.
+        """
+        configs = []
+        for backend, n_envs, n_steps, batch_size in itertools.product(
+            self.backends, self.n_envs_grid, self.n_steps_grid, self.batch_size_grid
+        ):
+            if batch_size > n_envs * n_steps:
+                continue
+            worker_grid = [1] if backend == "dummy" else self.envs_per_worker_grid
+            for envs_per_worker in worker_grid:
+                if envs_per_worker > n_envs:
+                    continue
+                configs.append(
+                    {
+                        "n_envs": n_envs,
+                        "n_steps": n_steps,
+                        "batch_size": batch_size,
+                        "vec_env_backend": backend,
+                        "envs_per_worker": envs_per_worker,
+                    }
+                )
+        return configs
+
+    def calibrate(self, settings: Dict[str, Any]) -> CalibrationResult:
+        """Runs one calibration burst in a fresh process.
+
+        Args:
+            settings: One entry of ``configurations()``
+
+        Returns:
+            Measurements of the burst
+        """
+        ctx = mp.get_context(self.start_method or "spawn")
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_run_calibration,
+            args=(
+                self.scenario_path,
+                settings,
+                self.n_rollouts,
+                dict(self.trainer_kwargs),
+                child_conn,
+            ),
+        )
+        process.start()
+        child_conn.close()
+        try:
+            result = parent_conn.recv()
+        except EOFError:
+            result = CalibrationResult(
+                **settings, error=f"Calibration process exited ({process.exitcode})"
+            )
+        process.join()
+
+        if self.memory_budget_mb is not None and result.peak_rss_mb is not None:
+            result.fits_budget = result.peak_rss_mb <= self.memory_budget_mb
+        return result
+
+    def run(self) -> List[CalibrationResult]:
+        """Calibrates every configuration of the grid.
+
+        Returns:
+            List of calibration results
+        """
+        configs = self.configurations()
+        print(f"⏱️  Calibrating {len(configs)} configurations on {self.scenario_path}")
+
+        self.results = []
+        for i, settings in enumerate(configs):
+            result = self.calibrate(settings)
+            self.results.append(result)
+            if result.error:
+                print(f"   [{i + 1}/{len(configs)}] {settings} ❌ {result.error}")
+            else:
+                print(
+                    f"   [{i + 1}/{len(configs)}] {settings} "
+                    f"{result.steps_per_second:,.0f} steps/s, "
+                    f"update {result.mean_update_seconds:.2f}s, "
+                    f"peak {result.peak_rss_mb or 0:.0f} MiB"
+                )
+        return self.results
+
+    def recommend(
+        self, results: Optional[List[CalibrationResult]] = None
+    ) -> CalibrationResult:
+        """Selects the fastest configuration that fits the memory budget.
+
+        Args:
+            results: Calibration results (defaults to the last ``run()``)
+
+        Returns:
+            Result with the highest end-to-end steps per second
+
+        Raises:
+            RuntimeError: If no configuration succeeded within the budget
+        """
+        results = self.results if results is None else results
+        candidates = [r for r in results if r.error is None and r.fits_budget]
+        if not candidates:
+            raise RuntimeError("No calibrated configuration fits the memory budget")
+        return max(candidates, key=lambda r: r.steps_per_second)
+
+    @staticmethod
+    def apply(trainer, result: CalibrationResult) -> None:
+        """Applies a calibrated configuration to a trainer.
+
+        Args:
+            trainer: ``Trainer`` or ``CurriculumTrainer`` instance
+            result: Configuration to apply
+        """
+        trainer.vec_env_backend = result.vec_env_backend
+        trainer.vec_env_kwargs = {
+            **trainer.vec_env_kwargs,
+            "envs_per_worker": result.envs_per_worker,
+        }
+
+        if hasattr(trainer, "phases"):
+            for phase in trainer.phases:
+                phase["n_envs"] = result.n_envs
+                phase["hyperparams"]["n_steps"] = result.n_steps
+                phase["hyperparams"]["batch_size"] = result.batch_size
+        else:
+            trainer.n_envs = result.n_envs
+            trainer.ppo_kwargs["n_steps"] = result.n_steps
+            trainer.ppo_kwargs["batch_size"] = result.batch_size
+
+    def save_results(self, path: str) -> None:
+        """Saves all calibration results and the recommendation as JSON."""
+        summary: Dict[str, Any] = {
+            "scenario": self.scenario_path,
+            "memory_budget_mb": self.memory_budget_mb,
+            "results": [asdict(r) for r in self.results],
+        }
+        try:
+            summary["recommended"] = asdict(self.recommend())
+        except RuntimeError:
+            summary["recommended"] = None
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,663 @@
+"""Vectorized environment backends and worker topology control.
+
+Provides ``make_training_vec_env``, a drop-in replacement for
+``make_vec_env`` that selects the vectorization backend:
+
+* ``"dummy"``: all environments step sequentially in the learner process,
+* ``"subproc"``: environments are grouped ``envs_per_worker`` at a time into
+  worker processes that exchange observations through pipes,
+* ``"shmem"``: like ``"subproc"``, but observations are written by the
+  workers directly into shared memory instead of being pickled,
+* ``"threads"``: environments stay in the learner process and are stepped
+  shard by shard on a thread pool, writing into shared output buffers,
+* ``"remote"``: environments run on rollout worker daemons, possibly on
+  other machines, reached over TCP (see ``remote.py``).
+
+Worker processes can be pinned to CPU cores and have their PyTorch and BLAS
+thread pools limited, so that workers and the learner do not oversubscribe
+the machine.
+"""
+
+import multiprocessing as mp
+import os
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from copy import deepcopy
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper
+
+VEC_ENV_BACKENDS = ("dummy", "subproc", "shmem", "threads", "remote")
+
+# Environment variables that size the thread pools of common BLAS/OpenMP
+# runtimes. They must be set before the libraries are loaded in the worker.
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+CpuAffinity = Union[str, Sequence[Sequence[int]], None]
+
+
+def available_cpus() -> List[int]:
+    """Returns the CPU ids this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cpu_affinity(
+    n_workers: int, cpus_per_worker: int = 1, reserved_cpus: int = 0
+) -> List[List[int]]:
+    """Assigns CPU cores to worker processes.
+
+    The first ``reserved_cpus`` cores are left for the learner; the remaining
+    cores are handed out round-robin, ``cpus_per_worker`` at a time.
+
+    Args:
+        n_workers: Number of worker processes
+        cpus_per_worker: Cores pinned to each worker
+        reserved_cpus: Cores kept free for the learner process
+
+    Returns:
+        List with the CPU ids of each worker
+    """
+    cpus = available_cpus()
+    pool = cpus[reserved_cpus:] or cpus
+    return [
+        [pool[(w * cpus_per_worker + j) % len(pool)] for j in range(cpus_per_worker)]
+        for w in range(n_workers)
+    ]
+
+
+def limit_threads(num_threads: int) -> None:
+    """Limits PyTorch and BLAS thread pools of the current process.
+
+    Args:
+        num_threads: Maximum number of threads per pool
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(num_threads)
+
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+
+
+def pin_to_cpus(cpus: Sequence[int]) -> None:
+    """Pins the current process to the given CPU cores, where supported."""
+    if not hasattr(os, "sched_setaffinity"):
+        warnings.warn("CPU pinning is not supported on this platform; ignoring")
+        return
+    os.sched_setaffinity(0, set(cpus))
+
+
+@contextmanager
+def _thread_env(num_threads: Optional[int]):
+    """Temporarily sets thread-count variables inherited by new processes."""
+    if num_threads is None:
+        yield
+        return
+
+    saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(num_threads)
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _obs_buffers_spec(observation_space: spaces.Space, n_envs: int) -> Dict[Any, Any]:
+    """Returns ``{key: (shape, dtype)}`` for the stacked observation buffers."""
+    if isinstance(observation_space, spaces.Dict):
+        items = observation_space.spaces.items()
+    elif isinstance(observation_space, spaces.Box):
+        items = [(None, observation_space)]
+    else:
+        raise ValueError(
+            "Shared memory observations require a Box or Dict of Box spaces, "
+            f"got {observation_space}"
+        )
+
+    spec = {}
+    for key, space in items:
+        if not isinstance(space, spaces.Box):
+            raise ValueError(f"Observation key '{key}' is not a Box space: {space}")
+        spec[key] = ((n_envs,) + space.shape, space.dtype)
+    return spec
+
+
+def _attach_buffers(names: Dict[Any, str], spec: Dict[Any, Any]):
+    """Maps named shared memory blocks to NumPy arrays."""
+    blocks, arrays = {}, {}
+    for key, name in names.items():
+        shape, dtype = spec[key]
+        blocks[key] = SharedMemory(name=name)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+    return blocks, arrays
+
+
+def _batched_worker(
+    remote,
+    parent_remote,
+    env_fns_wrapper: CloudpickleWrapper,
+    cpus: Optional[List[int]],
+    num_threads: Optional[int],
+) -> None:
+    """Worker loop hosting several environments in one process."""
+    parent_remote.close()
+    if num_threads is not None:
+        limit_threads(num_threads)
+    if cpus is not None:
+        pin_to_cpus(cpus)
+
+    venv = DummyVecEnv(env_fns_wrapper.var)
+    blocks: Dict[Any, SharedMemory] = {}
+    buffers: Dict[Any, np.ndarray] = {}
+    offset = 0
+
+    def send_obs(obs, *extra):
+        if not buffers:
+            remote.send((obs,) + extra)
+            return
+        count = venv.num_envs
+        for key, buffer in buffers.items():
+            buffer[offset : offset + count] = obs if key is None else obs[key]
+        remote.send((None,) + extra)
+
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                venv.step_async(data)
+                obs, rewards, dones, infos = venv.step_wait()
+                send_obs(obs, rewards, dones, infos)
+            elif cmd == "reset":
+                seeds, options = data
+                for i, seed in enumerate(seeds):
+                    venv._seeds[i] = seed
+                venv.set_options(options)
+                obs = venv.reset()
+                send_obs(obs, venv.reset_infos)
+            elif cmd == "attach_shm":
+                names, spec, offset = data
+                blocks, buffers = _attach_buffers(names, spec)
+                remote.send(True)
+            elif cmd == "get_spaces":
+                remote.send((venv.observation_space, venv.action_space))
+            elif cmd == "get_attr":
+                name, indices = data
+                remote.send(venv.get_attr(name, indices))
+            elif cmd == "set_attr":
+                name, value, indices = data
+                remote.send(venv.set_attr(name, value, indices))
+            elif cmd == "env_method":
+                name, args, kwargs, indices = data
+                remote.send(venv.env_method(name, *args, indices=indices, **kwargs))
+            elif cmd == "is_wrapped":
+                wrapper_class, indices = data
+                remote.send(venv.env_is_wrapped(wrapper_class, indices))
+            elif cmd == "close":
+                venv.close()
+                remote.close()
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        buffers.clear()
+        for block in blocks.values():
+            block.close()
+
+
+class BatchedSubprocVecEnv(VecEnv):
+    """Subprocess vector environment hosting several environments per worker.
+
+    Environments are split into contiguous groups of ``envs_per_worker``; each
+    group steps sequentially inside one worker process, which amortizes the
+    inter-process round trip over the group. With ``shared_memory=True`` the
+    workers write observations into shared memory blocks, so only rewards,
+    dones and infos travel through the pipes.
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        envs_per_worker: int = 1,
+        start_method: Optional[str] = None,
+        shared_memory: bool = False,
+        cpu_affinity: CpuAffinity = None,
+        worker_threads: Optional[int] = 1,
+    ):
+        """Initialize the vector environment.
+
+        Args:
+            env_fns: Environment factories
+            envs_per_worker: Number of environments hosted by each worker
+            start_method: Multiprocessing start method (default: forkserver
+                where available, otherwise spawn)
+            shared_memory: Transfer observations through shared memory
+            cpu_affinity: ``"auto"`` to pin workers round-robin to the
+                available cores, an explicit list of core ids per worker, or
+                None to leave scheduling to the OS
+            worker_threads: PyTorch/BLAS threads per worker (None keeps the
+                library defaults)
+        """
+        if envs_per_worker < 1:
+            raise ValueError(f"envs_per_worker must be >= 1, got {envs_per_worker}")
+
+        self.waiting = False
+        self.closed = False
+        n_envs = len(env_fns)
+        self.envs_per_worker = envs_per_worker
+        self.slices = [
+            slice(start, min(start + envs_per_worker, n_envs))
+            for start in range(0, n_envs, envs_per_worker)
+        ]
+        n_workers = len(self.slices)
+
+        if cpu_affinity == "auto":
+            cpu_affinity = plan_cpu_affinity(n_workers, worker_threads or 1)
+        elif cpu_affinity is not None and len(cpu_affinity) < n_workers:
+            raise ValueError(
+                f"cpu_affinity lists {len(cpu_affinity)} workers, need {n_workers}"
+            )
+
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(n_workers)])
+        self.processes = []
+        with _thread_env(worker_threads):
+            for w, (work_remote, remote, worker_slice) in enumerate(
+                zip(work_remotes, self.remotes, self.slices)
+            ):
+                cpus = list(cpu_affinity[w]) if cpu_affinity is not None else None
+                args = (
+                    work_remote,
+                    remote,
+                    CloudpickleWrapper(env_fns[worker_slice]),
+                    cpus,
+                    worker_threads,
+                )
+                # daemon=True: if the main process crashes, workers must not hang
+                process = ctx.Process(target=_batched_worker, args=args, daemon=True)
+                process.start()
+                self.processes.append(process)
+                work_remote.close()
+
+        self.remotes[0].send(("get_spaces", None))
+        observation_space, action_space = self.remotes[0].recv()
+
+        self._blocks: Dict[Any, SharedMemory] = {}
+        self._buffers: Dict[Any, np.ndarray] = {}
+        if shared_memory:
+            self._create_shared_buffers(observation_space, n_envs)
+
+        super().__init__(n_envs, observation_space, action_space)
+
+    def _create_shared_buffers(self, observation_space: spaces.Space, n_envs: int):
+        """Allocates shared observation buffers and attaches every worker."""
+        spec = _obs_buffers_spec(observation_space, n_envs)
+        for key, (shape, dtype) in spec.items():
+            nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            self._blocks[key] = SharedMemory(create=True, size=nbytes)
+            self._buffers[key] = np.ndarray(
+                shape, dtype=dtype, buffer=self._blocks[key].buf
+            )
+
+        names = {key: block.name for key, block in self._blocks.items()}
+        for remote, worker_slice in zip(self.remotes, self.slices):
+            # Each worker writes into its own slice of the stacked buffers
+            remote.send(("attach_shm", (names, spec, worker_slice.start)))
+        for remote in self.remotes:
+            remote.recv()
+
+    def _gather_obs(self, worker_obs: List[Any]):
+        """Stacks worker observations, reading shared buffers if enabled."""
+        if self._buffers:
+            # Copy, because the workers overwrite the buffers on the next step
+            if None in self._buffers:
+                return self._buffers[None].copy()
+            return {key: buffer.copy() for key, buffer in self._buffers.items()}
+
+        if isinstance(self.observation_space, spaces.Dict):
+            return {
+                key: np.concatenate([obs[key] for obs in worker_obs])
+                for key in self.observation_space.spaces
+            }
+        return np.concatenate(worker_obs)
+
+    def step_async(self, actions: np.ndarray) -> None:
+        for remote, worker_slice in zip(self.remotes, self.slices):
+            remote.send(("step", actions[worker_slice]))
+        self.waiting = True
+
+    def step_wait(self):
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        worker_obs, rewards, dones, infos = zip(*results)
+        return (
+            self._gather_obs(list(worker_obs)),
+            np.concatenate(rewards),
+            np.concatenate(dones),
+            [info for worker_infos in infos for info in worker_infos],
+        )
+
+    def reset(self):
+        for remote, worker_slice in zip(self.remotes, self.slices):
+            remote.send(
+                ("reset", (self._seeds[worker_slice], self._options[worker_slice]))
+            )
+        results = [remote.recv() for remote in self.remotes]
+        worker_obs, reset_infos = zip(*results)
+        self.reset_infos = [info for infos in reset_infos for info in infos]
+        self._reset_seeds()
+        self._reset_options()
+        return self._gather_obs(list(worker_obs))
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+
+        self._buffers.clear()
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+        self.closed = True
+
+    def _dispatch(self, indices) -> Dict[int, List[int]]:
+        """Groups global env indices into ``{worker: [local indices]}``."""
+        groups: Dict[int, List[int]] = {}
+        for i in self._get_indices(indices):
+            worker = i // self.envs_per_worker
+            groups.setdefault(worker, []).append(i - self.slices[worker].start)
+        return groups
+
+    def _call(self, cmd: str, make_data, indices) -> List[Any]:
+        groups = self._dispatch(indices)
+        for worker, local_indices in groups.items():
+            self.remotes[worker].send((cmd, make_data(local_indices)))
+        return [result for worker in groups for result in self.remotes[worker].recv()]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return self._call("get_attr", lambda local: (attr_name, local), indices)
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        groups = self._dispatch(indices)
+        for worker, local_indices in groups.items():
+            self.remotes[worker].send(("set_attr", (attr_name, value, local_indices)))
+        for worker in groups:
+            self.remotes[worker].recv()
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        return self._call(
+            "env_method",
+            lambda local: (method_name, method_args, method_kwargs, local),
+            indices,
+        )
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return self._call("is_wrapped", lambda local: (wrapper_class, local), indices)
+
+
+class ThreadedVecEnv(DummyVecEnv):
+    """In-process vector environment stepping shards of envs on a thread pool.
+
+    Environments are split into contiguous shards of ``envs_per_thread``;
+    each pool thread steps its shard and writes observations, rewards, dones
+    and infos straight into the preallocated stacked buffers, so there is no
+    inter-process copy and the scenario data exists once. Threads run in
+    parallel wherever the simulator releases the GIL (NumPy kernels) and
+    fully on free-threaded Python builds. ``step_async`` submits the shards
+    immediately, so the caller can work while the environments step.
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        envs_per_thread: int = 1,
+        n_threads: Optional[int] = None,
+    ):
+        """Initialize the vector environment.
+
+        Args:
+            env_fns: Environment factories
+            envs_per_thread: Number of environments in each shard
+            n_threads: Size of the thread pool (defaults to one thread per
+                shard, capped at the number of available cores)
+        """
+        if envs_per_thread < 1:
+            raise ValueError(f"envs_per_thread must be >= 1, got {envs_per_thread}")
+        super().__init__(env_fns)
+
+        self.waiting = False
+        self.closed = False
+        self.slices = [
+            slice(start, min(start + envs_per_thread, self.num_envs))
+            for start in range(0, self.num_envs, envs_per_thread)
+        ]
+        n_threads = n_threads or min(len(self.slices), len(available_cpus()))
+        self._executor = ThreadPoolExecutor(
+            max_workers=n_threads, thread_name_prefix="vec_env"
+        )
+        self._futures: List[Future] = []
+
+    def _step_shard(self, shard: slice) -> None:
+        """Steps the environments of one shard into the shared buffers."""
+        for env_idx in range(shard.start, shard.stop):
+            obs, reward, terminated, truncated, info = self.envs[env_idx].step(
+                self.actions[env_idx]
+            )
+            self.buf_rews[env_idx] = reward
+            self.buf_dones[env_idx] = terminated or truncated
+            info["TimeLimit.truncated"] = truncated and not terminated
+            if self.buf_dones[env_idx]:
+                info["terminal_observation"] = obs
+                obs, self.reset_infos[env_idx] = self.envs[env_idx].reset()
+            self.buf_infos[env_idx] = info
+            self._save_obs(env_idx, obs)
+
+    def _reset_shard(self, shard: slice) -> None:
+        """Resets the environments of one shard into the shared buffers."""
+        for env_idx in range(shard.start, shard.stop):
+            options = self._options[env_idx]
+            maybe_options = {"options": options} if options else {}
+            obs, self.reset_infos[env_idx] = self.envs[env_idx].reset(
+                seed=self._seeds[env_idx], **maybe_options
+            )
+            self._save_obs(env_idx, obs)
+
+    def _run_shards(self, fn: Callable[[slice], None]) -> List[Future]:
+        return [self._executor.submit(fn, shard) for shard in self.slices]
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.actions = actions
+        self._futures = self._run_shards(self._step_shard)
+        self.waiting = True
+
+    def step_wait(self):
+        for future in self._futures:
+            # Re-raises exceptions of the worker threads
+            future.result()
+        self._futures = []
+        self.waiting = False
+        return (
+            self._obs_from_buf(),
+            np.copy(self.buf_rews),
+            np.copy(self.buf_dones),
+            deepcopy(self.buf_infos),
+        )
+
+    def reset(self):
+        for future in self._run_shards(self._reset_shard):
+            future.result()
+        self._reset_seeds()
+        self._reset_options()
+        return self._obs_from_buf()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for future in self._futures:
+                future.exception()
+        self._executor.shutdown(wait=True)
+        super().close()
+        self.closed = True
+
+
+def make_training_vec_env(
+    env_id: Callable[..., gym.Env],
+    n_envs: int,
+    env_kwargs: Optional[Dict[str, Any]] = None,
+    backend: str = "dummy",
+    start_method: Optional[str] = None,
+    envs_per_worker: int = 1,
+    cpu_affinity: CpuAffinity = None,
+    worker_threads: Optional[int] = 1,
+    wrapper_class: Optional[Callable[[gym.Env], gym.Env]] = None,
+    wrapper_kwargs: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None,
+    worker_addresses: Optional[Sequence[str]] = None,
+    remote_kwargs: Optional[Dict[str, Any]] = None,
+    pipelined: bool = False,
+) -> VecEnv:
+    """Creates monitored environments on the selected vectorization backend.
+
+    Args:
+        env_id: Environment class or factory, e.g. ``VertiportEnv``
+        n_envs: Number of environments
+        env_kwargs: Keyword arguments for ``env_id``
+        backend: One of ``"dummy"``, ``"subproc"``, ``"shmem"``, ``"threads"``
+            or ``"remote"``
+        start_method: Multiprocessing start method for subprocess backends
+        envs_per_worker: Environments hosted by each worker process (for
+            ``"threads"``: stepped by each pool thread; for ``"remote"``
+            without addresses: by each localhost worker)
+        cpu_affinity: ``"auto"``, explicit core ids per worker, or None
+        worker_threads: PyTorch/BLAS threads per worker process
+        wrapper_class: Optional wrapper applied after the ``Monitor``
+        wrapper_kwargs: Keyword arguments for ``wrapper_class``
+        seed: Initial seed for the environments
+        worker_addresses: ``"host:port"`` of the rollout workers for the
+            ``"remote"`` backend; None starts workers on localhost
+        remote_kwargs: Extra arguments of ``RemoteVecEnv``
+        pipelined: Split the environments into two independently stepped
+            halves for ``PipelinedPPO`` (remote halves use disjoint workers)
+
+    Returns:
+        Vectorized environment
+
+    Raises:
+        ValueError: If ``backend`` is unknown
+    """
+    if backend not in VEC_ENV_BACKENDS:
+        raise ValueError(
+            f"Unknown vec env backend '{backend}'. Available: {VEC_ENV_BACKENDS}"
+        )
+
+    if pipelined:
+        from .pipeline import PipelinedVecEnv
+
+        if n_envs < 2:
+            raise ValueError(f"Pipelining needs at least 2 environments, got {n_envs}")
+        if worker_addresses is not None and len(worker_addresses) < 2:
+            raise ValueError("Pipelining remote environments needs at least 2 workers")
+        sizes = [n_envs // 2, n_envs - n_envs // 2]
+        affinities = [cpu_affinity, cpu_affinity]
+        if cpu_affinity == "auto" and backend in ("subproc", "shmem"):
+            # Plan both halves together so their workers get distinct cores
+            n_workers = [-(-size // envs_per_worker) for size in sizes]
+            plan = plan_cpu_affinity(sum(n_workers), worker_threads or 1)
+            affinities = [plan[: n_workers[0]], plan[n_workers[0] :]]
+        halves = [
+            make_training_vec_env(
+                env_id,
+                n_envs=size,
+                env_kwargs=env_kwargs,
+                backend=backend,
+                start_method=start_method,
+                envs_per_worker=envs_per_worker,
+                cpu_affinity=affinities[half],
+                worker_threads=worker_threads,
+                wrapper_class=wrapper_class,
+                wrapper_kwargs=wrapper_kwargs,
+                seed=None if seed is None else seed + half * sizes[0],
+                worker_addresses=(
+                    None if worker_addresses is None else worker_addresses[half::2]
+                ),
+                remote_kwargs=remote_kwargs,
+            )
+            for half, size in enumerate(sizes)
+        ]
+        return PipelinedVecEnv(halves)
+
+    vec_env_cls = DummyVecEnv
+    vec_env_kwargs: Dict[str, Any] = {}
+    if backend == "remote":
+        from .remote import RemoteVecEnv, launch_local_workers
+
+        vec_env_cls = RemoteVecEnv
+        vec_env_kwargs = dict(remote_kwargs or {})
+        if worker_addresses is None:
+            n_workers = -(-n_envs // envs_per_worker)
+            worker_addresses, processes = launch_local_workers(
+                n_workers,
+                start_method=start_method,
+                worker_threads=worker_threads,
+                authkey=vec_env_kwargs.get("authkey"),
+            )
+            vec_env_kwargs["local_processes"] = processes
+        vec_env_kwargs["addresses"] = worker_addresses
+    elif backend == "threads":
+        vec_env_cls = ThreadedVecEnv
+        vec_env_kwargs = {"envs_per_thread": envs_per_worker}
+    elif backend != "dummy":
+        vec_env_cls = BatchedSubprocVecEnv
+        vec_env_kwargs = {
+            "envs_per_worker": envs_per_worker,
+            "start_method": start_method,
+            "shared_memory": backend == "shmem",
+            "cpu_affinity": cpu_affinity,
+            "worker_threads": worker_threads,
+        }
+
+    return make_vec_env(
+        env_id,
+        n_envs=n_envs,
+        seed=seed,
+        env_kwargs=env_kwargs,
+        vec_env_cls=vec_env_cls,
+        vec_env_kwargs=vec_env_kwargs,
+        wrapper_class=wrapper_class,
+        wrapper_kwargs=wrapper_kwargs,
+    )
@@ -0,0 +1,146 @@
+import os
+import sys
+
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.logger import Logger
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.core.wrappers import DecisionPointWrapper
+from src.vertiport_autonomy.training.callbacks import (
+    AsyncEvalCallback,
+    CurriculumAdvancementCallback,
+)
+
+
+def test_async_eval_callback_evaluates_snapshots(tmp_path):
+    """Snapshots are evaluated in a worker and reported in order"""
+    scenario = "scenarios/easy_world.yaml"
+    config = load_scenario_config(scenario)
+    env = VecNormalize(DummyVecEnv([lambda: VertiportEnv(config)]))
+    model = PPO("MultiInputPolicy", env, n_steps=32, batch_size=32, seed=0)
+
+    callback = AsyncEvalCallback(
+        scenario,
+        n_eval_episodes=1,
+        eval_freq=32,
+        wrapper_class=DecisionPointWrapper,
+        wrapper_kwargs={"max_repeat": 4},
+        log_path=str(tmp_path / "logs"),
+        best_model_save_path=str(tmp_path / "best"),
+        max_pending=2,
+        verbose=0,
+    )
+    assert callback.start_method in ("forkserver", "spawn")
+    model.learn(64, callback=callback)
+    env.close()
+
+    assert callback.evaluations_timesteps == [32, 64]
+    assert callback.best_mean_reward == max(
+        np.mean(rewards) for rewards in callback.evaluations_results
+    )
+
+    evaluations = np.load(tmp_path / "logs" / "evaluations.npz")
+    assert list(evaluations["timesteps"]) == [32, 64]
+    assert (tmp_path / "best" / "best_model.zip").exists()
+    assert (tmp_path / "best" / "vecnormalize.pkl").exists()
+    # Snapshots are removed once evaluated
+    assert not os.path.exists(callback._snapshot_dir)
+
+    # Replaying the best snapshot shows that the Monitor below the wrapper
+    # measured simulator ticks rather than macro-steps
+    best = int(np.argmax([np.mean(r) for r in callback.evaluations_results]))
+    eval_env = VecNormalize.load(
+        str(tmp_path / "best" / "vecnormalize.pkl"),
+        DummyVecEnv([lambda: DecisionPointWrapper(VertiportEnv(config), 4)]),
+    )
+    eval_env.training = False
+    best_model = PPO.load(str(tmp_path / "best" / "best_model.zip"))
+    obs = eval_env.reset()
+    macro_steps, ticks, done = 0, 0, False
+    while not done:
+        action, _ = best_model.predict(obs, deterministic=True)
+        obs, _, dones, infos = eval_env.step(action)
+        macro_steps += 1
+        ticks += infos[0]["repeat_count"]
+        done = dones[0]
+    assert callback.evaluations_length[best] == [ticks]
+    assert ticks > macro_steps
+
+
+def _feed_episodes(callback, model, rewards, completion_rates=None):
+    """Reports finished episodes to the callback, two workers per step"""
+    continue_training = True
+    for start in range(0, len(rewards), 2):
+        infos, dones = [], []
+        for k in range(start, min(start + 2, len(rewards))):
+            info = {"episode": {"r": rewards[k], "l": 100}}
+            if completion_rates is not None:
+                info["completion_rate"] = completion_rates[k]
+            infos.append(info)
+            dones.append(True)
+        # Unfinished episodes are ignored
+        infos.append({"episode": {"r": -1e6, "l": 1}})
+        dones.append(False)
+        model.num_timesteps += 3
+        callback.update_locals({"infos": infos, "dones": np.array(dones)})
+        continue_training = callback.on_step()
+        if not continue_training:
+            break
+    return continue_training
+
+
+def test_curriculum_advancement_callback():
+    """Phases end once the lower confidence bounds clear the thresholds"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    model = PPO("MultiInputPolicy", DummyVecEnv([lambda: VertiportEnv(config)]))
+    model.set_logger(Logger(folder=None, output_formats=[]))
+
+    def make_callback(**kwargs):
+        callback = CurriculumAdvancementCallback(
+            reward_threshold=-50, window=20, min_episodes=10, verbose=0, **kwargs
+        )
+        model.num_timesteps = 0
+        callback.init_callback(model)
+        callback.on_training_start({"total_timesteps": 1000}, {})
+        return callback
+
+    # Too few episodes, however good
+    callback = make_callback()
+    assert _feed_episodes(callback, model, [0.0] * 8)
+    assert not callback.advanced
+
+    # Mean above the threshold, but too noisy for a confident lower bound
+    callback = make_callback()
+    assert _feed_episodes(callback, model, [-140.0, 60.0] * 10)
+    assert not callback.advanced
+
+    # Consistently above the threshold; stops as soon as the bound is met
+    callback = make_callback()
+    assert not _feed_episodes(callback, model, [-30.0, -20.0] * 10)
+    assert callback.advanced
+    assert len(callback.episode_rewards) == 10
+    assert callback.timesteps_saved == 1000 - model.num_timesteps == 1000 - 15
+    logged = model.logger.name_to_value
+    assert logged["curriculum/reward_lower_bound"] >= -50
+    assert logged["curriculum/timesteps_saved"] == callback.timesteps_saved
+
+    # The completion rate must clear its threshold too
+    callback = make_callback(completion_threshold=0.9)
+    assert _feed_episodes(callback, model, [-20.0] * 20, [0.5] * 20)
+    assert not callback.advanced
+    callback = make_callback(completion_threshold=0.9)
+    assert not _feed_episodes(callback, model, [-20.0] * 20, [1.0, 0.95] * 10)
+    assert callback.advanced
+
+    # A single episode has no standard deviation to bound the mean with
+    for kwargs in ({"window": 1}, {"min_episodes": 1}):
+        try:
+            CurriculumAdvancementCallback(reward_threshold=-50, **kwargs)
+            raise AssertionError("Expected a ValueError")
+        except ValueError as e:
+            assert ">= 2" in str(e)
@@ -0,0 +1,110 @@
+import copy
+import os
+import random
+import sys
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.training.checkpoint import (
+    CheckpointManager,
+    restore_training_state,
+)
+from src.vertiport_autonomy.training.trainer import Trainer
+
+
+def test_checkpoint_roundtrip_and_retention(tmp_path):
+    """Checkpoints restore parameters, normalization and counters"""
+    trainer = Trainer(
+        log_dir=str(tmp_path / "logs"),
+        model_dir=str(tmp_path / "models"),
+        n_envs=2,
+        n_steps=32,
+        batch_size=32,
+    )
+    env = trainer.create_environment("scenarios/easy_world.yaml")
+    model = trainer.create_model(env, verbose=0, tensorboard_log=None)
+    model.learn(64)
+
+    manager = CheckpointManager(str(tmp_path / "checkpoints"), keep_last=2)
+    for _ in range(3):
+        manager.save(model, extra={"phase": "easy_world"})
+    manager.wait()
+    assert len(manager.list_checkpoints()) == 2
+
+    expected = {k: v.clone() for k, v in model.policy.state_dict().items()}
+    optimizer_state = copy.deepcopy(model.policy.optimizer.state_dict()["state"])
+    obs_rms = copy.deepcopy(env.obs_rms)
+    ret_rms = copy.deepcopy(env.ret_rms)
+    num_timesteps = model.num_timesteps
+    # The next random draws after the checkpoint
+    draws = (random.random(), np.random.rand(), torch.rand(1))
+
+    model.learn(64, reset_num_timesteps=False)
+    assert model.num_timesteps > num_timesteps
+    assert not np.allclose(env.ret_rms.var, ret_rms.var)
+
+    extra = restore_training_state(model, manager.load())
+    assert extra == {"phase": "easy_world"}
+    assert model.num_timesteps == num_timesteps
+    for key, value in model.policy.state_dict().items():
+        assert torch.equal(value, expected[key])
+
+    # Adam moments and step counts are restored with the parameters
+    restored = model.policy.optimizer.state_dict()["state"]
+    assert restored.keys() == optimizer_state.keys()
+    for index, moments in optimizer_state.items():
+        for name, value in moments.items():
+            assert torch.equal(restored[index][name], value)
+
+    for key, rms in obs_rms.items():
+        assert np.allclose(env.obs_rms[key].mean, rms.mean)
+        assert np.allclose(env.obs_rms[key].var, rms.var)
+        assert env.obs_rms[key].count == rms.count
+    assert np.allclose(env.ret_rms.var, ret_rms.var)
+    assert env.ret_rms.count == ret_rms.count
+
+    # Training resumes with the same random numbers
+    assert random.random() == draws[0]
+    assert np.random.rand() == draws[1]
+    assert torch.equal(torch.rand(1), draws[2])
+
+    manager.close()
+    env.close()
+
+
+def test_trainer_resumes_from_latest_checkpoint(tmp_path):
+    """Training with resume continues the checkpointed run to the total"""
+
+    def make_trainer():
+        return Trainer(
+            log_dir=str(tmp_path / "logs"),
+            model_dir=str(tmp_path / "models"),
+            n_envs=2,
+            n_steps=32,
+            batch_size=32,
+        )
+
+    kwargs = {"save_final": False, "verbose": 0, "tensorboard_log": None}
+    make_trainer().train("scenarios/easy_world.yaml", 64, **kwargs)
+    manager = CheckpointManager(
+        str(tmp_path / "models" / "checkpoints"), name_prefix="ppo_vertiport"
+    )
+    state = manager.load()
+    assert state["num_timesteps"] == 64
+
+    model = make_trainer().train(
+        "scenarios/easy_world.yaml", 128, resume="latest", **kwargs
+    )
+    # Only the remaining timesteps run, on top of the restored counters
+    assert model.num_timesteps == 128
+    assert model._n_updates == 2 * state["n_updates"]
+    # The statistics continue from the checkpoint's: one reset and 32 steps
+    count = state["vec_normalize"]["obs_rms"]["drones_state"].count
+    obs_rms = model.get_vec_normalize_env().obs_rms["drones_state"]
+    assert np.isclose(obs_rms.count, count + 2 * 33)
+    assert len(manager.list_checkpoints()) == 2
+    manager.close()
+    model.get_env().close()
@@ -1,10 +1,15 @@
 import os
 import sys
 
+import numpy as np
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
 from src.vertiport_autonomy.config.loader import load_scenario_config
 from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.training.curriculum import CurriculumTrainer
 
 
 def test_curriculum_phases():
@@ -74,5 +79,90 @@ def test_curriculum_phases():
     print("🎉 All curriculum phases tested successfully!")
 
 
+def test_full_curriculum_with_growing_fleets(tmp_path, capsys):
+    """Phases with 5, 7 and 10 drones share one padded environment"""
+    trainer = CurriculumTrainer(
+        log_dir=str(tmp_path / "logs"),
+        model_dir=str(tmp_path / "models"),
+        auto_advance=False,
+    )
+    trainer.set_custom_phases(
+        [
+            {
+                "name": name,
+                "scenario": f"scenarios/{name}.yaml",
+                "timesteps": 32,
+                "n_envs": 2,
+                "hyperparams": {"n_steps": 16, "batch_size": 32},
+            }
+            for name in ("easy_world", "intermediate_world", "steady_flow")
+        ]
+    )
+    assert trainer.fleet_size() == 10
+
+    model = trainer.run_full_curriculum()
+    assert model.observation_space["drones_state"].shape == (10, 16)
+    assert capsys.readouterr().out.count("Swapped scenario in running workers") == 2
+
+    # Normalization statistics carry over from phase to phase
+    counts = []
+    dummy_env = DummyVecEnv(
+        [lambda: VertiportEnv(load_scenario_config("scenarios/steady_flow.yaml"))]
+    )
+    for name in trainer.get_phase_names():
+        stats = VecNormalize.load(
+            str(tmp_path / "models" / f"curriculum_{name}_final_vecnormalize.pkl"),
+            dummy_env,
+        )
+        counts.append(stats.obs_rms["drones_state"].count)
+    assert counts[0] < counts[1] < counts[2]
+
+
+def test_full_curriculum_with_changing_n_envs(tmp_path):
+    """A phase with more envs reloads the model and keeps the statistics"""
+    trainer = CurriculumTrainer(
+        log_dir=str(tmp_path / "logs"),
+        model_dir=str(tmp_path / "models"),
+        auto_advance=False,
+    )
+    trainer.set_custom_phases(
+        [
+            {
+                "name": name,
+                "scenario": f"scenarios/{name}.yaml",
+                "timesteps": 32,
+                "n_envs": n_envs,
+                "hyperparams": {"n_steps": 16, "batch_size": 32},
+            }
+            for name, n_envs in (("easy_world", 2), ("intermediate_world", 4))
+        ]
+    )
+
+    model = trainer.run_full_curriculum()
+    assert model.n_envs == 4
+    assert model.rollout_buffer.n_envs == 4
+    # Timesteps restart per phase, with 16 steps of 4 envs in the last one
+    assert model.num_timesteps == 64
+
+    dummy_env = DummyVecEnv(
+        [
+            lambda: VertiportEnv(
+                load_scenario_config("scenarios/intermediate_world.yaml")
+            )
+        ]
+    )
+    counts = [
+        VecNormalize.load(
+            str(tmp_path / "models" / f"curriculum_{name}_final_vecnormalize.pkl"),
+            dummy_env,
+        )
+        .obs_rms["drones_state"]
+        .count
+        for name in trainer.get_phase_names()
+    ]
+    # The second phase adds its reset and 16 steps of 4 envs to the first's
+    assert np.isclose(counts[1], counts[0] + 4 * 17)
+
+
 if __name__ == "__main__":
     test_curriculum_phases()
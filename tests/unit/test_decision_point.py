@@ -0,0 +1,172 @@
+import os
+import sys
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.buffers import RolloutBuffer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import torch
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.core.simulator import DroneState
+from src.vertiport_autonomy.core.wrappers import DecisionPointWrapper
+from src.vertiport_autonomy.training.semi_mdp import semi_mdp_rollout_buffer
+from src.vertiport_autonomy.training.trainer import Trainer
+
+
+class _RewardLog(gym.Wrapper):
+    """Records the reward of every simulator tick"""
+
+    def __init__(self, env):
+        super().__init__(env)
+        self.rewards = []
+
+    def step(self, action):
+        result = self.env.step(action)
+        self.rewards.append(result[1])
+        return result
+
+
+def test_decision_point_events():
+    """State changes, FATO changes and new separation threats are events"""
+    env = DecisionPointWrapper(
+        VertiportEnv(load_scenario_config("scenarios/easy_world.yaml"))
+    )
+    env.reset(seed=0)
+    sim = env.unwrapped.sim
+    sim.positions = np.arange(sim.num_drones)[:, None] * np.array([100.0, 0, 0])
+    env._detect_event()
+    assert not env._detect_event()
+
+    sim.states[0] = DroneState.AWAITING_CLEARANCE
+    assert env._detect_event()
+    assert not env._detect_event()
+
+    sim.fato_occupancy[0] = True
+    assert env._detect_event()
+    assert not env._detect_event()
+
+    # A new loss of separation is an event, a sustained one is not
+    sim.positions[1] = sim.positions[0] + np.array([1.0, 0, 0])
+    assert env._detect_event()
+    assert not env._detect_event()
+    sim.positions[1] = sim.positions[0] + np.array([100.0, 0, 0])
+    assert not env._detect_event()
+
+
+def test_decision_point_accumulates_discounted_rewards():
+    """Macro-steps sum discounted tick rewards and end at events or the cap"""
+    log = _RewardLog(VertiportEnv(load_scenario_config("scenarios/easy_world.yaml")))
+    env = DecisionPointWrapper(log, max_repeat=5, gamma=0.9)
+    env.reset(seed=0)
+    sim = env.unwrapped.sim
+    continue_all = np.ones(env.action_space.shape, dtype=np.int64)
+
+    repeats = []
+    done = False
+    while not done:
+        states = [state.value for state in sim.states]
+        occupancy = sim.fato_occupancy.copy()
+        _, reward, terminated, truncated, info = env.step(continue_all)
+        done = terminated or truncated
+        k = info["repeat_count"]
+        repeats.append(k)
+
+        ticks = log.rewards[-k:]
+        assert np.isclose(reward, sum(0.9**i * r for i, r in enumerate(ticks)))
+        assert np.isclose(info["discount"], 0.9**k)
+        assert 1 <= k <= 5
+        if k < 5 and not done:
+            changed = states != [state.value for state in sim.states]
+            changed |= not np.array_equal(occupancy, sim.fato_occupancy)
+            # Otherwise the macro-step ended at a new separation threat
+            assert changed or np.any(env._prev_threats)
+
+    assert sum(repeats) == len(log.rewards) == env.unwrapped.current_step
+    assert max(repeats) == 5
+
+
+def test_semi_mdp_buffer_discounts_each_transition():
+    """GAE bootstraps every transition with its own discount"""
+    buffer_class = semi_mdp_rollout_buffer(RolloutBuffer)
+    buffer = buffer_class(
+        3,
+        spaces.Box(-1, 1, (2,)),
+        spaces.Discrete(2),
+        gamma=0.9,
+        gae_lambda=1.0,
+        n_envs=1,
+    )
+    rewards = [1.0, 2.0, 3.0]
+    for reward in rewards:
+        buffer.add(
+            np.zeros((1, 2)),
+            np.zeros((1, 1)),
+            np.array([reward]),
+            np.array([False]),
+            torch.zeros(1),
+            torch.zeros(1),
+        )
+    discounts = [0.9**3, 0.9, 0.9**2]
+    buffer.discounts[:, 0] = discounts
+    buffer.compute_returns_and_advantage(torch.tensor([10.0]), np.array([False]))
+
+    expected = rewards[2] + discounts[2] * 10.0
+    expected = rewards[1] + discounts[1] * expected
+    expected = rewards[0] + discounts[0] * expected
+    assert np.isclose(buffer.returns[0, 0], expected, rtol=1e-5)
+
+
+def test_trainer_bootstraps_macro_steps_with_their_discount(tmp_path):
+    """Training with action repeat records gamma**k per transition"""
+    trainer = Trainer(
+        log_dir=str(tmp_path),
+        model_dir=str(tmp_path),
+        n_envs=2,
+        max_action_repeat=4,
+        n_steps=32,
+        batch_size=32,
+    )
+    env = trainer.create_environment("scenarios/easy_world.yaml")
+    model = trainer.create_model(env, verbose=0, tensorboard_log=None, seed=0)
+    model.learn(64, callback=trainer.algorithm_callbacks())
+    env.close()
+
+    discounts = model.rollout_buffer.discounts
+    assert type(model.rollout_buffer).__name__ == "SemiMDPDictRolloutBuffer"
+    allowed = np.float32([0.99**k for k in range(1, 5)])
+    assert np.isin(discounts, allowed).all()
+    assert (discounts < allowed[0]).any()
+
+
+def test_trainer_discounts_macro_steps_with_the_model_gamma(tmp_path):
+    """A gamma override of the model also discounts the ticks of macro-steps"""
+    trainer = Trainer(
+        log_dir=str(tmp_path),
+        model_dir=str(tmp_path),
+        n_envs=2,
+        max_action_repeat=4,
+        n_steps=32,
+        batch_size=32,
+    )
+    assert trainer.model_params(gamma=0.9)["gamma"] == 0.9
+    model = trainer.train(
+        "scenarios/easy_world.yaml",
+        64,
+        save_final=False,
+        verbose=0,
+        tensorboard_log=None,
+        seed=0,
+        gamma=0.9,
+    )
+    model.get_env().close()
+
+    assert model.gamma == 0.9
+    discounts = model.rollout_buffer.discounts
+    allowed = np.float32([0.9**k for k in range(1, 5)])
+    assert np.isin(discounts, allowed).all()
+    assert (discounts < allowed[0]).any()
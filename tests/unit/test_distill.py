@@ -0,0 +1,70 @@
+import os
+import sys
+
+import numpy as np
+import torch
+from stable_baselines3 import PPO
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import VecNormalize
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.agents.drl import DistilledAgent, PPOAgent
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.training.distill import distill_policy
+
+
+def test_distilled_student_reports_fidelity_and_round_trips(tmp_path):
+    """The student imitates the teacher and acts as a stand-alone agent"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VecNormalize(
+        make_vec_env(VertiportEnv, n_envs=2, env_kwargs={"config": config})
+    )
+    model = PPO("MultiInputPolicy", env, n_steps=32, batch_size=32, n_epochs=1, seed=0)
+    model.learn(64)
+    # Sharpen the barely trained policy so its decisions can be imitated
+    with torch.no_grad():
+        model.policy.action_net.weight.mul_(10.0)
+        model.policy.action_net.bias.mul_(10.0)
+    model.save(str(tmp_path / "teacher"))
+    env.save(str(tmp_path / "teacher_vecnormalize.pkl"))
+    teacher = PPOAgent(str(tmp_path / "teacher.zip"))
+
+    student, report = distill_policy(
+        teacher,
+        "scenarios/easy_world.yaml",
+        n_samples=1000,
+        hidden_sizes=(64,),
+        dagger_rounds=1,
+        epochs=40,
+        batch_size=128,
+        learning_rate=1e-2,
+        n_envs=4,
+        eval_samples=200,
+        verbose=0,
+    )
+    assert report.samples == 2000
+    assert len(report.loss) == 80
+    assert 0.0 <= report.joint_agreement <= report.action_agreement <= 1.0
+    # Well above the 0.2 agreement of a random student over five actions
+    assert report.action_agreement > 0.8
+    assert report.student_parameters == student.num_parameters
+    assert report.student_parameters < report.teacher_parameters
+    assert report.student_latency_p99_us >= report.student_latency_p50_us > 0
+
+    eval_env = VertiportEnv(config)
+    observations = [eval_env.reset(seed=3)[0]]
+    for _ in range(20):
+        observations.append(eval_env.step(student.act(observations[-1]))[0])
+    batch = {
+        key: np.stack([obs[key] for obs in observations]) for key in observations[0]
+    }
+
+    path = str(tmp_path / "student.npz")
+    student.save(path)
+    loaded = DistilledAgent.load(path)
+    actions = loaded.act(batch)
+    assert actions.shape == (len(observations), config.traffic.max_drones)
+    assert np.array_equal(actions, student.act(batch))
+    assert np.array_equal(loaded.act(observations[4]), actions[4])
@@ -1,10 +1,13 @@
 import os
 import sys
 
+import numpy as np
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from src.vertiport_autonomy.config.loader import load_scenario_config
 from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.core.simulator import DroneState
 
 
 # Test basic functionality
@@ -30,5 +33,114 @@ def test_basic_setup():
     print("Test completed successfully!")
 
 
+def test_action_masks():
+    """Action masks follow drone states and always leave a valid action"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VertiportEnv(config)
+
+    obs, info = env.reset()
+    assert info["action_mask"].shape == (env.num_drones, 5)
+    assert env.action_masks().shape == (env.num_drones * 5,)
+
+    for _ in range(200):
+        mask = env.action_masks().reshape(env.num_drones, 5)
+        assert mask.any(axis=1).all()
+        assert not mask[:, 2:4].any()
+
+        states = obs["drones_state"][:, 14].astype(int)
+        awaiting = states == DroneState.AWAITING_CLEARANCE.value
+        assert np.array_equal(mask[:, 4], awaiting)
+
+        # Sample uniformly among the valid actions of every drone
+        action = np.array([np.random.choice(np.flatnonzero(row)) for row in mask])
+        obs, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            break
+
+    env.close()
+
+
+def test_topk_observation_mode():
+    """Top-k observations list each drone's nearest neighbors in order"""
+    config = load_scenario_config("scenarios/steady_flow.yaml")
+    env = VertiportEnv(config, obs_mode="topk", k_neighbors=3)
+
+    obs, info = env.reset()
+    assert env.observation_space.contains(obs)
+    assert "distance_matrix" not in obs
+    assert obs["neighbors"].shape == (env.num_drones, 3, 8)
+
+    for _ in range(10):
+        obs, reward, terminated, truncated, info = env.step(np.ones(env.num_drones))
+
+    state = env.sim._get_state()
+    for i in range(env.num_drones):
+        others = np.delete(state["distance_matrix"][i], i)
+        expected = np.sort(others)[:3]
+        assert np.allclose(obs["neighbors"][i, :, 6], expected, atol=1e-4)
+        assert np.all(obs["neighbor_mask"][i] == 1.0)
+
+    env.close()
+
+
+def test_graph_observation_mode():
+    """Graph observations only contain edges between drones in sensor range"""
+    config = load_scenario_config("scenarios/steady_flow.yaml")
+    env = VertiportEnv(config, obs_mode="graph", k_neighbors=3)
+
+    obs, info = env.reset()
+    assert env.observation_space.contains(obs)
+
+    state = env.sim._get_state()
+    sensor_range = config.simulation.get("sensor_range", 20.0)
+    valid = obs["edge_mask"] == 1.0
+    src, dst = obs["edge_index"][:, valid].astype(int)
+    assert np.all(src != dst)
+    assert np.all(state["distance_matrix"][src, dst] < sensor_range)
+    assert np.allclose(obs["edge_attr"][valid, 3], state["distance_matrix"][src, dst])
+
+    in_range = (state["distance_matrix"] < sensor_range).sum(axis=1)
+    assert valid.sum() == np.minimum(in_range, 3).sum()
+
+    env.close()
+
+
+def test_set_scenario():
+    """Scenarios with the same spaces can be swapped in place"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VertiportEnv(config)
+    env.reset(seed=0)
+
+    swapped = config.model_copy(deep=True)
+    swapped.traffic.arrival_rate = 0.1
+    env.set_scenario(swapped)
+    assert env.sim.config is swapped
+    obs, _ = env.reset(seed=0)
+    assert env.observation_space.contains(obs)
+
+    try:
+        env.set_scenario(load_scenario_config("scenarios/intermediate_world.yaml"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError for a different fleet size")
+    assert env.config is swapped
+
+
+def test_completion_rate_reported_at_episode_end():
+    """The final step of an episode reports the fraction of finished drones"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VertiportEnv(config)
+    env.reset(seed=0)
+
+    done = False
+    while not done:
+        _, _, terminated, truncated, info = env.step(env.action_space.sample())
+        done = terminated or truncated
+        assert ("completion_rate" in info) == done
+
+    assert 0.0 <= info["completion_rate"] <= 1.0
+
+
 if __name__ == "__main__":
     test_basic_setup()
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.agents.heuristic import SimpleHeuristicAgent
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.core.simulator import DroneState
+
+
+def _observation(states, positions=None, targets=None, granted=()):
+    num_drones = len(states)
+    drones_state = np.zeros((num_drones, 16), dtype=np.float32)
+    drones_state[:, 14] = states
+    drones_state[list(granted), 15] = 1.0
+    if positions is not None:
+        drones_state[:, 0:3] = positions
+        drones_state[:, 9:12] = targets
+    return {"drones_state": drones_state, "infrastructure_state": np.zeros(4)}
+
+
+def test_fcfs_clearance_and_conflict_priority():
+    """Clearance follows arrival order per FATO; the lower priority drone holds"""
+    agent = SimpleHeuristicAgent(num_fatos=2)
+    en_route = DroneState.EN_ROUTE_TO_ENTRY.value
+    waiting = DroneState.AWAITING_CLEARANCE.value
+
+    # Drones 0 and 2 share FATO 0; drone 2 reaches the holding point first
+    actions = agent.act(_observation([en_route, en_route, waiting, en_route]))
+    assert actions.tolist() == [1, 1, 4, 1]
+    actions = agent.act(
+        _observation([waiting, en_route, waiting, waiting], granted=[2])
+    )
+    assert actions.tolist() == [0, 1, 0, 4]
+    for state in (DroneState.CLEARED_TO_LAND, DroneState.ON_PAD):
+        actions = agent.act(_observation([waiting, en_route, state.value, waiting]))
+        assert actions[0] == 0
+    actions = agent.act(
+        _observation([waiting, en_route, DroneState.EN_ROUTE_TO_EXIT.value, waiting])
+    )
+    assert actions[0] == 4
+
+    # Two drones crossing at (10, 0, 10) in two seconds
+    positions = np.array([[0.0, 0.0, 10.0], [10.0, -10.0, 10.0]])
+    targets = np.array([[20.0, 0.0, 10.0], [10.0, 10.0, 10.0]])
+    agent = SimpleHeuristicAgent(num_fatos=2)
+    assert agent.act(_observation([en_route] * 2, positions, targets)).tolist() == [
+        1,
+        0,
+    ]
+    departing = [en_route, DroneState.EN_ROUTE_TO_EXIT.value]
+    assert agent.act(_observation(departing, positions, targets)).tolist() == [0, 1]
+
+
+def test_heuristic_completes_missions_with_batched_observations():
+    """The controller lands every drone without collisions, batched or not"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    envs = [VertiportEnv(config) for _ in range(3)]
+    observations = [env.reset(seed=0)[0] for env in envs]
+    # Offset the environments so the batch mixes different traffic situations
+    for offset, env in enumerate(envs):
+        for _ in range(offset * 60):
+            observations[offset] = env.step(np.zeros(env.max_drones, np.int64))[0]
+
+    batched_agent = SimpleHeuristicAgent.from_config(config)
+    single_agents = [SimpleHeuristicAgent.from_config(config) for _ in envs]
+    finished = [False] * len(envs)
+    for _ in range(800):
+        batch = {
+            key: np.stack([obs[key] for obs in observations]) for key in observations[0]
+        }
+        actions = batched_agent.act(batch)
+        assert actions.shape == (3, config.traffic.max_drones)
+        for i, env in enumerate(envs):
+            assert np.array_equal(actions[i], single_agents[i].act(observations[i]))
+            if finished[i]:
+                continue
+            observations[i], _, terminated, truncated, info = env.step(actions[i])
+            assert not env.sim._get_state()["collisions"]
+            if terminated:
+                assert info["completion_rate"] == 1.0
+                finished[i] = True
+    assert all(finished)
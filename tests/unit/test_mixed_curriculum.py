@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.training.mixed_curriculum import (
+    make_mixed_scenario_vec_env,
+)
+
+
+def test_mixed_scenarios_share_padded_spaces():
+    """Slots run different scenarios padded to the largest fleet"""
+    scenario_paths = [
+        "scenarios/easy_world.yaml",
+        "scenarios/intermediate_world.yaml",
+        "scenarios/steady_flow.yaml",
+    ]
+    env = make_mixed_scenario_vec_env(scenario_paths, n_envs=3, window=4, seed=0)
+    obs = env.reset()
+
+    assert env.get_attr("num_drones") == [5, 7, 10]
+    assert obs["drones_state"].shape == (3, 10, 16)
+    # Padded drone rows of the smallest scenario stay empty
+    assert not obs["drones_state"][0, 5:].any()
+
+    finished = set()
+    for _ in range(300):
+        actions = np.stack([env.action_space.sample() for _ in range(3)])
+        obs, _, dones, infos = env.step(actions)
+        finished.update(info["scenario"] for info, done in zip(infos, dones) if done)
+        for i, num_drones in enumerate(env.get_attr("num_drones")):
+            assert not obs["drones_state"][i, num_drones:].any()
+
+    assert finished
+    probabilities = env.sampling_probabilities()
+    assert set(probabilities) == {"easy_world", "intermediate_world", "steady_flow"}
+    assert np.isclose(sum(probabilities.values()), 1.0)
+    env.close()
@@ -0,0 +1,140 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.multi_agent import (
+    OWN_FEATURES,
+    SharedPolicyVecEnv,
+    VertiportParallelEnv,
+    build_egocentric_observations,
+)
+from src.vertiport_autonomy.core.simulator import DroneState
+
+
+def test_parallel_env_api():
+    """Agents, spaces and per-agent reset/step dicts follow ParallelEnv"""
+    env = VertiportParallelEnv(load_scenario_config("scenarios/easy_world.yaml"))
+    agents = [f"drone_{i}" for i in range(5)]
+    assert env.possible_agents == agents
+    assert env.agents == []
+    for agent in agents:
+        assert env.observation_space(agent).shape == (env.obs_dim,)
+        assert env.action_space(agent).n == 5
+
+    obs, infos = env.reset(seed=0)
+    assert env.agents == agents
+    assert set(obs) == set(infos) == set(agents)
+    for agent in agents:
+        assert env.observation_space(agent).contains(obs[agent])
+        assert infos[agent]["action_mask"].shape == (5,)
+    assert env.state().shape == (5 * 16,)
+
+    env.env.max_steps = 2
+    # Agents without an action hover
+    obs, rewards, terminations, truncations, infos = env.step({"drone_0": 1})
+    assert set(obs) == set(rewards) == set(terminations) == set(agents)
+    assert len(set(rewards.values())) == 1
+    assert not any(truncations.values())
+    assert np.allclose(env.sim.velocities[1:], 0)
+    assert np.linalg.norm(env.sim.velocities[0]) > 0
+
+    _, _, terminations, truncations, _ = env.step({agent: 1 for agent in agents})
+    assert all(truncations.values()) and not any(terminations.values())
+    assert env.agents == []
+    env.close()
+
+
+def test_egocentric_observation_contents():
+    """Rows hold own, masked neighbor and infrastructure features"""
+    k = 6
+    env = VertiportParallelEnv(
+        load_scenario_config("scenarios/easy_world.yaml"), k_neighbors=k
+    )
+    env.reset(seed=0)
+    for _ in range(5):
+        env.step_batch(np.ones(5, dtype=np.int64))
+    env.sim.states[2] = DroneState.AWAITING_CLEARANCE
+    env.sim.fato_occupancy[0] = True
+    obs = env.env._get_obs()
+    observations = build_egocentric_observations(obs)
+    assert observations.shape == (5, env.obs_dim)
+
+    sim = env.sim
+    state = sim._get_state()
+    neighbors_end = OWN_FEATURES + k * 8
+    for i, row in enumerate(observations):
+        assert np.allclose(row[0:3], state["target_waypoints"][i] - sim.positions[i])
+        assert np.allclose(row[3:6], sim.velocities[i])
+        assert row[6] == sim.hovering[i] and row[7] == sim.hover_count[i]
+        assert row[8] == sim.clearance_granted[i]
+        one_hot = row[9:OWN_FEATURES]
+        assert one_hot.sum() == 1 and one_hot[sim.states[i].value] == 1
+
+        # Four real neighbors; the masked slots are zeroed, distance included
+        neighbors = row[OWN_FEATURES:neighbors_end].reshape(k, 8)
+        mask = row[neighbors_end : neighbors_end + k]
+        assert np.array_equal(mask, [1, 1, 1, 1, 0, 0])
+        assert np.allclose(neighbors[4:], 0)
+        assert np.all(np.diff(neighbors[:4, 6]) >= 0)
+        assert np.isclose(
+            neighbors[0, 6],
+            min(state["distance_matrix"][i, j] for j in range(5) if j != i),
+        )
+
+        assert np.allclose(row[neighbors_end + k :], obs["infrastructure_state"])
+    assert observations[2, 9 + DroneState.AWAITING_CLEARANCE.value] == 1
+    env.close()
+
+
+def test_shared_policy_vec_env_slots_and_auto_reset():
+    """Slots map to drones of each world and finished worlds reset alone"""
+    vec_env = SharedPolicyVecEnv(
+        load_scenario_config("scenarios/easy_world.yaml"), n_worlds=2
+    )
+    n = vec_env.drones_per_world
+    assert vec_env.num_envs == 2 * n
+    observations = vec_env.reset()
+    assert observations.shape == (2 * n, vec_env.observation_space.shape[0])
+
+    world_0, world_1 = vec_env.worlds
+    world_0.env.max_steps = 3
+    # World 0 hovers, world 1 continues
+    actions = np.repeat([0, 1], n)
+    for step in range(3):
+        observations, rewards, dones, infos = vec_env.step(actions)
+        if step < 2:
+            assert not dones.any()
+            for w, world in enumerate(vec_env.worlds):
+                expected = build_egocentric_observations(world._last_obs)
+                assert np.allclose(observations[w * n : (w + 1) * n], expected)
+                assert np.all(rewards[w * n : (w + 1) * n] == rewards[w * n])
+            assert np.allclose(world_0.sim.velocities, 0)
+            assert np.all(np.linalg.norm(world_1.sim.velocities, axis=1) > 0)
+
+    assert dones[:n].all() and not dones[n:].any()
+    for i in range(n):
+        assert infos[i]["TimeLimit.truncated"]
+        assert "terminal_observation" in infos[i]
+        assert "terminal_observation" not in infos[n + i]
+    # World 0 was reset and its slots hold the first observation of the episode
+    assert world_0.env.current_step == 0 and world_1.env.current_step == 3
+    reset_obs = build_egocentric_observations(world_0._last_obs)
+    assert np.allclose(observations[:n], reset_obs)
+
+    masks = vec_env.env_method("action_masks", indices=[0, n + 1])
+    assert np.array_equal(masks[0], world_0.action_masks()[0])
+    assert np.array_equal(masks[1], world_1.action_masks()[1])
+    assert vec_env.get_attr("num_drones", indices=[0, n]) == [n, n]
+
+    # Other methods run once per world and are broadcast to its slots
+    calls = []
+    for w, world in enumerate(vec_env.worlds):
+        world.describe = lambda w=w: calls.append(w) or f"world {w}"
+    results = vec_env.env_method("describe", indices=[0, 1, n, n + 2])
+    assert results == ["world 0", "world 0", "world 1", "world 1"]
+    assert calls == [0, 1]
+    vec_env.close()
@@ -0,0 +1,147 @@
+import multiprocessing as mp
+import os
+import sys
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.training.checkpoint import capture_training_state
+from src.vertiport_autonomy.training.pbt import (
+    PopulationStore,
+    _run_member,
+    copy_member_state,
+    perturb_hyperparameters,
+    select_exploit_source,
+)
+from src.vertiport_autonomy.training.trainer import Trainer
+from src.vertiport_autonomy.training.vec_env import available_cpus
+
+TRAINER_KWARGS = {"n_envs": 2, "n_steps": 32, "batch_size": 32}
+
+
+def test_store_exploit_and_explore(tmp_path):
+    """Only bottom members exploit, always from the top, within bounds"""
+    store = PopulationStore(str(tmp_path))
+    for member_id, score in enumerate([5.0, -3.0, 10.0, 1.0, None]):
+        store.publish(
+            member_id,
+            {"member_id": member_id, "score": score},
+            {"weights": np.full(3, member_id)},
+        )
+    records = store.records()
+    assert sorted(records) == [0, 1, 2, 3, 4]
+    assert np.all(store.load_state(2)["weights"] == 2)
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+    rng = np.random.default_rng(0)
+    # Four scored members and a fraction of 0.25 gives one member per group
+    assert select_exploit_source(1, records, 0.25, rng) == 2
+    for member_id in (0, 2, 3, 4):
+        assert select_exploit_source(member_id, records, 0.25, rng) is None
+    assert select_exploit_source(1, {1: records[1]}, 0.25, rng) is None
+
+    bounds = {"learning_rate": (1e-5, 1e-3), "ent_coef": (0.0, 0.1)}
+    for _ in range(20):
+        params = perturb_hyperparameters(
+            {"learning_rate": 1e-3, "ent_coef": 0.01, "vf_coef": 0.5},
+            bounds,
+            (0.8, 1.25),
+            rng,
+        )
+        assert params["learning_rate"] in (8e-4, 1e-3)
+        assert np.isclose(params["ent_coef"], 0.008) or np.isclose(
+            params["ent_coef"], 0.0125
+        )
+        assert params["vf_coef"] == 0.5
+
+
+def _make_model(tmp_path, name, **hyperparams):
+    trainer = Trainer(
+        log_dir=str(tmp_path / name),
+        model_dir=str(tmp_path / name),
+        **TRAINER_KWARGS,
+        **hyperparams,
+    )
+    env = trainer.create_environment("scenarios/easy_world.yaml")
+    return trainer.create_model(env, verbose=0, tensorboard_log=None, seed=0)
+
+
+def test_copy_member_state_keeps_counters_and_resets_scores(tmp_path):
+    """Exploiting copies weights but restarts the rolling episode rewards"""
+    source = _make_model(tmp_path, "source", learning_rate=1e-3, ent_coef=0.05)
+    source.learn(64)
+    state = capture_training_state(
+        source, extra={"hyperparams": {"learning_rate": 1e-3, "ent_coef": 0.05}}
+    )
+
+    model = _make_model(tmp_path, "member", learning_rate=1e-4, ent_coef=0.01)
+    model.learn(512)
+    assert len(model.ep_info_buffer) > 0
+    counters = (model.num_timesteps, model._n_updates, model._episode_num)
+
+    hyperparams = copy_member_state(model, state)
+    assert hyperparams == {"learning_rate": 1e-3, "ent_coef": 0.05}
+    assert (model.num_timesteps, model._n_updates, model._episode_num) == counters
+    assert len(model.ep_info_buffer) == 0
+    for name, value in source.policy.state_dict().items():
+        assert torch.equal(model.policy.state_dict()[name], value)
+    source_stats = source.get_vec_normalize_env().obs_rms["drones_state"]
+    stats = model.get_vec_normalize_env().obs_rms["drones_state"]
+    assert np.array_equal(stats.mean, source_stats.mean)
+
+
+def test_member_exploits_a_better_member(tmp_path):
+    """A bottom member copies the top member's state and perturbs its params"""
+    store = PopulationStore(str(tmp_path / "store"))
+    source = _make_model(tmp_path, "source", learning_rate=1e-3, ent_coef=0.05)
+    source.learn(64)
+    state = capture_training_state(
+        source, extra={"hyperparams": {"learning_rate": 1e-3, "ent_coef": 0.05}}
+    )
+    # The record was republished with new hyperparameters after the state
+    # was taken; the exploiting member must use those stored with the state
+    store.publish(
+        1,
+        {
+            "member_id": 1,
+            "score": 1e9,
+            "hyperparams": {"learning_rate": 5e-5, "ent_coef": 0.001},
+        },
+        state,
+    )
+
+    bounds = {"learning_rate": (1e-6, 1e-2), "ent_coef": (1e-5, 0.1)}
+    process = mp.get_context("spawn").Process(
+        target=_run_member,
+        args=(
+            0,
+            "scenarios/easy_world.yaml",
+            {"learning_rate": 1e-4, "ent_coef": 0.01},
+            512,
+            256,
+            0.5,
+            bounds,
+            (0.8, 1.25),
+            store.directory,
+            str(tmp_path / "member_00"),
+            available_cpus()[:1],
+            0,
+            TRAINER_KWARGS,
+        ),
+    )
+    process.start()
+    process.join()
+
+    record = store.records()[0]
+    assert record["status"] == "completed", record.get("error")
+    assert record["timesteps"] == 512
+    exploit = record["history"][0]
+    assert exploit["copied_from"] == 1 and exploit["timesteps"] == 256
+    for name, value in {"learning_rate": 1e-3, "ent_coef": 0.05}.items():
+        assert any(
+            np.isclose(exploit["hyperparams"][name], value * factor)
+            for factor in (0.8, 1.25)
+        )
+    assert record["hyperparams"] == record["history"][-1]["hyperparams"]
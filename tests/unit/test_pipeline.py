@@ -0,0 +1,57 @@
+import functools
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.training.trainer import Trainer
+
+
+def _rollout(tmp_path, pipeline_rollouts):
+    trainer = Trainer(
+        log_dir=str(tmp_path),
+        model_dir=str(tmp_path),
+        n_envs=4,
+        vec_env_backend="subproc",
+        vec_env_kwargs={"envs_per_worker": 2},
+        pipeline_rollouts=pipeline_rollouts,
+        n_steps=16,
+        batch_size=32,
+    )
+    env = trainer.create_environment("scenarios/easy_world.yaml")
+    env.seed(0)
+    # Frozen statistics, because halves merge them in a different order
+    env.training = False
+    model = trainer.create_model(env, verbose=0, tensorboard_log=None, seed=0)
+    # Deterministic actions make both rollout loops comparable step by step
+    model.policy.forward = functools.partial(model.policy.forward, deterministic=True)
+    model.learn(64)
+    buffer = model.rollout_buffer
+    original = (env.get_original_obs(), env.get_original_reward())
+    env.close()
+    return type(model).__name__, buffer, original
+
+
+def test_pipelined_rollouts_match_ppo(tmp_path):
+    """Alternating halves records the same transitions as the PPO loop"""
+    name, pipelined, original = _rollout(tmp_path / "pipelined", True)
+    assert name == "PipelinedPPO"
+    _, reference, reference_original = _rollout(tmp_path / "reference", False)
+
+    assert np.array_equal(pipelined.actions, reference.actions)
+    assert np.array_equal(pipelined.episode_starts, reference.episode_starts)
+    assert np.allclose(pipelined.rewards, reference.rewards, atol=1e-4)
+    assert np.allclose(pipelined.values, reference.values, atol=1e-4)
+    for key in reference.observations:
+        assert np.allclose(
+            pipelined.observations[key], reference.observations[key], atol=1e-4
+        )
+
+    # The raw observations and rewards of the last step are kept as well
+    obs, rewards = original
+    reference_obs, reference_rewards = reference_original
+    assert np.allclose(rewards, reference_rewards, atol=1e-4)
+    for key in reference_obs:
+        assert np.allclose(obs[key], reference_obs[key], atol=1e-4)
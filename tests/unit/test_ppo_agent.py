@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import VecNormalize
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.agents.drl.ppo import PPOAgent
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.evaluation.framework import agent_wrapper
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def test_numpy_policy_matches_sb3_predictions(tmp_path):
+    """The NumPy forward pass reproduces SB3's actions without importing torch"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VecNormalize(
+        make_vec_env(VertiportEnv, n_envs=2, env_kwargs={"config": config}),
+        clip_obs=10.0,
+    )
+    model = PPO(
+        "MultiInputPolicy",
+        env,
+        n_steps=32,
+        batch_size=32,
+        n_epochs=1,
+        policy_kwargs={"net_arch": [32, 32]},
+        seed=0,
+    )
+    model.learn(64)
+    model_path = str(tmp_path / "model")
+    model.save(model_path)
+    env.save(f"{model_path}_vecnormalize.pkl")
+
+    eval_env = VertiportEnv(config)
+    observations = [eval_env.reset(seed=1)[0]]
+    for _ in range(40):
+        observations.append(eval_env.step(eval_env.action_space.sample())[0])
+    batch = {
+        key: np.stack([obs[key] for obs in observations]) for key in observations[0]
+    }
+
+    agent = PPOAgent(f"{model_path}.zip")
+    expected, _ = model.predict(env.normalize_obs(batch), deterministic=True)
+    actions = agent.act(batch)
+    assert actions.shape == (len(observations), config.traffic.max_drones)
+    assert np.array_equal(actions, expected)
+    assert np.array_equal(agent.act(observations[5]), expected[5])
+
+    sampled = PPOAgent(f"{model_path}.zip", deterministic=False, seed=0).act(batch)
+    assert sampled.shape == actions.shape and sampled.max() < 5
+
+    # A fresh interpreter loads and runs the policy without torch
+    script = (
+        "import sys\n"
+        "from src.vertiport_autonomy.agents.drl import PPOAgent\n"
+        "from src.vertiport_autonomy.config.loader import load_scenario_config\n"
+        "from src.vertiport_autonomy.core.environment import VertiportEnv\n"
+        f"agent = PPOAgent({model_path!r})\n"
+        "env = VertiportEnv(load_scenario_config('scenarios/easy_world.yaml'))\n"
+        "agent.act(env.reset(seed=0)[0])\n"
+        "assert 'torch' not in sys.modules, 'torch was imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, check=True)
+
+
+def _save_model(tmp_path, name, env_kwargs):
+    """Trains a tiny model on easy_world with extra env arguments and saves it"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VecNormalize(
+        make_vec_env(
+            VertiportEnv, n_envs=2, env_kwargs={"config": config, **env_kwargs}
+        )
+    )
+    model = PPO("MultiInputPolicy", env, n_steps=16, batch_size=32, seed=0)
+    model.learn(32)
+    model_path = str(tmp_path / name)
+    model.save(model_path)
+    env.save(f"{model_path}_vecnormalize.pkl")
+    env.close()
+    return f"{model_path}.zip"
+
+
+def test_padded_and_topk_models_evaluate_on_smaller_scenarios(tmp_path):
+    """The saved spaces give the env layout a model is evaluated with"""
+    padded = PPOAgent(_save_model(tmp_path, "padded", {"max_drones": 10}))
+    assert padded.env_kwargs == {"max_drones": 10}
+    topk = PPOAgent(
+        _save_model(tmp_path, "topk", {"obs_mode": "topk", "k_neighbors": 3})
+    )
+    assert topk.env_kwargs == {"max_drones": 5, "obs_mode": "topk", "k_neighbors": 3}
+
+    for agent in (padded, topk):
+        agent_fn = agent_wrapper(agent, env_kwargs=agent.env_kwargs)
+        metrics = agent_fn("scenarios/easy_world.yaml", 0, 50)
+        assert metrics["episode_length"] > 0
+
+    # Without the layout, the padded model cannot act on the 5 drone scenario
+    try:
+        agent_wrapper(padded)("scenarios/easy_world.yaml", 0, 50)
+        raise AssertionError("Expected a ValueError")
+    except ValueError as e:
+        assert "reshape" in str(e)
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import VecNormalize
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.agents.heuristic import SimpleHeuristicAgent
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.training.pretrain import (
+    DemonstrationDataset,
+    collect_demonstrations,
+    pretrain_policy,
+)
+
+
+def test_collect_and_clone_demonstrations(tmp_path):
+    """Parallel rollouts fill the memory maps and BC fits the demonstrations"""
+    dataset_dir = str(tmp_path / "demos")
+    dataset = collect_demonstrations(
+        "scenarios/easy_world.yaml", dataset_dir, n_samples=400, n_workers=2
+    )
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    num_drones = config.traffic.max_drones
+
+    assert len(dataset) == 400
+    assert dataset.actions.shape == (400, num_drones)
+    assert isinstance(dataset.observations["drones_state"], np.memmap)
+    # Both workers wrote their half: every row holds a real observation
+    positions = dataset.observations["drones_state"][:, :, 0:3]
+    assert np.all(np.abs(positions).sum(axis=(1, 2)) > 0)
+    # Stored actions are the agent's decisions on the stored observations
+    for row in (0, 200):
+        agent = SimpleHeuristicAgent.from_config(config)
+        obs = {key: array[row] for key, array in dataset.observations.items()}
+        assert np.array_equal(agent.act(obs), dataset.actions[row])
+
+    env = VecNormalize(
+        make_vec_env(VertiportEnv, n_envs=2, env_kwargs={"config": config})
+    )
+    model = PPO("MultiInputPolicy", env, n_steps=64, batch_size=64, seed=0)
+    history = pretrain_policy(
+        model, DemonstrationDataset(dataset_dir), epochs=3, batch_size=64, verbose=0
+    )
+
+    assert history["loss"][-1] < history["loss"][0]
+    assert history["accuracy"][-1] >= history["accuracy"][0]
+    # PPO starts with the normalization the policy was cloned under
+    states = np.asarray(dataset.observations["drones_state"])
+    assert np.allclose(env.obs_rms["drones_state"].mean, states.mean(axis=0))
+    env.close()
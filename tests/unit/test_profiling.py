@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.logger import KVWriter, Logger
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.training.profiling import (
+    ROLLOUT_SECTIONS,
+    ThroughputProfilerCallback,
+)
+
+
+class _RecordingWriter(KVWriter):
+    """Keeps every dumped set of logger values"""
+
+    def __init__(self):
+        self.dumps = []
+
+    def write(self, key_values, key_excluded, step=0):
+        self.dumps.append(dict(key_values))
+
+
+def test_throughput_profiler_breaks_down_training(tmp_path):
+    """Every rollout is split into env step, inference, buffer and update time"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    env = VecNormalize(DummyVecEnv([lambda: VertiportEnv(config)] * 2))
+    model = PPO("MultiInputPolicy", env, n_steps=16, batch_size=16, n_epochs=2, seed=0)
+    writer = _RecordingWriter()
+    model.set_logger(Logger(folder=None, output_formats=[writer]))
+
+    summary_path = tmp_path / "profile.json"
+    profiler = ThroughputProfilerCallback(summary_path=str(summary_path))
+    model.learn(96, callback=profiler)
+    env.close()
+
+    assert len(profiler.rollouts) == 3
+    for record in profiler.rollouts:
+        assert all(record[section] > 0 for section in ROLLOUT_SECTIONS)
+        assert record["env_step"] > record["normalize"]
+        timed = record["env_step"] + record["inference"] + record["buffer_insert"]
+        assert np.isclose(record["other"], record["rollout"] - timed)
+        assert record["other"] >= 0
+        assert record["timesteps"] == 32
+        # PPO counts one update per epoch; the last update is included too
+        assert record["update"] > 0
+        assert record["gradient_steps"] == 2
+
+    # The timers are removed after training
+    assert "step" not in vars(env)
+    assert "forward" not in vars(model.policy)
+    assert "add" not in vars(model.rollout_buffer)
+
+    summary = json.loads(summary_path.read_text())
+    assert summary["iterations"] == 3
+    assert summary["timesteps"] == 96
+    for section in ROLLOUT_SECTIONS + ("other", "update"):
+        assert np.isclose(
+            summary["seconds"][section],
+            sum(record[section] for record in profiler.rollouts),
+        )
+    # Normalization is part of the environment step
+    fractions = summary["fraction"]
+    assert sum(fractions.values()) - fractions["normalize"] <= 1.0 + 1e-6
+    assert summary["updates_per_s"] > 0
+    assert summary["peak_rss_mb"] > 0
+
+    logged = {key for dump in writer.dumps for key in dump}
+    for section in ROLLOUT_SECTIONS + ("other", "rollout"):
+        assert f"profile/{section}_s" in logged
+    assert {"profile/env_steps_per_s", "profile/update_s"} <= logged
+    assert {"profile/updates_per_s", "profile/peak_rss_mb"} <= logged
@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.agents.base import BaseAgent
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.evaluation.realtime import RealTimeRunner
+
+
+class _SlowAgent(BaseAgent):
+    """Continues every drone, taking ``delay`` s on every ``slow_every``-th call"""
+
+    def __init__(self, delay: float, slow_every: int):
+        super().__init__("Slow")
+        self.delay = delay
+        self.slow_every = slow_every
+        self.calls = 0
+
+    def act(self, observation):
+        self.calls += 1
+        if self.calls % self.slow_every == 0:
+            time.sleep(self.delay)
+        return np.ones(len(observation["drones_state"]), dtype=np.int64)
+
+    def reset(self):
+        pass
+
+
+def test_realtime_runner_falls_back_on_deadline_misses(tmp_path):
+    """Late decisions are replaced by hovering and counted as misses"""
+    env = VertiportEnv(load_scenario_config("scenarios/easy_world.yaml"))
+    agent = _SlowAgent(delay=0.03, slow_every=5)
+    runner = RealTimeRunner(
+        env, agent, real_time_factor=5.0, decision_budget=0.01, fallback="hover"
+    )
+    applied = []
+    advance = env.advance
+    env.advance = lambda action: applied.append(np.array(action)) or advance(action)
+
+    report = runner.run(40, seed=0)
+
+    # Every slow call misses the deadline and blocks the next tick as well
+    assert report.ticks == 40
+    assert report.deadline_misses >= 40 // 5
+    assert report.miss_rate == report.deadline_misses / 40
+    hovered = sum(not action.any() for action in applied)
+    assert hovered == report.deadline_misses
+    assert all(action.all() for action in applied if action.any())
+
+    inference = report.stages["inference"]
+    assert inference.count == 40
+    assert inference.p50 <= inference.p99 <= inference.p999 <= inference.max
+    assert inference.p50 < 10.0
+    assert sum(inference.histogram) == 40
+    assert report.stages["agent"].max >= 30.0
+
+    path = tmp_path / "report.json"
+    report.save(str(path))
+    saved = json.loads(path.read_text())
+    assert saved["deadline_misses"] == report.deadline_misses
+    assert len(saved["histogram_edges_ms"]) == len(inference.histogram) + 1
+
+
+def test_realtime_runner_paces_ticks():
+    """Ticks are spaced by the simulation time step over the real-time factor"""
+    env = VertiportEnv(load_scenario_config("scenarios/easy_world.yaml"))
+    runner = RealTimeRunner(env, _SlowAgent(0.0, 1), real_time_factor=10.0)
+
+    start = time.perf_counter()
+    report = runner.run(20, seed=0)
+    elapsed = time.perf_counter() - start
+
+    assert report.deadline_misses == 0
+    assert np.isclose(report.period_ms, env.sim.dt / 10.0 * 1e3)
+    assert elapsed >= 19 * env.sim.dt / 10.0
@@ -0,0 +1,165 @@
+import os
+import sys
+
+import numpy as np
+import torch
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.utils import obs_as_tensor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.training.remote import find_remote_vec_env
+from src.vertiport_autonomy.training.trainer import Trainer
+from src.vertiport_autonomy.training.vec_env import make_training_vec_env
+
+
+def test_remote_workers_match_local_rollouts_and_recover():
+    """Localhost workers step like DummyVecEnv and survive a worker failure"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    actions = np.ones((3, config.traffic.max_drones), dtype=np.int64)
+
+    results = {}
+    for backend in ("dummy", "remote"):
+        env = make_training_vec_env(
+            VertiportEnv,
+            n_envs=3,
+            env_kwargs={"config": config},
+            backend=backend,
+            envs_per_worker=2,
+            seed=0,
+            remote_kwargs={"reconnect_attempts": 1, "retry_interval": 0.1},
+        )
+        env.reset()
+        rewards = []
+        for _ in range(20):
+            obs, reward, done, info = env.step(actions)
+            rewards.append(reward)
+        assert env.get_attr("num_drones") == [config.traffic.max_drones] * 3
+        results[backend] = (obs, np.array(rewards))
+
+        if backend == "remote":
+            assert env.assignments == [[0, 1], [2]]
+            # Environments of a dead worker move to the surviving worker
+            env.local_processes[0].terminate()
+            env.local_processes[0].join()
+            obs, reward, done, info = env.step(actions)
+            assert done.all() and all(i.get("worker_failure") for i in info)
+            assert env.assignments == [[], [0, 1, 2]]
+            obs, reward, done, info = env.step(actions)
+            assert obs["drones_state"].shape[0] == 3
+        env.close()
+
+    reference_obs, reference_rewards = results["dummy"]
+    obs, rewards = results["remote"]
+    assert np.allclose(rewards, reference_rewards)
+    for key in reference_obs:
+        assert np.allclose(obs[key], reference_obs[key])
+
+
+def test_distributed_ppo_collects_on_workers(tmp_path):
+    """DistributedPPO fills full rollouts from worker-side inference"""
+    trainer = Trainer(
+        log_dir=str(tmp_path),
+        model_dir=str(tmp_path),
+        n_envs=2,
+        vec_env_backend="remote",
+        n_steps=32,
+        batch_size=32,
+    )
+    env = trainer.create_environment("scenarios/easy_world.yaml")
+    model = trainer.create_model(env, verbose=0, tensorboard_log=None)
+    assert type(model).__name__ == "DistributedPPO"
+
+    model.learn(64)
+    assert model.num_timesteps == 64
+    buffer = model.rollout_buffer
+    assert buffer.full
+    assert np.isfinite(buffer.advantages).all()
+    assert np.isfinite(buffer.log_probs).all()
+    env.close()
+
+
+class _RolloutCheck(BaseCallback):
+    """Compares the batched values and log-probs with per-step evaluation"""
+
+    def __init__(self):
+        super().__init__()
+        self.checked = 0
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self) -> None:
+        buffer = self.model.rollout_buffer
+        policy = self.model.policy
+        for t in range(buffer.buffer_size):
+            obs = {key: value[t] for key, value in buffer.observations.items()}
+            with torch.no_grad():
+                values, log_probs, _ = policy.evaluate_actions(
+                    obs_as_tensor(obs, policy.device),
+                    torch.as_tensor(buffer.actions[t], device=policy.device),
+                )
+            assert np.allclose(buffer.values[t], values.flatten().numpy(), atol=1e-5)
+            assert np.allclose(buffer.log_probs[t], log_probs.numpy(), atol=1e-4)
+        self.checked += 1
+
+
+def test_distributed_ppo_recovers_from_worker_failure_mid_collect(tmp_path):
+    """Killing a worker during collect restarts only its environments"""
+    trainer = Trainer(
+        log_dir=str(tmp_path),
+        model_dir=str(tmp_path),
+        n_envs=3,
+        vec_env_backend="remote",
+        vec_env_kwargs={
+            "envs_per_worker": 1,
+            "remote_kwargs": {
+                "reconnect_attempts": 1,
+                "retry_interval": 0.1,
+                "chunk_steps": 8,
+            },
+        },
+        n_steps=32,
+        batch_size=32,
+    )
+    env = trainer.create_environment("scenarios/easy_world.yaml")
+    model = trainer.create_model(env, verbose=0, tensorboard_log=None)
+    remote = find_remote_vec_env(env)
+    assert remote.assignments == [[0], [1], [2]]
+
+    # Kill worker 0 after its first chunk of the second rollout
+    collects, restarted = [], []
+    original_collect, original_recv = remote.collect, remote._recv
+
+    def collect(n_steps, deterministic=False):
+        collects.append(n_steps)
+        result = original_collect(n_steps, deterministic)
+        restarted.append(result[0])
+        return result
+
+    def recv(worker):
+        reply = original_recv(worker)
+        if len(collects) == 2 and worker == 0 and reply[0] == "chunk":
+            remote.local_processes[0].terminate()
+            remote.local_processes[0].join()
+        return reply
+
+    remote.collect, remote._recv = collect, recv
+
+    check = _RolloutCheck()
+    model.learn(96, callback=check)
+    first_starts = model._last_episode_starts.copy()
+    model.learn(96, callback=check, reset_num_timesteps=False)
+    env.close()
+
+    # Worker 0's environment moved to worker 1, whose collection restarted
+    assert remote.assignments == [[], [0, 1], [2]]
+    assert not restarted[0].any()
+    assert restarted[1].tolist() == [True, True, False]
+    buffer = model.rollout_buffer
+    assert buffer.full and model.num_timesteps == 192
+    assert buffer.episode_starts[0].tolist() == [1.0, 1.0, float(first_starts[2])]
+    assert np.isfinite(buffer.advantages).all()
+    assert check.checked == 2
@@ -0,0 +1,142 @@
+import os
+import pickle
+import sys
+import threading
+from multiprocessing.connection import Client
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.agents.drl import (
+    DistilledAgent,
+    PolicyServer,
+    RemotePolicyAgent,
+)
+from src.vertiport_autonomy.agents.drl.distilled import compact_features
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+
+
+def _observations_and_agent():
+    """Observations of one episode and a random student to serve"""
+    env = VertiportEnv(load_scenario_config("scenarios/easy_world.yaml"))
+    observations = [env.reset(seed=0)[0]]
+    for _ in range(40):
+        observations.append(env.step(env.action_space.sample())[0])
+
+    rng = np.random.default_rng(0)
+    num_features = compact_features(observations[0], env.max_drones).shape[1]
+    agent = DistilledAgent(
+        [
+            (rng.normal(size=(num_features, 16)), rng.normal(size=16)),
+            (
+                rng.normal(size=(16, env.max_drones * 5)),
+                rng.normal(size=env.max_drones * 5),
+            ),
+        ],
+        feature_mean=np.zeros(num_features),
+        feature_std=np.full(num_features, 50.0),
+        num_drones=env.max_drones,
+    )
+    return observations, agent
+
+
+def test_policy_server_micro_batches_concurrent_clients():
+    """Concurrent requests share forward passes and get their own actions"""
+    observations, agent = _observations_and_agent()
+    expected = agent.act(
+        {key: np.stack([obs[key] for obs in observations]) for key in observations[0]}
+    )
+
+    server = PolicyServer(agent, max_batch_size=64, max_wait=0.05).start()
+    try:
+        client = RemotePolicyAgent(server.address)
+        mismatches = []
+
+        def run_client(offset: int) -> None:
+            worker = pickle.loads(pickle.dumps(client))
+            for i in range(offset, len(observations), 4):
+                if not np.array_equal(worker.act(observations[i]), expected[i]):
+                    mismatches.append(i)
+            worker.close()
+
+        threads = [threading.Thread(target=run_client, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not mismatches
+
+        # Batched requests come back in order
+        batch = {
+            key: np.stack([obs[key] for obs in observations[:5]])
+            for key in observations[0]
+        }
+        assert np.array_equal(client.act(batch), expected[:5])
+
+        stats = server.stats()
+        assert stats["requests"] == len(observations) + 1
+        assert stats["observations"] == len(observations) + 5
+        assert stats["batches"] < stats["requests"]
+
+        # Policy errors are reported to the client, which stays usable
+        broken = dict(observations[0], drones_state=np.zeros((1, 3, 16)))
+        try:
+            client.act(broken)
+            raise AssertionError("Expected a RuntimeError")
+        except RuntimeError as e:
+            assert "Policy server error" in str(e)
+        assert np.array_equal(client.act(observations[0]), expected[0])
+        client.close()
+    finally:
+        server.close()
+
+
+def test_policy_server_isolates_a_bad_request_in_a_batch():
+    """A malformed request fails alone, not the good one batched with it"""
+    observations, agent = _observations_and_agent()
+    good = observations[3]
+    bad = dict(observations[0], drones_state=np.zeros((1, 3, 16)))
+
+    server = PolicyServer(agent, max_batch_size=64, max_wait=0.5).start()
+    try:
+        client = RemotePolicyAgent(server.address)
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def run_client(name, observation) -> None:
+            worker = pickle.loads(pickle.dumps(client))
+            barrier.wait()
+            try:
+                results[name] = worker.act(observation)
+            except RuntimeError as e:
+                results[name] = e
+            worker.close()
+
+        threads = [
+            threading.Thread(target=run_client, args=("good", good)),
+            threading.Thread(target=run_client, args=("bad", bad)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Both requests arrived within the same micro-batch
+        assert server.stats()["batches"] == 1
+        assert np.array_equal(results["good"], agent.act(good))
+        assert isinstance(results["bad"], RuntimeError)
+        assert "Policy server error" in str(results["bad"])
+
+        # Messages that are not observations are rejected on arrival
+        raw = Client(server.address, authkey=server.authkey)
+        for message in ("hello", {}, {"drones_state": 3.0}):
+            raw.send(message)
+            status, payload = raw.recv()
+            assert status == "error" and "Traceback" in payload
+        raw.close()
+        assert np.array_equal(client.act(good), agent.act(good))
+        client.close()
+    finally:
+        server.close()
@@ -0,0 +1,128 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core import (
+    BatchedVertiportSim,
+    SimulationClient,
+    SimulationServer,
+    VertiportSim,
+)
+
+
+def test_batched_simulator_matches_vertiport_sim():
+    """Stepping any subset of the batch matches independent simulators"""
+    config = load_scenario_config("scenarios/steady_flow.yaml")
+    sims = [VertiportSim(config) for _ in range(3)]
+    batch = BatchedVertiportSim(config)
+    slots = [batch.add() for _ in sims]
+    rng = np.random.default_rng(0)
+    seen_states = set()
+    for _ in range(1500):
+        actions = rng.choice([0, 1, 2, 4], p=[0.05, 0.75, 0.05, 0.15], size=(3, 10))
+        stepped = [k for k in range(3) if rng.random() < 0.8]
+        for k in stepped:
+            sims[k].step(actions[k])
+        batch.step([slots[k] for k in stepped], actions[stepped])
+
+        state = batch.get_state(slots)
+        for k, sim in enumerate(sims):
+            expected = sim._get_state()
+            assert np.array_equal(state["states"][k], expected["states"])
+            assert np.array_equal(state["waypoint_indices"][k], sim.waypoint_indices)
+            assert np.array_equal(state["fato_occupancy"][k], sim.fato_occupancy)
+            assert np.array_equal(state["hover_count"][k], expected["hover_count"])
+            assert state["collisions"][k] == expected["collisions"]
+            for key in ("positions", "velocities", "distance_matrix"):
+                assert np.allclose(state[key][k], expected[key])
+            seen_states.update(expected["states"].tolist())
+    # Every drone state from entry to exit was reached
+    assert seen_states == {1, 2, 3, 5, 6, 7}
+
+
+def test_simulation_server_batches_concurrent_sessions():
+    """Concurrent clients share vectorized steps and get their own states"""
+    scenario = "scenarios/easy_world.yaml"
+    server = SimulationServer(max_wait=0.005).start()
+    try:
+        failures = []
+
+        def run_client(seed: int) -> None:
+            rng = np.random.default_rng(seed)
+            reference = VertiportSim(load_scenario_config(scenario))
+            with SimulationClient(server.address) as client:
+                session, num_drones, num_fatos, dt = client.create(scenario)
+                state = client.reset(session)
+                for _ in range(100):
+                    actions = rng.choice([0, 1, 4], p=[0.1, 0.7, 0.2], size=num_drones)
+                    state = client.step(session, actions)
+                    reference.step(actions)
+                if not np.allclose(state["positions"], reference.positions, atol=1e-4):
+                    failures.append(seed)
+                snapshot = client.snapshot(session)
+                if int(snapshot["steps"]) != 100 or not np.array_equal(
+                    snapshot["states"], [s.value for s in reference.states]
+                ):
+                    failures.append(seed)
+
+        threads = [threading.Thread(target=run_client, args=(k,)) for k in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not failures
+
+        stats = server.stats()
+        assert stats["steps"] == 600
+        assert stats["step_calls"] < stats["steps"]
+        # Sessions are closed with the connections that created them
+        deadline = time.monotonic() + 5.0
+        while server.stats()["sessions"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.stats()["sessions"] == 0
+
+        # Errors are reported and the connection stays usable
+        with SimulationClient(server.address) as client:
+            session = client.create(scenario)[0]
+            for bad_actions in ([1, 1], [9] * 5):
+                try:
+                    client.step(session, bad_actions)
+                    raise AssertionError("Expected a RuntimeError")
+                except RuntimeError:
+                    pass
+            assert client.step(session, [1] * 5)["positions"].shape == (5, 3)
+
+            # Other connections can neither use nor close the session
+            with SimulationClient(server.address) as other:
+                for request in (other.reset, other.snapshot, other.close_session):
+                    try:
+                        request(session)
+                        raise AssertionError("Expected a RuntimeError")
+                    except RuntimeError as error:
+                        assert "belongs to another connection" in str(error)
+                try:
+                    other.step(session, [1] * 5)
+                    raise AssertionError("Expected a RuntimeError")
+                except RuntimeError as error:
+                    assert "belongs to another connection" in str(error)
+            assert int(client.snapshot(session)["steps"]) == 1
+            client.close_session(session)
+            try:
+                client.snapshot(session)
+                raise AssertionError("Expected a RuntimeError")
+            except RuntimeError as error:
+                assert "Unknown session" in str(error)
+
+        try:
+            SimulationClient(server.address, authkey=b"wrong key")
+            raise AssertionError("Expected a ConnectionError")
+        except ConnectionError:
+            pass
+    finally:
+        server.close()
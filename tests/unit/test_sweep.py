@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.training.sweep import (
+    HyperparameterSweep,
+    TrialResult,
+    load_trials,
+    rung_budgets,
+    sample_params,
+)
+
+
+def test_sampling_rungs_and_promotion(tmp_path):
+    """Sampled values stay in range and only the top 1/eta of a rung continue"""
+    space = {
+        "learning_rate": ("log_uniform", 1e-5, 1e-3),
+        "clip_range": ("uniform", 0.1, 0.3),
+        "n_epochs": ("int", 3, 10),
+        "batch_size": [64, 128],
+    }
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        params = sample_params(space, rng)
+        assert 1e-5 <= params["learning_rate"] <= 1e-3
+        assert 0.1 <= params["clip_range"] <= 0.3
+        assert 3 <= params["n_epochs"] <= 10
+        assert params["batch_size"] in (64, 128)
+
+    try:
+        sample_params({"gamma": ("beta", 0, 1)}, rng)
+        assert False, "Unknown distribution should raise"
+    except ValueError:
+        pass
+
+    assert rung_budgets(100, 1000, 3) == [100, 300, 900, 1000]
+    assert rung_budgets(100, 100, 3) == [100]
+
+    sweep = HyperparameterSweep(
+        "scenarios/easy_world.yaml",
+        min_timesteps=100,
+        max_timesteps=900,
+        reduction_factor=3,
+        sweep_dir=str(tmp_path),
+    )
+    # The first report at a rung always continues; afterwards a score must
+    # reach the top third of everything reported at that rung
+    assert sweep.should_promote(0, 1.0)
+    assert not sweep.should_promote(0, 0.5)
+    assert sweep.should_promote(0, 2.0)
+    assert not sweep.should_promote(0, 1.5)
+    assert not sweep.should_promote(0, 0.0)
+    assert sweep.should_promote(0, 1.8)
+
+
+def test_only_trials_below_the_final_rung_are_pruned(tmp_path):
+    """A trial reporting its final rung completes even if it ranks low there"""
+    sweep = HyperparameterSweep(
+        "scenarios/easy_world.yaml",
+        min_timesteps=100,
+        max_timesteps=300,
+        reduction_factor=3,
+        sweep_dir=str(tmp_path),
+    )
+    assert sweep.budgets == [100, 300]
+    trials = [TrialResult(trial_id=k, params={}) for k in range(3)]
+    sweep.trials = trials
+
+    assert sweep._on_report(trials[0], 0, 100, 1.0)
+    assert not sweep._on_report(trials[1], 0, 100, 0.5)
+    assert trials[1].status == "pruned"
+
+    assert sweep._on_report(trials[0], 1, 300, 2.0)
+    assert sweep._on_report(trials[2], 0, 100, 3.0)
+    # Ranks below trial 0 at the final rung, but has trained its full budget
+    sweep._on_report(trials[2], 1, 300, 1.5)
+    assert trials[2].status == "running"
+    assert trials[2].rung_scores == [3.0, 1.5]
+    assert trials[2].timesteps == 300
+
+    for trial in (trials[0], trials[2]):
+        trial.status = "completed"
+    assert sweep.best_trial() is trials[0]
+
+
+def test_sweep_prunes_and_records_trials(tmp_path):
+    """A small sweep promotes, prunes and records every trial"""
+    sweep = HyperparameterSweep(
+        "scenarios/easy_world.yaml",
+        search_space={
+            "learning_rate": [1e-4, 3e-2],
+            "ent_coef": ("uniform", 0.0, 0.1),
+            "seed": [0],
+        },
+        n_trials=3,
+        n_parallel=1,
+        min_timesteps=32,
+        max_timesteps=64,
+        reduction_factor=2,
+        n_eval_episodes=1,
+        sweep_dir=str(tmp_path),
+        seed=0,
+        n_envs=2,
+        n_steps=16,
+        batch_size=32,
+    )
+    trials = sweep.run()
+    assert [t.trial_id for t in trials] == [0, 1, 2]
+    assert {t.status for t in trials} == {"completed", "pruned"}
+
+    # Trials run one at a time, so the first rung sees them in launch order
+    # and a trial continues iff it ties or beats the best score so far
+    for k, trial in enumerate(trials):
+        first = trial.rung_scores[0]
+        promoted = first >= max(t.rung_scores[0] for t in trials[: k + 1])
+        if promoted:
+            assert trial.status == "completed"
+            assert len(trial.rung_scores) == 2 and trial.timesteps == 64
+            assert os.path.exists(tmp_path / f"trial_{k}" / "model.zip")
+        else:
+            assert trial.status == "pruned"
+            assert trial.rung_scores == [first] and trial.timesteps == 32
+        assert trial.score == trial.rung_scores[-1]
+    assert sweep.rung_scores[0] == [t.rung_scores[0] for t in trials]
+
+    best = sweep.best_trial()
+    completed = [t for t in trials if t.status == "completed"]
+    assert best.score == max(t.score for t in completed)
+
+    # Every finished trial is appended to the results store
+    with open(tmp_path / "trials.jsonl") as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(r["trial_id"] for r in records) == [0, 1, 2]
+    loaded = {t.trial_id: t for t in load_trials(str(tmp_path / "trials.jsonl"))}
+    for trial in trials:
+        assert loaded[trial.trial_id].status == trial.status
+        assert np.allclose(loaded[trial.trial_id].rung_scores, trial.rung_scores)
+        assert loaded[trial.trial_id].params == trial.params
+        assert loaded[trial.trial_id].duration_seconds > 0
@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.training.trainer import Trainer
+from src.vertiport_autonomy.training.tuning import CalibrationResult, ThroughputTuner
+
+
+def test_tuner_recommends_and_applies_fastest_config(tmp_path):
+    """Tuner skips invalid grid points and applies the fastest config in budget"""
+    tuner = ThroughputTuner(
+        "scenarios/easy_world.yaml",
+        n_envs_grid=[2, 4],
+        n_steps_grid=[32],
+        batch_size_grid=[64, 128],
+        backends=["dummy", "subproc"],
+        envs_per_worker_grid=[1, 4],
+        memory_budget_mb=1000,
+    )
+    configs = tuner.configurations()
+    assert all(c["batch_size"] <= c["n_envs"] * c["n_steps"] for c in configs)
+    assert all(c["envs_per_worker"] <= c["n_envs"] for c in configs)
+    assert all(
+        c["envs_per_worker"] == 1 for c in configs if c["vec_env_backend"] == "dummy"
+    )
+
+    results = [
+        CalibrationResult(2, 32, 64, "dummy", 1, steps_per_second=500.0),
+        CalibrationResult(
+            4, 32, 128, "subproc", 4, steps_per_second=900.0, fits_budget=False
+        ),
+        CalibrationResult(4, 32, 64, "subproc", 1, steps_per_second=800.0),
+        CalibrationResult(4, 32, 128, "dummy", 1, error="failed"),
+    ]
+    best = tuner.recommend(results)
+    assert best.steps_per_second == 800.0
+
+    trainer = Trainer(log_dir=str(tmp_path), model_dir=str(tmp_path), n_envs=50)
+    ThroughputTuner.apply(trainer, best)
+    assert trainer.n_envs == 4
+    assert trainer.vec_env_backend == "subproc"
+    assert trainer.vec_env_kwargs["envs_per_worker"] == 1
+    assert trainer.ppo_kwargs["n_steps"] == 32
+    assert trainer.ppo_kwargs["batch_size"] == 64
+
+
+def test_calibrate_counts_memory_of_environment_workers():
+    """Peak memory of a burst includes its live subprocess workers"""
+    tuner = ThroughputTuner(
+        "scenarios/easy_world.yaml",
+        n_envs_grid=[2],
+        n_steps_grid=[16],
+        batch_size_grid=[32],
+        backends=["dummy", "subproc"],
+        n_rollouts=1,
+    )
+    dummy_config, subproc_config = tuner.configurations()
+    dummy = tuner.calibrate(dummy_config)
+    tuner.memory_budget_mb = dummy.peak_rss_mb + 50
+    subproc = tuner.calibrate(subproc_config)
+    for result in (dummy, subproc):
+        assert result.error is None
+        assert result.timesteps == 32
+        assert result.steps_per_second > 0
+    # Two worker processes add far more than sampling noise
+    assert subproc.peak_rss_mb > dummy.peak_rss_mb + 100
+    assert not subproc.fits_budget
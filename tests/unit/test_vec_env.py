@@ -0,0 +1,81 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.vertiport_autonomy.config.loader import load_scenario_config
+from src.vertiport_autonomy.core.environment import VertiportEnv
+from src.vertiport_autonomy.training.vec_env import make_training_vec_env
+
+
+def test_backends_produce_identical_rollouts():
+    """Subprocess and shared-memory backends match the in-process backend"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    actions = np.ones((3, config.traffic.max_drones), dtype=np.int64)
+
+    results = {}
+    for backend, envs_per_worker in [("dummy", 1), ("subproc", 2), ("shmem", 2)]:
+        env = make_training_vec_env(
+            VertiportEnv,
+            n_envs=3,
+            env_kwargs={"config": config},
+            backend=backend,
+            envs_per_worker=envs_per_worker,
+            seed=0,
+        )
+        obs = env.reset()
+        rewards = []
+        for _ in range(20):
+            obs, reward, done, info = env.step(actions)
+            rewards.append(reward)
+
+        assert env.get_attr("num_drones") == [config.traffic.max_drones] * 3
+        assert np.stack(env.env_method("action_masks")).shape == (3, 25)
+        results[backend] = (obs, np.array(rewards))
+        env.close()
+
+    reference_obs, reference_rewards = results["dummy"]
+    for backend in ("subproc", "shmem"):
+        obs, rewards = results[backend]
+        assert np.allclose(rewards, reference_rewards)
+        for key in reference_obs:
+            assert np.allclose(obs[key], reference_obs[key])
+
+
+def test_threaded_backend_matches_dummy_across_resets():
+    """Thread-pool shards reproduce sequential stepping, including auto-resets"""
+    config = load_scenario_config("scenarios/easy_world.yaml")
+    actions = np.ones((5, config.traffic.max_drones), dtype=np.int64)
+
+    results = {}
+    for backend in ("dummy", "threads"):
+        env = make_training_vec_env(
+            VertiportEnv,
+            n_envs=5,
+            env_kwargs={"config": config},
+            backend=backend,
+            envs_per_worker=2,
+            seed=0,
+        )
+        for monitored_env in env.envs:
+            monitored_env.unwrapped.max_steps = 7
+        env.reset()
+        steps = []
+        for _ in range(15):
+            env.step_async(actions)
+            steps.append(env.step_wait())
+        results[backend] = steps
+        env.close()
+
+    for reference, threaded in zip(results["dummy"], results["threads"]):
+        assert np.allclose(threaded[1], reference[1])
+        assert np.array_equal(threaded[2], reference[2])
+        for key in reference[0]:
+            assert np.allclose(threaded[0][key], reference[0][key])
+        for ref_info, info in zip(reference[3], threaded[3]):
+            assert ref_info.keys() == info.keys()
+    # Episodes were truncated at step 7 and the envs reset themselves
+    assert results["threads"][6][2].all()
+    assert "terminal_observation" in results["threads"][6][3][0]